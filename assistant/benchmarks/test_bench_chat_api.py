@@ -41,6 +41,7 @@ def mock_openai():
     mock_response.choices[0].message.tool_calls = None
 
     mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock()
     mock_client.chat.completions.create.return_value = mock_response
 
     return mock_client
@@ -0,0 +1,100 @@
+"""
+Benchmarks for Cron Next-Run Computation
+
+Critical paths tested:
+- Next run for thousands of generated expressions with the compiled
+  bitmask search (what the scheduler does after every execution)
+- The minute-by-minute search it replaced, on a smaller sample
+- Bulk previews of upcoming runs (/api/schedule/preview, schedule validate)
+"""
+
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.services.scheduler import CronParser
+
+EXPRESSION_COUNT = 2000
+START = datetime(2026, 3, 14, 15, 9, 26)
+COMMON_EXPRESSIONS = [
+    "*/5 * * * *", "0 * * * *", "0 7 * * *", "30 8 * * 1-5", "0 0 1 * *", "0 9 * * 0",
+    "*/15 9-17 * * 1-5", "0 22 * * 6", "45 6 1,15 * *", "0 12 * 1-6 *",
+]
+
+
+def generate_expressions(count: int) -> list[str]:
+    """Seeded mix of realistic schedules and random field combinations."""
+    rng = random.Random(42)
+    expressions = []
+    for i in range(count):
+        if i % 2 == 0:
+            expressions.append(COMMON_EXPRESSIONS[i // 2 % len(COMMON_EXPRESSIONS)])
+            continue
+        fields = []
+        for name in CronParser.FIELDS:
+            low, high = CronParser.RANGES[name]
+            value = rng.randint(low, high)
+            fields.append(rng.choice(["*", str(value), f"{value}-{high}", f"*/{rng.randint(2, 6)}"]))
+        expressions.append(" ".join(fields))
+    # Keep expressions that have a run within the search horizon
+    valid = []
+    for expr in expressions:
+        try:
+            CronParser.get_next_run(expr, START)
+        except ValueError:
+            continue
+        valid.append(expr)
+    return valid
+
+
+def minute_stepping_next_run(cron_expr: str, after: datetime) -> datetime:
+    """The previous implementation: test every minute for up to a year."""
+    parsed = CronParser.parse(cron_expr)
+    current = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    for _ in range(525600):
+        if (current.minute in parsed["minute"] and
+            current.hour in parsed["hour"] and
+            current.day in parsed["day"] and
+            current.month in parsed["month"] and
+            (current.weekday() + 1) % 7 in parsed["weekday"]):
+            return current
+        current += timedelta(minutes=1)
+    raise ValueError(f"No valid run time found for cron expression: {cron_expr}")
+
+
+EXPRESSIONS = generate_expressions(EXPRESSION_COUNT)
+
+
+class TestCronBenchmarks:
+    """Benchmarks for next-run computation."""
+
+    def test_bench_next_run_compiled(self, benchmark):
+        """Next run for ~2000 expressions with the compiled bitmask search."""
+        def run():
+            return [CronParser.get_next_run(expr, START) for expr in EXPRESSIONS]
+
+        result = benchmark(run)
+        assert len(result) == len(EXPRESSIONS)
+
+    def test_bench_next_run_minute_stepping(self, benchmark):
+        """Baseline: the minute-by-minute search on every 50th expression."""
+        sample = EXPRESSIONS[::50]
+
+        def run():
+            return [minute_stepping_next_run(expr, START) for expr in sample]
+
+        result = benchmark.pedantic(run, rounds=3, iterations=1)
+        assert len(result) == len(sample)
+
+    def test_bench_next_n_runs(self, benchmark):
+        """Preview of the next 100 runs for 100 everyday expressions."""
+        sample = COMMON_EXPRESSIONS * 10
+
+        def run():
+            return [CronParser.next_n_runs(expr, 100, START) for expr in sample]
+
+        result = benchmark(run)
+        assert all(len(runs) == 100 for runs in result)
@@ -0,0 +1,113 @@
+"""
+Benchmarks for MCP Client
+
+Critical paths tested:
+- MCPClientManager.call_tool round trip to a stdio server
+- Throughput of concurrent call_tool requests multiplexed over one server
+"""
+
+import pytest
+import asyncio
+import textwrap
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.services.mcp_client import MCPClientManager, MCPServerConfig
+
+
+# Minimal MCP server: echoes tools/call arguments, answering each call on its
+# own thread so concurrent requests overlap like a real I/O-bound server.
+ECHO_MCP_SERVER = textwrap.dedent('''
+    import json
+    import sys
+    import threading
+    import time
+
+    write_lock = threading.Lock()
+
+    def send(message):
+        with write_lock:
+            sys.stdout.write(json.dumps(message) + "\\n")
+            sys.stdout.flush()
+
+    def call(request_id, args):
+        time.sleep(args.get("delay", 0))
+        send({"jsonrpc": "2.0", "id": request_id,
+              "result": {"content": [{"type": "text", "text": args.get("text", "")}]}})
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        if "id" not in request:
+            continue
+        if request["method"] == "initialize":
+            send({"jsonrpc": "2.0", "id": request["id"], "result": {"protocolVersion": "2024-11-05"}})
+        elif request["method"] == "tools/list":
+            send({"jsonrpc": "2.0", "id": request["id"], "result": {"tools": [
+                {"name": "echo", "description": "Echo", "inputSchema": {"type": "object"}}]}})
+        else:
+            args = request["params"].get("arguments", {})
+            threading.Thread(target=call, args=(request["id"], args), daemon=True).start()
+''')
+
+
+@pytest.fixture
+def event_loop():
+    """Create event loop for async benchmarks."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def mcp_manager(tmp_path, event_loop):
+    """MCP manager connected to a local echo server."""
+    script = tmp_path / "echo_mcp_server.py"
+    script.write_text(ECHO_MCP_SERVER)
+
+    manager = MCPClientManager(tmp_path / "bench.db")
+    manager._configs = [MCPServerConfig(
+        name="echo",
+        transport="stdio",
+        command=[sys.executable, str(script)],
+    )]
+    event_loop.run_until_complete(manager.connect_all())
+    yield manager
+    event_loop.run_until_complete(manager.disconnect_all())
+
+
+class TestMCPClientBenchmarks:
+    """Benchmarks for MCPClientManager.call_tool."""
+
+    def test_bench_call_tool_single(self, benchmark, mcp_manager, event_loop):
+        """Benchmark one call_tool round trip."""
+
+        async def call():
+            return await mcp_manager.call_tool("echo", {"text": "ping"})
+
+        benchmark(lambda: event_loop.run_until_complete(call()))
+
+    def test_bench_call_tool_concurrent_100(self, benchmark, mcp_manager, event_loop):
+        """Benchmark 100 concurrent call_tool requests to one server."""
+
+        async def call_many():
+            return await asyncio.gather(*[
+                mcp_manager.call_tool("echo", {"text": f"msg-{i}"}) for i in range(100)
+            ])
+
+        benchmark(lambda: event_loop.run_until_complete(call_many()))
+
+    def test_bench_call_tool_concurrent_io_bound(self, benchmark, mcp_manager, event_loop):
+        """Benchmark 20 concurrent 50ms tool calls (serial would take >= 1s)."""
+
+        async def call_many():
+            return await asyncio.gather(*[
+                mcp_manager.call_tool("echo", {"text": "slow", "delay": 0.05}) for _ in range(20)
+            ])
+
+        benchmark(lambda: event_loop.run_until_complete(call_many()))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--benchmark-only"])
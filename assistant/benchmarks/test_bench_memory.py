@@ -5,6 +5,8 @@ Critical paths tested:
 - add_message: Adding a message to conversation
 - get_messages: Retrieving conversation messages
 - search_messages: Full-text search across messages
+- get_context_for_api: Per-turn context assembly for long conversations
+- get_conversation: Per-conversation lookups in a multi-conversation database
 """
 
 import pytest
@@ -180,6 +182,60 @@ class TestMemoryServiceBenchmarks:
 
         benchmark(lambda: event_loop.run_until_complete(count()))
 
+    def test_bench_get_context_long_conversation(self, benchmark, memory_service, event_loop):
+        """Benchmark per-turn context assembly after summaries are sealed (2000 messages)."""
+
+        async def setup():
+            await memory_service._ensure_initialized()
+            await memory_service._ensure_default_conversation()
+            for i in range(2000):
+                await memory_service.add_to_conversation("user", f"Test message {i}")
+            # First call seals all complete batches
+            await memory_service.get_context_for_api()
+
+        async def get_context():
+            return await memory_service.get_context_for_api()
+
+        event_loop.run_until_complete(setup())
+
+        benchmark(lambda: event_loop.run_until_complete(get_context()))
+
+    def test_bench_get_conversation_indexed(self, benchmark, memory_service, event_loop):
+        """Benchmark loading one small conversation out of 5000 stored messages.
+
+        With the (conversation_id, created_at) index this is a range lookup;
+        the query plan is checked so a regression to a table scan fails fast.
+        """
+        target = {}
+
+        async def setup():
+            await memory_service._ensure_initialized()
+            for c in range(50):
+                conv_id = await memory_service.create_conversation(title=f"Chat {c}")
+                for i in range(100):
+                    await memory_service.add_message(conv_id, "user", f"Message {i}")
+            target["id"] = await memory_service.create_conversation(title="Target")
+            for i in range(10):
+                await memory_service.add_message(target["id"], "user", f"Target message {i}")
+
+        async def query_plan():
+            async with memory_service._get_connection() as db:
+                cursor = await db.execute(
+                    "EXPLAIN QUERY PLAN SELECT id, role, content, created_at FROM messages "
+                    "WHERE conversation_id = ? ORDER BY created_at",
+                    (target["id"],)
+                )
+                return " | ".join(row[-1] for row in await cursor.fetchall())
+
+        async def get_conversation():
+            return await memory_service.get_conversation(target["id"])
+
+        event_loop.run_until_complete(setup())
+        plan = event_loop.run_until_complete(query_plan())
+        assert "idx_messages_conversation_created" in plan, plan
+
+        benchmark(lambda: event_loop.run_until_complete(get_conversation()))
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--benchmark-only"])
@@ -0,0 +1,135 @@
+"""
+Benchmarks for Prompt Assembly
+
+Critical paths tested:
+- Time from a stored user message to the LLM call, with each prompt source
+  (history, settings, persona, facts, profile, network check) costing a
+  few milliseconds as a busy SQLite database or DNS lookup would
+- The same inputs awaited one after another, as chat used to
+- Assembly against real services on a temporary database
+"""
+
+import pytest
+import asyncio
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.services.prompt_assembly import PromptAssembler, PromptSources
+
+SOURCE_LATENCY = 0.005  # Seconds per simulated source read
+
+
+@pytest.fixture
+def event_loop():
+    """Create event loop for async benchmarks."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+class SlowSource:
+    """Every prompt source in one object, each read taking SOURCE_LATENCY."""
+
+    async def _read(self, value):
+        await asyncio.sleep(SOURCE_LATENCY)
+        return value
+
+    def get_context_for_api(self):
+        return self._read(([{"role": "user", "content": "hi"}], {"total_messages": 1, "summarized_count": 0, "verbatim_count": 1}))
+
+    def get_all(self):
+        return self._read({"system_prompt": "Be brief."})
+
+    def get_active_system_prompt(self, conversation_id, default_system_prompt=""):
+        return self._read(default_system_prompt)
+
+    def recall_facts(self, query=None, limit=10):
+        return self._read(["- likes tea"])
+
+    def format_facts_for_system_prompt(self, facts):
+        return "\n".join(facts)
+
+    def get_profile_summary(self):
+        return self._read("## User Profile:")
+
+    def check_network(self):
+        return self._read(True)
+
+    def analyze_message(self, message):
+        return []
+
+    def get_available_tools_summary(self):
+        return "Tools: calculate"
+
+
+def slow_sources():
+    source = SlowSource()
+    return PromptSources(
+        memory=source, settings=source, persona=source, facts=source,
+        profile=source, suggestions=source, degradation=source,
+    )
+
+
+async def assemble_sequentially(sources: PromptSources) -> str:
+    """The pre-pipeline order: every input awaited in turn."""
+    messages, _meta = await sources.memory.get_context_for_api()
+    settings = await sources.settings.get_all()
+    base = await sources.persona.get_active_system_prompt("main", settings.get("system_prompt", ""))
+    facts = await sources.facts.recall_facts(query="hi")
+    profile = await sources.profile.get_profile_summary()
+    await sources.degradation.check_network()
+    return "\n\n".join([base, profile, sources.facts.format_facts_for_system_prompt(facts)])
+
+
+class TestPromptAssemblyBenchmarks:
+    """Benchmarks for time-to-LLM-call."""
+
+    def test_bench_assembly_sequential(self, benchmark, event_loop):
+        """Baseline: six sources awaited one after another (~6 x latency)."""
+        sources = slow_sources()
+        result = benchmark(lambda: event_loop.run_until_complete(assemble_sequentially(sources)))
+        assert result.startswith("Be brief.")
+
+    def test_bench_assembly_concurrent(self, benchmark, event_loop):
+        """Pipeline: sources gathered; only settings -> persona is chained (~2 x latency)."""
+        sources = slow_sources()
+        assembler = PromptAssembler()
+        result = benchmark(lambda: event_loop.run_until_complete(assembler.assemble(sources, "main", "hi")))
+        assert result.system_prompt.startswith("Be brief.")
+        assert result.degraded == []
+
+    def test_bench_assembly_real_services(self, benchmark, event_loop, tmp_path):
+        """Assembly against real services on a temporary database."""
+        from server.services.memory import MemoryService
+        from server.services.settings import SettingsService
+        from server.services.persona import PersonaService
+        from server.services.memory_extractor import MemoryExtractorService
+        from server.services.user_profile import UserProfileService
+        from server.services.tool_suggestions import get_suggestion_service
+
+        db_path = tmp_path / "bench_prompt.db"
+        memory = MemoryService(db_path)
+        sources = PromptSources(
+            memory=memory,
+            settings=SettingsService(db_path),
+            persona=PersonaService(db_path),
+            facts=MemoryExtractorService(tmp_path / "bench_facts.db"),
+            profile=UserProfileService(tmp_path / "bench_profile.db"),
+            suggestions=get_suggestion_service(),
+        )
+        assembler = PromptAssembler()
+
+        async def setup():
+            await memory._ensure_initialized()
+            await memory._ensure_default_conversation()
+            for i in range(20):
+                await memory.add_to_conversation("user" if i % 2 == 0 else "assistant", f"Message {i}")
+
+        event_loop.run_until_complete(setup())
+
+        result = benchmark(lambda: event_loop.run_until_complete(
+            assembler.assemble(sources, "main", "What's the weather like?")
+        ))
+        assert result.messages
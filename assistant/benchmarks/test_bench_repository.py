@@ -0,0 +1,108 @@
+"""
+Benchmarks for Repository Scans
+
+Critical paths tested (over a synthetic 50k-file tree):
+- search_code scanning every file serially vs. split across the process pool
+- search_code with a common pattern, where the parallel scan stops early
+- Recursive list_files with a rare pattern, serial vs. parallel
+"""
+
+import random
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.services import repository
+from server.services.repository import RepositoryService
+
+FILE_COUNT = 50_000
+TOP_LEVEL_DIRS = 50
+SUBDIRS = 10
+WORDS = ["user", "request", "cache", "config", "handler", "session", "token", "event", "queue", "result"]
+
+
+def write_tree(root: Path, count: int) -> None:
+    """Seeded source-like files spread over TOP_LEVEL_DIRS x SUBDIRS directories."""
+    rng = random.Random(42)
+    per_dir = count // (TOP_LEVEL_DIRS * SUBDIRS)
+    for top in range(TOP_LEVEL_DIRS):
+        for sub in range(SUBDIRS):
+            directory = root / f"pkg{top:02d}" / f"mod{sub:02d}"
+            directory.mkdir(parents=True)
+            for i in range(per_dir):
+                lines = ["import os", ""]
+                for _ in range(8):
+                    a, b = rng.sample(WORDS, 2)
+                    lines.append(f"def {a}_{b}_{rng.randint(0, 999)}({a}):")
+                    lines.append(f"    return {a}.get('{b}')")
+                if rng.random() < 0.001:
+                    lines.append("RARE_MARKER = True")
+                (directory / f"file{i:03d}.py").write_text("\n".join(lines) + "\n")
+        (root / f"pkg{top:02d}" / "README.md").write_text("Package notes\n")
+
+
+@pytest.fixture(scope="module")
+def tree(tmp_path_factory):
+    root = tmp_path_factory.mktemp("repo")
+    write_tree(root, FILE_COUNT)
+    return root
+
+
+@pytest.fixture(scope="module")
+def service(tree):
+    # Exercise the pool even on single-core hosts (where it can't be faster)
+    workers = repository.SCAN_WORKERS
+    repository.SCAN_WORKERS = max(2, workers)
+    yield RepositoryService(allowed_paths=[str(tree)])
+    repository.shutdown_scan_pool()
+    repository.SCAN_WORKERS = workers
+
+
+class TestRepositoryScanBenchmarks:
+    """Benchmarks for search_code and list_files without the trigram index."""
+
+    def test_bench_search_serial(self, benchmark, service, tree):
+        """Rare pattern over 50k files, one file at a time."""
+        def run():
+            return service.search_code("RARE_MARKER", directory=str(tree), parallel=False)
+
+        result = benchmark.pedantic(run, rounds=3, iterations=1)
+        assert result["files_searched"] == FILE_COUNT + TOP_LEVEL_DIRS
+
+    def test_bench_search_parallel(self, benchmark, service, tree):
+        """Rare pattern over 50k files, chunks spread over the process pool."""
+        service.search_code("warm up", directory=str(tree / "pkg00"), parallel=True)
+
+        def run():
+            return service.search_code("RARE_MARKER", directory=str(tree), parallel=True)
+
+        result = benchmark.pedantic(run, rounds=3, iterations=1)
+        assert result["files_searched"] == FILE_COUNT + TOP_LEVEL_DIRS
+
+    def test_bench_search_parallel_early_stop(self, benchmark, service, tree):
+        """Common pattern; the parallel scan stops after max_results matches."""
+        def run():
+            return service.search_code(r"def user_\w+", directory=str(tree), max_results=50, parallel=True)
+
+        result = benchmark.pedantic(run, rounds=3, iterations=1)
+        assert len(result["matches"]) == 50
+        assert result["truncated"]
+
+    def test_bench_list_serial(self, benchmark, service, tree):
+        """Recursive listing that walks the whole tree, serially."""
+        def run():
+            return service.list_files(str(tree), pattern="file999.py", recursive=True, parallel=False)
+
+        result = benchmark.pedantic(run, rounds=3, iterations=1)
+        assert result["success"]
+
+    def test_bench_list_parallel(self, benchmark, service, tree):
+        """Recursive listing with top-level directories walked by the pool."""
+        def run():
+            return service.list_files(str(tree), pattern="file999.py", recursive=True, parallel=True)
+
+        result = benchmark.pedantic(run, rounds=3, iterations=1)
+        assert result["success"]
@@ -5,6 +5,7 @@ Critical paths tested:
 - Settings load (get individual setting)
 - Settings save (set individual setting)
 - Settings get_all (load all settings)
+- Settings get_all with encrypted API keys (cold vs cached decryption)
 """
 
 import pytest
@@ -14,6 +15,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from server.services.encryption import CRYPTOGRAPHY_AVAILABLE
 from server.services.settings import SettingsService
 
 
@@ -127,5 +129,68 @@ class TestSettingsServiceBenchmarks:
         benchmark(lambda: event_loop.run_until_complete(get_all()))
 
 
+@pytest.mark.skipif(not CRYPTOGRAPHY_AVAILABLE, reason="cryptography not installed")
+class TestEncryptedSettingsBenchmarks:
+    """Benchmarks for get_all() with encrypted API keys.
+
+    The cold benchmark drops the derived-key cache and the decrypted
+    snapshot before every round, which is what each chat message paid
+    before caching. The warm benchmark is the steady state.
+    """
+
+    SENSITIVE = {
+        "openai_api_key": "sk-bench-openai",
+        "anthropic_api_key": "sk-ant-bench",
+        "telegram_bot_token": "123456:bench-token",
+    }
+
+    def test_bench_get_all_encrypted_cold(self, benchmark, settings_service, event_loop):
+        """Benchmark get_all() with every key re-derived (uncached)."""
+
+        async def setup():
+            await settings_service._ensure_initialized()
+            await settings_service.set_multiple(self.SENSITIVE)
+
+        async def get_all_cold():
+            settings_service._invalidate_snapshot()
+            settings_service._get_encryption_service().clear_key_cache()
+            return await settings_service.get_all()
+
+        event_loop.run_until_complete(setup())
+
+        benchmark(lambda: event_loop.run_until_complete(get_all_cold()))
+
+    def test_bench_get_all_encrypted_warm(self, benchmark, settings_service, event_loop):
+        """Benchmark get_all() served from the decrypted snapshot."""
+
+        async def setup():
+            await settings_service._ensure_initialized()
+            await settings_service.set_multiple(self.SENSITIVE)
+            await settings_service.get_all()
+
+        async def get_all():
+            return await settings_service.get_all()
+
+        event_loop.run_until_complete(setup())
+
+        benchmark(lambda: event_loop.run_until_complete(get_all()))
+
+    def test_bench_get_all_encrypted_key_cache(self, benchmark, settings_service, event_loop):
+        """Benchmark get_all() decrypting with cached derived keys only."""
+
+        async def setup():
+            await settings_service._ensure_initialized()
+            await settings_service.set_multiple(self.SENSITIVE)
+            await settings_service.get_all()
+
+        async def get_all_uncached_snapshot():
+            settings_service._invalidate_snapshot()
+            return await settings_service.get_all()
+
+        event_loop.run_until_complete(setup())
+
+        benchmark(lambda: event_loop.run_until_complete(get_all_uncached_snapshot()))
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--benchmark-only"])
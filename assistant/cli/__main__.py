@@ -8,6 +8,7 @@ Usage:
     python -m assistant.cli alerts list --severity error --limit 50
     python -m assistant.cli alerts stats
     python -m assistant.cli backup create --output backup.tar.gz
+    python -m assistant.cli backup create --incremental
     python -m assistant.cli backup restore --input backup.tar.gz
     python -m assistant.cli backup list
     python -m assistant.cli backup verify --input backup.tar.gz
@@ -17,6 +18,7 @@ Usage:
     python -m assistant.cli resources cleanup memory
     python -m assistant.cli logs tail
     python -m assistant.cli logs tail --name error --lines 100
+    python -m assistant.cli logs tail -f --level WARNING --grep "timeout"
     python -m assistant.cli logs clear --name assistant --confirm
     python -m assistant.cli logs list
     python -m assistant.cli logs cleanup --dry-run
@@ -38,7 +40,9 @@ Usage:
 import argparse
 import asyncio
 import json
+import re
 import sys
+import time
 from pathlib import Path
 from datetime import datetime
 
@@ -49,9 +53,9 @@ from server.services.memory import MemoryService
 from server.services.alerts import AlertService, AlertSeverity, AlertType
 from server.services.backup import BackupService, BackupStatus
 from server.services.resources import ResourceService, ResourceConfig
-from server.services.logging_service import LogConfig, LoggingService, get_logging_service
+from server.services.logging_service import FOLLOW_POLL_INTERVAL, LogConfig, LoggingService, get_logging_service
 from server.services.scheduler import (
-    SchedulerService, TaskType, TaskStatus, CronParser, init_scheduler_service
+    SchedulerService, TaskType, TaskStatus, CronParser, MAX_PREVIEW_RUNS, init_scheduler_service
 )
 from server.services.settings import SettingsService
 from server.services.memory_extractor import get_memory_extractor
@@ -214,12 +218,16 @@ async def backup_create_command(args):
     result = await service.create_backup(
         output_path=output_path,
         include_benchmarks=args.include_benchmarks,
+        incremental=args.incremental,
     )
 
     if result.status == BackupStatus.SUCCESS:
         print(f"Backup created successfully: {result.output_path}")
         print(f"  Files included: {', '.join(result.metadata.files_included)}")
         print(f"  Total size: {result.metadata.total_size_bytes:,} bytes")
+        if result.metadata.incremental:
+            print(f"  New chunks: {result.stats['new_chunks']} ({result.stats['bytes_written']:,} bytes written)")
+            print(f"  Unchanged files: {result.stats['files_reused']}")
         print(f"  Version: {result.metadata.version}")
     elif result.status == BackupStatus.PARTIAL:
         print(f"Backup created with warnings: {result.output_path}")
@@ -472,23 +480,48 @@ async def resources_cleanup_memory_command(args):
 
 
 def logs_tail_command(args):
-    """Show last N lines of a log file (like tail -f)."""
+    """Show last N lines of a log file (like tail, or tail -f with --follow)."""
     log_dir = config.BASE_DIR / "logs"
     log_config = LogConfig(log_dir=log_dir)
     service = LoggingService(log_config)
 
-    lines = service.tail_log(log_name=args.name, lines=args.lines)
+    try:
+        result = service.get_log_content(
+            args.name, lines=args.lines, level=args.level, pattern=args.grep
+        )
+    except (ValueError, re.error) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    lines = result["lines"]
 
-    if args.json:
+    if args.json and not args.follow:
         print(json.dumps({"lines": lines, "log_name": args.name}, indent=2))
         return
 
-    if not lines:
-        print(f"No log entries in {args.name}.log")
+    for line in lines:
+        if args.json:
+            print(json.dumps({"line": line, "log_name": args.name}))
+        else:
+            print(line)
+
+    if not args.follow:
+        if not lines:
+            print(f"No log entries in {args.name}.log")
         return
 
-    for line in lines:
-        print(line)
+    follower = service.follow_log(
+        args.name, from_offset=result["end_offset"], level=args.level, pattern=args.grep
+    )
+    try:
+        while True:
+            for _, _, line in follower.poll():
+                if args.json:
+                    print(json.dumps({"line": line, "log_name": args.name}), flush=True)
+                else:
+                    print(line, flush=True)
+            time.sleep(FOLLOW_POLL_INTERVAL)
+    except KeyboardInterrupt:
+        pass
 
 
 def logs_list_command(args):
@@ -797,13 +830,16 @@ async def schedule_validate_command(args):
         print(f"Invalid cron expression: {error}", file=sys.stderr)
         sys.exit(1)
 
+    if not 1 <= args.count <= MAX_PREVIEW_RUNS:
+        print(f"--count must be between 1 and {MAX_PREVIEW_RUNS}", file=sys.stderr)
+        sys.exit(1)
+
     # Calculate next runs
-    current = datetime.now()
-    next_runs = []
-    for _ in range(5):
-        next_run = CronParser.get_next_run(args.cron, current)
-        next_runs.append(next_run)
-        current = next_run
+    try:
+        next_runs = CronParser.next_n_runs(args.cron, args.count)
+    except ValueError as e:
+        print(f"Invalid cron expression: {e}", file=sys.stderr)
+        sys.exit(1)
 
     if args.json:
         print(json.dumps({
@@ -815,7 +851,7 @@ async def schedule_validate_command(args):
 
     print(f"Valid cron expression: {args.cron}")
     print()
-    print("Next 5 run times:")
+    print(f"Next {len(next_runs)} run times:")
     for run in next_runs:
         print(f"  {run.strftime('%Y-%m-%d %H:%M (%A)')}")
 
@@ -1345,6 +1381,11 @@ def main():
         type=int, default=10,
         help="Number of backups to keep for rotation (default: 10)"
     )
+    backup_create_parser.add_argument(
+        "--incremental", "-I",
+        action="store_true",
+        help="Store only data changed since earlier incremental backups (chunks shared in memory/backups/chunks)"
+    )
 
     # backup restore
     backup_restore_parser = backup_subparsers.add_parser("restore", help="Restore from a backup")
@@ -1445,10 +1486,24 @@ def main():
         type=int, default=50,
         help="Number of lines to show (default: 50)"
     )
+    logs_tail_parser.add_argument(
+        "--follow", "-f",
+        action="store_true",
+        help="Keep printing lines as they are written (Ctrl+C to stop)"
+    )
+    logs_tail_parser.add_argument(
+        "--level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        help="Only show records at or above this level"
+    )
+    logs_tail_parser.add_argument(
+        "--grep", "-g",
+        help="Only show lines matching this regex"
+    )
     logs_tail_parser.add_argument(
         "--json", "-j",
         action="store_true",
-        help="Output in JSON format"
+        help="Output in JSON format (one object per line with --follow)"
     )
 
     # logs list
@@ -1617,6 +1672,12 @@ def main():
         "cron",
         help="Cron expression to validate (e.g., '0 7 * * *')"
     )
+    schedule_validate_parser.add_argument(
+        "--count", "-n",
+        type=int,
+        default=5,
+        help=f"Number of upcoming run times to show, 1-{MAX_PREVIEW_RUNS} (default: 5)"
+    )
     schedule_validate_parser.add_argument(
         "--json", "-j",
         action="store_true",
@@ -63,3 +63,16 @@ OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "120"))
 REPOSITORY_PATHS = os.getenv("REPOSITORY_PATHS", str(BASE_DIR.parent))
 # Maximum file size to read (in bytes)
 REPOSITORY_MAX_FILE_SIZE = int(os.getenv("REPOSITORY_MAX_FILE_SIZE", str(1024 * 1024)))  # 1MB
+# Worker processes for parallel search_code/list_files scans (0 or 1 = serial)
+REPOSITORY_SCAN_WORKERS = int(os.getenv("REPOSITORY_SCAN_WORKERS", str(min(8, os.cpu_count() or 1))))
+# Trigram index for search_code, built in the background at startup
+# (see server/services/code_index.py)
+CODE_INDEX_ENABLED = os.getenv("CODE_INDEX_ENABLED", "true").lower() == "true"
+
+# Tool result cache (see server/services/tool_cache.py)
+# Byte budgets for the in-memory and SQLite tiers
+TOOL_CACHE_MEMORY_BYTES = int(os.getenv("TOOL_CACHE_MEMORY_BYTES", str(8 * 1024 * 1024)))  # 8MB
+TOOL_CACHE_DISK_BYTES = int(os.getenv("TOOL_CACHE_DISK_BYTES", str(64 * 1024 * 1024)))  # 64MB
+# Comma-separated file tools to cache (read_file, search_code, get_file_info).
+# Off by default; cached results are invalidated when file mtimes change.
+TOOL_CACHE_FILE_TOOLS = [t.strip() for t in os.getenv("TOOL_CACHE_FILE_TOOLS", "").split(",") if t.strip()]
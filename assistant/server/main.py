@@ -76,6 +76,18 @@ async def lifespan(app: FastAPI):
     init_push()
     logger.info("Push notification service initialized")
 
+    # Shared LLM clients keep provider connections alive across requests
+    from server.services.llm_clients import get_llm_clients
+    get_llm_clients()
+    logger.info("LLM client registry initialized")
+
+    # Build the code search index in the background; search_code scans until it is ready
+    from server.services.repository import get_repository_service
+    code_index = get_repository_service().index
+    if code_index is not None:
+        code_index.start()
+        logger.info("Code index build started")
+
     # Initialize degradation service and check actual Ollama availability
     from server.services.degradation import get_degradation_service
     degradation_svc = get_degradation_service()
@@ -102,6 +114,7 @@ async def lifespan(app: FastAPI):
         await mcp_manager.load_configs_from_settings()
         await mcp_manager.connect_all()
         register_mcp_tools_from_manager()
+        mcp_manager.on_tools_changed = register_mcp_tools_from_manager
         tool_count = len(mcp_manager.get_all_tools())
         if tool_count > 0:
             logger.info(f"MCP client initialized: {tool_count} tools from {len(mcp_manager.clients)} server(s)")
@@ -129,6 +142,27 @@ async def lifespan(app: FastAPI):
     from server.services.mcp_client import get_mcp_manager
     mcp_manager = get_mcp_manager()
     await mcp_manager.disconnect_all()
+    # Close pooled LLM provider connections
+    from server.services.llm_clients import get_llm_clients
+    await get_llm_clients().aclose()
+    # Close pooled web_fetch connections
+    from server.services.web_fetch import get_web_fetcher
+    await get_web_fetcher().aclose()
+    # Stop the code index build and close its database
+    if code_index is not None:
+        code_index.stop()
+    # Stop the parallel scan worker processes
+    from server.services.repository import shutdown_scan_pool
+    shutdown_scan_pool()
+    # Stop the worker threads used for concurrent tool calls
+    from server.services.tools import shutdown_tool_executor
+    shutdown_tool_executor()
+    # Write out queued audit log entries
+    from server.services.audit import get_audit_logger
+    get_audit_logger().close()
+    # Close the shared SQLite connection pools
+    from server.services.storage import close_all_pools
+    await close_all_pools()
     logger.info("Shutting down AI Assistant")
 
 
@@ -166,12 +200,39 @@ async def security_headers_middleware(request: Request, call_next):
     return response
 
 
+def _route_label(request: Request) -> str:
+    """Route template for metrics labels (raw paths would be unbounded)."""
+    from starlette.routing import Mount
+
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    if isinstance(route, Mount):
+        return route.path
+    # Routes of included routers report their path without the router
+    # prefix; recover the prefix from the leading segments of the URL
+    path = request.url.path
+    template = route.path
+    prefix_segments = path.rstrip("/").count("/") - template.rstrip("/").count("/")
+    if prefix_segments > 0:
+        template = "/".join(path.split("/")[:prefix_segments + 1]) + template
+    return template
+
+
 @app.middleware("http")
 async def access_log_middleware(request: Request, call_next):
-    """Log all HTTP requests to access.log."""
-    start_time = time.time()
-    response = await call_next(request)
-    duration_ms = (time.time() - start_time) * 1000
+    """Log all HTTP requests to access.log and record them in metrics."""
+    from server.services.metrics import metrics
+
+    start_time = time.perf_counter()
+    metrics.add_gauge("http_requests_in_flight", 1)
+    try:
+        response = await call_next(request)
+    finally:
+        metrics.add_gauge("http_requests_in_flight", -1)
+    duration_ms = (time.perf_counter() - start_time) * 1000
+
+    metrics.record_http(request.method, _route_label(request), response.status_code, duration_ms)
 
     # Log format: IP METHOD PATH STATUS DURATION_MS
     access_logger.info(
@@ -241,7 +302,7 @@ async def auth_middleware(request: Request, call_next):
 
 
 # Import and include routers
-from server.routes import chat, status, upload, metrics, settings, capabilities, alerts, resources, degradation, auth, schedule, persona, notifications, push, memory_facts, user_profile, mcp, audit
+from server.routes import chat, status, upload, metrics, settings, capabilities, alerts, resources, degradation, auth, schedule, persona, notifications, push, memory_facts, user_profile, mcp, audit, debug, repository, logs
 
 # Auth routes (always accessible)
 app.include_router(auth.router, prefix="/api", tags=["auth"])
@@ -251,6 +312,7 @@ app.include_router(chat.router, prefix="/api", tags=["chat"])
 app.include_router(status.router, prefix="/api", tags=["status"])
 app.include_router(upload.router, prefix="/api", tags=["upload"])
 app.include_router(metrics.router, prefix="/api", tags=["metrics"])
+app.include_router(metrics.prometheus_router, tags=["metrics"])
 app.include_router(settings.router, prefix="/api", tags=["settings"])
 app.include_router(capabilities.router, prefix="/api", tags=["capabilities"])
 app.include_router(alerts.router, prefix="/api", tags=["alerts"])
@@ -264,6 +326,9 @@ app.include_router(memory_facts.router, prefix="/api", tags=["memory"])
 app.include_router(user_profile.router, prefix="/api", tags=["profile"])
 app.include_router(mcp.router, prefix="/api", tags=["mcp"])
 app.include_router(audit.router, prefix="/api", tags=["audit"])
+app.include_router(debug.router, prefix="/api", tags=["debug"])
+app.include_router(repository.router, prefix="/api", tags=["repository"])
+app.include_router(logs.router, prefix="/api", tags=["logs"])
 
 # Serve static UI files (when they exist)
 UI_PATH = Path(__file__).parent.parent / "ui"
@@ -105,10 +105,13 @@ async def detailed_health_check() -> DetailedHealthResponse:
         from server.services.memory import MemoryService
         memory = MemoryService(config.DATABASE_PATH)
         await memory._ensure_initialized()
+        from server.services.storage import check_all_pools
+        pool_health = await check_all_pools()
         components.append(ComponentHealth(
             name="database",
             status="healthy",
-            message="SQLite database accessible"
+            message="SQLite database accessible",
+            details={"pools": pool_health}
         ))
     except Exception as e:
         overall_status = "unhealthy"
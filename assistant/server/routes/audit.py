@@ -1,5 +1,6 @@
 """Audit log API endpoints."""
 
+import asyncio
 from fastapi import APIRouter, Query
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel
@@ -38,6 +39,7 @@ class AuditStatsResponse(BaseModel):
     top_tools: List[Dict[str, Any]]
     recent_failures: List[Dict[str, Any]]
     avg_durations: List[Dict[str, Any]]
+    pipeline: Dict[str, Any] = {}
 
 
 @router.get("/audit", response_model=AuditLogResponse)
@@ -52,7 +54,9 @@ async def get_audit_log(
     """Query audit log entries with filters and pagination."""
     audit_logger = get_audit_logger()
 
-    entries = audit_logger.query(
+    # query() waits for queued entries to be written, so keep it off the loop
+    entries = await asyncio.to_thread(
+        audit_logger.query,
         tool_name=tool_name,
         success=success,
         start_time=start_time,
@@ -89,6 +93,6 @@ async def get_audit_log(
 async def get_audit_stats():
     """Get statistics from audit log."""
     audit_logger = get_audit_logger()
-    stats = audit_logger.get_stats()
+    stats = await asyncio.to_thread(audit_logger.get_stats)
 
-    return AuditStatsResponse(**stats)
+    return AuditStatsResponse(**stats, pipeline=audit_logger.get_pipeline_stats())
@@ -14,16 +14,19 @@ from datetime import datetime
 from typing import Optional, List, AsyncGenerator
 from pathlib import Path
 from pydantic import BaseModel
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 
 import config
-from server.services.memory import MemoryService, DEFAULT_CONVERSATION_ID
+from server.services.memory import MemoryService, DEFAULT_CONVERSATION_ID, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from server.services.tools import registry as tool_registry
 from server.services.retry import api_retry
 from server.services.metrics import metrics
+from server.services.tracing import Trace, start_trace
+from server.services.prompt_assembly import AssembledPrompt, PromptSources, get_prompt_assembler
 from server.services.tool_suggestions import get_suggestion_service
 from server.services.degradation import get_degradation_service
+from server.services.llm_clients import get_llm_clients
 from server.services.encryption import is_encrypted, ENCRYPTED_PREFIX
 from server.services.ollama import get_ollama_client, OllamaStatus
 from server.services.persona import PersonaService
@@ -44,6 +47,29 @@ settings_service = SettingsService(config.DATABASE_PATH)
 memory_extractor = get_memory_extractor()
 # Initialize user profile service
 user_profile_service = get_user_profile_service()
+# Shared by chat and chat_stream
+prompt_assembler = get_prompt_assembler()
+
+
+async def _assemble_prompt(
+    conversation_id: str,
+    message: str,
+    trace: Trace,
+    check_network: bool = False,
+) -> AssembledPrompt:
+    """Gather history and system prompt inputs for one chat turn."""
+    sources = PromptSources(
+        memory=memory,
+        settings=settings_service,
+        persona=persona_service,
+        facts=memory_extractor,
+        profile=user_profile_service,
+        suggestions=get_suggestion_service(),
+        degradation=get_degradation_service() if check_network else None,
+    )
+    prompt = await prompt_assembler.assemble(sources, conversation_id, message, trace=trace)
+    trace.root.set_attribute("prompt_version", prompt.version)
+    return prompt
 
 
 async def _extract_facts_async(
@@ -127,6 +153,8 @@ class ChatResponse(BaseModel):
     permission_escalation: Optional[PermissionEscalation] = None
     # Optional: suggested tools based on user's message
     suggested_tools: Optional[List[SuggestedTool]] = None
+    # Optional: prompt sources replaced by defaults (e.g. ["history"])
+    degraded_sources: Optional[List[str]] = None
 
 
 def _validate_api_key_safe(key: str, provider: str) -> bool:
@@ -160,7 +188,7 @@ def _validate_api_key_safe(key: str, provider: str) -> bool:
 
 
 def get_anthropic_client():
-    """Get Anthropic client instance.
+    """Get the shared, connection-pooled async Anthropic client.
 
     Returns None if:
     - No API key is configured
@@ -172,12 +200,11 @@ def get_anthropic_client():
     if not _validate_api_key_safe(config.ANTHROPIC_API_KEY, "Anthropic"):
         return None
 
-    from anthropic import Anthropic
-    return Anthropic(api_key=config.ANTHROPIC_API_KEY)
+    return get_llm_clients().get_anthropic(config.ANTHROPIC_API_KEY)
 
 
 def get_openai_client():
-    """Get OpenAI client instance.
+    """Get the shared, connection-pooled async OpenAI client.
 
     Returns None if:
     - No API key is configured
@@ -189,8 +216,7 @@ def get_openai_client():
     if not _validate_api_key_safe(config.OPENAI_API_KEY, "OpenAI"):
         return None
 
-    from openai import OpenAI
-    return OpenAI(api_key=config.OPENAI_API_KEY)
+    return get_llm_clients().get_openai(config.OPENAI_API_KEY)
 
 
 def load_file_for_claude(file_id: str) -> Optional[dict]:
@@ -336,7 +362,7 @@ async def call_claude_api(messages: list, file_ids: list, user_message: str, sys
             api_kwargs["tools"] = tools
 
         try:
-            response = client.messages.create(**api_kwargs)
+            response = await client.messages.create(**api_kwargs)
             degradation.record_success("claude")
         except Exception as e:
             # Check if it's a rate limit error
@@ -367,14 +393,18 @@ async def call_claude_api(messages: list, file_ids: list, user_message: str, sys
         permission_escalation = None  # Track if any tool needs escalation
 
         for tool_block in tool_use_blocks:
+            logger.info(f"Claude calling tool: {tool_block.name} with input: {tool_block.input}")
+
+        # Execute independent tool calls concurrently; results keep call order
+        results = await tool_registry.execute_many(
+            [(tool_block.name, tool_block.input) for tool_block in tool_use_blocks]
+        )
+
+        for tool_block, result in zip(tool_use_blocks, results):
             tool_name = tool_block.name
-            tool_input = tool_block.input
             tool_id = tool_block.id
 
-            logger.info(f"Claude calling tool: {tool_name} with input: {tool_input}")
-
-            # Execute the tool and record metrics
-            result = tool_registry.execute(tool_name, **tool_input)
+            # Record metrics for each tool that was attempted
             metrics.record_tool_call(tool_name)
 
             if result["success"]:
@@ -472,7 +502,7 @@ async def call_openai_api(messages: list, file_ids: list, user_message: str, sys
             api_kwargs["tools"] = tools
 
         try:
-            completion = client.chat.completions.create(**api_kwargs)
+            completion = await client.chat.completions.create(**api_kwargs)
             degradation.record_success("openai")
         except Exception as e:
             # Check if it's a rate limit error
@@ -512,7 +542,8 @@ async def call_openai_api(messages: list, file_ids: list, user_message: str, sys
             ]
         })
 
-        # Execute each tool and add results
+        # Parse arguments for each tool call
+        calls = []
         for tool_call in choice.message.tool_calls:
             tool_name = tool_call.function.name
             try:
@@ -521,9 +552,12 @@ async def call_openai_api(messages: list, file_ids: list, user_message: str, sys
                 tool_args = {}
 
             logger.info(f"OpenAI calling tool: {tool_name} with input: {tool_args}")
+            calls.append((tool_name, tool_args))
 
-            # Execute the tool and record metrics
-            result = tool_registry.execute(tool_name, **tool_args)
+        # Execute independent tool calls concurrently and add results in order
+        results = await tool_registry.execute_many(calls)
+
+        for tool_call, (tool_name, _), result in zip(choice.message.tool_calls, calls, results):
             metrics.record_tool_call(tool_name)
 
             if result["success"]:
@@ -643,11 +677,11 @@ async def call_ollama_api(messages: list, file_ids: list, user_message: str, sys
             "tool_calls": tool_calls
         })
 
+        calls = []
         for tool_call in tool_calls:
             func = tool_call.get("function", {})
             tool_name = func.get("name", "")
             tool_args_str = func.get("arguments", "{}")
-            tool_id = tool_call.get("id", f"call_{iteration}")
 
             try:
                 tool_args = json.loads(tool_args_str) if isinstance(tool_args_str, str) else tool_args_str
@@ -655,9 +689,13 @@ async def call_ollama_api(messages: list, file_ids: list, user_message: str, sys
                 tool_args = {}
 
             logger.info(f"Ollama calling tool: {tool_name} with input: {tool_args}")
+            calls.append((tool_name, tool_args))
 
-            # Execute the tool and record metrics
-            result = tool_registry.execute(tool_name, **tool_args)
+        # Execute independent tool calls concurrently; results keep call order
+        results = await tool_registry.execute_many(calls)
+
+        for tool_call, (tool_name, _), result in zip(tool_calls, calls, results):
+            tool_id = tool_call.get("id", f"call_{iteration}")
             metrics.record_tool_call(tool_name)
 
             if result["success"]:
@@ -761,7 +799,6 @@ async def stream_claude_response(
             "model": config.CLAUDE_MODEL,
             "max_tokens": 4096,
             "messages": claude_messages,
-            "stream": True,  # Enable streaming
         }
         if system_prompt:
             api_kwargs["system"] = system_prompt
@@ -773,8 +810,9 @@ async def stream_claude_response(
             tool_use_blocks = []
             current_tool_use = None
 
-            with client.messages.stream(**api_kwargs) as stream:
-                for event in stream:
+            # Leaving the context (including on cancellation) closes the HTTP stream
+            async with client.messages.stream(**api_kwargs) as stream:
+                async for event in stream:
                     # Handle different event types
                     if event.type == "content_block_start":
                         if hasattr(event.content_block, "type"):
@@ -813,17 +851,20 @@ async def stream_claude_response(
             # Process tool calls
             tool_results = []
             for tool_block in tool_use_blocks:
-                tool_name = tool_block["name"]
-                tool_input = tool_block["input"]
-                tool_id = tool_block["id"]
-
                 yield format_sse("tool_call", {
-                    "name": tool_name,
-                    "input": tool_input
+                    "name": tool_block["name"],
+                    "input": tool_block["input"]
                 })
+                logger.info(f"Claude streaming: calling tool {tool_block['name']}")
+
+            # Execute independent tool calls concurrently; results keep call order
+            results = await tool_registry.execute_many(
+                [(tool_block["name"], tool_block["input"]) for tool_block in tool_use_blocks]
+            )
 
-                logger.info(f"Claude streaming: calling tool {tool_name}")
-                result = tool_registry.execute(tool_name, **tool_input)
+            for tool_block, result in zip(tool_use_blocks, results):
+                tool_name = tool_block["name"]
+                tool_id = tool_block["id"]
                 metrics.record_tool_call(tool_name)
 
                 if result["success"]:
@@ -961,35 +1002,37 @@ async def stream_openai_response(
             current_text = ""
             tool_calls = {}  # id -> {name, arguments}
 
-            stream = client.chat.completions.create(**api_kwargs)
-
-            for chunk in stream:
-                if not chunk.choices:
-                    continue
-
-                delta = chunk.choices[0].delta
-
-                # Handle text content
-                if delta.content:
-                    current_text += delta.content
-                    yield format_sse("token", {"text": delta.content})
-
-                # Handle tool calls
-                if delta.tool_calls:
-                    for tc in delta.tool_calls:
-                        tc_id = tc.id or list(tool_calls.keys())[-1] if tool_calls else None
-                        if tc.id:
-                            # New tool call
-                            tool_calls[tc.id] = {
-                                "name": tc.function.name if tc.function else "",
-                                "arguments": tc.function.arguments if tc.function else ""
-                            }
-                        elif tc_id and tc.function:
-                            # Continuation of existing tool call
-                            if tc.function.name:
-                                tool_calls[tc_id]["name"] = tc.function.name
-                            if tc.function.arguments:
-                                tool_calls[tc_id]["arguments"] += tc.function.arguments
+            stream = await client.chat.completions.create(**api_kwargs)
+
+            # Leaving the context (including on cancellation) closes the HTTP stream
+            async with stream:
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+
+                    delta = chunk.choices[0].delta
+
+                    # Handle text content
+                    if delta.content:
+                        current_text += delta.content
+                        yield format_sse("token", {"text": delta.content})
+
+                    # Handle tool calls
+                    if delta.tool_calls:
+                        for tc in delta.tool_calls:
+                            tc_id = tc.id or list(tool_calls.keys())[-1] if tool_calls else None
+                            if tc.id:
+                                # New tool call
+                                tool_calls[tc.id] = {
+                                    "name": tc.function.name if tc.function else "",
+                                    "arguments": tc.function.arguments if tc.function else ""
+                                }
+                            elif tc_id and tc.function:
+                                # Continuation of existing tool call
+                                if tc.function.name:
+                                    tool_calls[tc_id]["name"] = tc.function.name
+                                if tc.function.arguments:
+                                    tool_calls[tc_id]["arguments"] += tc.function.arguments
 
             accumulated_text += current_text
 
@@ -1021,7 +1064,8 @@ async def stream_openai_response(
                 "tool_calls": tool_call_list
             })
 
-            # Execute tools and add results
+            # Announce tool calls, then execute them concurrently
+            calls = []
             for tc_id, tc_data in tool_calls.items():
                 tool_name = tc_data["name"]
                 try:
@@ -1033,9 +1077,13 @@ async def stream_openai_response(
                     "name": tool_name,
                     "input": tool_args
                 })
-
                 logger.info(f"OpenAI streaming: calling tool {tool_name}")
-                result = tool_registry.execute(tool_name, **tool_args)
+                calls.append((tool_name, tool_args))
+
+            results = await tool_registry.execute_many(calls)
+
+            # Add results in the order the model issued the calls
+            for tc_id, (tool_name, _), result in zip(tool_calls.keys(), calls, results):
                 metrics.record_tool_call(tool_name)
 
                 if result["success"]:
@@ -1192,11 +1240,11 @@ async def stream_ollama_response(
                 "tool_calls": tool_calls
             })
 
+            calls = []
             for tool_call in tool_calls:
                 func = tool_call.get("function", {})
                 tool_name = func.get("name", "")
                 tool_args_str = func.get("arguments", "{}")
-                tool_id = tool_call.get("id", f"call_{iteration}")
 
                 try:
                     tool_args = json.loads(tool_args_str) if isinstance(tool_args_str, str) else tool_args_str
@@ -1207,9 +1255,14 @@ async def stream_ollama_response(
                     "name": tool_name,
                     "input": tool_args
                 })
-
                 logger.info(f"Ollama streaming: calling tool {tool_name}")
-                result = tool_registry.execute(tool_name, **tool_args)
+                calls.append((tool_name, tool_args))
+
+            # Execute independent tool calls concurrently; results keep call order
+            results = await tool_registry.execute_many(calls)
+
+            for tool_call, (tool_name, _), result in zip(tool_calls, calls, results):
+                tool_id = tool_call.get("id", f"call_{iteration}")
                 metrics.record_tool_call(tool_name)
 
                 if result["success"]:
@@ -1269,7 +1322,7 @@ async def stream_ollama_response(
 
 
 @router.post("/chat/stream")
-async def chat_stream(request: ChatMessage):
+async def chat_stream(request: ChatMessage, http_request: Request):
     """Stream chat response using Server-Sent Events (SSE).
 
     This endpoint provides real-time streaming of AI responses as they are generated.
@@ -1280,6 +1333,9 @@ async def chat_stream(request: ChatMessage):
     - token: Text chunk from the AI
     - tool_call: Tool is being invoked
     - tool_result: Result from tool execution
+    - timing: Sent after the first token; time to first token, the
+      per-stage breakdown of the request so far and the prompt sources
+      that failed or timed out and were replaced by defaults
     - done: Stream complete, includes total text
     - error: An error occurred
 
@@ -1299,6 +1355,12 @@ async def chat_stream(request: ChatMessage):
         if not exists:
             raise HTTPException(status_code=404, detail="Conversation not found")
 
+    trace = start_trace(
+        "chat_stream",
+        traceparent=http_request.headers.get("traceparent"),
+        conversation_id=conversation_id,
+    )
+
     # Build message content with attachments
     file_refs = []
     if request.file_ids:
@@ -1310,10 +1372,12 @@ async def chat_stream(request: ChatMessage):
     if file_refs:
         message_text = f"{request.message}\n[Attached files: {', '.join(file_refs)}]"
 
-    await memory.add_message(conversation_id, "user", message_text)
+    with trace.span("persistence"):
+        await memory.add_message(conversation_id, "user", message_text)
 
-    # Auto-title conversation from first user message
-    conv = await memory.get_conversation(conversation_id)
+    # Auto-title conversation from first user message (two messages are
+    # enough to tell whether it is the first)
+    conv = await memory.get_conversation(conversation_id, limit=2)
     if conv and conv.get("title") in ("New Conversation", "New conversation") and len(conv.get("messages", [])) == 1:
         await memory.auto_title_conversation(conversation_id, request.message)
 
@@ -1324,67 +1388,8 @@ async def chat_stream(request: ChatMessage):
         has_error = False
 
         try:
-            # Get conversation history
-            if conversation_id == DEFAULT_CONVERSATION_ID:
-                messages, context_meta = await memory.get_context_for_api()
-            else:
-                messages = await memory.get_conversation_messages(conversation_id)
-                context_meta = {"total_messages": len(messages) - 1, "summarized_count": 0, "verbatim_count": len(messages) - 1}
-
-            if context_meta["summarized_count"] > 0:
-                logger.info(
-                    f"Context: {context_meta['total_messages']} total msgs, "
-                    f"{context_meta['summarized_count']} summarized, "
-                    f"{context_meta['verbatim_count']} verbatim"
-                )
-
-            # Get default system prompt from settings
-            settings = await settings_service.get_all()
-            default_system_prompt = settings.get("system_prompt", "")
-
-            # Get effective system prompt for this conversation
-            base_system_prompt = await persona_service.get_active_system_prompt(
-                conversation_id=conversation_id,
-                default_system_prompt=default_system_prompt
-            )
-
-            # Recall relevant facts for long-term memory context
-            recalled_facts = await memory_extractor.recall_facts(
-                query=request.message,  # Use user message for relevance
-                limit=10  # Top 10 most relevant facts
-            )
-            facts_context = memory_extractor.format_facts_for_system_prompt(recalled_facts)
-            if facts_context:
-                logger.info(f"Recalled {len(recalled_facts)} relevant facts for context")
-
-            # Get user profile summary for context
-            profile_summary = await user_profile_service.get_profile_summary()
-            if profile_summary:
-                logger.info("Injecting user profile summary into system prompt")
-
-            # Analyze user message for relevant tool suggestions
-            suggestion_service = get_suggestion_service()
-            suggestions = suggestion_service.analyze_message(request.message)
-
-            # Build system prompt (base + profile + facts + tool suggestions)
-            system_parts = [base_system_prompt]
-
-            if profile_summary:
-                system_parts.append(profile_summary)
-
-            if facts_context:
-                system_parts.append(facts_context)
-
-            if suggestions:
-                suggestion_text = suggestion_service.get_system_prompt_injection(suggestions)
-                system_parts.append(suggestion_text)
-                logger.info(f"Suggesting {len(suggestions)} relevant tools: {[s.name for s in suggestions]}")
-            else:
-                summary = suggestion_service.get_available_tools_summary()
-                if summary:
-                    system_parts.append(summary)
-
-            system_prompt = "\n\n".join(system_parts)
+            prompt = await _assemble_prompt(conversation_id, request.message, trace)
+            messages, system_prompt = prompt.messages, prompt.system_prompt
 
             # Smart API selection using degradation service
             degradation = get_degradation_service()
@@ -1470,21 +1475,47 @@ async def chat_stream(request: ChatMessage):
             if stream_generator is None:
                 raise ValueError("No API available for streaming")
 
-            # Forward events from the stream
-            async for event_str in stream_generator:
-                yield event_str
-
-                # Extract accumulated text from done event for memory storage
-                if event_str.startswith("event: done"):
-                    try:
-                        data_line = event_str.split("data: ", 1)[1].split("\n")[0]
-                        done_data = json.loads(data_line)
-                        accumulated_response = done_data.get("total_text", "")
-                    except (IndexError, json.JSONDecodeError):
-                        pass
-                elif event_str.startswith("event: error"):
-                    has_error = True
-
+            # Forward events from the stream. If the SSE client disconnects,
+            # this generator is cancelled or closed at a yield; closing the
+            # provider stream explicitly aborts the upstream request.
+            # Tool calls made by the provider stream nest under llm_total
+            first_token_span = trace.start_span("llm_first_token", model=model_used)
+            with trace.span("llm_total", model=model_used):
+                try:
+                    async for event_str in stream_generator:
+                        if not first_token_span.ended and event_str.startswith("event: token"):
+                            first_token_span.end()
+                            yield event_str
+                            yield format_sse("timing", {
+                                "trace_id": trace.trace_id,
+                                "ttft_ms": round(trace.duration_ms, 2),
+                                "stages": trace.stage_timings(),
+                                "degraded": prompt.degraded,
+                            })
+                            continue
+                        yield event_str
+
+                        # Extract accumulated text from done event for memory storage
+                        if event_str.startswith("event: done"):
+                            try:
+                                data_line = event_str.split("data: ", 1)[1].split("\n")[0]
+                                done_data = json.loads(data_line)
+                                accumulated_response = done_data.get("total_text", "")
+                            except (IndexError, json.JSONDecodeError):
+                                pass
+                        elif event_str.startswith("event: error"):
+                            has_error = True
+                finally:
+                    await stream_generator.aclose()
+
+        except (asyncio.CancelledError, GeneratorExit):
+            logger.info(f"Stream client disconnected from conversation {conversation_id}")
+            metrics.record_request(
+                "/api/chat/stream", (time.time() - start_time) * 1000, success=False
+            )
+            metrics.record_error("/api/chat/stream", "ClientDisconnected")
+            trace.finish(error=asyncio.CancelledError("client disconnected"))
+            raise
         except Exception as e:
             logger.error(f"Streaming error: {e}")
             yield format_sse("error", {"message": str(e)})
@@ -1492,7 +1523,8 @@ async def chat_stream(request: ChatMessage):
 
         # Save assistant response to memory if we got something
         if accumulated_response:
-            message_id = await memory.add_message(conversation_id, "assistant", accumulated_response)
+            with trace.span("persistence"):
+                message_id = await memory.add_message(conversation_id, "assistant", accumulated_response)
             logger.info(f"Stream completed, saved {len(accumulated_response)} chars to memory")
 
             # Extract facts from this conversation turn (async, non-blocking)
@@ -1513,6 +1545,8 @@ async def chat_stream(request: ChatMessage):
         metrics.record_request("/api/chat/stream", latency_ms, success=not has_error)
         if has_error:
             metrics.record_error("/api/chat/stream", "StreamError")
+        trace.root.set_attribute("success", not has_error)
+        trace.finish()
 
     return StreamingResponse(
         generate_response(),
@@ -1521,12 +1555,13 @@ async def chat_stream(request: ChatMessage):
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "X-Accel-Buffering": "no",  # Disable nginx buffering
+            "X-Trace-Id": trace.trace_id,
         }
     )
 
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatMessage):
+async def chat(request: ChatMessage, http_request: Request):
     """Send a message and get AI response (Claude primary, OpenAI fallback).
 
     Messages are stored in the specified conversation (defaults to "main").
@@ -1546,6 +1581,9 @@ async def chat(request: ChatMessage):
         if not exists:
             raise HTTPException(status_code=404, detail="Conversation not found")
 
+    trace = start_trace("chat", traceparent=http_request.headers.get("traceparent"),
+                        conversation_id=conversation_id)
+
     # Build message content with attachments
     file_refs = []
     if request.file_ids:
@@ -1557,86 +1595,23 @@ async def chat(request: ChatMessage):
     if file_refs:
         message_text = f"{request.message}\n[Attached files: {', '.join(file_refs)}]"
 
-    await memory.add_message(conversation_id, "user", message_text)
+    with trace.span("persistence"):
+        await memory.add_message(conversation_id, "user", message_text)
 
     # Auto-title conversation from first user message if it's a non-default conversation
-    # with the default "New Conversation" title
-    conv = await memory.get_conversation(conversation_id)
+    # with the default "New Conversation" title (two messages are enough to
+    # tell whether it is the first)
+    conv = await memory.get_conversation(conversation_id, limit=2)
     if conv and conv.get("title") in ("New Conversation", "New conversation") and len(conv.get("messages", [])) == 1:
         await memory.auto_title_conversation(conversation_id, request.message)
 
     try:
-        # Get conversation history
-        if conversation_id == DEFAULT_CONVERSATION_ID:
-            messages, context_meta = await memory.get_context_for_api()
-        else:
-            messages = await memory.get_conversation_messages(conversation_id)
-            context_meta = {"total_messages": len(messages) - 1, "summarized_count": 0, "verbatim_count": len(messages) - 1}
-
-        if context_meta["summarized_count"] > 0:
-            logger.info(
-                f"Context: {context_meta['total_messages']} total msgs, "
-                f"{context_meta['summarized_count']} summarized, "
-                f"{context_meta['verbatim_count']} verbatim"
-            )
-
-        # Get default system prompt from settings
-        settings = await settings_service.get_all()
-        default_system_prompt = settings.get("system_prompt", "")
-
-        # Get effective system prompt for this conversation
-        base_system_prompt = await persona_service.get_active_system_prompt(
-            conversation_id=conversation_id,
-            default_system_prompt=default_system_prompt
-        )
-
-        # Recall relevant facts for long-term memory context
-        recalled_facts = await memory_extractor.recall_facts(
-            query=request.message,  # Use user message for relevance
-            limit=10  # Top 10 most relevant facts
-        )
-        facts_context = memory_extractor.format_facts_for_system_prompt(recalled_facts)
-        if facts_context:
-            logger.info(f"Recalled {len(recalled_facts)} relevant facts for context")
-
-        # Get user profile summary for context
-        profile_summary = await user_profile_service.get_profile_summary()
-        if profile_summary:
-            logger.info("Injecting user profile summary into system prompt")
-
-        # Analyze user message for relevant tool suggestions
-        suggestion_service = get_suggestion_service()
-        suggestions = suggestion_service.analyze_message(request.message)
-
-        # Build system prompt (base + profile + facts + tool suggestions)
-        system_parts = [base_system_prompt]
-
-        if profile_summary:
-            system_parts.append(profile_summary)
-
-        if facts_context:
-            system_parts.append(facts_context)
-
-        if suggestions:
-            suggestion_text = suggestion_service.get_system_prompt_injection(suggestions)
-            system_parts.append(suggestion_text)
-            logger.info(f"Suggesting {len(suggestions)} relevant tools: {[s.name for s in suggestions]}")
-        else:
-            # Include general tool summary when no specific suggestions
-            summary = suggestion_service.get_available_tools_summary()
-            if summary:
-                system_parts.append(summary)
-
-        system_prompt = "\n\n".join(system_parts)
+        prompt = await _assemble_prompt(conversation_id, request.message, trace, check_network=True)
+        messages, system_prompt, suggestions = prompt.messages, prompt.system_prompt, prompt.suggestions
 
         # Smart API selection using degradation service
         degradation = get_degradation_service()
 
-        # Check network availability first
-        network_available = await degradation.check_network()
-        if not network_available:
-            logger.warning("Network unavailable, API calls may fail")
-
         # Determine preferred API based on config and health
         preferred_api = "claude" if config.USE_CLAUDE else "openai"
         selected_api = degradation.get_preferred_api(preferred_api)
@@ -1645,88 +1620,91 @@ async def chat(request: ChatMessage):
         assistant_message = None
         permission_escalation = None
         last_error = None
+        # Tool calls made during the provider round trips nest under llm_total
+        with trace.span("llm_total"):
 
-        # Try selected API first
-        if selected_api == "ollama" and config.OLLAMA_ENABLED:
-            try:
-                ollama_client = get_ollama_client()
-                logger.info(f"Calling Ollama API with model {ollama_client.model}, files: {request.file_ids or []}")
-                if degradation.mode.name not in ("NORMAL", "LOCAL_ONLY"):
-                    logger.info(f"Degradation mode: {degradation.mode.name}")
-                assistant_message, model_used, permission_escalation = await call_ollama_api(
-                    messages, request.file_ids or [], request.message, system_prompt
-                )
-            except Exception as e:
-                last_error = e
-                logger.warning(f"Ollama API failed: {e}")
-
-        elif selected_api == "claude" and config.ANTHROPIC_API_KEY:
-            try:
-                logger.info(f"Calling Claude API with model {config.CLAUDE_MODEL}, files: {request.file_ids or []}")
-                if degradation.mode.name not in ("NORMAL", "OPENAI_UNAVAILABLE"):
-                    logger.info(f"Degradation mode: {degradation.mode.name}")
-                assistant_message, model_used, permission_escalation = await call_claude_api(
-                    messages, request.file_ids or [], request.message, system_prompt
-                )
-            except Exception as e:
-                last_error = e
-                logger.warning(f"Claude API failed: {e}")
-
-        elif selected_api == "openai" and config.OPENAI_API_KEY:
-            try:
-                logger.info(f"Calling OpenAI API with model {config.OPENAI_MODEL}, files: {request.file_ids or []}")
-                if degradation.mode.name not in ("NORMAL", "CLAUDE_UNAVAILABLE"):
-                    logger.info(f"Degradation mode: {degradation.mode.name}")
-                assistant_message, model_used, permission_escalation = await call_openai_api(
-                    messages, request.file_ids or [], request.message, system_prompt
-                )
-            except Exception as e:
-                last_error = e
-                logger.warning(f"OpenAI API failed: {e}")
-
-        # Cloud API fallback chain if primary failed (not if using Ollama)
-        if assistant_message is None and selected_api != "ollama":
-            fallback_api = "openai" if selected_api == "claude" else "claude"
-
-            if fallback_api == "openai" and config.OPENAI_API_KEY:
+            # Try selected API first
+            if selected_api == "ollama" and config.OLLAMA_ENABLED:
                 try:
-                    logger.info(f"Falling back to OpenAI API with model {config.OPENAI_MODEL}")
-                    assistant_message, model_used, permission_escalation = await call_openai_api(
+                    ollama_client = get_ollama_client()
+                    logger.info(f"Calling Ollama API with model {ollama_client.model}, files: {request.file_ids or []}")
+                    if degradation.mode.name not in ("NORMAL", "LOCAL_ONLY"):
+                        logger.info(f"Degradation mode: {degradation.mode.name}")
+                    assistant_message, model_used, permission_escalation = await call_ollama_api(
                         messages, request.file_ids or [], request.message, system_prompt
                     )
                 except Exception as e:
                     last_error = e
-                    logger.error(f"OpenAI fallback also failed: {e}")
+                    logger.warning(f"Ollama API failed: {e}")
 
-            elif fallback_api == "claude" and config.ANTHROPIC_API_KEY:
+            elif selected_api == "claude" and config.ANTHROPIC_API_KEY:
                 try:
-                    logger.info(f"Falling back to Claude API with model {config.CLAUDE_MODEL}")
+                    logger.info(f"Calling Claude API with model {config.CLAUDE_MODEL}, files: {request.file_ids or []}")
+                    if degradation.mode.name not in ("NORMAL", "OPENAI_UNAVAILABLE"):
+                        logger.info(f"Degradation mode: {degradation.mode.name}")
                     assistant_message, model_used, permission_escalation = await call_claude_api(
                         messages, request.file_ids or [], request.message, system_prompt
                     )
                 except Exception as e:
                     last_error = e
-                    logger.error(f"Claude fallback also failed: {e}")
+                    logger.warning(f"Claude API failed: {e}")
 
-        # Final fallback to Ollama if all cloud APIs failed
-        if assistant_message is None and config.OLLAMA_ENABLED:
-            try:
-                ollama_client = get_ollama_client()
-                if await ollama_client.is_available():
-                    logger.info(f"Final fallback to Ollama with model {ollama_client.model}")
-                    assistant_message, model_used, permission_escalation = await call_ollama_api(
+            elif selected_api == "openai" and config.OPENAI_API_KEY:
+                try:
+                    logger.info(f"Calling OpenAI API with model {config.OPENAI_MODEL}, files: {request.file_ids or []}")
+                    if degradation.mode.name not in ("NORMAL", "CLAUDE_UNAVAILABLE"):
+                        logger.info(f"Degradation mode: {degradation.mode.name}")
+                    assistant_message, model_used, permission_escalation = await call_openai_api(
                         messages, request.file_ids or [], request.message, system_prompt
                     )
-            except Exception as e:
-                last_error = e
-                logger.error(f"Ollama fallback also failed: {e}")
+                except Exception as e:
+                    last_error = e
+                    logger.warning(f"OpenAI API failed: {e}")
+
+            # Cloud API fallback chain if primary failed (not if using Ollama)
+            if assistant_message is None and selected_api != "ollama":
+                fallback_api = "openai" if selected_api == "claude" else "claude"
+
+                if fallback_api == "openai" and config.OPENAI_API_KEY:
+                    try:
+                        logger.info(f"Falling back to OpenAI API with model {config.OPENAI_MODEL}")
+                        assistant_message, model_used, permission_escalation = await call_openai_api(
+                            messages, request.file_ids or [], request.message, system_prompt
+                        )
+                    except Exception as e:
+                        last_error = e
+                        logger.error(f"OpenAI fallback also failed: {e}")
+
+                elif fallback_api == "claude" and config.ANTHROPIC_API_KEY:
+                    try:
+                        logger.info(f"Falling back to Claude API with model {config.CLAUDE_MODEL}")
+                        assistant_message, model_used, permission_escalation = await call_claude_api(
+                            messages, request.file_ids or [], request.message, system_prompt
+                        )
+                    except Exception as e:
+                        last_error = e
+                        logger.error(f"Claude fallback also failed: {e}")
+
+            # Final fallback to Ollama if all cloud APIs failed
+            if assistant_message is None and config.OLLAMA_ENABLED:
+                try:
+                    ollama_client = get_ollama_client()
+                    if await ollama_client.is_available():
+                        logger.info(f"Final fallback to Ollama with model {ollama_client.model}")
+                        assistant_message, model_used, permission_escalation = await call_ollama_api(
+                            messages, request.file_ids or [], request.message, system_prompt
+                        )
+                except Exception as e:
+                    last_error = e
+                    logger.error(f"Ollama fallback also failed: {e}")
 
         # If still no response, raise the last error
         if assistant_message is None:
             raise last_error or ValueError("No API available")
 
         # Save assistant response
-        message_id = await memory.add_message(conversation_id, "assistant", assistant_message)
+        with trace.span("persistence"):
+            message_id = await memory.add_message(conversation_id, "assistant", assistant_message)
 
         logger.info(f"Chat completed in conversation {conversation_id} using {model_used}")
 
@@ -1743,6 +1721,8 @@ async def chat(request: ChatMessage):
         # Record successful request metrics
         latency_ms = (time.time() - start_time) * 1000
         metrics.record_request("/api/chat", latency_ms, success=True)
+        trace.root.set_attribute("model", model_used)
+        trace.finish()
 
         # Convert escalation dict to Pydantic model if present
         escalation_model = None
@@ -1777,6 +1757,7 @@ async def chat(request: ChatMessage):
             model=model_used,
             permission_escalation=escalation_model,
             suggested_tools=suggested_tools_response,
+            degraded_sources=prompt.degraded or None,
         )
 
     except Exception as e:
@@ -1785,6 +1766,7 @@ async def chat(request: ChatMessage):
         latency_ms = (time.time() - start_time) * 1000
         metrics.record_request("/api/chat", latency_ms, success=False)
         metrics.record_error("/api/chat", type(e).__name__)
+        trace.finish(error=e)
 
         # Remove the user message if API call failed
         await memory.remove_last_message(conversation_id)
@@ -1792,17 +1774,21 @@ async def chat(request: ChatMessage):
 
 
 @router.get("/conversation")
-async def get_the_conversation():
+async def get_the_conversation(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Only the newest N messages"),
+):
     """Get the default 'main' conversation with messages.
 
     This endpoint returns messages from the default conversation.
     For backward compatibility with single-conversation clients.
+    With `limit`, only the newest messages are returned along with
+    `has_more_before`; older ones come from /conversations/main/messages.
     """
-    conversation = await memory.get_conversation(DEFAULT_CONVERSATION_ID)
+    conversation = await memory.get_conversation(DEFAULT_CONVERSATION_ID, limit=limit)
     if not conversation:
         # Auto-create if doesn't exist
         await memory._ensure_default_conversation()
-        conversation = await memory.get_conversation(DEFAULT_CONVERSATION_ID)
+        conversation = await memory.get_conversation(DEFAULT_CONVERSATION_ID, limit=limit)
     return conversation
 
 
@@ -1949,38 +1935,72 @@ async def import_conversation(request: ImportRequest):
 
 
 @router.get("/conversations/{conversation_id}")
-async def get_conversation(conversation_id: str):
-    """Get a conversation by ID with all its messages.
+async def get_conversation(
+    conversation_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Only the newest N messages"),
+):
+    """Get a conversation by ID with its messages.
 
     Args:
         conversation_id: The conversation to retrieve
+        limit: Only include the newest N messages (all when omitted)
 
     Returns:
         Conversation object with id, title, messages, timestamps
     """
-    conversation = await memory.get_conversation(conversation_id)
+    conversation = await memory.get_conversation(conversation_id, limit=limit)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
     return conversation
 
 
+@router.get("/conversations/{conversation_id}/messages")
+async def get_conversation_messages_page(
+    conversation_id: str,
+    before: Optional[str] = Query(None, description="Messages older than this message ID"),
+    after: Optional[str] = Query(None, description="Messages newer than this message ID"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+):
+    """Get one page of a conversation's messages (keyset pagination).
+
+    Without `before`/`after` the newest page is returned. Pass the first
+    message's ID as `before` to scroll back, or the last one's as `after`
+    to catch up. Messages in each page are in chronological order.
+    """
+    if before and after:
+        raise HTTPException(status_code=400, detail="Use either before or after, not both")
+    if not await memory.conversation_exists(conversation_id):
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    page = await memory.get_messages_page(conversation_id, before=before, after=after, limit=limit)
+    if page is None:
+        raise HTTPException(status_code=404, detail="Message not found")
+    return {"conversation_id": conversation_id, **page}
+
+
 @router.get("/messages/search")
 async def search_messages(
     q: str,
     limit: int = 50,
     offset: int = 0,
-    cross_conversation: bool = False
+    cross_conversation: bool = False,
+    cursor: Optional[str] = None,
+    recency_weight: float = 0.0
 ):
     """Search messages by keyword across conversations or within a specific one.
 
+    Results are ranked by relevance (bm25), optionally blended with recency.
+
     Args:
         q: Search query (required)
         limit: Maximum results (default 50, max 100)
-        offset: Pagination offset
+        offset: Pagination offset (deprecated, use cursor)
         cross_conversation: If true, search all conversations. If false, search only the default conversation.
+        cursor: next_cursor from the previous page
+        recency_weight: 0 for pure relevance, up to 1 to favor recent messages
 
     Returns:
-        List of matching messages with snippets and context
+        List of matching messages with snippets and context, plus next_cursor
     """
     if not q or len(q.strip()) < 2:
         raise HTTPException(
@@ -1990,21 +2010,30 @@ async def search_messages(
 
     # Cap limit to prevent abuse
     limit = min(limit, 100)
+    recency_weight = min(max(recency_weight, 0.0), 1.0)
 
     # Search across all conversations or just the default one
     conversation_id = None if cross_conversation else DEFAULT_CONVERSATION_ID
-    results = await memory.search_messages(
-        query=q.strip(),
-        conversation_id=conversation_id,
-        limit=limit,
-        offset=offset
-    )
+    try:
+        results = await memory.search_messages(
+            query=q.strip(),
+            conversation_id=conversation_id,
+            limit=limit,
+            offset=offset,
+            after=cursor,
+            recency_weight=recency_weight
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    next_cursor = results[-1]["cursor"] if len(results) == limit and results else None
 
     return {
         "query": q.strip(),
         "count": len(results),
         "cross_conversation": cross_conversation,
-        "results": results
+        "results": results,
+        "next_cursor": next_cursor
     }
 
 
@@ -0,0 +1,29 @@
+"""Debug API endpoints."""
+
+from fastapi import APIRouter, HTTPException, Query
+
+from server.services.tracing import get_trace_store
+
+router = APIRouter()
+
+
+@router.get("/debug/traces")
+async def list_traces(
+    limit: int = Query(20, ge=1, le=100, description="Maximum traces to return"),
+):
+    """Get the slowest recent request traces with per-stage timings."""
+    store = get_trace_store()
+    return {
+        "traces": [trace.summary() for trace in store.slowest(limit)],
+        "stored": len(store.slowest()),
+        "total_traces": store.total_traces,
+    }
+
+
+@router.get("/debug/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """Get every span of one stored trace (OTLP/JSON span shape)."""
+    trace = get_trace_store().get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return trace.to_dict()
@@ -82,8 +82,7 @@ async def clear_cache():
     Tool results are cached for offline access. Use this to force fresh data.
     """
     service = get_degradation_service()
-    count = len(service._tool_cache)
-    service.clear_cache()
+    count = service.clear_cache()
     return {
         "success": True,
         "cleared_entries": count,
@@ -0,0 +1,113 @@
+"""Log viewing API endpoints (paged reads and live follow)."""
+import asyncio
+import json
+import logging
+import re
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from server.services.logging_service import (
+    FOLLOW_POLL_INTERVAL,
+    LOG_NAMES,
+    get_logging_service,
+)
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Seconds without new lines before a keepalive comment is sent
+FOLLOW_KEEPALIVE_INTERVAL = 15.0
+
+
+def _check_name(log_name: str):
+    if log_name not in LOG_NAMES:
+        raise HTTPException(status_code=404, detail=f"Unknown log: {log_name}")
+
+
+@router.get("/logs")
+async def get_log_stats():
+    """Get log directory statistics (files, sizes, settings)."""
+    return await asyncio.to_thread(get_logging_service().get_stats)
+
+
+@router.get("/logs/{log_name}")
+async def get_log(
+    log_name: str,
+    lines: int = Query(100, ge=1, le=10000, description="Number of lines to return"),
+    offset: int = Query(0, ge=0, description="Matching lines from the end to skip"),
+    before: Optional[int] = Query(None, ge=0, description="Byte cursor from a previous page"),
+    level: Optional[str] = Query(None, description="Minimum record level, e.g. WARNING"),
+    pattern: Optional[str] = Query(None, description="Regex that lines must contain"),
+):
+    """Read lines from the end of a log.
+
+    Page backwards by passing the returned cursor as before. end_offset can
+    be passed to the follow endpoint to stream lines written afterwards.
+    """
+    _check_name(log_name)
+    try:
+        return await asyncio.to_thread(
+            get_logging_service().get_log_content,
+            log_name,
+            lines=lines,
+            offset=offset,
+            before=before,
+            level=level,
+            pattern=pattern,
+        )
+    except (ValueError, re.error) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/logs/{log_name}/follow")
+async def follow_log(
+    log_name: str,
+    request: Request,
+    from_offset: Optional[int] = Query(None, ge=0, description="Byte offset to start from (default: end)"),
+    level: Optional[str] = Query(None, description="Minimum record level, e.g. WARNING"),
+    pattern: Optional[str] = Query(None, description="Regex that lines must contain"),
+    last_event_id: Optional[str] = Header(None),
+):
+    """Stream lines as they are written to a log (Server-Sent Events).
+
+    Each "line" event's id is the byte offset just after that line, so a
+    reconnecting EventSource resumes after the last line it received via
+    Last-Event-ID.
+    """
+    _check_name(log_name)
+    if last_event_id and last_event_id.isdigit():
+        from_offset = int(last_event_id)
+    try:
+        follower = get_logging_service().follow_log(
+            log_name, from_offset=from_offset, level=level, pattern=pattern
+        )
+    except (ValueError, re.error) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def event_stream():
+        idle = 0.0
+        while not await request.is_disconnected():
+            lines = await asyncio.to_thread(follower.poll)
+            if lines:
+                idle = 0.0
+                for offset, end, line in lines:
+                    data = json.dumps({"offset": offset, "line": line}, ensure_ascii=False)
+                    yield f"id: {end}\nevent: line\ndata: {data}\n\n"
+                continue
+            idle += FOLLOW_POLL_INTERVAL
+            if idle >= FOLLOW_KEEPALIVE_INTERVAL:
+                idle = 0.0
+                yield ": keepalive\n\n"
+            await asyncio.sleep(FOLLOW_POLL_INTERVAL)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -1,13 +1,17 @@
 """Metrics API endpoint."""
 import logging
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
 
 from server.services.metrics import metrics
 from server.services.memory import MemoryService
 from server.services.resources import get_resource_service
+from server.services.storage import get_pool_stats
+from server.services.tool_cache import get_tool_cache
 import config
 
 router = APIRouter()
+prometheus_router = APIRouter()  # Mounted at the root: scrapers expect /metrics
 logger = logging.getLogger(__name__)
 
 # Initialize memory service for conversation stats
@@ -60,6 +64,10 @@ async def get_metrics():
         logger.warning(f"Could not fetch resource stats: {e}")
         data["resources"] = {"memory_mb": 0, "cpu_percent": 0, "disk_percent": 0, "status": "unknown"}
 
+    # Add SQLite connection pool sizes and wait times
+    data["db_pools"] = get_pool_stats()
+    data["tool_cache"] = get_tool_cache().get_stats()
+
     return data
 
 
@@ -68,3 +76,12 @@ async def reset_metrics():
     """Reset metrics (for testing/debugging)."""
     metrics.reset()
     return {"status": "ok", "message": "Metrics reset"}
+
+
+@prometheus_router.get("/metrics", response_class=PlainTextResponse)
+async def get_prometheus_metrics():
+    """Metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(
+        metrics.to_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,33 @@
+"""Repository API endpoints (code search index)."""
+import asyncio
+import logging
+
+from fastapi import APIRouter, HTTPException
+
+from server.services.repository import get_repository_service
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.get("/repository/index")
+async def get_index_stats():
+    """Get code search index statistics.
+
+    Returns state (building, ready, idle, failed), file and trigram counts,
+    build time, and the share of searchable files that searches had to read.
+    """
+    return await asyncio.to_thread(get_repository_service().get_index_stats)
+
+
+@router.post("/repository/index/refresh")
+async def refresh_index():
+    """Re-index files changed since the last refresh (starts a build if none has run)."""
+    index = get_repository_service().index
+    if index is None:
+        raise HTTPException(status_code=404, detail="Code index is disabled")
+    if not index.ready:
+        index.start()
+        return {"changed": 0, **await asyncio.to_thread(index.get_stats)}
+    changed = await asyncio.to_thread(index.refresh)
+    return {"changed": changed, **await asyncio.to_thread(index.get_stats)}
@@ -6,7 +6,7 @@ from datetime import datetime
 
 from server.services.scheduler import (
     SchedulerService, ScheduledTask, TaskType, TaskStatus,
-    TaskExecution, CronParser, get_scheduler_service, init_scheduler_service
+    TaskExecution, CronParser, MAX_PREVIEW_RUNS, get_scheduler_service, init_scheduler_service
 )
 import config
 
@@ -152,6 +152,20 @@ class ValidateCronResponse(BaseModel):
     next_runs: Optional[list[str]] = None
 
 
+class PreviewCronRequest(BaseModel):
+    """Request model for previewing a cron schedule."""
+    cron: str
+    count: int = Field(10, ge=1, le=MAX_PREVIEW_RUNS, description="Number of run times to return")
+    after: Optional[str] = Field(None, description="ISO datetime to start from (default: now)")
+
+
+class PreviewCronResponse(BaseModel):
+    """Response model for a cron schedule preview."""
+    cron: str
+    after: str
+    next_runs: list[str]
+
+
 def task_to_response(task: ScheduledTask) -> TaskResponse:
     """Convert ScheduledTask to TaskResponse."""
     return TaskResponse(
@@ -356,11 +370,30 @@ async def validate_cron(request: ValidateCronRequest) -> ValidateCronResponse:
         return ValidateCronResponse(valid=False, error=error)
 
     # Calculate next 5 run times
-    next_runs = []
-    current = datetime.now()
-    for _ in range(5):
-        next_run = CronParser.get_next_run(request.cron, current)
-        next_runs.append(next_run.isoformat())
-        current = next_run
+    next_runs = [run.isoformat() for run in CronParser.next_n_runs(request.cron, 5)]
 
     return ValidateCronResponse(valid=True, error=None, next_runs=next_runs)
+
+
+@router.post("/schedule/preview")
+async def preview_cron(request: PreviewCronRequest) -> PreviewCronResponse:
+    """List the next run times of a cron expression."""
+    is_valid, error = CronParser.is_valid(request.cron)
+    if not is_valid:
+        raise HTTPException(status_code=400, detail=f"Invalid cron expression: {error}")
+
+    try:
+        after = datetime.fromisoformat(request.after) if request.after else datetime.now()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid datetime format: {e}")
+
+    try:
+        runs = CronParser.next_n_runs(request.cron, request.count, after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return PreviewCronResponse(
+        cron=request.cron,
+        after=after.isoformat(),
+        next_runs=[run.isoformat() for run in runs],
+    )
@@ -6,7 +6,6 @@ This module provides:
 - macOS notification center integration
 - Optional webhook support for external alerting (Slack, Discord, etc.)
 """
-import aiosqlite
 import asyncio
 import subprocess
 import time
@@ -19,6 +18,8 @@ from pathlib import Path
 from typing import Callable, Optional
 import aiohttp
 
+from server.services.storage import PooledConnection, get_pool
+
 
 class AlertSeverity(Enum):
     """Alert severity levels."""
@@ -89,12 +90,20 @@ class AlertService:
         # Callbacks for alert notifications
         self._notification_callbacks: list[Callable] = []
 
+    def _get_connection(self) -> PooledConnection:
+        """Get the pooled writer connection context manager."""
+        return get_pool(self.db_path).writer()
+
+    def _get_read_connection(self) -> PooledConnection:
+        """Get a pooled read-only connection context manager."""
+        return get_pool(self.db_path).reader()
+
     async def _ensure_initialized(self):
         """Ensure database tables exist."""
         if self._initialized:
             return
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS alerts (
                     id TEXT PRIMARY KEY,
@@ -204,7 +213,7 @@ class AlertService:
         )
 
         # Store in database
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             import json
             await db.execute(
                 """INSERT INTO alerts
@@ -335,7 +344,7 @@ class AlertService:
         query += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             import json
             cursor = await db.execute(query, params)
             rows = await cursor.fetchall()
@@ -359,7 +368,7 @@ class AlertService:
         """Get a single alert by ID."""
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             import json
             cursor = await db.execute(
                 """SELECT id, type, severity, title, message, timestamp, metadata,
@@ -390,7 +399,7 @@ class AlertService:
 
         now = datetime.now().isoformat()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             cursor = await db.execute(
                 "UPDATE alerts SET acknowledged = 1, acknowledged_at = ? WHERE id = ?",
                 (now, alert_id)
@@ -402,7 +411,7 @@ class AlertService:
         """Get alert statistics."""
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             # Total count
             cursor = await db.execute("SELECT COUNT(*) FROM alerts")
             total = (await cursor.fetchone())[0]
@@ -442,7 +451,7 @@ class AlertService:
         """Delete alerts older than specified days."""
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             cursor = await db.execute(
                 """DELETE FROM alerts
                    WHERE datetime(timestamp) < datetime('now', ? || ' days')""",
@@ -1,12 +1,19 @@
 """Audit logging service for tool execution.
 
 Provides append-only audit log of all tool executions for security monitoring.
+
+Entries are written behind: log_execution only queues the row, and a
+background writer thread inserts queued rows in batched transactions over a
+single connection, so tool-call latency no longer includes a database commit.
+Queries flush the queue first, so they always see earlier log calls.
 """
 
 import logging
+import queue
 import sqlite3
 import hashlib
 import json
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from datetime import datetime
@@ -14,6 +21,20 @@ from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Entries waiting to be written; further entries are dropped when full
+AUDIT_QUEUE_MAX_SIZE = 10000
+# Maximum rows inserted per transaction
+AUDIT_BATCH_SIZE = 500
+# Seconds flush()/close() wait for the writer before giving up
+AUDIT_FLUSH_TIMEOUT = 5.0
+
+_INSERT_SQL = """
+    INSERT INTO audit_log
+    (timestamp, tool_name, args_hash, result_summary, user_ip,
+     success, duration_ms, sandboxed, rate_limited)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 @dataclass
 class AuditLogEntry:
@@ -30,12 +51,36 @@ class AuditLogEntry:
 
 
 class AuditLogger:
-    """Manages audit logging for tool execution."""
+    """Manages audit logging for tool execution.
 
-    def __init__(self, db_path: Path):
+    Args:
+        db_path: Path to the audit SQLite database
+        synchronous: Write each entry before log_execution returns instead
+            of queueing it (for tests and tooling that need no writer thread)
+        max_queue_size: Queued entries allowed before new ones are dropped
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        synchronous: bool = False,
+        max_queue_size: int = AUDIT_QUEUE_MAX_SIZE,
+    ):
         self.db_path = db_path
+        self.synchronous = synchronous
         self._init_database()
 
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._closed = False
+        # Pipeline counters (reported by get_pipeline_stats)
+        self._written = 0
+        self._dropped = 0
+        self._batches = 0
+        self._queue_high_water = 0
+        self._last_error: Optional[str] = None
+
     def _init_database(self):
         """Initialize audit log database with schema."""
         # Ensure parent directory exists
@@ -136,41 +181,167 @@ class AuditLogger:
             rate_limited: Whether rate limiting was applied
         """
         try:
-            timestamp = datetime.now().isoformat()
-            args_hash = self._hash_args(args)
-            result_summary = self._summarize_result(result)
+            row = (
+                datetime.now().isoformat(),
+                tool_name,
+                self._hash_args(args),
+                self._summarize_result(result),
+                user_ip,
+                1 if success else 0,
+                duration_ms,
+                1 if sandboxed else 0,
+                1 if rate_limited else 0,
+            )
+
+            if self.synchronous or self._closed:
+                self._write_rows([row])
+            else:
+                self._enqueue(row)
+
+            logger.debug(
+                f"Audit log: {tool_name} "
+                f"success={success} duration={duration_ms:.1f}ms"
+            )
 
-            conn = sqlite3.connect(str(self.db_path))
-            try:
-                conn.execute("""
-                    INSERT INTO audit_log
-                    (timestamp, tool_name, args_hash, result_summary, user_ip,
-                     success, duration_ms, sandboxed, rate_limited)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    timestamp,
-                    tool_name,
-                    args_hash,
-                    result_summary,
-                    user_ip,
-                    1 if success else 0,
-                    duration_ms,
-                    1 if sandboxed else 0,
-                    1 if rate_limited else 0,
-                ))
-                conn.commit()
+        except Exception as e:
+            # Never fail the actual operation due to audit logging errors
+            logger.error(f"Failed to write audit log: {e}", exc_info=True)
 
-                logger.debug(
-                    f"Audit log: {tool_name} "
-                    f"success={success} duration={duration_ms:.1f}ms"
+    def _enqueue(self, row: tuple):
+        """Queue a row for the writer thread, dropping it if the queue is full."""
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._dropped += 1
+            if self._dropped == 1 or self._dropped % 1000 == 0:
+                logger.warning(
+                    f"Audit queue full ({self._queue.maxsize} entries); "
+                    f"{self._dropped} entries dropped so far"
                 )
+            return
+        depth = self._queue.qsize()
+        if depth > self._queue_high_water:
+            self._queue_high_water = depth
+
+    def _ensure_writer(self):
+        """Start the background writer thread if it is not running."""
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name="audit-writer", daemon=True
+                )
+                self._writer.start()
 
-            finally:
-                conn.close()
+    def _writer_loop(self):
+        """Drain the queue, inserting rows in batched transactions."""
+        conn = self._connect()
+        try:
+            while True:
+                item = self._queue.get()
+                batch = []
+                markers = []
+                stop = False
+                while True:
+                    if item is None:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        markers.append(item)
+                    else:
+                        batch.append(item)
+                    if len(batch) >= AUDIT_BATCH_SIZE:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+
+                if batch:
+                    self._write_rows(batch, conn)
+                # Flush markers are released only after earlier rows are committed
+                for marker in markers:
+                    marker.set()
+                if stop:
+                    return
+        finally:
+            conn.close()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection tuned for appends."""
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _write_rows(self, rows: List[tuple], conn: Optional[sqlite3.Connection] = None):
+        """Insert rows in one transaction."""
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(str(self.db_path))
+        try:
+            with conn:
+                conn.executemany(_INSERT_SQL, rows)
+            self._written += len(rows)
+            self._batches += 1
         except Exception as e:
-            # Never fail the actual operation due to audit logging errors
-            logger.error(f"Failed to write audit log: {e}", exc_info=True)
+            self._dropped += len(rows)
+            self._last_error = str(e)
+            logger.error(f"Failed to write {len(rows)} audit log entries: {e}")
+        finally:
+            if own_conn:
+                conn.close()
+
+    def flush(self, timeout: float = AUDIT_FLUSH_TIMEOUT) -> bool:
+        """Wait until every entry queued so far has been written.
+
+        Returns:
+            True if the queue drained within the timeout
+        """
+        if self._writer is None or not self._writer.is_alive():
+            return self._queue.empty()
+        marker = threading.Event()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.wait(timeout)
+
+    def close(self, timeout: float = AUDIT_FLUSH_TIMEOUT):
+        """Flush pending entries and stop the writer thread.
+
+        Entries logged after close() are written synchronously.
+        """
+        self._closed = True
+        writer = self._writer
+        if writer is None or not writer.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            logger.warning("Audit queue still full at shutdown; pending entries may be lost")
+            return
+        writer.join(timeout)
+        if writer.is_alive():
+            logger.warning("Audit writer did not finish flushing before shutdown")
+
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        """Get write-behind queue statistics.
+
+        Returns:
+            Dict with queue depth, capacity and written/dropped counters
+        """
+        return {
+            "mode": "synchronous" if self.synchronous else "write_behind",
+            "queued": self._queue.qsize(),
+            "max_queue_size": self._queue.maxsize,
+            "queue_high_water": self._queue_high_water,
+            "written": self._written,
+            "dropped": self._dropped,
+            "batches": self._batches,
+            "last_error": self._last_error,
+        }
 
     def query(
         self,
@@ -216,6 +387,8 @@ class AuditLogger:
         query += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
 
+        self.flush()
+
         conn = sqlite3.connect(str(self.db_path))
         try:
             cursor = conn.execute(query, params)
@@ -246,6 +419,7 @@ class AuditLogger:
         Returns:
             Dict with statistics
         """
+        self.flush()
         conn = sqlite3.connect(str(self.db_path))
         try:
             # Total executions
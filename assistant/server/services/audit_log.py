@@ -3,12 +3,13 @@
 This module provides persistent logging of all permission changes
 for security auditing and compliance purposes.
 """
-import aiosqlite
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 import uuid
 
+from server.services.storage import PooledConnection, get_pool
+
 
 class AuditLogService:
     """Service for logging and querying permission audit events."""
@@ -17,12 +18,20 @@ class AuditLogService:
         self.db_path = db_path
         self._initialized = False
 
+    def _get_connection(self) -> PooledConnection:
+        """Get the pooled writer connection context manager."""
+        return get_pool(self.db_path).writer()
+
+    def _get_read_connection(self) -> PooledConnection:
+        """Get a pooled read-only connection context manager."""
+        return get_pool(self.db_path).reader()
+
     async def _ensure_initialized(self):
         """Ensure database table exists."""
         if self._initialized:
             return
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS permission_audit_log (
                     id TEXT PRIMARY KEY,
@@ -76,7 +85,7 @@ class AuditLogService:
         log_id = f"audit_{uuid.uuid4().hex[:12]}"
         timestamp = datetime.now().isoformat()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute(
                 """INSERT INTO permission_audit_log
                    (id, timestamp, old_level, old_level_name, new_level, new_level_name,
@@ -107,7 +116,7 @@ class AuditLogService:
         """
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             if source_filter:
                 cursor = await db.execute(
                     """SELECT id, timestamp, old_level, old_level_name,
@@ -159,7 +168,7 @@ class AuditLogService:
         """
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             if source_filter:
                 cursor = await db.execute(
                     "SELECT COUNT(*) FROM permission_audit_log WHERE source = ?",
@@ -188,6 +197,6 @@ class AuditLogService:
         """
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute("DELETE FROM permission_audit_log")
             await db.commit()
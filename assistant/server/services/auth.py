@@ -6,11 +6,11 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional, Tuple
 
-import aiosqlite
 import bcrypt
 import jwt
 
 import config
+from server.services.storage import PooledConnection, get_pool
 
 
 class AuthConfig:
@@ -99,12 +99,20 @@ class AuthService:
         self._initialized = False
         self._jwt_secret: Optional[str] = None
 
+    def _get_connection(self) -> PooledConnection:
+        """Get the pooled writer connection context manager."""
+        return get_pool(self.db_path).writer()
+
+    def _get_read_connection(self) -> PooledConnection:
+        """Get a pooled read-only connection context manager."""
+        return get_pool(self.db_path).reader()
+
     async def _ensure_initialized(self):
         """Ensure database tables exist."""
         if self._initialized:
             return
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             # Table for storing auth configuration
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS auth_config (
@@ -163,7 +171,7 @@ class AuthService:
 
         # Then check database
         await self._ensure_initialized()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 "SELECT value FROM auth_config WHERE key = 'jwt_secret'"
             )
@@ -181,7 +189,7 @@ class AuthService:
         """Set auth configuration in database."""
         await self._ensure_initialized()
         now = datetime.now(timezone.utc).isoformat()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute(
                 """INSERT INTO auth_config (key, value, updated_at)
                    VALUES (?, ?, ?)
@@ -193,7 +201,7 @@ class AuthService:
     async def _get_auth_config(self, key: str) -> Optional[str]:
         """Get auth configuration from database."""
         await self._ensure_initialized()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 "SELECT value FROM auth_config WHERE key = ?", (key,)
             )
@@ -227,7 +235,7 @@ class AuthService:
             minutes=AuthConfig.get_lockout_minutes()
         )
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 """SELECT COUNT(*) FROM login_attempts
                    WHERE ip_address = ?
@@ -264,7 +272,7 @@ class AuthService:
         await self._ensure_initialized()
         now = datetime.now(timezone.utc).isoformat()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute(
                 """INSERT INTO login_attempts (ip_address, timestamp, success)
                    VALUES (?, ?, ?)""",
@@ -389,7 +397,7 @@ class AuthService:
     ):
         """Store a session for tracking."""
         await self._ensure_initialized()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute(
                 """INSERT INTO active_sessions
                    (token_id, user, created_at, expires_at, ip_address, user_agent)
@@ -430,7 +438,7 @@ class AuthService:
     async def _is_session_revoked(self, token_id: str) -> bool:
         """Check if a session has been revoked."""
         await self._ensure_initialized()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 "SELECT revoked FROM active_sessions WHERE token_id = ?",
                 (token_id,)
@@ -449,7 +457,7 @@ class AuthService:
             return False
 
         await self._ensure_initialized()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute(
                 "UPDATE active_sessions SET revoked = 1 WHERE token_id = ?",
                 (token_id,)
@@ -461,7 +469,7 @@ class AuthService:
     async def revoke_all_sessions(self, username: str):
         """Revoke all sessions for a user."""
         await self._ensure_initialized()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute(
                 "UPDATE active_sessions SET revoked = 1 WHERE user = ?",
                 (username,)
@@ -473,7 +481,7 @@ class AuthService:
         await self._ensure_initialized()
         now = datetime.now(timezone.utc).isoformat()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 """SELECT token_id, created_at, expires_at, ip_address, user_agent
                    FROM active_sessions
@@ -498,7 +506,7 @@ class AuthService:
         await self._ensure_initialized()
         now = datetime.now(timezone.utc).isoformat()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             result = await db.execute(
                 "DELETE FROM active_sessions WHERE expires_at < ?",
                 (now,)
@@ -1,17 +1,127 @@
-"""Backup and restore service for AI Assistant data."""
+"""Backup and restore service for AI Assistant data.
+
+SQLite databases are copied with SQLite's online backup API, so each one is
+a consistent snapshot (including committed WAL content) taken while the
+server keeps running. Full backups stream every item into the tar.gz in a
+single pass, hashing contents on the way.
+
+Incremental backups split files into fixed-size chunks stored once each
+under backup_dir/chunks, named by their SHA-256; the archive itself holds
+only a manifest. Files whose size and mtime haven't changed since the
+previous incremental backup are not read again, and unchanged chunks of
+changed files are not written again.
+"""
 import asyncio
 import hashlib
+import io
 import json
 import shutil
+import sqlite3
 import tarfile
 import tempfile
-from dataclasses import dataclass
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 import os
 
+# Pages copied per step of a paged database backup (the source is unlocked between steps)
+BACKUP_PAGES_PER_STEP = 1024
+# Pause between steps so waiting writers of rollback-journal databases can commit
+BACKUP_STEP_PAUSE = 0.005
+# Paged backups restarted by concurrent writes before copying in a single step
+BACKUP_MAX_RESTARTS = 3
+# gzip level for archives and chunks (9 is much slower for little gain)
+COMPRESS_LEVEL = 6
+# Bytes per content-addressed chunk (a multiple of SQLite page sizes)
+CHUNK_SIZE = 256 * 1024
+# Seconds an unreferenced chunk is kept, in case a running backup is using it
+CHUNK_GC_GRACE = 3600
+
+SQLITE_HEADER = b"SQLite format 3\x00"
+METADATA_NAME = "backup_metadata.json"
+MANIFEST_NAME = "backup_manifest.json"
+
+
+class _BackupRestarted(Exception):
+    """A paged database backup kept restarting because of concurrent writes."""
+
+
+def is_sqlite_database(path: Path) -> bool:
+    """Whether a file starts with the SQLite database header."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except OSError:
+        return False
+
+
+def snapshot_database(source: Path, dest: Path) -> None:
+    """Copy a live SQLite database to dest with the online backup API.
+
+    WAL databases are copied in one step: the copy reads a single snapshot
+    and WAL readers never block writers. Rollback-journal databases are
+    copied a few pages at a time so writers can commit between steps; a
+    write restarts the copy, so after BACKUP_MAX_RESTARTS restarts the rest
+    is copied in one step.
+    """
+    src = sqlite3.connect(str(source))
+    try:
+        single_step = src.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+        restarts = 0
+        last_remaining = None
+
+        def progress(status, remaining, total):
+            nonlocal restarts, last_remaining
+            if last_remaining is not None and remaining > last_remaining:
+                restarts += 1
+                if restarts >= BACKUP_MAX_RESTARTS:
+                    raise _BackupRestarted()
+            last_remaining = remaining
+            if remaining:
+                time.sleep(BACKUP_STEP_PAUSE)
+
+        while True:
+            dest.unlink(missing_ok=True)
+            dst = sqlite3.connect(str(dest))
+            try:
+                if single_step:
+                    src.backup(dst)
+                else:
+                    src.backup(dst, pages=BACKUP_PAGES_PER_STEP, progress=progress)
+                return
+            except _BackupRestarted:
+                single_step = True
+            finally:
+                dst.close()
+    finally:
+        src.close()
+
+
+def _fold_checksum(entries: Iterable[tuple[str, str]]) -> str:
+    """Backup checksum over (path, SHA-256 of contents) pairs, in archive order."""
+    digest = hashlib.sha256()
+    for path, file_hash in entries:
+        digest.update(f"{path}\0{file_hash}\n".encode())
+    return digest.hexdigest()
+
+
+class _HashingReader:
+    """Read-only file wrapper that hashes everything read through it."""
+
+    def __init__(self, f, digest):
+        self._f = f
+        self.digest = digest
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size)
+        self.digest.update(data)
+        return data
+
 
 class BackupStatus(str, Enum):
     """Status of a backup or restore operation."""
@@ -29,6 +139,10 @@ class BackupMetadata:
     files_included: list[str]
     total_size_bytes: int
     checksum: str
+    # "content": SHA-256 over each file's path and contents (see _fold_checksum);
+    # "archive": older backups, whose checksum can't be verified
+    checksum_type: str = "archive"
+    incremental: bool = False
 
     def to_dict(self) -> dict:
         return {
@@ -38,6 +152,8 @@ class BackupMetadata:
             "files_included": self.files_included,
             "total_size_bytes": self.total_size_bytes,
             "checksum": self.checksum,
+            "checksum_type": self.checksum_type,
+            "incremental": self.incremental,
         }
 
     @classmethod
@@ -49,6 +165,8 @@ class BackupMetadata:
             files_included=data["files_included"],
             total_size_bytes=data["total_size_bytes"],
             checksum=data["checksum"],
+            checksum_type=data.get("checksum_type", "archive"),
+            incremental=data.get("incremental", False),
         )
 
 
@@ -60,6 +178,8 @@ class BackupResult:
     metadata: Optional[BackupMetadata]
     message: str
     errors: list[str]
+    # new_chunks, bytes_written and files_reused (incremental backups)
+    stats: dict = field(default_factory=dict)
 
 
 @dataclass
@@ -113,6 +233,7 @@ class BackupService:
         """
         self.memory_dir = memory_dir
         self.backup_dir = backup_dir or (memory_dir / "backups")
+        self.chunk_dir = self.backup_dir / "chunks"
         self.max_backups = max_backups
 
         # Ensure backup directory exists
@@ -150,23 +271,33 @@ class BackupService:
         self,
         output_path: Optional[Path] = None,
         include_benchmarks: bool = False,
+        incremental: bool = False,
     ) -> BackupResult:
         """Create a backup of all assistant data.
 
         Args:
             output_path: Custom output path for backup file
             include_benchmarks: Whether to include benchmark data
+            incremental: Store contents as shared chunks in backup_dir/chunks,
+                         writing only chunks no earlier backup has stored
 
         Returns:
             BackupResult with status and details
         """
-        errors = []
-
         # Determine output path
         if output_path is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_path = self.backup_dir / f"backup_{timestamp}.tar.gz"
 
+        if incremental and output_path.parent.resolve() != self.backup_dir.resolve():
+            return BackupResult(
+                status=BackupStatus.FAILED,
+                output_path=None,
+                metadata=None,
+                message="Incremental backups must be written to the backup directory",
+                errors=[f"Output path is outside {self.backup_dir}"],
+            )
+
         # Ensure parent directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -190,69 +321,28 @@ class BackupService:
                 errors=["Memory directory is empty or does not exist"],
             )
 
-        # Create backup in a temporary directory first
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            staging_dir = temp_path / "backup"
-            staging_dir.mkdir()
-
-            # Copy files to staging area
-            files_included = []
-            for item in files_to_backup:
-                try:
-                    dest = staging_dir / item.name
-                    if item.is_file():
-                        shutil.copy2(item, dest)
-                        files_included.append(item.name)
-                    elif item.is_dir():
-                        shutil.copytree(item, dest)
-                        files_included.append(f"{item.name}/")
-                except Exception as e:
-                    errors.append(f"Failed to copy {item.name}: {e}")
-
-            if not files_included:
-                return BackupResult(
-                    status=BackupStatus.FAILED,
-                    output_path=None,
-                    metadata=None,
-                    message="Failed to copy any files",
-                    errors=errors,
-                )
-
-            # Calculate total size
-            total_size = self._get_total_size([staging_dir])
-
-            # Create metadata
-            metadata = BackupMetadata(
-                version=self.BACKUP_VERSION,
-                created_at=datetime.now().isoformat(),
-                assistant_version=self._get_assistant_version(),
-                files_included=files_included,
-                total_size_bytes=total_size,
-                checksum="",  # Will be calculated after tarball creation
+        errors = []
+        try:
+            metadata, stats = await asyncio.to_thread(
+                self._write_backup, files_to_backup, output_path, incremental, errors
+            )
+        except Exception as e:
+            return BackupResult(
+                status=BackupStatus.FAILED,
+                output_path=None,
+                metadata=None,
+                message=f"Failed to write backup: {e}",
+                errors=errors + [str(e)],
             )
 
-            # Write metadata file
-            metadata_file = staging_dir / "backup_metadata.json"
-            metadata_file.write_text(json.dumps(metadata.to_dict(), indent=2))
-
-            # Create tarball
-            temp_tarball = temp_path / "backup.tar.gz"
-            with tarfile.open(temp_tarball, "w:gz") as tar:
-                tar.add(staging_dir, arcname=".")
-
-            # Calculate checksum of tarball
-            metadata.checksum = self._calculate_checksum(temp_tarball)
-
-            # Update metadata with checksum
-            metadata_file.write_text(json.dumps(metadata.to_dict(), indent=2))
-
-            # Recreate tarball with updated metadata
-            with tarfile.open(temp_tarball, "w:gz") as tar:
-                tar.add(staging_dir, arcname=".")
-
-            # Move to final destination
-            shutil.move(str(temp_tarball), str(output_path))
+        if metadata is None:
+            return BackupResult(
+                status=BackupStatus.FAILED,
+                output_path=None,
+                metadata=None,
+                message="Failed to copy any files",
+                errors=errors,
+            )
 
         # Perform rotation if needed
         await self._rotate_backups()
@@ -264,8 +354,316 @@ class BackupService:
             metadata=metadata,
             message=f"Backup created: {output_path}",
             errors=errors,
+            stats=stats,
+        )
+
+    def _write_backup(
+        self,
+        items: list[Path],
+        output_path: Path,
+        incremental: bool,
+        errors: list[str],
+    ) -> tuple[Optional[BackupMetadata], dict]:
+        """Write the archive to a temporary file and move it into place when complete."""
+        temp_output = output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            # Database snapshots are staged next to the backups, not in /tmp
+            with tempfile.TemporaryDirectory(dir=self.backup_dir, prefix=".snapshots-") as snapshot_dir:
+                if incremental:
+                    metadata, stats = self._write_incremental(items, temp_output, Path(snapshot_dir), errors)
+                else:
+                    metadata, stats = self._write_full(items, temp_output, Path(snapshot_dir), errors)
+            if metadata is not None:
+                os.replace(temp_output, output_path)
+            return metadata, stats
+        finally:
+            temp_output.unlink(missing_ok=True)
+
+    def _new_metadata(self, files_included: list[str], total_size: int, checksum: str, incremental: bool) -> BackupMetadata:
+        return BackupMetadata(
+            version=self.BACKUP_VERSION,
+            created_at=datetime.now().isoformat(),
+            assistant_version=self._get_assistant_version(),
+            files_included=files_included,
+            total_size_bytes=total_size,
+            checksum=checksum,
+            checksum_type="content",
+            incremental=incremental,
         )
 
+    def _walk_item(self, item: Path, errors: list[str]) -> Iterator[tuple[Path, str, bool]]:
+        """(path, archive name, is_dir) for a backup item and, for directories, everything under it."""
+        if not item.is_dir():
+            yield item, item.name, False
+            return
+
+        def on_error(e: OSError):
+            errors.append(f"Failed to read {e.filename}: {e.strerror}")
+
+        yield item, item.name, True
+        for root, dirs, files in os.walk(item, onerror=on_error):
+            dirs.sort()
+            root_path = Path(root)
+            for name in dirs:
+                path = root_path / name
+                yield path, path.relative_to(self.memory_dir).as_posix(), True
+            for name in sorted(files):
+                path = root_path / name
+                yield path, path.relative_to(self.memory_dir).as_posix(), False
+
+    def _snapshot_if_database(self, path: Path, snapshot_dir: Path) -> Path:
+        """A consistent copy of a SQLite database, or the path itself for other files."""
+        if not is_sqlite_database(path):
+            return path
+        snapshot = snapshot_dir / f"{uuid.uuid4().hex}-{path.name}"
+        snapshot_database(path, snapshot)
+        return snapshot
+
+    def _add_json(self, tar: tarfile.TarFile, name: str, data: dict):
+        content = json.dumps(data, indent=2).encode()
+        info = tarfile.TarInfo(f"./{name}")
+        info.size = len(content)
+        info.mtime = int(time.time())
+        tar.addfile(info, io.BytesIO(content))
+
+    def _write_full(
+        self,
+        items: list[Path],
+        temp_output: Path,
+        snapshot_dir: Path,
+        errors: list[str],
+    ) -> tuple[Optional[BackupMetadata], dict]:
+        """Stream all items into one tar.gz, with the metadata as the last member."""
+        files_included = []
+        entries = []
+        total_size = 0
+
+        with tarfile.open(temp_output, "w:gz", compresslevel=COMPRESS_LEVEL) as tar:
+            for item in items:
+                included = False
+                for path, arcname, is_dir in self._walk_item(item, errors):
+                    source = path
+                    try:
+                        info = tar.gettarinfo(str(path), arcname=f"./{arcname}")
+                        if is_dir:
+                            tar.addfile(info)
+                            included = True
+                            continue
+                        source = self._snapshot_if_database(path, snapshot_dir)
+                        f = open(source, "rb")
+                    except (OSError, sqlite3.Error) as e:
+                        errors.append(f"Failed to copy {arcname}: {e}")
+                        if source != path:
+                            source.unlink(missing_ok=True)
+                        continue
+
+                    # Failures from here on leave a broken archive, so they abort the backup
+                    try:
+                        with f:
+                            info.size = os.fstat(f.fileno()).st_size
+                            digest = hashlib.sha256()
+                            tar.addfile(info, _HashingReader(f, digest))
+                    finally:
+                        if source != path:
+                            source.unlink(missing_ok=True)
+                    entries.append((arcname, digest.hexdigest()))
+                    total_size += info.size
+                    included = True
+
+                if included:
+                    files_included.append(f"{item.name}/" if item.is_dir() else item.name)
+
+            if not files_included:
+                return None, {}
+
+            metadata = self._new_metadata(files_included, total_size, _fold_checksum(entries), False)
+            self._add_json(tar, METADATA_NAME, metadata.to_dict())
+
+        return metadata, {}
+
+    def _write_incremental(
+        self,
+        items: list[Path],
+        temp_output: Path,
+        snapshot_dir: Path,
+        errors: list[str],
+    ) -> tuple[Optional[BackupMetadata], dict]:
+        """Store contents as chunks and write an archive holding the manifest and metadata."""
+        previous = self._latest_manifest_files()
+        stats = {"new_chunks": 0, "bytes_written": 0, "files_reused": 0}
+        files_included = []
+        dirs = []
+        files = []
+
+        for item in items:
+            included = False
+            for path, arcname, is_dir in self._walk_item(item, errors):
+                if is_dir:
+                    dirs.append(arcname)
+                    included = True
+                    continue
+                try:
+                    files.append(self._store_file(path, arcname, previous.get(arcname), snapshot_dir, stats))
+                except (OSError, sqlite3.Error) as e:
+                    errors.append(f"Failed to copy {arcname}: {e}")
+                    continue
+                included = True
+
+            if included:
+                files_included.append(f"{item.name}/" if item.is_dir() else item.name)
+
+        if not files_included:
+            return None, stats
+
+        checksum = _fold_checksum((entry["path"], entry["sha256"]) for entry in files)
+        total_size = sum(entry["size"] for entry in files)
+        metadata = self._new_metadata(files_included, total_size, checksum, True)
+        manifest = {"chunk_size": CHUNK_SIZE, "dirs": dirs, "files": files}
+
+        # The manifest goes first so it can be read without decompressing the rest
+        with tarfile.open(temp_output, "w:gz", compresslevel=COMPRESS_LEVEL) as tar:
+            self._add_json(tar, MANIFEST_NAME, manifest)
+            self._add_json(tar, METADATA_NAME, metadata.to_dict())
+
+        return metadata, stats
+
+    def _store_file(
+        self,
+        path: Path,
+        arcname: str,
+        previous: Optional[dict],
+        snapshot_dir: Path,
+        stats: dict,
+    ) -> dict:
+        """Chunk one file into the chunk store and return its manifest entry."""
+        stat = path.stat()
+        signature = [stat.st_size, stat.st_mtime_ns]
+        wal_path = path.with_name(path.name + "-wal")
+        if wal_path.exists():
+            wal_stat = wal_path.stat()
+            signature += [wal_stat.st_size, wal_stat.st_mtime_ns]
+
+        if previous is not None and previous.get("signature") == signature and self._touch_chunks(previous["chunks"]):
+            stats["files_reused"] += 1
+            return previous
+
+        source = self._snapshot_if_database(path, snapshot_dir)
+        try:
+            digest = hashlib.sha256()
+            chunks = []
+            size = 0
+            with open(source, "rb") as f:
+                for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    digest.update(block)
+                    size += len(block)
+                    chunk = hashlib.sha256(block).hexdigest()
+                    self._put_chunk(chunk, block, stats)
+                    chunks.append(chunk)
+        finally:
+            if source != path:
+                source.unlink(missing_ok=True)
+
+        return {
+            "path": arcname,
+            "size": size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest.hexdigest(),
+            "chunks": chunks,
+            "signature": signature,
+        }
+
+    def _chunk_path(self, chunk: str) -> Path:
+        return self.chunk_dir / chunk[:2] / chunk
+
+    def _touch_chunks(self, chunks: list[str]) -> bool:
+        """Whether all chunks are stored; refreshes their mtimes to hold off collection."""
+        try:
+            for chunk in chunks:
+                os.utime(self._chunk_path(chunk))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _put_chunk(self, chunk: str, block: bytes, stats: dict):
+        path = self._chunk_path(chunk)
+        if self._touch_chunks([chunk]):
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = zlib.compress(block, COMPRESS_LEVEL)
+        temp_path = path.with_name(f".{chunk}.{uuid.uuid4().hex}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+        stats["new_chunks"] += 1
+        stats["bytes_written"] += len(data)
+
+    def _read_chunk(self, chunk: str) -> bytes:
+        block = zlib.decompress(self._chunk_path(chunk).read_bytes())
+        if hashlib.sha256(block).hexdigest() != chunk:
+            raise ValueError(f"Chunk {chunk} is corrupt")
+        return block
+
+    def _read_manifest(self, backup_path: Path) -> Optional[dict]:
+        """The manifest of an incremental backup (None for full backups)."""
+        try:
+            with tarfile.open(backup_path, "r|gz") as tar:
+                member = tar.next()
+                if member is None or member.name != f"./{MANIFEST_NAME}":
+                    return None
+                return json.loads(tar.extractfile(member).read())
+        except (tarfile.TarError, OSError, ValueError):
+            return None
+
+    def _latest_manifest_files(self) -> dict[str, dict]:
+        """Manifest entries by path from the newest incremental backup."""
+        for backup_file in sorted(
+            self.backup_dir.glob("*.tar.gz"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        ):
+            manifest = self._read_manifest(backup_file)
+            if manifest is not None:
+                return {entry["path"]: entry for entry in manifest["files"]}
+        return {}
+
+    def _collect_chunks(self) -> int:
+        """Delete chunks no remaining backup refers to. Returns the number deleted."""
+        referenced = set()
+        for backup_file in self.backup_dir.glob("*.tar.gz"):
+            manifest = self._read_manifest(backup_file)
+            if manifest is not None:
+                for entry in manifest["files"]:
+                    referenced.update(entry["chunks"])
+
+        cutoff = time.time() - CHUNK_GC_GRACE
+        removed = 0
+        for path in self.chunk_dir.glob("*/*"):
+            if path.name in referenced:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def _materialize(self, dest_dir: Path):
+        """Rebuild an extracted incremental backup's files from the chunk store."""
+        manifest = json.loads((dest_dir / MANIFEST_NAME).read_text())
+        for name in manifest["dirs"] + [entry["path"] for entry in manifest["files"]]:
+            if Path(name).is_absolute() or ".." in Path(name).parts:
+                raise ValueError(f"Unsafe path in manifest: {name}")
+
+        for name in manifest["dirs"]:
+            (dest_dir / name).mkdir(parents=True, exist_ok=True)
+        for entry in manifest["files"]:
+            target = dest_dir / entry["path"]
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with open(target, "wb") as out:
+                for chunk in entry["chunks"]:
+                    out.write(self._read_chunk(chunk))
+            os.utime(target, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+
     async def _rotate_backups(self):
         """Remove old backups to keep only max_backups most recent."""
         backup_files = sorted(
@@ -275,12 +673,18 @@ class BackupService:
         )
 
         # Remove older backups beyond max_backups
+        removed = 0
         for old_backup in backup_files[self.max_backups:]:
             try:
                 old_backup.unlink()
+                removed += 1
             except Exception:
                 pass
 
+        # Chunks only the removed backups used can go too
+        if removed and self.chunk_dir.exists():
+            await asyncio.to_thread(self._collect_chunks)
+
     async def list_backups(self) -> list[dict]:
         """List all available backups.
 
@@ -302,6 +706,7 @@ class BackupService:
                     "created_at": metadata.created_at if metadata else None,
                     "version": metadata.version if metadata else None,
                     "files_count": len(metadata.files_included) if metadata else 0,
+                    "incremental": metadata.incremental if metadata else False,
                 })
             except Exception:
                 backups.append({
@@ -311,6 +716,7 @@ class BackupService:
                     "created_at": None,
                     "version": None,
                     "files_count": 0,
+                    "incremental": False,
                 })
         return backups
 
@@ -391,6 +797,9 @@ class BackupService:
         if not metadata:
             return False, "Invalid backup: missing or corrupt metadata"
 
+        if metadata.checksum_type == "content":
+            return await asyncio.to_thread(self._verify_contents, backup_path, metadata)
+
         # Verify checksum
         calculated_checksum = self._calculate_checksum(backup_path)
         # Note: checksum verification is tricky since we store it inside the tarball
@@ -407,6 +816,40 @@ class BackupService:
 
         return True, "Backup integrity verified"
 
+    def _verify_contents(self, backup_path: Path, metadata: BackupMetadata) -> tuple[bool, str]:
+        """Re-hash every file in a backup (or its chunks) and compare with the checksum."""
+        entries = []
+        try:
+            if metadata.incremental:
+                manifest = self._read_manifest(backup_path)
+                if manifest is None:
+                    return False, "Invalid backup: missing manifest"
+                for entry in manifest["files"]:
+                    digest = hashlib.sha256()
+                    for chunk in entry["chunks"]:
+                        digest.update(self._read_chunk(chunk))
+                    if digest.hexdigest() != entry["sha256"]:
+                        return False, f"Backup is corrupt: {entry['path']} does not match its checksum"
+                    entries.append((entry["path"], entry["sha256"]))
+            else:
+                with tarfile.open(backup_path, "r|gz") as tar:
+                    for member in tar:
+                        if not member.isfile() or member.name == f"./{METADATA_NAME}":
+                            continue
+                        digest = hashlib.sha256()
+                        f = tar.extractfile(member)
+                        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+                            digest.update(block)
+                        entries.append((member.name.removeprefix("./"), digest.hexdigest()))
+        except FileNotFoundError as e:
+            return False, f"Backup is incomplete: missing chunk {Path(e.filename).name}"
+        except (tarfile.TarError, OSError, ValueError, zlib.error) as e:
+            return False, f"Backup file is corrupt: {e}"
+
+        if _fold_checksum(entries) != metadata.checksum:
+            return False, "Backup is corrupt: checksum mismatch"
+        return True, "Backup integrity verified"
+
     async def restore(
         self,
         backup_path: Path,
@@ -469,6 +912,17 @@ class BackupService:
                     errors=[str(e)],
                 )
 
+            if preview.metadata.incremental:
+                try:
+                    await asyncio.to_thread(self._materialize, temp_path)
+                except (OSError, ValueError, KeyError, zlib.error) as e:
+                    return RestoreResult(
+                        status=BackupStatus.FAILED,
+                        files_restored=[],
+                        message=f"Failed to rebuild files from chunks: {e}",
+                        errors=[str(e)],
+                    )
+
             # Copy files to memory directory
             for item in preview.files_to_restore:
                 item_name = item.rstrip("/")
@@ -0,0 +1,592 @@
+"""Persistent trigram index for RepositoryService.search_code.
+
+Every searchable file under the REPOSITORY_PATHS roots is reduced to the
+set of byte trigrams it contains (ASCII case-folded), and an inverted
+index maps each trigram to the files containing it. A search pattern is
+parsed into the literal runs any match must contain; only files holding
+all of their trigrams are candidates, and the regex is verified on those
+alone.
+
+Files are tracked by mtime and size, so a refresh only re-reads files that
+changed. Searches refresh the directory they cover at most once every
+INDEX_REFRESH_INTERVAL seconds, which is a stat walk rather than reading
+and matching every file. The index is kept in SQLite and loaded at startup
+by a background thread; until it is ready, search_code falls back to a
+full scan.
+
+Correctness rules:
+- Candidates are always a superset of the files that can match; patterns
+  with no usable literals select every indexed file.
+- Files over max_file_size (or unreadable when indexed) are not indexed
+  and are always candidates.
+- Files refused by the service's rules (sensitive, binary, outside the
+  allowed paths) are recorded so they are skipped without being reopened.
+"""
+
+import fnmatch
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Optional
+
+try:
+    from re import _constants as _sre
+    from re import _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants as _sre
+    import sre_parse as _sre_parse
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored layout or the indexing rules change
+INDEX_FORMAT = 1
+# Seconds a searched directory is trusted before it is re-walked
+INDEX_REFRESH_INTERVAL = 2.0
+# Rebuild posting lists once this share of their entries belongs to
+# replaced or deleted files
+COMPACT_RATIO = 0.25
+COMPACT_MIN_POSTINGS = 100_000
+# Files read by a refresh before their trigrams are added to the index
+REFRESH_BATCH_FILES = 256
+
+# File states
+FILE_INDEXED = 0
+FILE_SKIPPED = 1    # Not searchable (sensitive, binary, outside allowed paths)
+FILE_UNINDEXED = 2  # Searchable but not indexed (too large, unreadable); always a candidate
+
+_REPEATS = {_sre.MAX_REPEAT, _sre.MIN_REPEAT} | (
+    {_sre.POSSESSIVE_REPEAT} if hasattr(_sre, "POSSESSIVE_REPEAT") else set()
+)
+_ATOMIC_GROUP = getattr(_sre, "ATOMIC_GROUP", None)
+# ASCII letters that match non-ASCII characters case-insensitively
+# (e.g. "k" and the Kelvin sign, "s" and long s)
+_UNSAFE_CASELESS = set("iksIKS")
+
+
+@dataclass
+class _FileRecord:
+    id: int
+    mtime_ns: int
+    size: int
+    status: int
+    trigrams: int = 0
+
+
+def _file_trigrams(data: bytes) -> set[bytes]:
+    """Distinct case-folded trigrams in file content."""
+    data = data.lower()
+    return {data[i:i + 3] for i in range(len(data) - 2)}
+
+
+def _literal_trigrams(text: str) -> set[bytes]:
+    data = text.encode("utf-8").lower()
+    return {data[i:i + 3] for i in range(len(data) - 2)}
+
+
+def _usable_literal(code: int, ignorecase: bool) -> bool:
+    """Whether a literal character can be required verbatim (after ASCII folding)."""
+    char = chr(code)
+    # Searches match line by line on text decoded with errors="replace"
+    if char in "\r\n\ufffd":
+        return False
+    if ignorecase:
+        return char.isascii() and char not in _UNSAFE_CASELESS
+    return True
+
+
+def _sequence_query(items, ignorecase: bool):
+    """Trigram query for a parsed pattern sequence.
+
+    Returns None (any file can match) or ("all", trigrams, subqueries),
+    where subqueries are ("any", alternatives) for alternations.
+    """
+    trigrams: set[bytes] = set()
+    subqueries = []
+    run: list[str] = []
+
+    def flush():
+        trigrams.update(_literal_trigrams("".join(run)))
+        run.clear()
+
+    for op, av in items:
+        if op is _sre.LITERAL and _usable_literal(av, ignorecase):
+            run.append(chr(av))
+            continue
+        if op is _sre.AT:
+            # Zero-width anchors don't break a literal run
+            continue
+        flush()
+        if op is _sre.SUBPATTERN:
+            _, add_flags, _, subpattern = av
+            sub = _sequence_query(subpattern, ignorecase or bool(add_flags & re.IGNORECASE))
+        elif op is _ATOMIC_GROUP:
+            sub = _sequence_query(av, ignorecase)
+        elif op in _REPEATS and av[0] >= 1:
+            sub = _sequence_query(av[2], ignorecase)
+        elif op is _sre.BRANCH:
+            alternatives = tuple(_sequence_query(alt, ignorecase) for alt in av[1])
+            sub = None if any(alt is None for alt in alternatives) else ("any", alternatives)
+        else:
+            sub = None
+        if sub is None:
+            continue
+        if sub[0] == "all":
+            # Requirements of a group are requirements of the sequence
+            trigrams.update(sub[1])
+            subqueries.extend(sub[2])
+        else:
+            subqueries.append(sub)
+    flush()
+
+    if not trigrams and not subqueries:
+        return None
+    if not trigrams and len(subqueries) == 1:
+        return subqueries[0]
+    return ("all", frozenset(trigrams), tuple(subqueries))
+
+
+@lru_cache(maxsize=256)
+def trigram_query(pattern: str, flags: int = 0):
+    """Trigrams any match of a regex must contain, as a query tree (None = no filter)."""
+    try:
+        parsed = _sre_parse.parse(pattern, flags)
+    except Exception:
+        return None
+    return _sequence_query(parsed, bool(parsed.state.flags & re.IGNORECASE))
+
+
+class CodeIndex:
+    """Trigram index over a set of root directories."""
+
+    def __init__(
+        self,
+        roots: list[Path],
+        db_path: Optional[Path] = None,
+        accept: Optional[Callable[[Path], bool]] = None,
+        max_file_size: int = 1024 * 1024,
+        refresh_interval: float = INDEX_REFRESH_INTERVAL,
+    ):
+        """
+        Args:
+            roots: Directories to index (resolved)
+            db_path: SQLite file the index is kept in (None = memory only)
+            accept: Whether a file may be searched at all
+            max_file_size: Larger files are not indexed (always candidates)
+            refresh_interval: Seconds a searched directory is trusted before re-walking
+        """
+        self.roots = [Path(root) for root in roots]
+        self.db_path = Path(db_path) if db_path else None
+        self.max_file_size = max_file_size
+        self.refresh_interval = refresh_interval
+        self._accept = accept or (lambda path: True)
+
+        self._files: dict[str, _FileRecord] = {}
+        self._paths: dict[int, str] = {}  # Live file ids
+        self._postings: dict[bytes, array] = {}
+        self._next_id = 0
+        self._total_postings = 0
+        self._dead_postings = 0
+        # Files per status, kept up to date by _add/_remove for get_stats
+        self._status_counts = {FILE_INDEXED: 0, FILE_SKIPPED: 0, FILE_UNINDEXED: 0}
+        # Bumped whenever a file is added, changed or removed (see generation)
+        self._generation = 0
+
+        # _lock guards the in-memory index and is held only to change or
+        # query it; files are read without it, so searches and stats aren't
+        # held up by a build. _refresh_lock runs one refresh at a time and
+        # _db_lock guards the SQLite connection.
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._refreshed: dict[str, float] = {}
+        self._build_seconds: Optional[float] = None
+        self._last_refresh: Optional[float] = None
+        self._error: Optional[str] = None
+        self._queries = 0
+        self._candidates = 0
+        self._eligible = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    # === Lifecycle ===
+
+    def start(self):
+        """Build (or load and refresh) the index in a background thread."""
+        with self._lock:
+            if self.ready or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run_build, name="code-index", daemon=True)
+            self._thread.start()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def build(self):
+        """Load the stored index and bring it up to date with the roots."""
+        started = time.monotonic()
+        self._load()
+        for root in self.roots:
+            if self._stop.is_set():
+                return
+            self.refresh(root)
+        if self._stop.is_set():
+            return
+        self._build_seconds = time.monotonic() - started
+        self._ready.set()
+        logger.info(
+            f"Code index ready: {len(self._paths)} files, {len(self._postings)} trigrams "
+            f"in {self._build_seconds:.2f}s"
+        )
+
+    def stop(self, timeout: float = 5.0):
+        """Stop a running build and close the database."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _run_build(self):
+        try:
+            self.build()
+        except Exception as e:
+            self._error = str(e)
+            logger.error(f"Code index build failed: {e}", exc_info=True)
+
+    # === Storage ===
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self.db_path is None:
+            return None
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_FORMAT:
+                conn.execute("DROP TABLE IF EXISTS files")
+                conn.execute(f"PRAGMA user_version = {INDEX_FORMAT}")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    status INTEGER NOT NULL,
+                    trigrams BLOB
+                )
+            """)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _load(self):
+        """Read stored records for files under the roots."""
+        with self._db_lock:
+            conn = self._db()
+            if conn is None or self._files:
+                return
+            rows = conn.execute("SELECT path, mtime_ns, size, status, trigrams FROM files").fetchall()
+            stale = [(row[0],) for row in rows if self._root_for(Path(row[0])) is None]
+            if stale:
+                conn.executemany("DELETE FROM files WHERE path = ?", stale)
+                conn.commit()
+
+        for start in range(0, len(rows), REFRESH_BATCH_FILES):
+            with self._lock:
+                for path, mtime_ns, size, status, blob in rows[start:start + REFRESH_BATCH_FILES]:
+                    if self._root_for(Path(path)) is None:
+                        continue
+                    keys = [blob[i:i + 3] for i in range(0, len(blob), 3)] if blob else []
+                    self._add(path, _FileRecord(0, mtime_ns, size, status), keys)
+        logger.info(f"Code index loaded {len(self._files)} stored files")
+
+    # === Maintenance ===
+
+    def refresh(self, scope: Optional[Path] = None) -> int:
+        """Re-index files under scope (default: every root) whose mtime or size changed.
+
+        Returns:
+            Number of files added, changed or removed
+        """
+        if scope is None:
+            return sum(self.refresh(root) for root in self.roots)
+        scope = Path(scope)
+        prefix = os.path.join(str(scope), "")
+        seen = set()
+        writes = []
+        deletes = []
+        with self._refresh_lock:
+            complete = True
+            batch = []
+            for path, stat in self._walk(scope):
+                if self._stop.is_set():
+                    # Keep what was indexed so far; the walk resumes on the next build
+                    complete = False
+                    break
+                seen.add(path)
+                record = self._files.get(path)
+                if record is not None and record.mtime_ns == stat.st_mtime_ns and record.size == stat.st_size:
+                    continue
+                batch.append(self._read(path, stat))
+                if len(batch) >= REFRESH_BATCH_FILES:
+                    writes += self._apply(batch)
+                    batch = []
+            writes += self._apply(batch)
+
+            with self._lock:
+                if complete:
+                    for path in [p for p in self._files if p.startswith(prefix) and p not in seen]:
+                        self._remove(path)
+                        deletes.append((path,))
+                if self._dead_postings > max(COMPACT_MIN_POSTINGS, self._total_postings * COMPACT_RATIO):
+                    self.compact()
+                if complete:
+                    self._refreshed[str(scope)] = time.monotonic()
+                    self._last_refresh = time.time()
+
+            if writes or deletes:
+                with self._db_lock:
+                    conn = self._db()
+                    if conn is not None:
+                        conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", writes)
+                        conn.executemany("DELETE FROM files WHERE path = ?", deletes)
+                        conn.commit()
+        if writes or deletes:
+            logger.debug(f"Code index refreshed {scope}: {len(writes)} updated, {len(deletes)} removed")
+        return len(writes) + len(deletes)
+
+    def compact(self):
+        """Drop posting entries of replaced and deleted files."""
+        with self._lock:
+            live = self._paths
+            for key, ids in list(self._postings.items()):
+                kept = array("I", [i for i in ids if i in live])
+                if kept:
+                    self._postings[key] = kept
+                else:
+                    del self._postings[key]
+            self._total_postings -= self._dead_postings
+            self._dead_postings = 0
+
+    def _walk(self, scope: Path):
+        """(path, stat) for every file under scope, without following directory symlinks."""
+        stack = [str(scope)]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file():
+                                yield entry.path, entry.stat()
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+    def _read(self, path: str, stat: os.stat_result) -> tuple:
+        """Read one file's trigrams (without the lock); returns its database row and keys."""
+        keys: set[bytes] = set()
+        if not self._accept(Path(path)):
+            status = FILE_SKIPPED
+        elif stat.st_size > self.max_file_size:
+            status = FILE_UNINDEXED
+        else:
+            try:
+                with open(path, "rb") as f:
+                    keys = _file_trigrams(f.read())
+                status = FILE_INDEXED
+            except OSError:
+                status = FILE_UNINDEXED
+        blob = b"".join(keys) if status == FILE_INDEXED else None
+        return (path, stat.st_mtime_ns, stat.st_size, status, blob), keys
+
+    def _apply(self, batch: list[tuple]) -> list[tuple]:
+        """Replace the records of a batch of read files; returns their database rows."""
+        with self._lock:
+            for (path, mtime_ns, size, status, _), keys in batch:
+                if path in self._files:
+                    self._remove(path)
+                self._add(path, _FileRecord(0, mtime_ns, size, status), keys)
+        return [row for row, _ in batch]
+
+    def _add(self, path: str, record: _FileRecord, keys):
+        record.id = self._next_id
+        record.trigrams = len(keys)
+        self._next_id += 1
+        self._files[path] = record
+        self._paths[record.id] = path
+        postings = self._postings
+        for key in keys:
+            ids = postings.get(key)
+            if ids is None:
+                ids = postings[key] = array("I")
+            ids.append(record.id)
+        self._total_postings += record.trigrams
+        self._status_counts[record.status] += 1
+        self._generation += 1
+
+    def _remove(self, path: str):
+        # Posting entries stay until the next compaction; dead ids are filtered out
+        record = self._files.pop(path)
+        del self._paths[record.id]
+        self._dead_postings += record.trigrams
+        self._status_counts[record.status] -= 1
+        self._generation += 1
+
+    # === Queries ===
+
+    def _root_for(self, path: Path) -> Optional[Path]:
+        for root in self.roots:
+            if path == root or root in path.parents:
+                return root
+        return None
+
+    def _ensure_fresh(self, scope: Path):
+        now = time.monotonic()
+        for directory in (scope, *scope.parents):
+            refreshed = self._refreshed.get(str(directory))
+            if refreshed is not None and now - refreshed < self.refresh_interval:
+                return
+        self.refresh(scope)
+
+    def generation(self, scope: Path) -> Optional[int]:
+        """A number that changes whenever a file in the index changes.
+
+        Brings scope up to date first (as candidates does), so results
+        computed over scope can be cached under it. None when the index
+        can't answer for scope (not ready or outside the roots).
+        """
+        scope = Path(scope)
+        if not self.ready or self._root_for(scope) is None:
+            return None
+        self._ensure_fresh(scope)
+        return self._generation
+
+    def candidates(self, search_re: re.Pattern, scope: Path, file_pattern: str = "*") -> Optional[tuple[list[Path], int]]:
+        """Files under scope whose names match file_pattern and that may contain a match.
+
+        Args:
+            search_re: Compiled search pattern
+            scope: Directory being searched (resolved)
+            file_pattern: File name glob (as for Path.rglob)
+
+        Returns:
+            (candidate paths in sorted order, number of searchable files in scope),
+            or None when the index can't answer (not ready, scope outside the
+            roots, or a path-based file pattern) and the caller should scan.
+        """
+        if not self.ready or "/" in file_pattern or "**" in file_pattern:
+            return None
+        scope = Path(scope)
+        if self._root_for(scope) is None:
+            return None
+
+        query = trigram_query(search_re.pattern, search_re.flags)
+        prefix = os.path.join(str(scope), "")
+        self._ensure_fresh(scope)
+        with self._lock:
+            ids = self._evaluate(query)
+            paths = []
+            eligible = 0
+            for path, record in self._files.items():
+                if record.status == FILE_SKIPPED or not path.startswith(prefix):
+                    continue
+                if not fnmatch.fnmatchcase(os.path.basename(path), file_pattern):
+                    continue
+                eligible += 1
+                if ids is None or record.status == FILE_UNINDEXED or record.id in ids:
+                    paths.append(path)
+            self._queries += 1
+            self._candidates += len(paths)
+            self._eligible += eligible
+        paths.sort()
+        return [Path(p) for p in paths], eligible
+
+    def _evaluate(self, query) -> Optional[set[int]]:
+        """File ids satisfying a trigram query (None = every file)."""
+        if query is None:
+            return None
+        if query[0] == "any":
+            result: set[int] = set()
+            for alternative in query[1]:
+                ids = self._evaluate(alternative)
+                if ids is None:
+                    return None
+                result |= ids
+            return result
+
+        _, trigrams, subqueries = query
+        result = None
+        for ids in sorted((self._postings.get(key, ()) for key in trigrams), key=len):
+            if result is None:
+                result = set(ids)
+            else:
+                result.intersection_update(ids)
+            if not result:
+                return result
+        for subquery in subqueries:
+            ids = self._evaluate(subquery)
+            if ids is None:
+                continue
+            result = ids if result is None else result & ids
+            if not result:
+                return result
+        return result
+
+    def get_stats(self) -> dict:
+        """Index size, state and how much searches are narrowed.
+
+        Reads counters only, without the index lock, so it answers promptly
+        during a build (figures may be a batch behind).
+        """
+        counts = dict(self._status_counts)
+        if self.ready:
+            state = "ready"
+        elif self._error:
+            state = "failed"
+        elif self._thread is not None and self._thread.is_alive():
+            state = "building"
+        else:
+            state = "idle"
+        db_bytes = 0
+        if self.db_path is not None and self.db_path.exists():
+            db_bytes = self.db_path.stat().st_size
+        return {
+            "enabled": True,
+            "state": state,
+            "error": self._error,
+            "roots": [str(root) for root in self.roots],
+            "files": len(self._files),
+            "indexed_files": counts[FILE_INDEXED],
+            "skipped_files": counts[FILE_SKIPPED],
+            "unindexed_files": counts[FILE_UNINDEXED],
+            "trigrams": len(self._postings),
+            "postings": self._total_postings - self._dead_postings,
+            "dead_postings": self._dead_postings,
+            "build_seconds": round(self._build_seconds, 3) if self._build_seconds is not None else None,
+            "last_refresh": datetime.fromtimestamp(self._last_refresh).isoformat() if self._last_refresh else None,
+            "queries": self._queries,
+            "candidate_ratio": round(self._candidates / self._eligible, 4) if self._eligible else None,
+            "db_path": str(self.db_path) if self.db_path else None,
+            "db_bytes": db_bytes,
+        }
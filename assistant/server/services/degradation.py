@@ -4,7 +4,7 @@ This service provides:
 - API fallback: Automatically switch between Claude and OpenAI on failures
 - Network detection: Check online/offline status
 - Rate limit handling: Queue requests when rate limited
-- Cached tool results: Store web_fetch results for offline access
+- Cached tool results: Serve web_fetch results offline (see tool_cache.py)
 - Status tracking: Monitor and report degraded mode status
 """
 import asyncio
@@ -17,6 +17,8 @@ from enum import Enum, auto
 from typing import Optional, Dict, List, Callable, Any
 from collections import deque
 
+from .tool_cache import ToolResultCache, get_tool_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -120,7 +122,7 @@ class DegradationService:
     MAX_QUEUE_SIZE = 100
     QUEUE_TIMEOUT = 300  # 5 minutes max wait
 
-    def __init__(self):
+    def __init__(self, tool_cache: Optional[ToolResultCache] = None):
         self._api_health: Dict[str, APIHealth] = {
             "claude": APIHealth(name="claude"),
             "openai": APIHealth(name="openai"),
@@ -136,9 +138,10 @@ class DegradationService:
         self._lock = asyncio.Lock()
         self._queue_processor_running: bool = False
 
-        # Cache for tool results (especially web_fetch)
-        self._tool_cache: Dict[str, dict] = {}
-        self._cache_max_age = timedelta(hours=24)
+        # Cache for tool results (especially web_fetch). Unless one is given,
+        # the global cache is looked up on each use, so this always reads the
+        # cache the tools write to.
+        self._own_tool_cache = tool_cache
 
     async def initialize_ollama_status(self):
         """Check actual Ollama availability on startup.
@@ -161,6 +164,10 @@ class DegradationService:
             self._api_health["ollama"].available = False
             self._update_mode()
 
+    @property
+    def _tool_cache(self) -> ToolResultCache:
+        return self._own_tool_cache or get_tool_cache()
+
     @property
     def mode(self) -> DegradationMode:
         """Current degradation mode."""
@@ -328,35 +335,24 @@ class DegradationService:
 
     def cache_tool_result(self, tool_name: str, args_hash: str, result: Any):
         """Cache a tool result for offline access."""
-        cache_key = f"{tool_name}:{args_hash}"
-        self._tool_cache[cache_key] = {
-            "result": result,
-            "cached_at": datetime.now(),
-        }
+        self._tool_cache.set(tool_name, args_hash, result)
         logger.debug(f"Cached result for {tool_name}")
 
     def get_cached_tool_result(self, tool_name: str, args_hash: str) -> Optional[dict]:
         """Get a cached tool result if available and not expired."""
-        cache_key = f"{tool_name}:{args_hash}"
-        cached = self._tool_cache.get(cache_key)
-
-        if not cached:
-            return None
-
-        # Check if expired
-        if datetime.now() - cached["cached_at"] > self._cache_max_age:
-            del self._tool_cache[cache_key]
+        entry = self._tool_cache.get(tool_name, args_hash)
+        if entry is None:
             return None
 
         return {
-            "result": cached["result"],
+            "result": entry.value,
             "cached": True,
-            "cached_at": cached["cached_at"].isoformat(),
+            "cached_at": datetime.fromtimestamp(entry.stored_at).isoformat(),
         }
 
-    def clear_cache(self):
-        """Clear all cached tool results."""
-        self._tool_cache.clear()
+    def clear_cache(self) -> int:
+        """Clear all cached tool results. Returns the number removed."""
+        return self._tool_cache.clear()
 
     # =========================================================================
     # Request Queue (for rate limit handling)
@@ -610,7 +606,7 @@ class DegradationService:
                 name: health.to_dict()
                 for name, health in self._api_health.items()
             },
-            "cache_entries": len(self._tool_cache),
+            "cache_entries": self._tool_cache.count(),
         }
 
     def reset_api_health(self, api_name: Optional[str] = None):
@@ -7,7 +7,9 @@ import hashlib
 import os
 import platform
 import secrets
+import threading
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Tuple, Union
@@ -27,6 +29,7 @@ KEY_SIZE = 32  # 256 bits for AES-256
 NONCE_SIZE = 12  # 96 bits recommended for GCM
 SALT_SIZE = 16  # 128 bits for salt
 PBKDF2_ITERATIONS = 480000  # OWASP 2023 recommendation for SHA256
+DERIVED_KEY_CACHE_SIZE = 128  # Per-value salts whose derived keys are kept
 
 # Encryption format version for future compatibility
 ENCRYPTION_VERSION = 1
@@ -106,6 +109,10 @@ class EncryptionService:
 
         self._key_file_path = key_file_path
         self._master_key = master_key or self._derive_machine_key()
+        # salt -> derived key, most recently used last. Deriving a key costs
+        # PBKDF2_ITERATIONS rounds, so repeat decrypts of a value reuse it.
+        self._derived_keys: OrderedDict[bytes, bytearray] = OrderedDict()
+        self._derived_keys_lock = threading.Lock()
 
     def _get_machine_identifier(self) -> str:
         """Get a stable machine-specific identifier.
@@ -190,15 +197,37 @@ class EncryptionService:
         """Derive an encryption key from master key using the given salt.
 
         Each encrypted value uses a unique salt for key derivation,
-        providing additional security.
+        providing additional security. Derived keys are cached per salt
+        in a bounded LRU so re-reading a value skips the PBKDF2 rounds.
         """
+        with self._derived_keys_lock:
+            cached = self._derived_keys.get(salt)
+            if cached is not None:
+                self._derived_keys.move_to_end(salt)
+                return bytes(cached)
+
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=KEY_SIZE,
             salt=salt,
             iterations=PBKDF2_ITERATIONS,
         )
-        return kdf.derive(self._master_key)
+        key = kdf.derive(self._master_key)
+
+        with self._derived_keys_lock:
+            self._derived_keys[salt] = bytearray(key)
+            self._derived_keys.move_to_end(salt)
+            while len(self._derived_keys) > DERIVED_KEY_CACHE_SIZE:
+                _, evicted = self._derived_keys.popitem(last=False)
+                _zeroize(evicted)
+        return key
+
+    def clear_key_cache(self) -> None:
+        """Zero and drop all cached derived keys."""
+        with self._derived_keys_lock:
+            for key in self._derived_keys.values():
+                _zeroize(key)
+            self._derived_keys.clear()
 
     def encrypt(self, plaintext: str) -> str:
         """Encrypt a plaintext string.
@@ -301,6 +330,8 @@ class EncryptionService:
             # Re-encrypt with new key
             result[key] = new_service.encrypt(plaintext)
 
+        # Keys derived from the old master key are no longer needed
+        self.clear_key_cache()
         return result
 
     @classmethod
@@ -359,6 +390,11 @@ class EncryptionService:
             raise ValueError(f"Invalid encryption key in {env_var}: {e}")
 
 
+def _zeroize(buffer: bytearray) -> None:
+    """Overwrite key material in place before it is released."""
+    buffer[:] = bytes(len(buffer))
+
+
 # Singleton instance for use throughout the application
 _encryption_service: Optional[EncryptionService] = None
 
@@ -396,5 +432,7 @@ def init_encryption_service(key_file_path: Path) -> EncryptionService:
         The initialized encryption service.
     """
     global _encryption_service
+    if _encryption_service is not None:
+        _encryption_service.clear_key_cache()
     _encryption_service = EncryptionService(key_file_path=key_file_path)
     return _encryption_service
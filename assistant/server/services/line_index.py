@@ -0,0 +1,154 @@
+"""Line-offset indexes for reading line ranges of files.
+
+A LineIndex records the byte offset where each line starts, found by
+scanning a memory map of the file for newlines (no decoding). Reading
+lines 10-20 then seeks to the first offset and decodes only that byte
+range. Indexes are cached per path and reused while the file's mtime and
+size are unchanged; the cache is bounded by the memory the offsets use.
+
+Lines end at "\\n" and "\\r\\n" is read as "\\n", matching text-mode reads
+of files with Unix or Windows line endings.
+"""
+
+import logging
+import mmap
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Memory for cached offsets (8 bytes per line)
+LINE_INDEX_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class LineIndex:
+    """Start offsets of the lines of one version of a file."""
+
+    def __init__(self, path: Path, mtime_ns: int, size: int, starts: array):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self._starts = starts
+
+    @classmethod
+    def build(cls, path: Path) -> "LineIndex":
+        """Scan a file for line starts."""
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            starts = array("Q")
+            if stat.st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    size = len(mm)
+                    find = mm.find
+                    position = 0
+                    while position < size:
+                        starts.append(position)
+                        newline = find(b"\n", position)
+                        if newline < 0:
+                            break
+                        position = newline + 1
+            return cls(path, stat.st_mtime_ns, stat.st_size, starts)
+
+    @property
+    def line_count(self) -> int:
+        return len(self._starts)
+
+    @property
+    def nbytes(self) -> int:
+        return self._starts.itemsize * len(self._starts)
+
+    def byte_range(self, start_line: int, end_line: int) -> tuple[int, int]:
+        """Byte offsets spanning lines start_line..end_line (1-indexed, inclusive)."""
+        count = len(self._starts)
+        start_idx = min(max(0, start_line - 1), count)
+        end_idx = min(max(start_idx, end_line), count)
+        if start_idx == end_idx:
+            return 0, 0
+        start = self._starts[start_idx]
+        end = self._starts[end_idx] if end_idx < count else self.size
+        return start, end
+
+    def read(self, start_line: int, end_line: int, max_chars: int) -> tuple[str, bool]:
+        """Decode lines start_line..end_line, stopping after max_chars characters.
+
+        Returns:
+            (text, truncated)
+        """
+        start, end = self.byte_range(start_line, end_line)
+        if start == end:
+            return "", False
+        # A character is at most 4 bytes, so this covers max_chars characters
+        length = min(end - start, max_chars * 4 + 4)
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            data = f.read(length)
+        text = data.decode("utf-8", errors="replace").replace("\r\n", "\n")
+        truncated = len(text) > max_chars or start + len(data) < end
+        return text[:max_chars], truncated
+
+
+class LineIndexCache:
+    """LRU of line indexes, validated against file mtime and size."""
+
+    def __init__(self, max_bytes: int = LINE_INDEX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, LineIndex] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path, mtime_ns: int, size: int) -> LineIndex:
+        """The index for a file, rebuilt if the file changed since it was cached."""
+        key = str(path)
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None and index.mtime_ns == mtime_ns and index.size == size:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return index
+            self.misses += 1
+
+        index = LineIndex.build(path)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            if index.nbytes <= self.max_bytes:
+                self._entries[key] = index
+                self._bytes += index.nbytes
+                while self._bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= evicted.nbytes
+        return index
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "files": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Global instance
+_line_index_cache: Optional[LineIndexCache] = None
+
+
+def get_line_index_cache() -> LineIndexCache:
+    """Get or create the global line index cache."""
+    global _line_index_cache
+    if _line_index_cache is None:
+        _line_index_cache = LineIndexCache()
+    return _line_index_cache
@@ -0,0 +1,181 @@
+"""Process-wide pooled LLM client registry.
+
+Building an AsyncAnthropic/AsyncOpenAI client creates a new HTTP connection
+pool, so constructing one per request pays TCP connect and TLS handshake on
+every turn. The registry keeps one client per provider, each backed by a
+keep-alive connection pool (HTTP/2 when the SDK's HTTP stack supports it), and
+only rebuilds a client when its API key changes (e.g. through the Settings page).
+
+Every request made through a pooled client is traced to record whether it
+opened a new connection or reused a pooled one (see MetricsService).
+"""
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Callable, Optional
+
+from server.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+ANTHROPIC = "anthropic"
+OPENAI = "openai"
+
+# Idle connections are kept long enough to survive the gap between turns
+# (the HTTP client default of 5 seconds drops them before the next message)
+MAX_CONNECTIONS = 50
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY_SECONDS = 120.0
+
+
+class _ConnectionTrace:
+    """httpcore trace hook noting whether a request opened a new connection."""
+
+    def __init__(self):
+        self.connected = False
+        self.tls_handshake = False
+
+    async def __call__(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.connected = True
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshake = True
+
+
+@dataclass
+class _PooledClient:
+    """A provider SDK client and the state it was built for."""
+    client: Any
+    key_fingerprint: str
+    loop: Optional[asyncio.AbstractEventLoop]
+
+
+def _fingerprint(api_key: str) -> str:
+    """Hash an API key so the plaintext is not kept alongside the client."""
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class LLMClientRegistry:
+    """Shared, lazily built SDK clients for the cloud LLM providers."""
+
+    def __init__(self):
+        self._clients: dict[str, _PooledClient] = {}
+        # Replaced clients may still be serving in-flight streams, so they
+        # are closed at shutdown rather than when they are replaced
+        self._retired: list[Any] = []
+
+    def get_anthropic(self, api_key: str):
+        """Get the pooled AsyncAnthropic client for api_key."""
+        def build():
+            import anthropic
+            return anthropic.AsyncAnthropic(
+                api_key=api_key, http_client=self._build_http_client(ANTHROPIC, anthropic)
+            )
+        return self._get(ANTHROPIC, api_key, build)
+
+    def get_openai(self, api_key: str):
+        """Get the pooled AsyncOpenAI client for api_key."""
+        def build():
+            import openai
+            return openai.AsyncOpenAI(
+                api_key=api_key, http_client=self._build_http_client(OPENAI, openai)
+            )
+        return self._get(OPENAI, api_key, build)
+
+    def _get(self, provider: str, api_key: str, build: Callable[[], Any]):
+        """Return the cached client for provider, rebuilding it if stale.
+
+        A client is stale when the API key changed or when it was built on a
+        different event loop (pooled connections are bound to their loop).
+        """
+        fingerprint = _fingerprint(api_key)
+        loop = _current_loop()
+        pooled = self._clients.get(provider)
+        if pooled is not None:
+            if pooled.key_fingerprint == fingerprint and pooled.loop is loop:
+                return pooled.client
+            reason = "API key changed" if pooled.key_fingerprint != fingerprint else "event loop changed"
+            logger.info(f"Rebuilding {provider} client ({reason})")
+            self._retired.append(pooled.client)
+
+        client = build()
+        self._clients[provider] = _PooledClient(client=client, key_fingerprint=fingerprint, loop=loop)
+        return client
+
+    def _build_http_client(self, provider: str, sdk: ModuleType):
+        """Create a keep-alive connection pool with connection-reuse tracing.
+
+        The pool is built from the SDK's own DefaultAsyncHttpxClient so it
+        keeps the SDK's timeouts and TCP keep-alive socket options.
+
+        Args:
+            provider: Provider name used to label connection metrics
+            sdk: The anthropic or openai module
+        """
+        async def attach_trace(request) -> None:
+            request.extensions["trace"] = _ConnectionTrace()
+
+        async def record_connection(response) -> None:
+            trace = response.request.extensions.get("trace")
+            if isinstance(trace, _ConnectionTrace):
+                metrics.record_connection(
+                    provider,
+                    reused=not trace.connected,
+                    tls_handshake=trace.tls_handshake,
+                )
+
+        limits = type(sdk.DEFAULT_CONNECTION_LIMITS)(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+        )
+        event_hooks = {"request": [attach_trace], "response": [record_connection]}
+        try:
+            return sdk.DefaultAsyncHttpxClient(http2=True, limits=limits, event_hooks=event_hooks)
+        except ImportError:
+            # HTTP/2 support is an optional extra of the HTTP client
+            logger.info(f"HTTP/2 unavailable for {provider}, pooling HTTP/1.1 connections")
+            return sdk.DefaultAsyncHttpxClient(limits=limits, event_hooks=event_hooks)
+
+    def invalidate(self, provider: Optional[str] = None) -> None:
+        """Drop cached clients so the next request builds a fresh one.
+
+        Args:
+            provider: Provider to drop, or None for all providers
+        """
+        providers = [provider] if provider else list(self._clients)
+        for name in providers:
+            pooled = self._clients.pop(name, None)
+            if pooled is not None:
+                self._retired.append(pooled.client)
+
+    async def aclose(self) -> None:
+        """Close every client and its connection pool (called at shutdown)."""
+        self.invalidate()
+        retired, self._retired = self._retired, []
+        for client in retired:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.debug(f"Error closing LLM client: {e}")
+
+
+# Global singleton instance
+_llm_clients: Optional[LLMClientRegistry] = None
+
+
+def get_llm_clients() -> LLMClientRegistry:
+    """Get the global LLM client registry instance."""
+    global _llm_clients
+    if _llm_clients is None:
+        _llm_clients = LLMClientRegistry()
+    return _llm_clients
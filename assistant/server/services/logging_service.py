@@ -5,13 +5,18 @@ Provides:
 - Separate log files: assistant.log, error.log, access.log
 - Configurable log levels via ASSISTANT_LOG_LEVEL environment variable
 - Old log cleanup (configurable age, default 30 days)
+- Log viewing without loading whole files: tails are read backwards from
+  the end in blocks, pages are addressed by byte-offset cursors, level and
+  regex filters are applied while reading, and LogFollower streams lines
+  as they are appended (stat polling, surviving rotation and truncation)
 """
 import logging
 import os
+import re
 from datetime import datetime, timedelta
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 # Default log configuration
 DEFAULT_LOG_LEVEL = "INFO"
@@ -19,6 +24,214 @@ DEFAULT_MAX_BYTES = 10 * 1024 * 1024  # 10MB
 DEFAULT_BACKUP_COUNT = 5
 DEFAULT_LOG_MAX_AGE_DAYS = 30
 
+# Bytes read per step when scanning a log backwards (or counting lines)
+READ_BLOCK_SIZE = 64 * 1024
+# Seconds between checks for new lines when following a log
+FOLLOW_POLL_INTERVAL = 0.5
+# Bytes read per follow poll; the rest is picked up by the next poll
+FOLLOW_MAX_READ = 1024 * 1024
+# Continuation lines (tracebacks) held while looking back for their record's header
+MAX_RECORD_LINES = 1000
+
+LOG_NAMES = ("assistant", "error", "access")
+LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+# Start of a record: "2026-01-01 12:00:00 LEVEL ..."
+_RECORD_HEADER = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:,\d+)? (\S+)")
+
+
+def _decode(line: bytes) -> str:
+    return line.decode("utf-8", errors="replace").rstrip("\r")
+
+
+def _record_level(line: str) -> Optional[int]:
+    """Level of a record's first line (0 if it has none); None for continuation lines."""
+    match = _RECORD_HEADER.match(line)
+    if match is None:
+        return None
+    return LOG_LEVELS.get(match.group(1), 0)
+
+
+class LogFilter:
+    """Server-side log filter.
+
+    level keeps records at or above a level; a record's continuation lines
+    (e.g. a traceback) go with its first line. pattern is a regex that
+    each returned line must contain.
+
+    Raises:
+        ValueError: Unknown level
+        re.error: Invalid pattern
+    """
+
+    def __init__(self, level: Optional[str] = None, pattern: Optional[str] = None):
+        if level and level.upper() not in LOG_LEVELS:
+            raise ValueError(f"Unknown log level: {level}")
+        self.min_level = LOG_LEVELS[level.upper()] if level else None
+        self.regex = re.compile(pattern) if pattern else None
+        # Whether the record being read forwards passes the level filter
+        self._record_matches = self.min_level is None
+
+    def _level_ok(self, level: int) -> bool:
+        return self.min_level is None or level >= self.min_level
+
+    def _pattern_ok(self, line: str) -> bool:
+        return self.regex is None or self.regex.search(line) is not None
+
+    def feed(self, line: str) -> bool:
+        """Whether a line passes, for lines read in file order."""
+        level = _record_level(line)
+        if level is not None:
+            self._record_matches = self._level_ok(level)
+        return self._record_matches and self._pattern_ok(line)
+
+    def reverse(self, lines: Iterator[tuple[int, str]]) -> Iterator[tuple[int, str]]:
+        """Filter (offset, line) pairs read from the end backwards."""
+        if self.min_level is None:
+            for item in lines:
+                if self._pattern_ok(item[1]):
+                    yield item
+            return
+
+        # Continuation lines come before their header when reading backwards
+        pending: list[tuple[int, str]] = []
+        for offset, line in lines:
+            level = _record_level(line)
+            if level is None:
+                if len(pending) < MAX_RECORD_LINES:
+                    pending.append((offset, line))
+                continue
+            if self._level_ok(level):
+                for item in pending:
+                    if self._pattern_ok(item[1]):
+                        yield item
+                if self._pattern_ok(line):
+                    yield offset, line
+            pending.clear()
+
+
+def _reverse_lines(f, end: int) -> Iterator[tuple[int, str]]:
+    """(offset, line) pairs of a binary file, newest first, for lines ending at or before end.
+
+    end is a line boundary (a line start, or the file size). Only
+    READ_BLOCK_SIZE bytes (plus a partial line) are held at a time.
+    """
+    position = end
+    buffer = b""
+    first = True
+    while position > 0:
+        size = min(READ_BLOCK_SIZE, position)
+        position -= size
+        f.seek(position)
+        buffer = f.read(size) + buffer
+        stop = len(buffer)
+        if first:
+            # The newline ending the last line doesn't start another
+            if buffer.endswith(b"\n"):
+                stop -= 1
+            first = False
+        while True:
+            newline = buffer.rfind(b"\n", 0, stop)
+            if newline < 0:
+                break
+            yield position + newline + 1, _decode(buffer[newline + 1:stop])
+            stop = newline
+        buffer = buffer[:stop]
+    if end > 0:
+        yield 0, _decode(buffer)
+
+
+class LogFollower:
+    """Reads lines as they are appended to a log file.
+
+    Call poll() periodically. Rotation (a new file under the same name) is
+    detected by inode; the rest of the old file is read from its ".1" backup
+    before continuing with the new file. A truncated file is read from the
+    start.
+    """
+
+    def __init__(self, path: Path, position: Optional[int] = None, log_filter: Optional[LogFilter] = None):
+        """
+        Args:
+            path: Log file
+            position: Byte offset to start from (default: the current end)
+            log_filter: Filter for returned lines
+        """
+        self.path = Path(path)
+        self.filter = log_filter or LogFilter()
+        self._partial = b""
+        try:
+            stat = os.stat(self.path)
+            self._ino: Optional[int] = stat.st_ino
+            self.position = stat.st_size if position is None else max(0, min(position, stat.st_size))
+        except FileNotFoundError:
+            self._ino = None
+            self.position = 0
+
+    @property
+    def offset(self) -> int:
+        """Offset of the first line not yet returned (to resume from)."""
+        return self.position - len(self._partial)
+
+    def poll(self) -> list[tuple[int, int, str]]:
+        """Lines completed since the last poll, as (offset, end offset, line).
+
+        The end offset is where the next line starts, i.e. where to resume
+        after this line.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+
+        lines = []
+        if self._ino is not None and stat.st_ino != self._ino:
+            # Rotated: finish the old file first
+            rotated = self.path.with_name(self.path.name + ".1")
+            try:
+                rotated_stat = os.stat(rotated)
+                if rotated_stat.st_ino == self._ino:
+                    while self.position < rotated_stat.st_size:
+                        lines += self._read(rotated, rotated_stat.st_size)
+                    if self._partial:
+                        lines += self._emit([self._partial], self.offset)
+            except FileNotFoundError:
+                pass
+            self.position = 0
+            self._partial = b""
+        elif stat.st_size < self.offset:
+            # Truncated (e.g. cleared)
+            self.position = 0
+            self._partial = b""
+        self._ino = stat.st_ino
+
+        if stat.st_size > self.position:
+            lines += self._read(self.path, stat.st_size)
+        return lines
+
+    def _read(self, path: Path, size: int) -> list[tuple[int, int, str]]:
+        with open(path, "rb") as f:
+            f.seek(self.position)
+            data = f.read(min(size - self.position, FOLLOW_MAX_READ))
+        if not data:
+            # Shrunk while reading
+            self.position = size
+            return []
+        start = self.offset
+        self.position += len(data)
+        parts = (self._partial + data).split(b"\n")
+        self._partial = parts.pop()
+        return self._emit(parts, start)
+
+    def _emit(self, parts: list[bytes], offset: int) -> list[tuple[int, int, str]]:
+        lines = []
+        for part in parts:
+            line = _decode(part)
+            end = offset + len(part) + 1
+            if self.filter.feed(line):
+                lines.append((offset, end, line))
+            offset = end
+        return lines
+
 
 class LogConfig:
     """Configuration for logging service."""
@@ -60,6 +273,8 @@ class LoggingService:
         self.config = config
         self._configured = False
         self._handlers: list[logging.Handler] = []
+        # Path -> (inode, bytes counted, newlines) for _count_lines
+        self._line_counts: dict[str, tuple[int, int, int]] = {}
 
     def configure(self) -> None:
         """Configure logging with rotating file handlers."""
@@ -170,62 +385,129 @@ class LoggingService:
         self,
         log_name: str = "assistant",
         lines: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        before: Optional[int] = None,
+        level: Optional[str] = None,
+        pattern: Optional[str] = None,
     ) -> dict:
         """Get content from a log file.
 
+        The file is read backwards from the end (or from before) in blocks,
+        so only the returned lines are decoded and kept.
+
         Args:
             log_name: Name of log file (assistant, error, access)
             lines: Number of lines to return
-            offset: Number of lines from end to skip (for pagination)
+            offset: Number of (matching) lines from end to skip
+            before: Byte offset cursor; return lines before it (from a
+                    previous page's cursor)
+            level: Minimum level of records to return (e.g. "WARNING")
+            pattern: Regex that returned lines must contain
 
         Returns:
-            dict with lines, total_lines, and file info
+            dict with lines, total_lines, file info, cursor (byte offset of
+            the first returned line; pass as before for the previous page),
+            has_more, and end_offset (file size, to follow from)
+
+        Raises:
+            ValueError: Unknown level
+            re.error: Invalid pattern
         """
         log_path = self.config.log_dir / f"{log_name}.log"
+        log_filter = LogFilter(level, pattern)
 
         if not log_path.exists():
             return {
                 "lines": [],
                 "total_lines": 0,
                 "file": str(log_path),
-                "exists": False
+                "exists": False,
+                "cursor": 0,
+                "has_more": False,
+                "end_offset": 0,
             }
 
-        # Read all lines
-        with open(log_path, "r", encoding="utf-8", errors="replace") as f:
-            all_lines = f.readlines()
-
-        total_lines = len(all_lines)
-
-        # Get requested slice from end
-        if offset > 0:
-            end_idx = -offset
-            start_idx = end_idx - lines
-        else:
-            end_idx = None
-            start_idx = -lines
-
-        if start_idx >= 0:
-            start_idx = 0
-
-        if end_idx is not None:
-            selected = all_lines[start_idx:end_idx]
-        else:
-            selected = all_lines[start_idx:]
+        selected: list[tuple[int, str]] = []
+        with open(log_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            end = size if before is None else max(0, min(before, size))
+            cursor = 0
+            skipped = 0
+            if lines > 0:
+                for line_offset, line in log_filter.reverse(_reverse_lines(f, end)):
+                    if skipped < offset:
+                        skipped += 1
+                        continue
+                    selected.append((line_offset, line))
+                    if len(selected) >= lines:
+                        cursor = line_offset
+                        break
+        selected.reverse()
 
         return {
-            "lines": [line.rstrip("\n") for line in selected],
-            "total_lines": total_lines,
+            "lines": [line for _, line in selected],
+            "total_lines": self._count_lines(log_path),
             "file": str(log_path),
-            "exists": True
+            "exists": True,
+            "cursor": cursor,
+            "has_more": cursor > 0,
+            "end_offset": size,
         }
 
-    def tail_log(self, log_name: str = "assistant", lines: int = 50) -> list[str]:
-        """Get last N lines from a log file (like tail -f)."""
-        result = self.get_log_content(log_name, lines=lines)
+    def _count_lines(self, log_path: Path) -> int:
+        """Line count of a log, counting only bytes appended since the last call."""
+        with open(log_path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            cached = self._line_counts.get(str(log_path))
+            start, newlines = 0, 0
+            if cached and cached[0] == stat.st_ino and cached[1] <= stat.st_size:
+                _, start, newlines = cached
+            f.seek(start)
+            remaining = stat.st_size - start
+            while remaining > 0:
+                block = f.read(min(READ_BLOCK_SIZE * 16, remaining))
+                if not block:
+                    break
+                newlines += block.count(b"\n")
+                remaining -= len(block)
+            size = stat.st_size - remaining
+            self._line_counts[str(log_path)] = (stat.st_ino, size, newlines)
+            # A last line without a newline still counts
+            unterminated = False
+            if size:
+                f.seek(size - 1)
+                unterminated = f.read(1) != b"\n"
+        return newlines + unterminated
+
+    def tail_log(
+        self,
+        log_name: str = "assistant",
+        lines: int = 50,
+        level: Optional[str] = None,
+        pattern: Optional[str] = None,
+    ) -> list[str]:
+        """Get last N lines from a log file (like tail)."""
+        result = self.get_log_content(log_name, lines=lines, level=level, pattern=pattern)
         return result["lines"]
 
+    def follow_log(
+        self,
+        log_name: str = "assistant",
+        from_offset: Optional[int] = None,
+        level: Optional[str] = None,
+        pattern: Optional[str] = None,
+    ) -> LogFollower:
+        """Follow a log file (like tail -f); poll() the result for new lines.
+
+        Args:
+            log_name: Name of log file (assistant, error, access)
+            from_offset: Byte offset to start from (default: the current end)
+            level: Minimum level of records to return
+            pattern: Regex that returned lines must contain
+        """
+        log_path = self.config.log_dir / f"{log_name}.log"
+        return LogFollower(log_path, position=from_offset, log_filter=LogFilter(level, pattern))
+
     def clear_log(self, log_name: str, confirm: bool = False) -> dict:
         """Clear a log file.
 
@@ -6,17 +6,27 @@ to external MCP servers and use their tools.
 MCP Protocol: https://spec.modelcontextprotocol.io/
 """
 
+import asyncio
 import json
 import logging
-import subprocess
+import time
 from dataclasses import dataclass, field
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Callable
 from pathlib import Path
 from enum import IntEnum
 import httpx
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for a JSON-RPC response before giving up on a request
+DEFAULT_REQUEST_TIMEOUT = 30.0
+# Largest single JSON-RPC message accepted from a stdio server (bytes)
+STDIO_LINE_LIMIT = 16 * 1024 * 1024
+# How many times a crashed stdio server is respawned before giving up
+MAX_STDIO_RESTARTS = 3
+# A server that stays up this long before exiting gets its restart budget back
+STDIO_HEALTHY_SECONDS = 60.0
+
 
 @dataclass
 class MCPTool:
@@ -48,6 +58,7 @@ class MCPServerConfig:
     url: Optional[str] = None  # For SSE transport
     env: Dict[str, str] = field(default_factory=dict)  # Environment variables
     trust_level: MCPTrustLevel = MCPTrustLevel.TRUSTED  # Default to TRUSTED
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT  # Per-request timeout (seconds)
 
 
 class MCPClient:
@@ -57,15 +68,32 @@ class MCPClient:
     Supports connecting to MCP servers via:
     - stdio transport (launch subprocess, communicate via stdin/stdout)
     - SSE transport (HTTP with Server-Sent Events)
+
+    The stdio transport is multiplexed: a background reader task routes each
+    response to the request with the matching JSON-RPC id, so many requests
+    can be in flight per server. A server that exits is respawned on the
+    next request.
     """
 
     def __init__(self, config: MCPServerConfig):
         self.config = config
-        self.process: Optional[subprocess.Popen] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
         self.http_client: Optional[httpx.AsyncClient] = None
         self.tools: List[MCPTool] = []
         self._request_id = 0
         self._connected = False
+        # stdio transport state
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader_task: Optional[asyncio.Task] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._respawn_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._started_at: Optional[float] = None
+        self._exited_at: Optional[float] = None
+        self.restart_count = 0
+        # Called when a respawned server reports a different tool set
+        self.on_tools_changed: Optional[Callable[[], None]] = None
 
     async def connect(self) -> Dict[str, Any]:
         """Connect to the MCP server and initialize capabilities.
@@ -86,43 +114,10 @@ class MCPClient:
             raise ValueError("stdio transport requires command")
 
         try:
-            # Launch subprocess
-            self.process = subprocess.Popen(
-                self.config.command,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                env={**self.config.env},
-                text=True,
-                bufsize=1
-            )
-
-            # Send initialize request
-            response = await self._send_request_stdio("initialize", {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {
-                    "roots": {"listChanged": True}
-                },
-                "clientInfo": {
-                    "name": "genesis",
-                    "version": "0.1.0"
-                }
-            })
-
-            # Send initialized notification
-            await self._send_notification_stdio("notifications/initialized")
+            response = await self._start_stdio()
 
             # List available tools
-            tools_response = await self._send_request_stdio("tools/list", {})
-            self.tools = [
-                MCPTool(
-                    name=tool["name"],
-                    description=tool.get("description", ""),
-                    input_schema=tool.get("inputSchema", {}),
-                    server_name=self.config.name
-                )
-                for tool in tools_response.get("tools", [])
-            ]
+            self.tools = self._parse_tools(await self._send_request_stdio("tools/list", {}))
 
             self._connected = True
             logger.info(f"MCP stdio client connected to {self.config.name}: {len(self.tools)} tools")
@@ -130,11 +125,146 @@ class MCPClient:
 
         except Exception as e:
             logger.error(f"Failed to connect via stdio: {e}")
-            if self.process:
-                self.process.kill()
-                self.process = None
+            await self._stop_stdio()
             raise
 
+    def _parse_tools(self, tools_response: Dict[str, Any]) -> List[MCPTool]:
+        """Build the tool list from a tools/list result."""
+        return [
+            MCPTool(
+                name=tool["name"],
+                description=tool.get("description", ""),
+                input_schema=tool.get("inputSchema", {}),
+                server_name=self.config.name
+            )
+            for tool in tools_response.get("tools", [])
+        ]
+
+    async def _start_stdio(self) -> Dict[str, Any]:
+        """Launch the server process, start the reader and run the handshake."""
+        self._loop = asyncio.get_running_loop()
+        self._write_lock = asyncio.Lock()
+        self._respawn_lock = self._respawn_lock or asyncio.Lock()
+
+        # Launch subprocess
+        self.process = await asyncio.create_subprocess_exec(
+            *self.config.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env={**self.config.env},
+            limit=STDIO_LINE_LIMIT,
+        )
+        self._started_at = time.monotonic()
+        self._exited_at = None
+        self._reader_task = asyncio.create_task(self._read_stdout(self.process))
+        self._stderr_task = asyncio.create_task(self._drain_stderr(self.process))
+
+        # Send initialize request
+        response = await self._request_stdio("initialize", {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {
+                "roots": {"listChanged": True}
+            },
+            "clientInfo": {
+                "name": "genesis",
+                "version": "0.1.0"
+            }
+        })
+
+        # Send initialized notification
+        await self._send_notification_stdio("notifications/initialized")
+        return response
+
+    async def _stop_stdio(self):
+        """Stop the reader tasks and the server process, failing pending requests."""
+        for task in (self._reader_task, self._stderr_task):
+            if task and not task.done():
+                task.cancel()
+        self._reader_task = None
+        self._stderr_task = None
+
+        process, self.process = self.process, None
+        if process and process.returncode is None:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+
+        self._fail_pending(RuntimeError(f"MCP server '{self.config.name}' disconnected"))
+
+    def _fail_pending(self, error: Exception):
+        """Fail every request still waiting for a response."""
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def _read_stdout(self, process: asyncio.subprocess.Process):
+        """Read JSON-RPC messages and resolve the matching pending requests."""
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"MCP server '{self.config.name}' sent invalid JSON: {line[:200]!r}")
+                    continue
+                await self._dispatch_message(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"MCP reader for '{self.config.name}' failed: {e}")
+
+        # EOF or read error: the server is gone
+        if self.process is process:
+            self._exited_at = time.monotonic()
+            code = await process.wait()
+            logger.warning(f"MCP server '{self.config.name}' exited with code {code}")
+            self._fail_pending(RuntimeError(f"MCP server '{self.config.name}' exited (code {code})"))
+
+    async def _dispatch_message(self, message: Dict[str, Any]):
+        """Route one message from the server."""
+        if "method" in message:
+            # Server-initiated request or notification
+            if "id" in message:
+                if message["method"] == "ping":
+                    reply = {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+                else:
+                    reply = {
+                        "jsonrpc": "2.0",
+                        "id": message["id"],
+                        "error": {"code": -32601, "message": f"Method not found: {message['method']}"}
+                    }
+                await self._write_stdio(reply)
+            else:
+                logger.debug(f"MCP notification from '{self.config.name}': {message['method']}")
+            return
+
+        future = self._pending.pop(message.get("id"), None)
+        if future is None:
+            # Response to a request that already timed out
+            logger.debug(f"Dropping MCP response for unknown id {message.get('id')}")
+            return
+        if future.done():
+            return
+        if "error" in message:
+            future.set_exception(RuntimeError(f"MCP error: {message['error']}"))
+        else:
+            future.set_result(message.get("result", {}))
+
+    async def _drain_stderr(self, process: asyncio.subprocess.Process):
+        """Log server stderr so a chatty server cannot fill the pipe and stall."""
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                return
+            logger.debug(f"MCP server '{self.config.name}' stderr: {line.decode(errors='replace').rstrip()}")
+
     async def _connect_sse(self) -> Dict[str, Any]:
         """Connect via SSE transport (HTTP)."""
         if not self.config.url:
@@ -154,16 +284,7 @@ class MCPClient:
             })
 
             # List available tools
-            tools_response = await self._send_request_sse("tools/list", {})
-            self.tools = [
-                MCPTool(
-                    name=tool["name"],
-                    description=tool.get("description", ""),
-                    input_schema=tool.get("inputSchema", {}),
-                    server_name=self.config.name
-                )
-                for tool in tools_response.get("tools", [])
-            ]
+            self.tools = self._parse_tools(await self._send_request_sse("tools/list", {}))
 
             self._connected = True
             logger.info(f"MCP SSE client connected to {self.config.url}: {len(self.tools)} tools")
@@ -178,19 +299,13 @@ class MCPClient:
 
     async def disconnect(self):
         """Disconnect from the MCP server."""
-        if self.process:
-            self.process.terminate()
-            try:
-                self.process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.process.kill()
-            self.process = None
+        self._connected = False
+        await self._stop_stdio()
 
         if self.http_client:
             await self.http_client.aclose()
             self.http_client = None
 
-        self._connected = False
         logger.info(f"MCP client disconnected from {self.config.name}")
 
     def is_connected(self) -> bool:
@@ -201,12 +316,15 @@ class MCPClient:
         """Get list of tools available from this server."""
         return self.tools
 
-    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    async def call_tool(
+        self, tool_name: str, arguments: Dict[str, Any], timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         """Call a tool on the MCP server.
 
         Args:
             tool_name: Name of the tool to call
             arguments: Arguments to pass to the tool
+            timeout: Seconds to wait for the result (default: config.request_timeout)
 
         Returns:
             Tool execution result
@@ -228,55 +346,130 @@ class MCPClient:
             return await self._send_request_stdio("tools/call", {
                 "name": tool_name,
                 "arguments": arguments
-            })
+            }, timeout=timeout)
         else:
             return await self._send_request_sse("tools/call", {
                 "name": tool_name,
                 "arguments": arguments
             })
 
-    async def _send_request_stdio(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Send JSON-RPC request via stdio."""
-        if not self.process or not self.process.stdin or not self.process.stdout:
+    async def _send_request_stdio(
+        self, method: str, params: Dict[str, Any], timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Send JSON-RPC request via stdio.
+
+        Safe to call from any event loop: calls from a loop other than the
+        one that owns the subprocess are forwarded to the owning loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not None and loop is not self._loop and self._loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(
+                self._send_request_stdio(method, params, timeout), self._loop
+            )
+            return await asyncio.wrap_future(future)
+
+        if self._connected and (self.process is None or self.process.returncode is not None):
+            await self._respawn_stdio()
+
+        return await self._request_stdio(method, params, timeout)
+
+    async def _request_stdio(
+        self, method: str, params: Dict[str, Any], timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Write a request and wait for the response with the same id."""
+        if not self.process or self.process.returncode is not None:
             raise RuntimeError("Process not running")
 
         self._request_id += 1
+        request_id = self._request_id
         request = {
             "jsonrpc": "2.0",
-            "id": self._request_id,
+            "id": request_id,
             "method": method,
             "params": params
         }
 
-        # Send request
-        self.process.stdin.write(json.dumps(request) + "\n")
-        self.process.stdin.flush()
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._write_stdio(request)
+            return await asyncio.wait_for(
+                future, timeout=timeout if timeout is not None else self.config.request_timeout
+            )
+        except asyncio.TimeoutError:
+            await self._cancel_request(request_id, "timeout")
+            raise TimeoutError(
+                f"MCP request '{method}' to '{self.config.name}' timed out"
+            ) from None
+        except asyncio.CancelledError:
+            await asyncio.shield(self._cancel_request(request_id, "cancelled"))
+            raise
+        finally:
+            self._pending.pop(request_id, None)
 
-        # Read response
-        response_line = self.process.stdout.readline()
-        if not response_line:
-            raise RuntimeError("No response from MCP server")
+    async def _cancel_request(self, request_id: int, reason: str):
+        """Tell the server a request was abandoned (best effort)."""
+        self._pending.pop(request_id, None)
+        try:
+            await self._send_notification_stdio(
+                "notifications/cancelled", {"requestId": request_id, "reason": reason}
+            )
+        except Exception:
+            pass
 
-        response = json.loads(response_line)
+    async def _respawn_stdio(self):
+        """Restart a stdio server that exited while connected.
 
-        if "error" in response:
-            raise RuntimeError(f"MCP error: {response['error']}")
+        Only crashes in quick succession count toward MAX_STDIO_RESTARTS: a
+        server that ran for STDIO_HEALTHY_SECONDS starts a fresh budget. The
+        tool list is fetched again, since the new process may offer
+        different tools.
+        """
+        async with self._respawn_lock:
+            if self.process is not None and self.process.returncode is None:
+                return  # Another request already respawned it
+            if self._started_at is not None:
+                uptime = (self._exited_at or time.monotonic()) - self._started_at
+                if uptime >= STDIO_HEALTHY_SECONDS:
+                    self.restart_count = 0
+            if self.restart_count >= MAX_STDIO_RESTARTS:
+                self._connected = False
+                raise RuntimeError(
+                    f"MCP server '{self.config.name}' crashed {self.restart_count} times; giving up"
+                )
+            self.restart_count += 1
+            logger.warning(
+                f"Respawning MCP server '{self.config.name}' "
+                f"(restart {self.restart_count}/{MAX_STDIO_RESTARTS})"
+            )
+            await self._stop_stdio()
+            await self._start_stdio()
+
+            tools = self._parse_tools(await self._request_stdio("tools/list", {}))
+            if tools != self.tools:
+                logger.info(f"MCP server '{self.config.name}' now offers {len(tools)} tools")
+                self.tools = tools
+                if self.on_tools_changed is not None:
+                    self.on_tools_changed()
+
+    async def _write_stdio(self, message: Dict[str, Any]):
+        """Write one JSON-RPC message line to the server."""
+        if not self.process or not self.process.stdin:
+            raise RuntimeError("Process not running")
 
-        return response.get("result", {})
+        async with self._write_lock:
+            self.process.stdin.write((json.dumps(message) + "\n").encode())
+            await self.process.stdin.drain()
 
     async def _send_notification_stdio(self, method: str, params: Optional[Dict[str, Any]] = None):
         """Send JSON-RPC notification via stdio (no response expected)."""
-        if not self.process or not self.process.stdin:
-            raise RuntimeError("Process not running")
-
         notification = {
             "jsonrpc": "2.0",
             "method": method,
             "params": params or {}
         }
 
-        self.process.stdin.write(json.dumps(notification) + "\n")
-        self.process.stdin.flush()
+        await self._write_stdio(notification)
 
     async def _send_request_sse(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Send JSON-RPC request via SSE/HTTP."""
@@ -318,6 +511,8 @@ class MCPClientManager:
         self.db_path = db_path
         self.clients: Dict[str, MCPClient] = {}
         self._configs: List[MCPServerConfig] = []
+        # Called when a connected server's tool set changes (e.g. after a respawn)
+        self.on_tools_changed: Optional[Callable[[], None]] = None
 
     async def load_configs_from_settings(self):
         """Load MCP server configurations from settings database."""
@@ -342,7 +537,8 @@ class MCPClientManager:
                     command=s.get("command"),
                     url=s.get("url"),
                     env=s.get("env", {}),
-                    trust_level=MCPTrustLevel(s.get("trust_level", MCPTrustLevel.TRUSTED))
+                    trust_level=MCPTrustLevel(s.get("trust_level", MCPTrustLevel.TRUSTED)),
+                    request_timeout=float(s.get("request_timeout", DEFAULT_REQUEST_TIMEOUT))
                 )
                 for s in servers
             ]
@@ -372,6 +568,7 @@ class MCPClientManager:
                 del self.clients[name]
 
         client = MCPClient(config)
+        client.on_tools_changed = self._tools_changed
         server_info = await client.connect()
         self.clients[name] = client
 
@@ -399,6 +596,10 @@ class MCPClientManager:
             except Exception as e:
                 logger.error(f"Failed to disconnect from '{name}': {e}")
 
+    def _tools_changed(self):
+        if self.on_tools_changed is not None:
+            self.on_tools_changed()
+
     def get_all_tools(self) -> List[MCPTool]:
         """Get list of all tools from all connected MCP servers."""
         tools = []
@@ -407,12 +608,17 @@ class MCPClientManager:
                 tools.extend(client.list_tools())
         return tools
 
-    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    async def call_tool(
+        self, tool_name: str, arguments: Dict[str, Any], timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         """Call a tool on the appropriate MCP server.
 
+        Calls may be issued concurrently, including several to one server.
+
         Args:
             tool_name: Name of the tool (may include server prefix like "server:tool")
             arguments: Arguments to pass to the tool
+            timeout: Seconds to wait for the result (default: server's request_timeout)
 
         Returns:
             Tool execution result
@@ -422,7 +628,7 @@ class MCPClientManager:
             if client.is_connected():
                 for tool in client.tools:
                     if tool.name == tool_name:
-                        return await client.call_tool(tool_name, arguments)
+                        return await client.call_tool(tool_name, arguments, timeout=timeout)
 
         raise ValueError(f"MCP tool '{tool_name}' not found")
 
@@ -7,7 +7,7 @@ MCP Protocol: https://spec.modelcontextprotocol.io/
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from server.services.tools import registry as tool_registry
@@ -159,8 +159,43 @@ class MCPServer:
 
         return {"tools": tools}
 
-    def _handle_tools_call(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle tools/call method - execute a Genesis tool."""
+    async def handle_request_async(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle a JSON-RPC 2.0 request from async code.
+
+        Same as handle_request, but tools/call awaits the tool instead of
+        blocking the event loop, so async (e.g. MCP-bridged) tools work.
+
+        Args:
+            request_data: JSON-RPC request object
+
+        Returns:
+            JSON-RPC response object
+        """
+        request_id = request_data.get("id")
+        if (
+            request_data.get("jsonrpc") != "2.0"
+            or request_id is None
+            or request_data.get("method") != "tools/call"
+        ):
+            return self.handle_request(request_data)
+
+        try:
+            result = await self._handle_tools_call_async(request_data.get("params", {}))
+            return {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "result": result
+            }
+        except Exception as e:
+            logger.error(f"Error handling MCP request tools/call: {e}")
+            return self._error_response(
+                request_id,
+                -32603,
+                f"Internal error: {str(e)}"
+            )
+
+    def _parse_tools_call(self, params: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Extract and validate the tool name and arguments of a tools/call."""
         tool_name = params.get("name")
         arguments = params.get("arguments", {})
 
@@ -168,10 +203,30 @@ class MCPServer:
             raise ValueError("Tool name is required")
 
         logger.info(f"MCP tool call: {tool_name} with {arguments}")
+        return tool_name, arguments
+
+    def _handle_tools_call(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle tools/call method - execute a Genesis tool.
+
+        Sync path for callers without an event loop; async (e.g.
+        MCP-bridged) tools fail here when a loop is running, so async code
+        goes through handle_request_async instead.
+        """
+        tool_name, arguments = self._parse_tools_call(params)
 
         # Execute the tool via Genesis tool registry
         result = tool_registry.execute(tool_name, **arguments)
+        return self._format_tool_result(result)
+
+    async def _handle_tools_call_async(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle tools/call method without blocking the event loop."""
+        tool_name, arguments = self._parse_tools_call(params)
+
+        result = await tool_registry.execute_async(tool_name, **arguments)
+        return self._format_tool_result(result)
 
+    def _format_tool_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a tool registry result into MCP tools/call content."""
         if result["success"]:
             return {
                 "content": [
@@ -235,7 +290,7 @@ async def handle_mcp_message(request: Request) -> JSONResponse:
     try:
         request_data = await request.json()
         server = get_mcp_server()
-        response_data = server.handle_request(request_data)
+        response_data = await server.handle_request_async(request_data)
 
         if not response_data:
             # Notification, no response
@@ -1,9 +1,10 @@
 """Memory service for conversation persistence using SQLite.
 
-Uses a connection pool with WAL mode for concurrency safety.
+Uses the shared WAL connection pool from server/services/storage.py.
 """
 import aiosqlite
 import asyncio
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Tuple, Callable, TypeVar, Any
@@ -12,8 +13,11 @@ import threading
 import random
 import logging
 import functools
+import re
 
 import config
+from server.services.migrations import Migration, apply_migrations
+from server.services.storage import PooledConnection, get_pool
 
 logger = logging.getLogger(__name__)
 
@@ -23,12 +27,109 @@ T = TypeVar('T')
 # Single infinite conversation - all messages go to this conversation
 DEFAULT_CONVERSATION_ID = "main"
 
-# Connection pool settings
-_DB_BUSY_TIMEOUT_MS = 5000  # 5 seconds - shorter timeout, rely on retries
-_DB_POOL_SIZE = 10  # Number of connections in pool (increased for concurrent writes)
+# Message pages for scrolling through long conversations
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Retry settings for transient lock errors
 _DB_MAX_RETRIES = 5  # Number of retries for database operations
 _DB_RETRY_BASE_DELAY = 0.05  # Base delay for exponential backoff (50ms)
 
+# Schema history for conversations.db (see server/services/migrations.py)
+_SCHEMA_MIGRATIONS = (
+    Migration(1, "initial schema", (
+        """CREATE TABLE IF NOT EXISTS conversations (
+            id TEXT PRIMARY KEY,
+            title TEXT,
+            created_at TIMESTAMP,
+            updated_at TIMESTAMP
+        )""",
+        """CREATE TABLE IF NOT EXISTS messages (
+            id TEXT PRIMARY KEY,
+            conversation_id TEXT,
+            role TEXT,
+            content TEXT,
+            created_at TIMESTAMP,
+            FOREIGN KEY (conversation_id) REFERENCES conversations(id)
+        )""",
+        """CREATE TABLE IF NOT EXISTS files (
+            id TEXT PRIMARY KEY,
+            original_filename TEXT,
+            stored_filename TEXT,
+            content_type TEXT,
+            size INTEGER,
+            conversation_id TEXT,
+            uploaded_at TIMESTAMP,
+            FOREIGN KEY (conversation_id) REFERENCES conversations(id)
+        )""",
+        # Summaries of old message batches
+        """CREATE TABLE IF NOT EXISTS message_summaries (
+            id TEXT PRIMARY KEY,
+            conversation_id TEXT,
+            start_message_id TEXT,
+            end_message_id TEXT,
+            message_count INTEGER,
+            summary TEXT,
+            created_at TIMESTAMP,
+            FOREIGN KEY (conversation_id) REFERENCES conversations(id)
+        )""",
+        # High-water mark of the last message folded into a sealed summary
+        """CREATE TABLE IF NOT EXISTS summary_cursors (
+            conversation_id TEXT PRIMARY KEY,
+            last_message_id TEXT,
+            last_created_at TIMESTAMP,
+            summarized_count INTEGER,
+            updated_at TIMESTAMP
+        )""",
+    )),
+    Migration(2, "conversation/time indexes", (
+        """CREATE INDEX IF NOT EXISTS idx_messages_conversation_created
+           ON messages (conversation_id, created_at, id)""",
+        # Serves the last-user-message preview in list_conversations
+        """CREATE INDEX IF NOT EXISTS idx_messages_conversation_role_created
+           ON messages (conversation_id, role, created_at)""",
+        """CREATE INDEX IF NOT EXISTS idx_files_conversation_uploaded
+           ON files (conversation_id, uploaded_at)""",
+        """CREATE INDEX IF NOT EXISTS idx_files_uploaded
+           ON files (uploaded_at)""",
+        """CREATE INDEX IF NOT EXISTS idx_summaries_conversation_created
+           ON message_summaries (conversation_id, created_at)""",
+        """CREATE INDEX IF NOT EXISTS idx_conversations_updated
+           ON conversations (updated_at)""",
+    )),
+    # Full-text index over message content, kept in sync by triggers like
+    # facts_fts in memory_extractor.py. External content keyed on the
+    # messages rowid, so the text itself is not stored twice.
+    Migration(3, "messages_fts full-text index", (
+        """CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+            content,
+            content='messages',
+            content_rowid='rowid',
+            prefix='2 3'
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+            INSERT INTO messages_fts(rowid, content) VALUES (new.rowid, new.content);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+            INSERT INTO messages_fts(messages_fts, rowid, content)
+            VALUES ('delete', old.rowid, old.content);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE OF content ON messages BEGIN
+            INSERT INTO messages_fts(messages_fts, rowid, content)
+            VALUES ('delete', old.rowid, old.content);
+            INSERT INTO messages_fts(rowid, content) VALUES (new.rowid, new.content);
+        END""",
+        # Backfill rows written before the index existed
+        "INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')",
+    )),
+)
+
+# Message search settings
+_SEARCH_WORD_RE = re.compile(r"\w+")
+_SNIPPET_TOKENS = 20  # Tokens of context returned by snippet()
+_HIGHLIGHT_OPEN = "**"  # Markdown bold, rendered by the UI's markdown pipeline
+_HIGHLIGHT_CLOSE = "**"
+
 
 def with_db_retry(max_retries: int = _DB_MAX_RETRIES, base_delay: float = _DB_RETRY_BASE_DELAY):
     """Decorator to retry database operations on lock errors.
@@ -76,123 +177,34 @@ def with_db_retry(max_retries: int = _DB_MAX_RETRIES, base_delay: float = _DB_RE
     return decorator
 
 
-class ConnectionPool:
-    """Simple async connection pool for aiosqlite with WAL mode."""
-
-    def __init__(self, db_path: Path, pool_size: int = _DB_POOL_SIZE):
-        self.db_path = db_path
-        self.pool_size = pool_size
-        self._pool: Optional[asyncio.Queue] = None
-        self._initialized = False
-        self._lock: Optional[asyncio.Lock] = None
-        self._init_lock = threading.Lock()  # Thread-safe lock for initialization
-        self._loop = None  # Track which event loop we're bound to
-
-    async def initialize(self):
-        """Initialize the connection pool."""
-        # Check if we're on a different event loop than we were initialized with
-        current_loop = asyncio.get_running_loop()
-        if self._loop is not None and self._loop != current_loop:
-            # We've switched event loops, need to reinitialize
-            await self.close()
-
-        if self._initialized:
-            return
-
-        # Create asyncio primitives lazily to avoid event loop attachment issues
-        # Use thread lock to prevent race condition in creating async lock
-        with self._init_lock:
-            if self._lock is None:
-                self._loop = current_loop
-                self._lock = asyncio.Lock()
-
-        async with self._lock:
-            if self._initialized:
-                return
-
-            # Create pool queue lazily
-            if self._pool is None:
-                self._pool = asyncio.Queue(maxsize=self.pool_size)
-
-            # Create pool of connections
-            for _ in range(self.pool_size):
-                conn = await aiosqlite.connect(
-                    self.db_path,
-                    timeout=_DB_BUSY_TIMEOUT_MS / 1000  # Convert to seconds
-                )
-                # Enable WAL mode for better concurrency
-                await conn.execute("PRAGMA journal_mode=WAL")
-                # Set busy timeout
-                await conn.execute(f"PRAGMA busy_timeout={_DB_BUSY_TIMEOUT_MS}")
-                # Optimize synchronous mode for WAL
-                await conn.execute("PRAGMA synchronous=NORMAL")
-                await self._pool.put(conn)
-
-            self._initialized = True
-
-    async def acquire(self) -> aiosqlite.Connection:
-        """Get a connection from the pool."""
-        await self.initialize()
-        if self._pool is None:
-            raise RuntimeError("Connection pool not initialized")
-        return await self._pool.get()
-
-    async def release(self, conn: aiosqlite.Connection):
-        """Return a connection to the pool."""
-        if self._pool is None:
-            raise RuntimeError("Connection pool not initialized")
-        await self._pool.put(conn)
-
-    async def close(self):
-        """Close all connections in the pool."""
-        if self._pool is not None:
-            while not self._pool.empty():
-                try:
-                    conn = self._pool.get_nowait()
-                    await conn.close()
-                except asyncio.QueueEmpty:
-                    break
-        self._initialized = False
-        self._pool = None
-        self._lock = None
-
-
-class PooledConnection:
-    """Context manager for pooled database connections."""
-
-    def __init__(self, pool: ConnectionPool):
-        self.pool = pool
-        self.conn: Optional[aiosqlite.Connection] = None
-
-    async def __aenter__(self) -> aiosqlite.Connection:
-        self.conn = await self.pool.acquire()
-        return self.conn
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.conn:
-            await self.pool.release(self.conn)
-            self.conn = None
-
-
 class MemoryService:
     """Service for managing conversation memory in SQLite.
 
-    Uses a connection pool with WAL mode for safe concurrent access.
+    Uses the shared connection pool (see server/services/storage.py).
     """
 
     def __init__(self, db_path: Path):
         self.db_path = db_path
-        self._pool = ConnectionPool(db_path)
+        self._pool = get_pool(db_path)
         self._tables_created = False
         self._tables_lock: Optional[asyncio.Lock] = None
         self._tables_init_lock = threading.Lock()
+        # Per-conversation context state: summary cursor plus the assembled
+        # summary block, kept until a new batch is sealed
+        self._context_cache: dict[str, "_ContextState"] = {}
+        self._context_lock: Optional[asyncio.Lock] = None
+        self._context_lock_loop = None
 
     def _get_connection(self) -> PooledConnection:
-        """Get a pooled connection context manager."""
-        return PooledConnection(self._pool)
+        """Get the pooled writer connection context manager."""
+        return self._pool.writer()
+
+    def _get_read_connection(self) -> PooledConnection:
+        """Get a pooled read-only connection context manager."""
+        return self._pool.reader()
 
     async def _ensure_initialized(self):
-        """Ensure database tables exist."""
+        """Ensure the database schema is migrated to the latest version."""
         if self._tables_created:
             return
 
@@ -206,50 +218,7 @@ class MemoryService:
                 return
 
             async with self._get_connection() as db:
-                await db.execute("""
-                    CREATE TABLE IF NOT EXISTS conversations (
-                        id TEXT PRIMARY KEY,
-                        title TEXT,
-                        created_at TIMESTAMP,
-                        updated_at TIMESTAMP
-                    )
-                """)
-                await db.execute("""
-                    CREATE TABLE IF NOT EXISTS messages (
-                        id TEXT PRIMARY KEY,
-                        conversation_id TEXT,
-                        role TEXT,
-                        content TEXT,
-                        created_at TIMESTAMP,
-                        FOREIGN KEY (conversation_id) REFERENCES conversations(id)
-                    )
-                """)
-                await db.execute("""
-                    CREATE TABLE IF NOT EXISTS files (
-                        id TEXT PRIMARY KEY,
-                        original_filename TEXT,
-                        stored_filename TEXT,
-                        content_type TEXT,
-                        size INTEGER,
-                        conversation_id TEXT,
-                        uploaded_at TIMESTAMP,
-                        FOREIGN KEY (conversation_id) REFERENCES conversations(id)
-                    )
-                """)
-                # Table for storing summaries of old message batches
-                await db.execute("""
-                    CREATE TABLE IF NOT EXISTS message_summaries (
-                        id TEXT PRIMARY KEY,
-                        conversation_id TEXT,
-                        start_message_id TEXT,
-                        end_message_id TEXT,
-                        message_count INTEGER,
-                        summary TEXT,
-                        created_at TIMESTAMP,
-                        FOREIGN KEY (conversation_id) REFERENCES conversations(id)
-                    )
-                """)
-                await db.commit()
+                await apply_migrations(db, _SCHEMA_MIGRATIONS)
             self._tables_created = True
 
     @with_db_retry()
@@ -288,7 +257,7 @@ class MemoryService:
         """Check if a conversation exists."""
         await self._ensure_initialized()
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 "SELECT 1 FROM conversations WHERE id = ?",
                 (conversation_id,)
@@ -338,12 +307,14 @@ class MemoryService:
 
         async with self._get_connection() as db:
             cursor = await db.execute(
-                "SELECT id FROM messages WHERE conversation_id = ? ORDER BY created_at DESC LIMIT 1",
+                "SELECT id, created_at FROM messages WHERE conversation_id = ? "
+                "ORDER BY created_at DESC, id DESC LIMIT 1",
                 (conversation_id,)
             )
             row = await cursor.fetchone()
             if row:
                 await db.execute("DELETE FROM messages WHERE id = ?", (row[0],))
+                await self._forget_message(db, conversation_id, row[0], row[1])
                 await db.commit()
 
     async def get_conversation_messages(self, conversation_id: str) -> list[dict]:
@@ -354,7 +325,7 @@ class MemoryService:
             {"role": "system", "content": "You are a helpful AI assistant. Be concise and helpful."}
         ]
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 "SELECT role, content FROM messages WHERE conversation_id = ? ORDER BY created_at",
                 (conversation_id,)
@@ -384,7 +355,7 @@ class MemoryService:
             {"role": "system", "content": "You are a helpful AI assistant. Be concise and helpful."}
         ]
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             if limit:
                 cursor = await db.execute(
                     """SELECT role, content FROM messages
@@ -413,6 +384,76 @@ class MemoryService:
         await self._ensure_default_conversation()
         await self.remove_last_message(DEFAULT_CONVERSATION_ID)
 
+    def _get_context_lock(self) -> asyncio.Lock:
+        """Get the lock serializing context assembly on the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._context_lock is None or self._context_lock_loop is not loop:
+            self._context_lock = asyncio.Lock()
+            self._context_lock_loop = loop
+        return self._context_lock
+
+    async def _load_context_state(self, conversation_id: str) -> "_ContextState":
+        """Load the summary cursor and sealed summaries for a conversation.
+
+        The result is cached in memory; the database is only consulted again
+        after the cache entry is dropped by a destructive operation.
+        """
+        state = self._context_cache.get(conversation_id)
+        if state is not None:
+            return state
+
+        state = _ContextState()
+        async with self._get_connection() as db:
+            cursor = await db.execute(
+                """SELECT last_created_at, last_message_id, summarized_count
+                   FROM summary_cursors WHERE conversation_id = ?""",
+                (conversation_id,)
+            )
+            row = await cursor.fetchone()
+
+            if row is None:
+                # Summaries written before cursors existed: derive the
+                # high-water mark from the newest summarized message (one-off)
+                cursor = await db.execute(
+                    """SELECT m.created_at, m.id FROM message_summaries s
+                       JOIN messages m ON m.id = s.end_message_id
+                       WHERE s.conversation_id = ?
+                       ORDER BY m.created_at DESC, m.id DESC LIMIT 1""",
+                    (conversation_id,)
+                )
+                legacy = await cursor.fetchone()
+                if legacy:
+                    cursor = await db.execute(
+                        """SELECT COUNT(*) FROM messages
+                           WHERE conversation_id = ? AND (created_at, id) <= (?, ?)""",
+                        (conversation_id, legacy[0], legacy[1])
+                    )
+                    count_row = await cursor.fetchone()
+                    row = (legacy[0], legacy[1], count_row[0] if count_row else 0)
+                    await db.execute(
+                        """INSERT OR REPLACE INTO summary_cursors
+                           (conversation_id, last_message_id, last_created_at,
+                            summarized_count, updated_at)
+                           VALUES (?, ?, ?, ?, ?)""",
+                        (conversation_id, row[1], row[0], row[2], datetime.now().isoformat())
+                    )
+                    await db.commit()
+
+            if row is not None:
+                state.last_created_at, state.last_message_id, state.summarized_count = row
+
+            cursor = await db.execute(
+                """SELECT summary FROM message_summaries
+                   WHERE conversation_id = ?
+                   ORDER BY created_at""",
+                (conversation_id,)
+            )
+            for (summary,) in await cursor.fetchall():
+                state.add_summary(summary)
+
+        self._context_cache[conversation_id] = state
+        return state
+
     async def get_context_for_api(self) -> Tuple[list[dict], dict]:
         """Get messages optimized for LLM context window.
 
@@ -421,6 +462,12 @@ class MemoryService:
         2. Summarizes older messages to save context space
         3. Original messages are always preserved in DB
 
+        Work per call is independent of conversation length: a persisted
+        cursor marks the last message folded into a sealed summary, so only
+        the recent window and the unsummarized rows after the cursor are
+        read. Full batches of MESSAGES_PER_SUMMARY_BATCH messages are sealed
+        and stored; a trailing partial batch is summarized on the fly.
+
         Returns:
             Tuple of (messages_list, metadata) where:
             - messages_list: Messages in OpenAI format with system prompt
@@ -429,27 +476,76 @@ class MemoryService:
         await self._ensure_initialized()
         await self._ensure_default_conversation()
 
-        # Get total message count
-        async with self._get_connection() as db:
-            cursor = await db.execute(
-                "SELECT COUNT(*) FROM messages WHERE conversation_id = ?",
-                (DEFAULT_CONVERSATION_ID,)
+        async with self._get_context_lock():
+            state = await self._load_context_state(DEFAULT_CONVERSATION_ID)
+
+            async with self._get_read_connection() as db:
+                # Recent window, newest first (index range scan)
+                cursor = await db.execute(
+                    """SELECT id, role, content, created_at FROM messages
+                       WHERE conversation_id = ?
+                       ORDER BY created_at DESC, id DESC LIMIT ?""",
+                    (DEFAULT_CONVERSATION_ID, config.RECENT_MESSAGES_VERBATIM)
+                )
+                recent_messages = list(reversed(await cursor.fetchall()))
+
+                # Unsummarized messages between the cursor and the recent window
+                unsummarized = []
+                if recent_messages:
+                    window_start = (recent_messages[0][3], recent_messages[0][0])
+                    cursor = await db.execute(
+                        """SELECT id, role, content, created_at FROM messages
+                           WHERE conversation_id = ?
+                             AND (created_at, id) > (?, ?)
+                             AND (created_at, id) < (?, ?)
+                           ORDER BY created_at, id""",
+                        (DEFAULT_CONVERSATION_ID,
+                         state.last_created_at or "", state.last_message_id or "",
+                         window_start[0], window_start[1])
+                    )
+                    unsummarized = await cursor.fetchall()
+
+            recent_unsummarized = sum(
+                1 for msg_id, _, _, created_at in recent_messages
+                if not state.covers(created_at, msg_id)
             )
-            row = await cursor.fetchone()
-            total_messages = row[0] if row else 0
-
-        # If few messages, return all verbatim
-        if total_messages <= config.RECENT_MESSAGES_VERBATIM:
-            messages = await self.get_messages()
-            return messages, {
-                "total_messages": total_messages,
-                "summarized_count": 0,
-                "verbatim_count": total_messages,
-                "summaries_used": 0
-            }
+            total_messages = state.summarized_count + len(unsummarized) + recent_unsummarized
+
+            # If few messages, return all verbatim
+            if total_messages <= config.RECENT_MESSAGES_VERBATIM:
+                messages = [
+                    {"role": "system", "content": "You are a helpful AI assistant. Be concise and helpful."}
+                ]
+                for _, role, content, _ in recent_messages:
+                    messages.append({"role": role, "content": content})
+                return messages, {
+                    "total_messages": total_messages,
+                    "summarized_count": 0,
+                    "verbatim_count": total_messages,
+                    "summaries_used": 0
+                }
+
+            # Seal every complete batch of old messages and advance the cursor
+            batch_size = max(config.MESSAGES_PER_SUMMARY_BATCH, 1)
+            sealed_through = len(unsummarized) - len(unsummarized) % batch_size
+            for i in range(0, sealed_through, batch_size):
+                batch = unsummarized[i:i + batch_size]
+                summary = _create_text_summary(batch, config.MAX_SUMMARY_LENGTH)
+                await self._store_summary(state, batch, summary)
+
+            summary_block = state.summary_block
+            summaries_used = state.summary_count
+
+            # Remaining partial batch is summarized but not stored until full
+            pending = unsummarized[sealed_through:]
+            if pending:
+                pending_summary = _create_text_summary(pending, config.MAX_SUMMARY_LENGTH)
+                summary_block = (
+                    f"{summary_block}\n---\n{pending_summary}" if summary_block else pending_summary
+                )
+                summaries_used += 1
 
-        # Need to summarize older messages
-        verbatim_count = config.RECENT_MESSAGES_VERBATIM
+        verbatim_count = len(recent_messages)
         messages_to_summarize = total_messages - verbatim_count
 
         # Start with system prompt
@@ -457,70 +553,11 @@ class MemoryService:
             {"role": "system", "content": "You are a helpful AI assistant. Be concise and helpful."}
         ]
 
-        # Get or create summaries for older messages
-        async with self._get_connection() as db:
-            # Get all messages ordered by time
-            cursor = await db.execute(
-                """SELECT id, role, content, created_at FROM messages
-                   WHERE conversation_id = ?
-                   ORDER BY created_at""",
-                (DEFAULT_CONVERSATION_ID,)
-            )
-            all_messages = await cursor.fetchall()
-
-            # Split into old (to summarize) and recent (verbatim)
-            old_messages = all_messages[:messages_to_summarize]
-            recent_messages = all_messages[messages_to_summarize:]
-
-            # Check for existing summaries
-            cursor = await db.execute(
-                """SELECT start_message_id, end_message_id, summary
-                   FROM message_summaries
-                   WHERE conversation_id = ?
-                   ORDER BY created_at""",
-                (DEFAULT_CONVERSATION_ID,)
-            )
-            existing_summaries = await cursor.fetchall()
-
-        # Determine which messages need new summaries
-        summarized_message_ids = set()
-        summaries_to_add = []
-
-        for start_id, end_id, summary in existing_summaries:
-            # Find range of summarized messages
-            in_range = False
-            for msg_id, _, _, _ in old_messages:
-                if msg_id == start_id:
-                    in_range = True
-                if in_range:
-                    summarized_message_ids.add(msg_id)
-                if msg_id == end_id:
-                    break
-            summaries_to_add.append(summary)
-
-        # Create summaries for unsummarized old messages
-        unsummarized = [(m[0], m[1], m[2], m[3]) for m in old_messages if m[0] not in summarized_message_ids]
-
-        if unsummarized:
-            # Group into batches and create summaries
-            batch_size = config.MESSAGES_PER_SUMMARY_BATCH
-            for i in range(0, len(unsummarized), batch_size):
-                batch = unsummarized[i:i + batch_size]
-                if batch:
-                    summary = _create_text_summary(batch, config.MAX_SUMMARY_LENGTH)
-                    summaries_to_add.append(summary)
-
-                    # Store the summary with retry logic
-                    await self._store_summary(
-                        batch[0][0], batch[-1][0], len(batch), summary
-                    )
-
         # Add summaries as context
-        if summaries_to_add:
-            combined_summary = "\n---\n".join(summaries_to_add)
+        if summary_block:
             messages.append({
                 "role": "system",
-                "content": f"[Previous conversation summary ({messages_to_summarize} messages):\n{combined_summary}]"
+                "content": f"[Previous conversation summary ({messages_to_summarize} messages):\n{summary_block}]"
             })
 
         # Add recent messages verbatim
@@ -531,19 +568,25 @@ class MemoryService:
             "total_messages": total_messages,
             "summarized_count": messages_to_summarize,
             "verbatim_count": verbatim_count,
-            "summaries_used": len(summaries_to_add)
+            "summaries_used": summaries_used
         }
 
     @with_db_retry()
-    async def _store_summary(
-        self, start_msg_id: str, end_msg_id: str, msg_count: int, summary: str
-    ):
-        """Store a message summary with retry logic.
+    async def _store_summary(self, state: "_ContextState", batch: list, summary: str):
+        """Store a sealed summary batch and advance the summary cursor.
 
-        Helper method for get_context_for_api() to handle database writes
-        with automatic retries on lock errors.
+        Helper method for get_context_for_api(). The summary row and the
+        cursor are written in one transaction so they never disagree.
+
+        Args:
+            state: Cached context state, updated after the commit
+            batch: List of (id, role, content, created_at) tuples
+            summary: Summary text for the batch
         """
         summary_id = f"sum_{uuid.uuid4().hex[:12]}"
+        last_id, _, _, last_created_at = batch[-1]
+        summarized_count = state.summarized_count + len(batch)
+        now = datetime.now().isoformat()
         async with self._get_connection() as db:
             await db.execute(
                 """INSERT INTO message_summaries
@@ -551,11 +594,38 @@ class MemoryService:
                     message_count, summary, created_at)
                    VALUES (?, ?, ?, ?, ?, ?, ?)""",
                 (summary_id, DEFAULT_CONVERSATION_ID,
-                 start_msg_id, end_msg_id,
-                 msg_count, summary, datetime.now().isoformat())
+                 batch[0][0], last_id,
+                 len(batch), summary, now)
+            )
+            await db.execute(
+                """INSERT OR REPLACE INTO summary_cursors
+                   (conversation_id, last_message_id, last_created_at,
+                    summarized_count, updated_at)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (DEFAULT_CONVERSATION_ID, last_id, last_created_at, summarized_count, now)
             )
             await db.commit()
 
+        state.last_created_at = last_created_at
+        state.last_message_id = last_id
+        state.summarized_count = summarized_count
+        state.add_summary(summary)
+
+    async def _forget_message(
+        self, db: aiosqlite.Connection, conversation_id: str, message_id: str, created_at: str
+    ):
+        """Keep the summary cursor's count in step with a deleted message.
+
+        Must be called on the connection performing the delete, before commit.
+        """
+        await db.execute(
+            """UPDATE summary_cursors SET summarized_count = summarized_count - 1
+               WHERE conversation_id = ?
+                 AND (last_created_at, last_message_id) >= (?, ?)""",
+            (conversation_id, created_at, message_id)
+        )
+        self._context_cache.pop(conversation_id, None)
+
     async def get_summaries(self) -> list[dict]:
         """Get all stored summaries for the conversation.
 
@@ -564,7 +634,7 @@ class MemoryService:
         """
         await self._ensure_initialized()
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 """SELECT id, start_message_id, end_message_id, message_count, summary, created_at
                    FROM message_summaries
@@ -594,7 +664,12 @@ class MemoryService:
                 "DELETE FROM message_summaries WHERE conversation_id = ?",
                 (DEFAULT_CONVERSATION_ID,)
             )
+            await db.execute(
+                "DELETE FROM summary_cursors WHERE conversation_id = ?",
+                (DEFAULT_CONVERSATION_ID,)
+            )
             await db.commit()
+        self._context_cache.pop(DEFAULT_CONVERSATION_ID, None)
 
     async def list_conversations(self) -> list[dict]:
         """List all conversations with metadata, sorted by most recently active.
@@ -603,7 +678,7 @@ class MemoryService:
         """
         await self._ensure_initialized()
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 """SELECT c.id, c.title, c.created_at, c.updated_at,
                           COUNT(m.id) as message_count,
@@ -626,11 +701,18 @@ class MemoryService:
                 for row in rows
             ]
 
-    async def get_conversation(self, conversation_id: str) -> Optional[dict]:
-        """Get a conversation with all its messages."""
+    async def get_conversation(self, conversation_id: str, limit: Optional[int] = None) -> Optional[dict]:
+        """Get a conversation with its messages.
+
+        Args:
+            conversation_id: The conversation to retrieve
+            limit: Only include the most recent `limit` messages; the rest
+                can be fetched with get_messages_page(before=...). All
+                messages are included when None.
+        """
         await self._ensure_initialized()
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 "SELECT id, title, created_at, updated_at FROM conversations WHERE id = ?",
                 (conversation_id,)
@@ -647,6 +729,12 @@ class MemoryService:
                 "messages": []
             }
 
+            if limit is not None:
+                page = await self._fetch_page(db, conversation_id, None, None, limit)
+                conversation["messages"] = page["messages"]
+                conversation["has_more_before"] = page["has_more_before"]
+                return conversation
+
             cursor = await db.execute(
                 "SELECT id, role, content, created_at FROM messages WHERE conversation_id = ? ORDER BY created_at",
                 (conversation_id,)
@@ -659,6 +747,98 @@ class MemoryService:
 
             return conversation
 
+    async def get_messages_page(
+        self,
+        conversation_id: str,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Optional[dict]:
+        """Get one page of a conversation's messages, in chronological order.
+
+        Pages are keyed on (created_at, id) of an anchor message rather than
+        an offset, so each page is a single range scan of
+        idx_messages_conversation_created however deep into the history it
+        is, and messages added meanwhile do not shift page boundaries.
+
+        Args:
+            conversation_id: The conversation to read
+            before: Return the messages immediately older than this message
+            after: Return the messages immediately newer than this message
+            limit: Page size (capped at MAX_PAGE_SIZE)
+
+        Returns:
+            {"messages": [...], "has_more_before": bool, "has_more_after": bool},
+            or None if the anchor message is not in the conversation.
+            With neither anchor, the newest page is returned.
+        """
+        if before is not None and after is not None:
+            raise ValueError("Pass either before or after, not both")
+        await self._ensure_initialized()
+
+        async with self._get_read_connection() as db:
+            return await self._fetch_page(db, conversation_id, before, after, limit)
+
+    async def _fetch_page(
+        self,
+        db: aiosqlite.Connection,
+        conversation_id: str,
+        before: Optional[str],
+        after: Optional[str],
+        limit: int,
+    ) -> Optional[dict]:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        anchor_id = before or after
+        anchor = None
+        if anchor_id is not None:
+            cursor = await db.execute(
+                "SELECT created_at, id FROM messages WHERE id = ? AND conversation_id = ?",
+                (anchor_id, conversation_id)
+            )
+            anchor = await cursor.fetchone()
+            if anchor is None:
+                return None
+
+        # One extra row tells whether there is another page in this direction
+        if after is not None:
+            cursor = await db.execute(
+                """SELECT id, role, content, created_at FROM messages
+                   WHERE conversation_id = ? AND (created_at, id) > (?, ?)
+                   ORDER BY created_at, id LIMIT ?""",
+                (conversation_id, anchor[0], anchor[1], limit + 1)
+            )
+            rows = await cursor.fetchall()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+        else:
+            if anchor is not None:
+                cursor = await db.execute(
+                    """SELECT id, role, content, created_at FROM messages
+                       WHERE conversation_id = ? AND (created_at, id) < (?, ?)
+                       ORDER BY created_at DESC, id DESC LIMIT ?""",
+                    (conversation_id, anchor[0], anchor[1], limit + 1)
+                )
+            else:
+                cursor = await db.execute(
+                    """SELECT id, role, content, created_at FROM messages
+                       WHERE conversation_id = ?
+                       ORDER BY created_at DESC, id DESC LIMIT ?""",
+                    (conversation_id, limit + 1)
+                )
+            rows = await cursor.fetchall()
+            has_more = len(rows) > limit
+            rows = list(reversed(rows[:limit]))
+
+        return {
+            "messages": [
+                {"id": m[0], "role": m[1], "content": m[2], "created_at": m[3]}
+                for m in rows
+            ],
+            # Paging from an anchor means the anchor itself lies the other way
+            "has_more_before": has_more if after is None else True,
+            "has_more_after": has_more if after is not None else before is not None,
+        }
+
     async def delete_conversation(self, conversation_id: str) -> bool:
         """Delete a conversation and all its messages.
 
@@ -689,12 +869,17 @@ class MemoryService:
                 "DELETE FROM message_summaries WHERE conversation_id = ?",
                 (conversation_id,)
             )
+            await db.execute(
+                "DELETE FROM summary_cursors WHERE conversation_id = ?",
+                (conversation_id,)
+            )
             # Delete conversation
             await db.execute(
                 "DELETE FROM conversations WHERE id = ?",
                 (conversation_id,)
             )
             await db.commit()
+            self._context_cache.pop(conversation_id, None)
             return True
 
     async def rename_conversation(self, conversation_id: str, title: str) -> bool:
@@ -772,7 +957,7 @@ class MemoryService:
         """List files, optionally filtered by conversation."""
         await self._ensure_initialized()
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             if conversation_id:
                 cursor = await db.execute(
                     "SELECT id, original_filename, content_type, size, conversation_id, uploaded_at "
@@ -801,7 +986,7 @@ class MemoryService:
         """Get file metadata by ID."""
         await self._ensure_initialized()
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 "SELECT id, original_filename, stored_filename, content_type, size, conversation_id, uploaded_at "
                 "FROM files WHERE id = ?",
@@ -825,23 +1010,117 @@ class MemoryService:
         query: str,
         conversation_id: Optional[str] = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        after: Optional[str] = None,
+        recency_weight: float = 0.0
     ) -> list[dict]:
         """Search messages by keyword across all conversations or a specific one.
 
+        Uses the messages_fts index: every word in the query must match
+        (case-insensitive, as a word prefix), and results are ordered by
+        bm25 relevance. Queries with no searchable words fall back to a
+        substring scan ordered by recency.
+
         Args:
-            query: Search keyword (case-insensitive)
+            query: Search keywords
             conversation_id: Optional filter to search within a specific conversation
             limit: Maximum results to return (default 50)
-            offset: Pagination offset (default 0)
+            offset: Pagination offset (default 0); prefer `after`
+            after: Keyset cursor from the last result of the previous page
+            recency_weight: Boost for recent messages, 0 (relevance only) to
+                1 (a message from today scores up to twice as well)
 
         Returns:
-            List of matching messages with conversation context
+            List of matching messages with conversation context, a plain
+            `snippet`, a `highlighted_snippet` with matches in bold, and a
+            `cursor` for fetching the next page
+
+        Raises:
+            ValueError: If `after` is not a cursor returned by this method
         """
         await self._ensure_initialized()
 
-        async with self._get_connection() as db:
-            # Use LIKE for simple keyword search (case-insensitive in SQLite by default for ASCII)
+        words = _SEARCH_WORD_RE.findall(query)
+        if not words:
+            return await self._search_messages_like(query, conversation_id, limit, offset)
+
+        fts_query = " ".join(f'"{word}"*' for word in words)
+        reference_time = datetime.now().isoformat()
+        after_score = after_rowid = None
+        if after:
+            after_score, after_rowid, reference_time = _parse_search_cursor(after)
+
+        # Rank every match, but only materialize the requested page
+        sql = """
+            SELECT rid, score FROM (
+                SELECT m.rowid AS rid,
+                       bm25(messages_fts) * (1.0 + ? / (1.0 + max(
+                           julianday(?) - julianday(m.created_at), 0))) AS score
+                FROM messages_fts
+                JOIN messages m ON m.rowid = messages_fts.rowid
+                WHERE messages_fts MATCH ?
+        """
+        params: list[Any] = [recency_weight, reference_time, fts_query]
+        if conversation_id:
+            sql += " AND m.conversation_id = ?"
+            params.append(conversation_id)
+        sql += ")"
+        if after:
+            sql += " WHERE (score, rid) > (?, ?)"
+            params.extend([after_score, after_rowid])
+        sql += " ORDER BY score, rid LIMIT ? OFFSET ?"
+        params.extend([limit, 0 if after else offset])
+
+        async with self._get_read_connection() as db:
+            cursor = await db.execute(sql, params)
+            page = await cursor.fetchall()
+            if not page:
+                return []
+
+            scores = {rid: score for rid, score in page}
+            placeholders = ",".join("?" * len(page))
+            cursor = await db.execute(
+                f"""SELECT m.rowid, m.id, m.conversation_id, m.role, m.content, m.created_at,
+                           c.title as conversation_title,
+                           snippet(messages_fts, 0, '', '', '...', ?),
+                           snippet(messages_fts, 0, ?, ?, '...', ?)
+                    FROM messages_fts
+                    JOIN messages m ON m.rowid = messages_fts.rowid
+                    JOIN conversations c ON m.conversation_id = c.id
+                    WHERE messages_fts MATCH ? AND messages_fts.rowid IN ({placeholders})""",
+                [_SNIPPET_TOKENS, _HIGHLIGHT_OPEN, _HIGHLIGHT_CLOSE, _SNIPPET_TOKENS,
+                 fts_query, *scores]
+            )
+            rows = {row[0]: row for row in await cursor.fetchall()}
+
+        results = []
+        for rid, score in page:
+            row = rows.get(rid)
+            if row is None:  # Deleted between the two queries
+                continue
+            results.append({
+                "id": row[1],
+                "conversation_id": row[2],
+                "role": row[3],
+                "content": row[4],
+                "created_at": row[5],
+                "conversation_title": row[6],
+                "snippet": row[7],
+                "highlighted_snippet": row[8],
+                "rank": score,
+                "cursor": f"{score!r}|{rid}|{reference_time}"
+            })
+        return results
+
+    async def _search_messages_like(
+        self,
+        query: str,
+        conversation_id: Optional[str],
+        limit: int,
+        offset: int
+    ) -> list[dict]:
+        """Substring search for queries the full-text index cannot express."""
+        async with self._get_read_connection() as db:
             search_pattern = f"%{query}%"
 
             if conversation_id:
@@ -876,8 +1155,10 @@ class MemoryService:
                     "content": row[3],
                     "created_at": row[4],
                     "conversation_title": row[5],
-                    # Include a snippet with context around the match
-                    "snippet": _extract_snippet(row[3], query)
+                    "snippet": _extract_snippet(row[3], query),
+                    "highlighted_snippet": _extract_snippet(row[3], query),
+                    "rank": None,
+                    "cursor": None
                 }
                 for row in rows
             ]
@@ -886,7 +1167,7 @@ class MemoryService:
         """Get total message count across all conversations."""
         await self._ensure_initialized()
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute("SELECT COUNT(*) FROM messages")
             row = await cursor.fetchone()
             return row[0] if row else 0
@@ -900,7 +1181,7 @@ class MemoryService:
         await self._ensure_initialized()
         await self._ensure_default_conversation()
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             # Get all messages with their timestamps
             cursor = await db.execute(
                 """SELECT id, role, content, created_at
@@ -980,7 +1261,7 @@ class MemoryService:
         # Get existing message timestamps for deduplication
         existing_timestamps = set()
         if mode == "merge":
-            async with self._get_connection() as db:
+            async with self._get_read_connection() as db:
                 cursor = await db.execute(
                     "SELECT created_at FROM messages WHERE conversation_id = ?",
                     (DEFAULT_CONVERSATION_ID,)
@@ -998,11 +1279,17 @@ class MemoryService:
                     "DELETE FROM message_summaries WHERE conversation_id = ?",
                     (DEFAULT_CONVERSATION_ID,)
                 )
+                await db.execute(
+                    "DELETE FROM summary_cursors WHERE conversation_id = ?",
+                    (DEFAULT_CONVERSATION_ID,)
+                )
                 await db.commit()
+            self._context_cache.pop(DEFAULT_CONVERSATION_ID, None)
 
         # Import messages
         imported_count = 0
         skipped_count = 0
+        oldest_imported = None
 
         async with self._get_connection() as db:
             for msg in messages:
@@ -1030,6 +1317,27 @@ class MemoryService:
                     (msg_id, DEFAULT_CONVERSATION_ID, msg["role"], msg["content"], timestamp)
                 )
                 imported_count += 1
+                if oldest_imported is None or timestamp < oldest_imported:
+                    oldest_imported = timestamp
+
+            # Messages merged in behind the summary cursor would never be
+            # summarized; drop the derived summaries so they are rebuilt
+            if oldest_imported is not None:
+                cursor = await db.execute(
+                    """SELECT 1 FROM summary_cursors
+                       WHERE conversation_id = ? AND last_created_at >= ?""",
+                    (DEFAULT_CONVERSATION_ID, oldest_imported)
+                )
+                if await cursor.fetchone():
+                    await db.execute(
+                        "DELETE FROM message_summaries WHERE conversation_id = ?",
+                        (DEFAULT_CONVERSATION_ID,)
+                    )
+                    await db.execute(
+                        "DELETE FROM summary_cursors WHERE conversation_id = ?",
+                        (DEFAULT_CONVERSATION_ID,)
+                    )
+                    self._context_cache.pop(DEFAULT_CONVERSATION_ID, None)
 
             await db.commit()
 
@@ -1056,10 +1364,11 @@ class MemoryService:
         async with self._get_connection() as db:
             # Check if message exists
             cursor = await db.execute(
-                "SELECT 1 FROM messages WHERE id = ? AND conversation_id = ?",
+                "SELECT created_at FROM messages WHERE id = ? AND conversation_id = ?",
                 (message_id, conversation_id)
             )
-            if not await cursor.fetchone():
+            row = await cursor.fetchone()
+            if not row:
                 return False
 
             # Delete the message
@@ -1067,10 +1376,36 @@ class MemoryService:
                 "DELETE FROM messages WHERE id = ? AND conversation_id = ?",
                 (message_id, conversation_id)
             )
+            await self._forget_message(db, conversation_id, message_id, row[0])
             await db.commit()
             return True
 
 
+@dataclass
+class _ContextState:
+    """Incremental summarization state for one conversation.
+
+    Tracks the (created_at, id) of the last message folded into a sealed
+    summary, how many messages are covered, and the joined summary block.
+    """
+    last_created_at: Optional[str] = None
+    last_message_id: Optional[str] = None
+    summarized_count: int = 0
+    summary_block: str = ""
+    summary_count: int = 0
+
+    def covers(self, created_at: str, message_id: str) -> bool:
+        """Check whether a message is at or before the summary cursor."""
+        if self.last_created_at is None:
+            return False
+        return (created_at, message_id) <= (self.last_created_at, self.last_message_id)
+
+    def add_summary(self, summary: str):
+        """Append a sealed summary to the cached block."""
+        self.summary_block = f"{self.summary_block}\n---\n{summary}" if self.summary_block else summary
+        self.summary_count += 1
+
+
 def _create_text_summary(messages: list, max_length: int = 500) -> str:
     """Create a text-based summary of a batch of messages.
 
@@ -1111,6 +1446,15 @@ def _create_text_summary(messages: list, max_length: int = 500) -> str:
     return summary
 
 
+def _parse_search_cursor(cursor: str) -> Tuple[float, int, str]:
+    """Decode a search_messages() keyset cursor into (score, rowid, reference_time)."""
+    try:
+        score, rowid, reference_time = cursor.split("|", 2)
+        return float(score), int(rowid), reference_time
+    except ValueError:
+        raise ValueError(f"Invalid search cursor: {cursor!r}")
+
+
 def _extract_snippet(content: str, query: str, context_chars: int = 50) -> str:
     """Extract a snippet from content with context around the first match.
 
@@ -16,7 +16,6 @@ Fact types:
 - behavioral_pattern: Communication patterns and habits
 - temporal: Schedule-related facts (timezone, working hours, routines)
 """
-import aiosqlite
 import asyncio
 import json
 import logging
@@ -29,12 +28,58 @@ from typing import Optional, List, Dict, Any
 from pydantic import BaseModel
 
 import config
+from server.services.llm_clients import get_llm_clients
+from server.services.migrations import Migration, apply_migrations
+from server.services.storage import PooledConnection, get_pool
 
 logger = logging.getLogger(__name__)
 
-# Connection pool settings (similar to memory.py)
-_DB_BUSY_TIMEOUT_MS = 5000
-_DB_POOL_SIZE = 5
+# Schema history for facts.db (see server/services/migrations.py)
+_SCHEMA_MIGRATIONS = (
+    Migration(1, "initial schema", (
+        """CREATE TABLE IF NOT EXISTS facts (
+            id TEXT PRIMARY KEY,
+            fact_type TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            source_conversation_id TEXT NOT NULL,
+            source_message_id TEXT NOT NULL,
+            confidence REAL NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )""",
+        # FTS5 virtual table for full-text search on facts
+        """CREATE VIRTUAL TABLE IF NOT EXISTS facts_fts USING fts5(
+            id UNINDEXED,
+            key,
+            value,
+            content='facts',
+            content_rowid='rowid'
+        )""",
+        # Triggers to keep FTS5 in sync
+        """CREATE TRIGGER IF NOT EXISTS facts_ai AFTER INSERT ON facts BEGIN
+            INSERT INTO facts_fts(rowid, id, key, value)
+            VALUES (new.rowid, new.id, new.key, new.value);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS facts_ad AFTER DELETE ON facts BEGIN
+            DELETE FROM facts_fts WHERE rowid = old.rowid;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS facts_au AFTER UPDATE ON facts BEGIN
+            UPDATE facts_fts SET key = new.key, value = new.value
+            WHERE rowid = old.rowid;
+        END""",
+        """CREATE INDEX IF NOT EXISTS idx_facts_type_key
+           ON facts(fact_type, key)""",
+    )),
+    Migration(2, "recency and confidence indexes", (
+        """CREATE INDEX IF NOT EXISTS idx_facts_type_updated
+           ON facts(fact_type, updated_at)""",
+        """CREATE INDEX IF NOT EXISTS idx_facts_updated
+           ON facts(updated_at)""",
+        """CREATE INDEX IF NOT EXISTS idx_facts_confidence
+           ON facts(confidence)""",
+    )),
+)
 
 
 class Fact(BaseModel):
@@ -50,95 +95,6 @@ class Fact(BaseModel):
     updated_at: str
 
 
-class ConnectionPool:
-    """Simple async connection pool for aiosqlite with WAL mode."""
-
-    def __init__(self, db_path: Path, pool_size: int = _DB_POOL_SIZE):
-        self.db_path = db_path
-        self.pool_size = pool_size
-        self._pool: Optional[asyncio.Queue] = None
-        self._initialized = False
-        self._lock: Optional[asyncio.Lock] = None
-        self._init_lock = threading.Lock()
-        self._loop = None
-
-    async def initialize(self):
-        """Initialize the connection pool."""
-        current_loop = asyncio.get_running_loop()
-        if self._loop is not None and self._loop != current_loop:
-            await self.close()
-
-        if self._initialized:
-            return
-
-        with self._init_lock:
-            if self._lock is None:
-                self._loop = current_loop
-                self._lock = asyncio.Lock()
-
-        async with self._lock:
-            if self._initialized:
-                return
-
-            if self._pool is None:
-                self._pool = asyncio.Queue(maxsize=self.pool_size)
-
-            for _ in range(self.pool_size):
-                conn = await aiosqlite.connect(
-                    self.db_path,
-                    timeout=_DB_BUSY_TIMEOUT_MS / 1000
-                )
-                await conn.execute("PRAGMA journal_mode=WAL")
-                await conn.execute(f"PRAGMA busy_timeout={_DB_BUSY_TIMEOUT_MS}")
-                await conn.execute("PRAGMA synchronous=NORMAL")
-                await self._pool.put(conn)
-
-            self._initialized = True
-
-    async def acquire(self) -> aiosqlite.Connection:
-        """Get a connection from the pool."""
-        await self.initialize()
-        if self._pool is None:
-            raise RuntimeError("Connection pool not initialized")
-        return await self._pool.get()
-
-    async def release(self, conn: aiosqlite.Connection):
-        """Return a connection to the pool."""
-        if self._pool is None:
-            raise RuntimeError("Connection pool not initialized")
-        await self._pool.put(conn)
-
-    async def close(self):
-        """Close all connections in the pool."""
-        if self._pool is not None:
-            while not self._pool.empty():
-                try:
-                    conn = self._pool.get_nowait()
-                    await conn.close()
-                except asyncio.QueueEmpty:
-                    break
-        self._initialized = False
-        self._pool = None
-        self._lock = None
-
-
-class PooledConnection:
-    """Context manager for pooled database connections."""
-
-    def __init__(self, pool: ConnectionPool):
-        self.pool = pool
-        self.conn: Optional[aiosqlite.Connection] = None
-
-    async def __aenter__(self) -> aiosqlite.Connection:
-        self.conn = await self.pool.acquire()
-        return self.conn
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.conn:
-            await self.pool.release(self.conn)
-            self.conn = None
-
-
 class MemoryExtractorService:
     """Service for extracting and managing long-term memory facts."""
 
@@ -169,17 +125,21 @@ If no facts can be extracted, return: {{"facts": []}}"""
 
     def __init__(self, db_path: Path):
         self.db_path = db_path
-        self._pool = ConnectionPool(db_path)
+        self._pool = get_pool(db_path)
         self._tables_created = False
         self._tables_lock: Optional[asyncio.Lock] = None
         self._tables_init_lock = threading.Lock()
 
     def _get_connection(self) -> PooledConnection:
-        """Get a pooled connection context manager."""
-        return PooledConnection(self._pool)
+        """Get the pooled writer connection context manager."""
+        return self._pool.writer()
+
+    def _get_read_connection(self) -> PooledConnection:
+        """Get a pooled read-only connection context manager."""
+        return self._pool.reader()
 
     async def _ensure_initialized(self):
-        """Ensure database tables exist."""
+        """Ensure the database schema is migrated to the latest version."""
         if self._tables_created:
             return
 
@@ -192,60 +152,7 @@ If no facts can be extracted, return: {{"facts": []}}"""
                 return
 
             async with self._get_connection() as db:
-                # Create facts table
-                await db.execute("""
-                    CREATE TABLE IF NOT EXISTS facts (
-                        id TEXT PRIMARY KEY,
-                        fact_type TEXT NOT NULL,
-                        key TEXT NOT NULL,
-                        value TEXT NOT NULL,
-                        source_conversation_id TEXT NOT NULL,
-                        source_message_id TEXT NOT NULL,
-                        confidence REAL NOT NULL,
-                        created_at TEXT NOT NULL,
-                        updated_at TEXT NOT NULL
-                    )
-                """)
-
-                # Create FTS5 virtual table for full-text search on facts
-                await db.execute("""
-                    CREATE VIRTUAL TABLE IF NOT EXISTS facts_fts USING fts5(
-                        id UNINDEXED,
-                        key,
-                        value,
-                        content='facts',
-                        content_rowid='rowid'
-                    )
-                """)
-
-                # Create triggers to keep FTS5 in sync
-                await db.execute("""
-                    CREATE TRIGGER IF NOT EXISTS facts_ai AFTER INSERT ON facts BEGIN
-                        INSERT INTO facts_fts(rowid, id, key, value)
-                        VALUES (new.rowid, new.id, new.key, new.value);
-                    END
-                """)
-
-                await db.execute("""
-                    CREATE TRIGGER IF NOT EXISTS facts_ad AFTER DELETE ON facts BEGIN
-                        DELETE FROM facts_fts WHERE rowid = old.rowid;
-                    END
-                """)
-
-                await db.execute("""
-                    CREATE TRIGGER IF NOT EXISTS facts_au AFTER UPDATE ON facts BEGIN
-                        UPDATE facts_fts SET key = new.key, value = new.value
-                        WHERE rowid = old.rowid;
-                    END
-                """)
-
-                # Index for efficient lookups
-                await db.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_facts_type_key
-                    ON facts(fact_type, key)
-                """)
-
-                await db.commit()
+                await apply_migrations(db, _SCHEMA_MIGRATIONS)
             self._tables_created = True
 
     async def extract_facts_from_turn(
@@ -322,11 +229,10 @@ If no facts can be extracted, return: {{"facts": []}}"""
         # Use a lightweight model for extraction to reduce cost/latency
         if use_lightweight_model and config.OPENAI_API_KEY:
             # Use GPT-4o-mini or GPT-4o for extraction
-            from openai import OpenAI
-            client = OpenAI(api_key=config.OPENAI_API_KEY)
+            client = get_llm_clients().get_openai(config.OPENAI_API_KEY)
 
             try:
-                response = client.chat.completions.create(
+                response = await client.chat.completions.create(
                     model="gpt-4o-mini",
                     messages=[{"role": "user", "content": prompt}],
                     response_format={"type": "json_object"},
@@ -342,10 +248,9 @@ If no facts can be extracted, return: {{"facts": []}}"""
 
         # Fallback to configured model
         if config.ANTHROPIC_API_KEY:
-            from anthropic import Anthropic
-            client = Anthropic(api_key=config.ANTHROPIC_API_KEY)
+            client = get_llm_clients().get_anthropic(config.ANTHROPIC_API_KEY)
 
-            response = client.messages.create(
+            response = await client.messages.create(
                 model=config.CLAUDE_MODEL,
                 max_tokens=500,
                 messages=[{"role": "user", "content": prompt}],
@@ -369,10 +274,9 @@ If no facts can be extracted, return: {{"facts": []}}"""
             return {"facts": []}
 
         elif config.OPENAI_API_KEY:
-            from openai import OpenAI
-            client = OpenAI(api_key=config.OPENAI_API_KEY)
+            client = get_llm_clients().get_openai(config.OPENAI_API_KEY)
 
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model=config.OPENAI_MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 response_format={"type": "json_object"},
@@ -463,7 +367,7 @@ If no facts can be extracted, return: {{"facts": []}}"""
         """
         await self._ensure_initialized()
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             words: List[str] = []
             if query:
                 # Sanitize query for FTS5 (strip special chars like ?, *, +, etc.)
@@ -554,7 +458,7 @@ If no facts can be extracted, return: {{"facts": []}}"""
         """
         await self._ensure_initialized()
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             if fact_type:
                 cursor = await db.execute(
                     """SELECT id, fact_type, key, value,
@@ -599,7 +503,7 @@ If no facts can be extracted, return: {{"facts": []}}"""
         """Get a specific fact by ID."""
         await self._ensure_initialized()
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 """SELECT id, fact_type, key, value,
                           source_conversation_id, source_message_id,
@@ -1,10 +1,155 @@
-"""Metrics service for tracking API usage and performance."""
+"""Metrics service for tracking API usage and performance.
+
+Latencies are kept in log-bucketed histograms rather than raw sample lists,
+so memory stays bounded no matter how many requests are recorded and
+percentiles cost a walk over a few hundred buckets instead of a sort.
+Each series also keeps short time slots so /api/metrics can report the
+last 1m/5m/1h next to the totals since startup.
+"""
+import math
 import time
-from collections import defaultdict
-from dataclasses import dataclass, field
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
-import statistics
+from typing import Callable, Iterator
+
+
+# Histogram buckets grow by 4%, so a value is reported within 4% of its
+# true value (exactly, when a bucket only holds one distinct value)
+_BUCKET_GROWTH = 1.04
+_LOG_BUCKET_GROWTH = math.log(_BUCKET_GROWTH)
+_MIN_TRACKED_MS = 0.001  # Everything at or below 1µs shares bucket 0
+
+# Time-windowed views: slot width and the windows reported
+WINDOW_SLOT_SECONDS = 10
+WINDOWS = {"1m": 60, "5m": 300, "1h": 3600}
+_MAX_WINDOW_SECONDS = max(WINDOWS.values())
+
+# Bucket bounds (ms) for the Prometheus exposition of each histogram
+PROMETHEUS_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+class Histogram:
+    """Constant-memory latency histogram (values in milliseconds).
+
+    Each bucket stores a count and a sum, so quantiles report the mean of
+    the bucket holding the requested rank.
+    """
+
+    __slots__ = ("count", "sum", "min", "max", "_buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buckets: dict[int, list] = {}  # index -> [count, sum]
+
+    def __len__(self) -> int:
+        return self.count
+
+    @staticmethod
+    def _index(value: float) -> int:
+        if value <= _MIN_TRACKED_MS:
+            return 0
+        return int(math.log(value / _MIN_TRACKED_MS) / _LOG_BUCKET_GROWTH) + 1
+
+    def record(self, value: float):
+        """Add one observation."""
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        index = self._index(value)
+        bucket = self._buckets.get(index)
+        if bucket is None:
+            self._buckets[index] = [1, value]
+        else:
+            bucket[0] += 1
+            bucket[1] += value
+
+    def merge(self, other: "Histogram"):
+        """Add all observations from another histogram."""
+        if not other.count:
+            return
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for index, (count, total) in other._buckets.items():
+            bucket = self._buckets.get(index)
+            if bucket is None:
+                self._buckets[index] = [count, total]
+            else:
+                bucket[0] += count
+                bucket[1] += total
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-th quantile (0 <= q <= 1)."""
+        if not self.count:
+            return 0.0
+        target = min(int(self.count * q), self.count - 1)
+        seen = 0
+        for index in sorted(self._buckets):
+            count, total = self._buckets[index]
+            seen += count
+            if seen > target:
+                return min(max(total / count, self.min), self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds: tuple) -> list[int]:
+        """Count observations at or below each bound (bounds ascending)."""
+        counts = []
+        seen = 0
+        buckets = sorted(self._buckets.items())
+        position = 0
+        for bound in bounds:
+            while position < len(buckets):
+                count, total = buckets[position][1]
+                if total / count > bound:
+                    break
+                seen += count
+                position += 1
+            counts.append(seen)
+        return counts
+
+    @property
+    def bucket_count(self) -> int:
+        """Number of non-empty buckets (the histogram's memory footprint)."""
+        return len(self._buckets)
+
+
+class WindowedHistogram:
+    """Histogram since startup plus rolling slots for recent windows."""
+
+    __slots__ = ("total", "_slots")
+
+    def __init__(self):
+        self.total = Histogram()
+        self._slots: deque = deque()  # (slot number, Histogram), oldest first
+
+    def record(self, value: float, now: float):
+        """Add one observation made at time `now` (epoch seconds)."""
+        self.total.record(value)
+        slot = int(now // WINDOW_SLOT_SECONDS)
+        if not self._slots or self._slots[-1][0] != slot:
+            self._slots.append((slot, Histogram()))
+            oldest = slot - _MAX_WINDOW_SECONDS // WINDOW_SLOT_SECONDS
+            while self._slots[0][0] <= oldest:
+                self._slots.popleft()
+        self._slots[-1][1].record(value)
+
+    def window(self, seconds: int, now: float) -> Histogram:
+        """Merge the slots covering the last `seconds` seconds."""
+        first = int(now // WINDOW_SLOT_SECONDS) - seconds // WINDOW_SLOT_SECONDS + 1
+        merged = Histogram()
+        for slot, histogram in self._slots:
+            if slot >= first:
+                merged.merge(histogram)
+        return merged
 
 
 @dataclass
@@ -16,70 +161,108 @@ class MetricsSnapshot:
     latency: dict
     tool_usage: dict
     errors: dict
+    connections: dict
 
 
 class MetricsService:
     """Service for collecting and reporting metrics."""
 
-    def __init__(self):
-        self._start_time = time.time()
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._start_time = clock()
         self._request_counts: dict[str, int] = defaultdict(int)
         self._error_counts: dict[str, int] = defaultdict(int)
-        self._latencies: dict[str, list[float]] = defaultdict(list)
+        self._latencies: dict[str, WindowedHistogram] = defaultdict(WindowedHistogram)
+        self._stages: dict[str, WindowedHistogram] = defaultdict(WindowedHistogram)
+        self._http: dict[tuple[str, str], WindowedHistogram] = defaultdict(WindowedHistogram)
+        self._http_responses: dict[tuple[str, str, int], int] = defaultdict(int)
+        self._gauges: dict[str, float] = defaultdict(float)
         self._tool_calls: dict[str, int] = defaultdict(int)
-        self._max_latency_samples = 1000  # Keep last N samples per endpoint
+        self._connections: dict[str, dict[str, int]] = defaultdict(
+            lambda: {"requests": 0, "reused": 0, "new": 0, "tls_handshakes": 0}
+        )
 
     def record_request(self, endpoint: str, latency_ms: float, success: bool = True):
         """Record a request with its latency."""
         self._request_counts[endpoint] += 1
-
-        # Track latency
-        latencies = self._latencies[endpoint]
-        latencies.append(latency_ms)
-        if len(latencies) > self._max_latency_samples:
-            latencies.pop(0)
+        self._latencies[endpoint].record(latency_ms, self._clock())
 
         if not success:
             self._error_counts[endpoint] += 1
 
+    def record_stage(self, stage: str, duration_ms: float):
+        """Record how long one stage of request handling took."""
+        self._stages[stage].record(duration_ms, self._clock())
+
+    @contextmanager
+    def time_stage(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block as a request-handling stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, (time.perf_counter() - start) * 1000)
+
+    def record_http(self, method: str, route: str, status_code: int, duration_ms: float):
+        """Record an HTTP response (fed by the access-log middleware)."""
+        self._http[(method, route)].record(duration_ms, self._clock())
+        self._http_responses[(method, route, status_code)] += 1
+
+    def set_gauge(self, name: str, value: float):
+        """Set a gauge to an absolute value."""
+        self._gauges[name] = value
+
+    def add_gauge(self, name: str, delta: float):
+        """Move a gauge up or down (e.g. in-flight requests)."""
+        self._gauges[name] += delta
+
     def record_tool_call(self, tool_name: str):
         """Record a tool invocation."""
         self._tool_calls[tool_name] += 1
 
+    def record_connection(self, provider: str, reused: bool, tls_handshake: bool = False):
+        """Record whether an upstream request reused a pooled connection."""
+        stats = self._connections[provider]
+        stats["requests"] += 1
+        stats["reused" if reused else "new"] += 1
+        if tls_handshake:
+            stats["tls_handshakes"] += 1
+
     def record_error(self, endpoint: str, error_type: str = "unknown"):
         """Record an error for an endpoint."""
         self._error_counts[f"{endpoint}:{error_type}"] += 1
 
-    def _calculate_latency_stats(self, latencies: list[float]) -> dict:
-        """Calculate latency statistics for a list of values."""
-        if not latencies:
+    def _calculate_latency_stats(self, histogram: Histogram) -> dict:
+        """Calculate latency statistics for a histogram."""
+        if not histogram.count:
             return {"avg": 0, "min": 0, "max": 0, "p50": 0, "p95": 0, "p99": 0}
 
-        sorted_latencies = sorted(latencies)
-        n = len(sorted_latencies)
-
-        def percentile(p: float) -> float:
-            idx = int(n * p / 100)
-            return sorted_latencies[min(idx, n - 1)]
-
         return {
-            "avg": round(statistics.mean(latencies), 2),
-            "min": round(min(latencies), 2),
-            "max": round(max(latencies), 2),
-            "p50": round(percentile(50), 2),
-            "p95": round(percentile(95), 2),
-            "p99": round(percentile(99), 2),
+            "avg": round(histogram.sum / histogram.count, 2),
+            "min": round(histogram.min, 2),
+            "max": round(histogram.max, 2),
+            "p50": round(histogram.quantile(0.50), 2),
+            "p95": round(histogram.quantile(0.95), 2),
+            "p99": round(histogram.quantile(0.99), 2),
         }
 
+    def _window_stats(self, series: WindowedHistogram, now: float) -> dict:
+        """Latency stats and counts for each reporting window."""
+        windows = {}
+        for name, seconds in WINDOWS.items():
+            histogram = series.window(seconds, now)
+            windows[name] = {"count": histogram.count, **self._calculate_latency_stats(histogram)}
+        return windows
+
     def get_snapshot(self) -> MetricsSnapshot:
         """Get current metrics snapshot."""
         now = datetime.now()
-        uptime = time.time() - self._start_time
+        uptime = self._clock() - self._start_time
 
         # Calculate latency stats per endpoint
         latency_stats = {}
-        for endpoint, latencies in self._latencies.items():
-            latency_stats[endpoint] = self._calculate_latency_stats(latencies)
+        for endpoint, series in self._latencies.items():
+            latency_stats[endpoint] = self._calculate_latency_stats(series.total)
 
         return MetricsSnapshot(
             timestamp=now.isoformat(),
@@ -88,21 +271,25 @@ class MetricsService:
             latency=latency_stats,
             tool_usage=dict(self._tool_calls),
             errors=dict(self._error_counts),
+            connections={provider: dict(stats) for provider, stats in self._connections.items()},
         )
 
     def to_dict(self) -> dict:
         """Convert metrics to dictionary for JSON response."""
         snapshot = self.get_snapshot()
+        now = self._clock()
 
         # Calculate totals
         total_requests = sum(snapshot.requests.values())
         total_errors = sum(snapshot.errors.values())
 
-        # Calculate overall latency stats
-        all_latencies = []
-        for latencies in self._latencies.values():
-            all_latencies.extend(latencies)
-        overall_latency = self._calculate_latency_stats(all_latencies)
+        # Calculate overall latency stats (all endpoints merged)
+        overall = Histogram()
+        overall_windows = {name: Histogram() for name in WINDOWS}
+        for series in self._latencies.values():
+            overall.merge(series.total)
+            for name, seconds in WINDOWS.items():
+                overall_windows[name].merge(series.window(seconds, now))
 
         return {
             "timestamp": snapshot.timestamp,
@@ -120,15 +307,122 @@ class MetricsService:
                 "rate": round(total_errors / max(total_requests, 1) * 100, 2),
             },
             "latency": {
-                "overall": overall_latency,
+                "overall": self._calculate_latency_stats(overall),
                 "by_endpoint": snapshot.latency,
+                "windows": {
+                    name: {"count": histogram.count, **self._calculate_latency_stats(histogram)}
+                    for name, histogram in overall_windows.items()
+                },
+            },
+            "stages": {
+                stage: {
+                    "count": series.total.count,
+                    **self._calculate_latency_stats(series.total),
+                    "windows": self._window_stats(series, now),
+                }
+                for stage, series in self._stages.items()
             },
+            "http": {
+                f"{method} {route}": {
+                    "count": series.total.count,
+                    **self._calculate_latency_stats(series.total),
+                }
+                for (method, route), series in self._http.items()
+            },
+            "gauges": dict(self._gauges),
             "tools": {
                 "total_calls": sum(snapshot.tool_usage.values()),
                 "by_tool": snapshot.tool_usage,
             },
+            "connections": {
+                provider: {
+                    **stats,
+                    "reuse_rate": round(stats["reused"] / max(stats["requests"], 1) * 100, 2),
+                }
+                for provider, stats in snapshot.connections.items()
+            },
         }
 
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+
+        def header(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP assistant_{name} {help_text}")
+            lines.append(f"# TYPE assistant_{name} {kind}")
+
+        def sample(name: str, labels: dict, value: float):
+            if labels:
+                label_text = ",".join(f'{key}="{_escape_label(str(val))}"' for key, val in labels.items())
+                lines.append(f"assistant_{name}{{{label_text}}} {_format_value(value)}")
+            else:
+                lines.append(f"assistant_{name} {_format_value(value)}")
+
+        def _emit_histogram(name: str, help_text: str, series: list[tuple[dict, Histogram]]):
+            if not series:
+                return
+            header(name, "histogram", help_text)
+            for labels, hist in series:
+                cumulative = hist.cumulative_counts(PROMETHEUS_BUCKETS_MS)
+                for bound, count in zip(PROMETHEUS_BUCKETS_MS, cumulative):
+                    sample(f"{name}_bucket", {**labels, "le": _format_value(bound / 1000)}, count)
+                sample(f"{name}_bucket", {**labels, "le": "+Inf"}, hist.count)
+                sample(f"{name}_sum", labels, hist.sum / 1000)
+                sample(f"{name}_count", labels, hist.count)
+
+        header("uptime_seconds", "gauge", "Seconds since the server started.")
+        sample("uptime_seconds", {}, round(self._clock() - self._start_time, 3))
+
+        if self._request_counts:
+            header("requests_total", "counter", "Chat requests handled.")
+            for endpoint, count in self._request_counts.items():
+                sample("requests_total", {"endpoint": endpoint}, count)
+
+        if self._error_counts:
+            header("errors_total", "counter", "Errors recorded, by endpoint and type.")
+            for key, count in self._error_counts.items():
+                endpoint, _, error_type = key.partition(":")
+                sample("errors_total", {"endpoint": endpoint, "type": error_type or "failed"}, count)
+
+        _emit_histogram(
+            "request_duration_seconds", "Chat request latency.",
+            [({"endpoint": endpoint}, series.total) for endpoint, series in self._latencies.items()],
+        )
+        _emit_histogram(
+            "stage_duration_seconds", "Time spent in each chat pipeline stage.",
+            [({"stage": stage}, series.total) for stage, series in self._stages.items()],
+        )
+        _emit_histogram(
+            "http_request_duration_seconds", "HTTP response time (until headers for streams).",
+            [({"method": method, "route": route}, series.total)
+             for (method, route), series in self._http.items()],
+        )
+
+        if self._http_responses:
+            header("http_responses_total", "counter", "HTTP responses by route and status.")
+            for (method, route, status_code), count in self._http_responses.items():
+                sample("http_responses_total", {"method": method, "route": route, "status": status_code}, count)
+
+        if self._tool_calls:
+            header("tool_calls_total", "counter", "Tool invocations.")
+            for tool_name, count in self._tool_calls.items():
+                sample("tool_calls_total", {"tool": tool_name}, count)
+
+        if self._connections:
+            header("upstream_requests_total", "counter", "LLM provider requests by connection reuse.")
+            for provider, stats in self._connections.items():
+                sample("upstream_requests_total", {"provider": provider, "connection": "reused"}, stats["reused"])
+                sample("upstream_requests_total", {"provider": provider, "connection": "new"}, stats["new"])
+            header("tls_handshakes_total", "counter", "TLS handshakes to LLM providers.")
+            for provider, stats in self._connections.items():
+                sample("tls_handshakes_total", {"provider": provider}, stats["tls_handshakes"])
+
+        for name, value in self._gauges.items():
+            header(name, "gauge", f"Current value of {name}.")
+            sample(name, {}, value)
+
+        return "\n".join(lines) + "\n"
+
     def _format_uptime(self, seconds: float) -> str:
         """Format uptime as human-readable string."""
         days = int(seconds // 86400)
@@ -149,11 +443,28 @@ class MetricsService:
 
     def reset(self):
         """Reset all metrics (useful for testing)."""
-        self._start_time = time.time()
+        self._start_time = self._clock()
         self._request_counts.clear()
         self._error_counts.clear()
         self._latencies.clear()
+        self._stages.clear()
+        self._http.clear()
+        self._http_responses.clear()
+        self._gauges.clear()
         self._tool_calls.clear()
+        self._connections.clear()
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value without a trailing '.0' on integers."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
 
 
 # Global metrics instance
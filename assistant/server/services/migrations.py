@@ -0,0 +1,104 @@
+"""Versioned schema migrations for the server's SQLite stores.
+
+Each store declares an ordered tuple of Migration steps. apply_migrations()
+records applied versions in a schema_version table and runs only the steps
+newer than the stored version, one transaction per step.
+
+Version 1 of every store is its original schema written with IF NOT EXISTS,
+so databases created before migrations existed upgrade in place. A step can
+also rewrite data in Python (Migration.upgrade) where SQL can't express it.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Optional, Sequence
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A single schema migration step."""
+    version: int
+    description: str
+    statements: tuple[str, ...]
+    # Run after the statements, in the same transaction
+    upgrade: Optional[Callable[[aiosqlite.Connection], Awaitable[None]]] = None
+
+
+async def get_schema_version(db: aiosqlite.Connection) -> int:
+    """Get the current schema version (0 for an unmanaged database)."""
+    cursor = await db.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    )
+    if await cursor.fetchone() is None:
+        return 0
+    cursor = await db.execute("SELECT MAX(version) FROM schema_version")
+    row = await cursor.fetchone()
+    return row[0] if row and row[0] is not None else 0
+
+
+async def apply_migrations(db: aiosqlite.Connection, migrations: Sequence[Migration]) -> int:
+    """Bring a database up to the latest version in migrations.
+
+    Steps run in version order inside BEGIN IMMEDIATE transactions, and the
+    version is re-checked under the write lock so concurrent initializers
+    (other pooled connections or processes) never apply a step twice.
+
+    Args:
+        db: Open connection to the database
+        migrations: Migration steps for this store
+
+    Returns:
+        The schema version after migrating
+
+    Raises:
+        ValueError: If migration versions are not unique
+    """
+    ordered = sorted(migrations, key=lambda m: m.version)
+    versions = [m.version for m in ordered]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"Duplicate migration versions: {versions}")
+
+    await db.commit()  # Never fold a caller's pending writes into a migration
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    """)
+    await db.commit()
+
+    current = await get_schema_version(db)
+    for migration in ordered:
+        if migration.version <= current:
+            continue
+
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            current = await get_schema_version(db)
+            if migration.version <= current:
+                await db.rollback()
+                continue
+
+            for statement in migration.statements:
+                await db.execute(statement)
+            if migration.upgrade is not None:
+                await migration.upgrade(db)
+            await db.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (migration.version, migration.description, datetime.now().isoformat())
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            logger.error(f"Schema migration {migration.version} failed: {migration.description}")
+            raise
+
+        current = migration.version
+        logger.info(f"Applied schema migration {migration.version}: {migration.description}")
+
+    return current
@@ -1,5 +1,4 @@
 """Persona service for managing system prompt templates."""
-import aiosqlite
 import asyncio
 import uuid
 import json
@@ -9,6 +8,11 @@ from typing import Optional, List
 from dataclasses import dataclass, asdict
 import threading
 
+from server.services.storage import PooledConnection, get_pool
+
+# Used when neither the conversation nor settings provide a system prompt
+DEFAULT_SYSTEM_PROMPT = "You are a helpful AI assistant. Be concise and helpful."
+
 
 @dataclass
 class PersonaTemplate:
@@ -78,13 +82,21 @@ class PersonaService:
         self._initialized = False
         self._init_lock = threading.Lock()
 
+    def _get_connection(self) -> PooledConnection:
+        """Get the pooled writer connection context manager."""
+        return get_pool(self.db_path).writer()
+
+    def _get_read_connection(self) -> PooledConnection:
+        """Get a pooled read-only connection context manager."""
+        return get_pool(self.db_path).reader()
+
     async def _ensure_initialized(self):
         """Ensure database tables exist."""
         with self._init_lock:
             if self._initialized:
                 return
 
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._get_connection() as db:
                 # Table for custom persona templates
                 await db.execute("""
                     CREATE TABLE IF NOT EXISTS persona_templates (
@@ -123,7 +135,7 @@ class PersonaService:
 
         personas = list(BUILTIN_PERSONAS)
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 """SELECT id, name, description, system_prompt, is_builtin, created_at, updated_at
                    FROM persona_templates
@@ -154,7 +166,7 @@ class PersonaService:
                 return persona
 
         # Check custom personas
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 """SELECT id, name, description, system_prompt, is_builtin, created_at, updated_at
                    FROM persona_templates
@@ -202,7 +214,7 @@ class PersonaService:
         persona_id = f"persona_{uuid.uuid4().hex[:12]}"
         now = datetime.now().isoformat()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute(
                 """INSERT INTO persona_templates
                    (id, name, description, system_prompt, is_builtin, created_at, updated_at)
@@ -273,7 +285,7 @@ class PersonaService:
         params.append(datetime.now().isoformat())
         params.append(persona_id)
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             cursor = await db.execute(
                 f"""UPDATE persona_templates
                     SET {', '.join(updates)}
@@ -299,7 +311,7 @@ class PersonaService:
             if builtin.id == persona_id:
                 return False
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             cursor = await db.execute(
                 "DELETE FROM persona_templates WHERE id = ? AND is_builtin = 0",
                 (persona_id,)
@@ -330,7 +342,7 @@ class PersonaService:
 
         now = datetime.now().isoformat()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute(
                 """INSERT INTO conversation_personas
                    (conversation_id, persona_id, custom_system_prompt, updated_at)
@@ -350,7 +362,7 @@ class PersonaService:
         """
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 """SELECT persona_id, custom_system_prompt
                    FROM conversation_personas
@@ -405,4 +417,4 @@ class PersonaService:
             return default_system_prompt
 
         # Ultimate fallback
-        return "You are a helpful AI assistant. Be concise and helpful."
+        return DEFAULT_SYSTEM_PROMPT
@@ -8,7 +8,6 @@ This module provides:
 - Configurable quiet hours
 """
 import asyncio
-import aiosqlite
 import json
 import logging
 import uuid
@@ -18,8 +17,42 @@ from enum import Enum
 from pathlib import Path
 from typing import Optional, Callable
 
+from server.services.migrations import Migration, apply_migrations
+from server.services.storage import PooledConnection, get_pool
+
 logger = logging.getLogger(__name__)
 
+# Schema history for proactive.db (see server/services/migrations.py)
+_SCHEMA_MIGRATIONS = (
+    Migration(1, "initial schema", (
+        """CREATE TABLE IF NOT EXISTS notifications (
+            id TEXT PRIMARY KEY,
+            type TEXT NOT NULL,
+            title TEXT NOT NULL,
+            body TEXT NOT NULL,
+            priority TEXT NOT NULL DEFAULT 'normal',
+            created_at TEXT NOT NULL,
+            read_at TEXT,
+            action_url TEXT,
+            metadata TEXT
+        )""",
+        """CREATE INDEX IF NOT EXISTS idx_notifications_created_at
+           ON notifications(created_at DESC)""",
+        """CREATE INDEX IF NOT EXISTS idx_notifications_read_at
+           ON notifications(read_at)""",
+        """CREATE TABLE IF NOT EXISTS proactive_config (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )""",
+    )),
+    # Unread listing filters on read_at IS NULL and orders by created_at
+    Migration(2, "partial index for unread notifications", (
+        """CREATE INDEX IF NOT EXISTS idx_notifications_unread_created
+           ON notifications(created_at DESC) WHERE read_at IS NULL""",
+    )),
+)
+
 
 class NotificationType(Enum):
     """Type of notification."""
@@ -106,49 +139,24 @@ class ProactiveService:
         # Callback for new notifications (can be used to push to frontend)
         self._notification_callback: Optional[Callable] = None
 
+    def _get_connection(self) -> PooledConnection:
+        """Get the pooled writer connection context manager."""
+        return get_pool(self.db_path).writer()
+
+    def _get_read_connection(self) -> PooledConnection:
+        """Get a pooled read-only connection context manager."""
+        return get_pool(self.db_path).reader()
+
     async def _ensure_initialized(self):
-        """Ensure database tables exist."""
+        """Ensure the database schema is migrated to the latest version."""
         if self._initialized:
             return
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             # Enable WAL mode for better concurrency
             await db.execute("PRAGMA journal_mode=WAL")
             await db.execute("PRAGMA busy_timeout=5000")
-
-            # Notifications table
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS notifications (
-                    id TEXT PRIMARY KEY,
-                    type TEXT NOT NULL,
-                    title TEXT NOT NULL,
-                    body TEXT NOT NULL,
-                    priority TEXT NOT NULL DEFAULT 'normal',
-                    created_at TEXT NOT NULL,
-                    read_at TEXT,
-                    action_url TEXT,
-                    metadata TEXT
-                )
-            """)
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_notifications_created_at
-                ON notifications(created_at DESC)
-            """)
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_notifications_read_at
-                ON notifications(read_at)
-            """)
-
-            # Proactive config table
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS proactive_config (
-                    key TEXT PRIMARY KEY,
-                    value TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-            """)
-
-            await db.commit()
+            await apply_migrations(db, _SCHEMA_MIGRATIONS)
         self._initialized = True
 
     def set_notification_callback(self, callback: Callable):
@@ -180,7 +188,7 @@ class ProactiveService:
             metadata=metadata or {}
         )
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute(
                 """INSERT INTO notifications
                    (id, type, title, body, priority, created_at, action_url, metadata)
@@ -244,7 +252,7 @@ class ProactiveService:
         query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(query, params)
             rows = await cursor.fetchall()
 
@@ -254,7 +262,7 @@ class ProactiveService:
         """Get count of unread notifications."""
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 "SELECT COUNT(*) FROM notifications WHERE read_at IS NULL"
             )
@@ -266,7 +274,7 @@ class ProactiveService:
         await self._ensure_initialized()
 
         now = datetime.now().isoformat()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             cursor = await db.execute(
                 "UPDATE notifications SET read_at = ? WHERE id = ? AND read_at IS NULL",
                 (now, notification_id)
@@ -279,7 +287,7 @@ class ProactiveService:
         await self._ensure_initialized()
 
         now = datetime.now().isoformat()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             cursor = await db.execute(
                 "UPDATE notifications SET read_at = ? WHERE read_at IS NULL",
                 (now,)
@@ -291,7 +299,7 @@ class ProactiveService:
         """Delete a notification."""
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             cursor = await db.execute(
                 "DELETE FROM notifications WHERE id = ?",
                 (notification_id,)
@@ -319,7 +327,7 @@ class ProactiveService:
         """Get proactive configuration."""
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute("SELECT key, value FROM proactive_config")
             rows = await cursor.fetchall()
 
@@ -347,7 +355,7 @@ class ProactiveService:
         await self._ensure_initialized()
 
         now = datetime.now().isoformat()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             for key, value in vars(config).items():
                 await db.execute(
                     """INSERT INTO proactive_config (key, value, updated_at)
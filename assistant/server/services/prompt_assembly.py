@@ -0,0 +1,233 @@
+"""Prompt assembly for chat requests.
+
+Everything that goes into an LLM call besides the new message itself —
+conversation history, settings, persona prompt, recalled facts, the user
+profile and (optionally) a network check — comes from independent sources,
+most of them separate SQLite databases. They are fetched concurrently, each
+under its own timeout. A source that fails or is too slow is replaced by a
+neutral default and listed in `AssembledPrompt.degraded`, so a stuck fact
+index delays nothing and a broken profile table does not fail the chat.
+History falls back to the most recent messages rather than to none.
+"""
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import config
+from server.services.memory import DEFAULT_CONVERSATION_ID
+from server.services.metrics import metrics
+from server.services.persona import DEFAULT_SYSTEM_PROMPT
+from server.services.tracing import Trace, start_trace
+
+logger = logging.getLogger(__name__)
+
+# Seconds each source may take before its default is used instead
+SOURCE_TIMEOUTS = {
+    "history": 5.0,
+    "recent_history": 2.0,  # Fallback when history fails
+    "settings": 2.0,
+    "persona": 2.0,
+    "fact_recall": 2.0,
+    "profile": 2.0,
+    "network_check": 1.0,
+}
+
+FACT_RECALL_LIMIT = 10  # Top facts injected into the system prompt
+
+
+@dataclass
+class PromptSources:
+    """Services the prompt is assembled from."""
+    memory: Any
+    settings: Any
+    persona: Any
+    facts: Any
+    profile: Any
+    suggestions: Any
+    degradation: Optional[Any] = None  # Set to include a network check
+
+
+@dataclass
+class AssembledPrompt:
+    """Everything needed to make the LLM call for one chat turn."""
+    conversation_id: str
+    system_prompt: str
+    messages: list
+    context_meta: dict
+    suggestions: list
+    version: str  # Hash of the system prompt; unchanged while its inputs are
+    network_available: Optional[bool] = None  # None when not checked
+    degraded: list[str] = field(default_factory=list)
+
+
+class PromptAssembler:
+    """Builds AssembledPrompts from concurrently fetched sources."""
+
+    def __init__(self, timeouts: Optional[dict] = None):
+        self.timeouts = {**SOURCE_TIMEOUTS, **(timeouts or {})}
+
+    async def assemble(
+        self,
+        sources: PromptSources,
+        conversation_id: str,
+        message: str,
+        trace: Optional[Trace] = None,
+    ) -> AssembledPrompt:
+        """Fetch every prompt input concurrently and build the system prompt.
+
+        Args:
+            sources: Services to read from
+            conversation_id: Conversation the turn belongs to
+            message: The new user message (used for fact recall and tool
+                suggestions; it is expected to be stored already)
+            trace: Trace to record the per-source spans in
+        """
+        trace = trace or start_trace("prompt_assembly")
+        context_span = trace.start_span("context_build")
+        degraded: list[str] = []
+
+        async def fetch(name: str, coro, default):
+            with trace.span(name, parent=context_span) as span:
+                try:
+                    return await asyncio.wait_for(coro, self.timeouts[name])
+                except asyncio.TimeoutError:
+                    logger.warning(f"Prompt source '{name}' timed out after {self.timeouts[name]}s")
+                    reason = "timeout"
+                except Exception as e:
+                    logger.warning(f"Prompt source '{name}' failed: {e}")
+                    reason = type(e).__name__
+                span.set_attribute("degraded", reason)
+                metrics.record_error("prompt_assembly", f"{name}:{reason}")
+                degraded.append(name)
+                return default
+
+        async def load_history():
+            if conversation_id == DEFAULT_CONVERSATION_ID:
+                return await sources.memory.get_context_for_api()
+            messages = await sources.memory.get_conversation_messages(conversation_id)
+            return messages, {
+                "total_messages": len(messages) - 1,
+                "summarized_count": 0,
+                "verbatim_count": len(messages) - 1,
+            }
+
+        async def load_recent_history():
+            # A bounded window of the latest messages, without summaries
+            conversation = await sources.memory.get_conversation(
+                conversation_id, limit=config.RECENT_MESSAGES_VERBATIM
+            )
+            recent = [
+                {"role": m["role"], "content": m["content"]}
+                for m in (conversation["messages"] if conversation else [])
+            ]
+            if not recent or recent[-1] != {"role": "user", "content": message}:
+                recent.append({"role": "user", "content": message})
+            return [{"role": "system", "content": DEFAULT_SYSTEM_PROMPT}, *recent], {
+                "total_messages": len(recent),
+                "summarized_count": 0,
+                "verbatim_count": len(recent),
+            }
+
+        async def history_with_fallback():
+            history = await fetch("history", load_history(), None)
+            if history is not None:
+                return history
+            return await fetch("recent_history", load_recent_history(), (
+                [{"role": "user", "content": message}],
+                {"total_messages": 1, "summarized_count": 0, "verbatim_count": 1},
+            ))
+
+        settings_task = asyncio.create_task(fetch("settings", sources.settings.get_all(), {}))
+
+        async def load_persona():
+            # The persona falls back to the settings prompt, so it waits for
+            # settings (shielded: a persona timeout must not cancel them)
+            settings = await asyncio.shield(settings_task)
+            return await sources.persona.get_active_system_prompt(
+                conversation_id=conversation_id,
+                default_system_prompt=settings.get("system_prompt", ""),
+            )
+
+        fetches = [
+            history_with_fallback(),
+            settings_task,
+            fetch("persona", load_persona(), None),
+            fetch("fact_recall", sources.facts.recall_facts(query=message, limit=FACT_RECALL_LIMIT), []),
+            fetch("profile", sources.profile.get_profile_summary(), ""),
+        ]
+        if sources.degradation is not None:
+            fetches.append(fetch("network_check", sources.degradation.check_network(), None))
+
+        try:
+            # Tool suggestions are CPU-only; work them out while the reads run
+            with trace.span("tool_suggestions", parent=context_span):
+                suggestions = sources.suggestions.analyze_message(message)
+            results = await asyncio.gather(*fetches)
+        finally:
+            if not settings_task.done():
+                settings_task.cancel()
+        (messages, context_meta), settings, base_prompt, facts, profile_summary = results[:5]
+        network_available = results[5] if len(results) > 5 else None
+
+        if base_prompt is None:
+            base_prompt = settings.get("system_prompt") or DEFAULT_SYSTEM_PROMPT
+
+        if context_meta["summarized_count"] > 0:
+            logger.info(
+                f"Context: {context_meta['total_messages']} total msgs, "
+                f"{context_meta['summarized_count']} summarized, "
+                f"{context_meta['verbatim_count']} verbatim"
+            )
+        if network_available is False:
+            logger.warning("Network unavailable, API calls may fail")
+
+        # Build system prompt (base + profile + facts + tool suggestions)
+        system_parts = [base_prompt]
+        if profile_summary:
+            logger.info("Injecting user profile summary into system prompt")
+            system_parts.append(profile_summary)
+
+        facts_context = sources.facts.format_facts_for_system_prompt(facts)
+        if facts_context:
+            logger.info(f"Recalled {len(facts)} relevant facts for context")
+            system_parts.append(facts_context)
+
+        if suggestions:
+            system_parts.append(sources.suggestions.get_system_prompt_injection(suggestions))
+            logger.info(f"Suggesting {len(suggestions)} relevant tools: {[s.name for s in suggestions]}")
+        else:
+            # Include general tool summary when no specific suggestions
+            summary = sources.suggestions.get_available_tools_summary()
+            if summary:
+                system_parts.append(summary)
+
+        system_prompt = "\n\n".join(system_parts)
+        assembled = AssembledPrompt(
+            conversation_id=conversation_id,
+            system_prompt=system_prompt,
+            messages=messages,
+            context_meta=context_meta,
+            suggestions=suggestions,
+            version=hashlib.sha256(system_prompt.encode()).hexdigest()[:16],
+            network_available=network_available,
+            degraded=degraded,
+        )
+
+        context_span.set_attribute("prompt_version", assembled.version)
+        if degraded:
+            context_span.set_attribute("degraded_sources", ",".join(degraded))
+        context_span.end()
+        return assembled
+
+
+_prompt_assembler: Optional[PromptAssembler] = None
+
+
+def get_prompt_assembler() -> PromptAssembler:
+    """Get or create the prompt assembler singleton."""
+    global _prompt_assembler
+    if _prompt_assembler is None:
+        _prompt_assembler = PromptAssembler()
+    return _prompt_assembler
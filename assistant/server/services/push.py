@@ -3,7 +3,6 @@
 Implements Web Push protocol with VAPID authentication.
 Integrates with ProactiveService to send OS-level notifications.
 """
-import aiosqlite
 import json
 import logging
 from dataclasses import dataclass
@@ -12,6 +11,8 @@ from pathlib import Path
 from typing import Optional
 import base64
 
+from server.services.storage import PooledConnection, get_pool
+
 try:
     from py_vapid import Vapid01  # type: ignore[import-untyped]
     from pywebpush import webpush, WebPushException  # type: ignore[import-untyped]
@@ -98,12 +99,20 @@ class PushService:
             logger.error(f"Failed to generate VAPID keys: {e}")
             raise
 
+    def _get_connection(self) -> PooledConnection:
+        """Get the pooled writer connection context manager."""
+        return get_pool(self.db_path).writer()
+
+    def _get_read_connection(self) -> PooledConnection:
+        """Get a pooled read-only connection context manager."""
+        return get_pool(self.db_path).reader()
+
     async def _ensure_initialized(self):
         """Ensure database tables exist."""
         if self._initialized:
             return
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute("PRAGMA journal_mode=WAL")
             await db.execute("PRAGMA busy_timeout=5000")
 
@@ -152,7 +161,7 @@ class PushService:
             user_agent=user_agent
         )
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute(
                 """INSERT OR REPLACE INTO push_subscriptions
                    (id, endpoint, p256dh, auth, created_at, user_agent)
@@ -175,7 +184,7 @@ class PushService:
         """Get all active push subscriptions."""
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 "SELECT id, endpoint, p256dh, auth, created_at, user_agent FROM push_subscriptions"
             )
@@ -197,7 +206,7 @@ class PushService:
         """Delete a push subscription."""
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             cursor = await db.execute(
                 "DELETE FROM push_subscriptions WHERE endpoint = ?",
                 (endpoint,)
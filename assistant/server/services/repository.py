@@ -7,9 +7,14 @@ Security:
 - Path validation prevents directory traversal attacks
 - Configurable allowed directories (REPOSITORY_PATHS)
 - Binary file detection
-- Size limits prevent reading huge files
+- Size limits: huge files are read a window of lines at a time
 - Sensitive file filtering (.env, credentials, etc.)
 
+search_code is narrowed by a trigram index (see code_index.py) once it
+has been built; until then, and for directories outside the index, it
+scans the tree. Large scans (and recursive listings of wide trees) are
+partitioned across a process pool, with results merged in file order.
+
 Requires LOCAL or higher permission level.
 """
 
@@ -18,10 +23,19 @@ import re
 import fnmatch
 import logging
 import mimetypes
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 from dataclasses import dataclass
 
+import config
+from .code_index import CodeIndex
+from .line_index import get_line_index_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -80,6 +94,85 @@ class SearchMatch:
     context_after: list[str]
 
 
+# Worker processes for parallel scans (regex matching is CPU-bound, so
+# threads would serialize on the GIL); 0 or 1 disables parallel scans
+SCAN_WORKERS = config.REPOSITORY_SCAN_WORKERS
+# search_code scans at least this many files in parallel
+PARALLEL_SCAN_MIN_FILES = 2000
+# Files per search_code task
+SCAN_CHUNK_FILES = 250
+# Recursive list_files runs in parallel when the directory has this many subdirectories
+PARALLEL_LIST_MIN_DIRS = 8
+
+_scan_pool: Optional[ProcessPoolExecutor] = None
+# Per-worker-process services, keyed by RepositoryService._scan_settings()
+_worker_services: dict[tuple, "RepositoryService"] = {}
+
+
+def get_scan_pool() -> ProcessPoolExecutor:
+    """Get the process pool used for parallel scans."""
+    global _scan_pool
+    if _scan_pool is None:
+        # spawn: forking a threaded server process can deadlock the children
+        _scan_pool = ProcessPoolExecutor(
+            max_workers=SCAN_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _scan_pool
+
+
+def shutdown_scan_pool() -> None:
+    """Shut down the scan process pool (called on app shutdown)."""
+    global _scan_pool
+    if _scan_pool is not None:
+        _scan_pool.shutdown(wait=False, cancel_futures=True)
+        _scan_pool = None
+
+
+def _stream_ordered(tasks: Iterator[tuple], window: int) -> Iterator:
+    """Run (function, *args) tasks on the scan pool, yielding results in task order.
+
+    At most window tasks are queued ahead of the consumer; tasks not yet
+    started are cancelled when the consumer stops early.
+    """
+    pool = get_scan_pool()
+    pending = deque(pool.submit(*task) for task in islice(tasks, window))
+    try:
+        while pending:
+            result = pending.popleft().result()
+            for task in islice(tasks, 1):
+                pending.append(pool.submit(*task))
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _worker_service(settings: tuple) -> "RepositoryService":
+    """The RepositoryService of a scan worker process (same rules as the caller's)."""
+    service = _worker_services.get(settings)
+    if service is None:
+        allowed_paths, max_file_size, max_line_length = settings
+        service = RepositoryService(list(allowed_paths), max_file_size, max_line_length)
+        _worker_services[settings] = service
+    return service
+
+
+def _search_chunk(settings, paths, dir_path, pattern, flags, context_lines, limit, check):
+    """Scan worker task: search_code over a slice of the file list."""
+    return _worker_service(settings)._search_files(
+        [Path(p) for p in paths], Path(dir_path), re.compile(pattern, flags), context_lines, limit, check
+    )
+
+
+def _list_chunk(settings, paths, dir_path, pattern, recursive, max_depth, include_hidden, limit):
+    """Scan worker task: list_files over some top-level entries and their subtrees."""
+    service = _worker_service(settings)
+    files = []
+    for path in paths:
+        service._list_tree(Path(path), Path(dir_path), 0, pattern, recursive, max_depth, include_hidden, files, limit)
+    return files
+
+
 class RepositoryService:
     """Service for repository analysis operations.
 
@@ -92,6 +185,8 @@ class RepositoryService:
     DEFAULT_MAX_LINE_LENGTH = 2000  # Truncate long lines
     DEFAULT_MAX_SEARCH_RESULTS = 100
     DEFAULT_MAX_LIST_DEPTH = 10
+    # Lines per read_file window for files over max_file_size
+    LARGE_FILE_WINDOW_LINES = 2000
 
     def __init__(
         self,
@@ -109,6 +204,7 @@ class RepositoryService:
         """
         self.max_file_size = max_file_size
         self.max_line_length = max_line_length
+        self.index: Optional[CodeIndex] = None
 
         if allowed_paths:
             self._allowed_paths = [Path(p).resolve() for p in allowed_paths]
@@ -198,6 +294,43 @@ class RepositoryService:
 
         return False
 
+    def _is_searchable(self, path: Path) -> bool:
+        """Check a file may be searched (not sensitive, not binary, allowed)."""
+        return (
+            not self._is_sensitive_file(path)
+            and not self._is_binary_file(path)
+            and self._is_path_allowed(path)
+        )
+
+    def enable_index(self, db_path: Optional[Path] = None) -> CodeIndex:
+        """Attach a trigram index over the allowed paths (built by index.start()).
+
+        Args:
+            db_path: SQLite file to keep the index in (None = memory only)
+        """
+        self.index = CodeIndex(
+            roots=self._allowed_paths,
+            db_path=db_path,
+            accept=self._is_searchable,
+            max_file_size=self.max_file_size,
+        )
+        return self.index
+
+    def get_index_stats(self) -> dict:
+        """Statistics for the code search index."""
+        if self.index is None:
+            return {"enabled": False}
+        return self.index.get_stats()
+
+    def _scan_settings(self) -> tuple:
+        """What a scan worker needs to apply this service's rules."""
+        return (tuple(str(p) for p in self._allowed_paths), self.max_file_size, self.max_line_length)
+
+    def _use_parallel(self, parallel: Optional[bool], size: int, threshold: int) -> bool:
+        if parallel is False or SCAN_WORKERS < 2:
+            return False
+        return parallel is True or size >= threshold
+
     def _truncate_line(self, line: str) -> str:
         """Truncate line if too long."""
         if len(line) > self.max_line_length:
@@ -232,6 +365,11 @@ class RepositoryService:
     ) -> dict:
         """Read contents of a file.
 
+        Line ranges are read by seeking to the range's byte offset (from a
+        cached line-offset index), and at most max_length characters are
+        decoded. Files over max_file_size are read in windows of
+        LARGE_FILE_WINDOW_LINES lines unless end_line is given.
+
         Args:
             file_path: Path to file (absolute or relative to allowed path)
             max_length: Maximum characters to return (None = no limit up to max_file_size)
@@ -245,6 +383,8 @@ class RepositoryService:
             - path: str - resolved path
             - lines: int - total line count
             - truncated: bool - whether content was truncated
+            - windowed: bool - a large file was read in a window
+            - size: int - file size in bytes
             - error: str (if not success)
         """
         # Validate path
@@ -259,14 +399,6 @@ class RepositoryService:
         if not path.is_file():
             return {"success": False, "error": f"Not a file: {file_path}"}
 
-        # Check file size
-        file_size = path.stat().st_size
-        if file_size > self.max_file_size:
-            return {
-                "success": False,
-                "error": f"File too large: {file_size:,} bytes (max: {self.max_file_size:,})"
-            }
-
         # Check if binary
         if self._is_binary_file(path):
             return {
@@ -275,31 +407,25 @@ class RepositoryService:
             }
 
         try:
-            with open(path, "r", encoding="utf-8", errors="replace") as f:
-                lines = f.readlines()
-
-            total_lines = len(lines)
-
-            # Handle line range
-            start_idx = max(0, start_line - 1)  # Convert to 0-indexed
-            end_idx = end_line if end_line else total_lines
+            stat = path.stat()
+            index = get_line_index_cache().get(path, stat.st_mtime_ns, stat.st_size)
+            total_lines = index.line_count
 
-            selected_lines = lines[start_idx:end_idx]
-            content = "".join(selected_lines)
+            # Large files are served a window at a time
+            windowed = stat.st_size > self.max_file_size and end_line is None
+            if windowed:
+                end_line = max(1, start_line) + self.LARGE_FILE_WINDOW_LINES - 1
+            last_line = min(end_line or total_lines, total_lines)
 
-            # Apply truncation
-            truncated = False
-            effective_max = max_length or self.max_file_size
-            if len(content) > effective_max:
-                content = content[:effective_max]
-                truncated = True
+            effective_max = min(max_length, self.max_file_size) if max_length else self.max_file_size
+            content, truncated = index.read(start_line, last_line, effective_max)
 
             # Truncate individual long lines
             content_lines = content.split("\n")
             content_lines = [self._truncate_line(line) for line in content_lines]
             content = "\n".join(content_lines)
 
-            logger.info(f"read_file: {path}, {total_lines} lines, {len(content)} chars")
+            logger.info(f"read_file: {path}, lines {start_line}-{last_line} of {total_lines}, {len(content)} chars")
 
             return {
                 "success": True,
@@ -307,12 +433,12 @@ class RepositoryService:
                 "path": str(path),
                 "lines": total_lines,
                 "truncated": truncated,
+                "windowed": windowed,
+                "size": stat.st_size,
                 "start_line": start_line,
-                "end_line": min(end_line or total_lines, total_lines),
+                "end_line": last_line,
             }
 
-        except UnicodeDecodeError:
-            return {"success": False, "error": "File encoding error: not valid UTF-8"}
         except Exception as e:
             logger.error(f"read_file error: {e}")
             return {"success": False, "error": f"Error reading file: {e}"}
@@ -324,6 +450,7 @@ class RepositoryService:
         recursive: bool = False,
         max_depth: Optional[int] = None,
         include_hidden: bool = False,
+        parallel: Optional[bool] = None,
     ) -> dict:
         """List files in a directory.
 
@@ -333,6 +460,8 @@ class RepositoryService:
             recursive: Whether to search subdirectories
             max_depth: Maximum directory depth (None = no limit)
             include_hidden: Include hidden files/directories (starting with .)
+            parallel: Walk top-level subtrees in worker processes
+                      (None = when recursive over a wide directory)
 
         Returns:
             Dict with:
@@ -359,50 +488,14 @@ class RepositoryService:
             max_results = 1000  # Prevent huge listings
             effective_depth = max_depth or self.DEFAULT_MAX_LIST_DEPTH
 
-            def process_path(p: Path, current_depth: int):
-                """Process a path and add to results."""
-                if len(files) >= max_results:
-                    return
-
-                # Skip hidden unless requested
-                if not include_hidden and p.name.startswith("."):
-                    return
-
-                # Skip sensitive files
-                if p.is_file() and self._is_sensitive_file(p):
-                    return
-
-                # Check if matches pattern
-                if pattern != "*" and not fnmatch.fnmatch(p.name, pattern):
-                    if not (p.is_dir() and recursive):  # Still process dirs for recursion
-                        return
-
-                # Add matching files
-                if fnmatch.fnmatch(p.name, pattern) or pattern == "*":
-                    try:
-                        stat = p.stat()
-                        files.append(FileInfo(
-                            path=str(p.relative_to(dir_path)),
-                            name=p.name,
-                            is_file=p.is_file(),
-                            is_directory=p.is_dir(),
-                            size=stat.st_size if p.is_file() else 0,
-                            extension=p.suffix.lower() if p.is_file() else "",
-                        ))
-                    except OSError:
-                        pass
-
-                # Recurse into directories
-                if p.is_dir() and recursive and current_depth < effective_depth:
-                    try:
-                        for child in sorted(p.iterdir()):
-                            process_path(child, current_depth + 1)
-                    except PermissionError:
-                        pass
-
-            # Start processing
-            for item in sorted(dir_path.iterdir()):
-                process_path(item, 0)
+            items = sorted(dir_path.iterdir())
+            subdirs = sum(1 for item in items if item.is_dir())
+            if recursive and self._use_parallel(parallel, subdirs, PARALLEL_LIST_MIN_DIRS):
+                files = self._list_parallel(items, dir_path, pattern, effective_depth, include_hidden, max_results)
+            else:
+                for item in items:
+                    self._list_tree(item, dir_path, 0, pattern, recursive, effective_depth,
+                                    include_hidden, files, max_results)
 
             truncated = len(files) >= max_results
 
@@ -420,6 +513,98 @@ class RepositoryService:
             logger.error(f"list_files error: {e}")
             return {"success": False, "error": f"Error listing directory: {e}"}
 
+    def _list_tree(
+        self,
+        p: Path,
+        dir_path: Path,
+        current_depth: int,
+        pattern: str,
+        recursive: bool,
+        max_depth: int,
+        include_hidden: bool,
+        files: list[FileInfo],
+        max_results: int,
+    ):
+        """Add p (and, when recursive, its subtree) to a list_files result."""
+        if len(files) >= max_results:
+            return
+
+        # Skip hidden unless requested
+        if not include_hidden and p.name.startswith("."):
+            return
+
+        # Skip sensitive files
+        if p.is_file() and self._is_sensitive_file(p):
+            return
+
+        # Check if matches pattern
+        if pattern != "*" and not fnmatch.fnmatch(p.name, pattern):
+            if not (p.is_dir() and recursive):  # Still process dirs for recursion
+                return
+
+        # Add matching files
+        if fnmatch.fnmatch(p.name, pattern) or pattern == "*":
+            try:
+                stat = p.stat()
+                files.append(FileInfo(
+                    path=str(p.relative_to(dir_path)),
+                    name=p.name,
+                    is_file=p.is_file(),
+                    is_directory=p.is_dir(),
+                    size=stat.st_size if p.is_file() else 0,
+                    extension=p.suffix.lower() if p.is_file() else "",
+                ))
+            except OSError:
+                pass
+
+        # Recurse into directories
+        if p.is_dir() and recursive and current_depth < max_depth:
+            try:
+                for child in sorted(p.iterdir()):
+                    self._list_tree(child, dir_path, current_depth + 1, pattern, recursive,
+                                    max_depth, include_hidden, files, max_results)
+            except PermissionError:
+                pass
+
+    def _list_parallel(
+        self,
+        items: list[Path],
+        dir_path: Path,
+        pattern: str,
+        max_depth: int,
+        include_hidden: bool,
+        max_results: int,
+    ) -> list[FileInfo]:
+        """Recursive list_files with each top-level directory walked by a worker process.
+
+        Consecutive top-level files share a task. Results are merged in
+        listing order and the walk stops once max_results entries are in.
+        """
+        groups: list[list[str]] = []
+        for item in items:
+            if item.is_dir() or not groups or Path(groups[-1][-1]).is_dir():
+                groups.append([])
+            groups[-1].append(str(item))
+
+        settings = self._scan_settings()
+        tasks = (
+            (_list_chunk, settings, group, str(dir_path), pattern, True, max_depth, include_hidden, max_results)
+            for group in groups
+        )
+        files: list[FileInfo] = []
+        try:
+            for chunk in _stream_ordered(tasks, SCAN_WORKERS * 2):
+                files.extend(chunk)
+                if len(files) >= max_results:
+                    break
+        except BrokenProcessPool:
+            logger.warning("Scan workers died, listing serially")
+            shutdown_scan_pool()
+            files = []
+            for item in items:
+                self._list_tree(item, dir_path, 0, pattern, True, max_depth, include_hidden, files, max_results)
+        return files[:max_results]
+
     def search_code(
         self,
         pattern: str,
@@ -429,6 +614,7 @@ class RepositoryService:
         max_results: int = DEFAULT_MAX_SEARCH_RESULTS,
         case_sensitive: bool = True,
         regex: bool = True,
+        parallel: Optional[bool] = None,
     ) -> dict:
         """Search for code patterns in files.
 
@@ -440,14 +626,18 @@ class RepositoryService:
             max_results: Maximum matches to return
             case_sensitive: Whether search is case-sensitive
             regex: Whether pattern is a regex (if False, literal match)
+            parallel: Split the files across worker processes
+                      (None = when there are PARALLEL_SCAN_MIN_FILES or more)
 
         Returns:
             Dict with:
             - success: bool
             - matches: list[SearchMatch] (if success)
-            - total: int - total matches found
-            - files_searched: int
+            - total: int - total matches found (a parallel scan stops
+              counting once more than max_results are found)
+            - files_searched: int - searchable files in scope
             - truncated: bool
+            - indexed: bool - whether the trigram index narrowed the search
             - error: str (if not success)
         """
         # Validate path
@@ -469,70 +659,33 @@ class RepositoryService:
         except re.error as e:
             return {"success": False, "error": f"Invalid regex pattern: {e}"}
 
-        matches = []
-        files_searched = 0
-        total_matches = 0
-
         try:
-            # Find all matching files
-            if "**" in file_pattern:
-                file_paths = list(dir_path.glob(file_pattern))
+            # Only files the index can't rule out, already checked for searchability
+            candidates = self.index.candidates(search_re, dir_path, file_pattern) if self.index else None
+            if candidates is not None:
+                file_paths = candidates[0]
+            elif "**" in file_pattern:
+                file_paths = sorted(dir_path.glob(file_pattern), key=str)
             else:
-                file_paths = list(dir_path.rglob(file_pattern))
-
-            for file_path in file_paths:
-                if not file_path.is_file():
-                    continue
-
-                # Skip sensitive and binary
-                if self._is_sensitive_file(file_path):
-                    continue
-                if self._is_binary_file(file_path):
-                    continue
-
-                # Check path is allowed
-                if not self._is_path_allowed(file_path):
-                    continue
-
-                # Search file
-                try:
-                    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-                        lines = f.readlines()
-
-                    files_searched += 1
-
-                    for line_num, line in enumerate(lines, 1):
-                        if search_re.search(line):
-                            total_matches += 1
-
-                            if len(matches) < max_results:
-                                # Get context
-                                start = max(0, line_num - 1 - context_lines)
-                                end = min(len(lines), line_num + context_lines)
-
-                                context_before = [
-                                    self._truncate_line(lines[i].rstrip())
-                                    for i in range(start, line_num - 1)
-                                ]
-                                context_after = [
-                                    self._truncate_line(lines[i].rstrip())
-                                    for i in range(line_num, end)
-                                ]
-
-                                matches.append(SearchMatch(
-                                    file=str(file_path.relative_to(dir_path)),
-                                    line_number=line_num,
-                                    line=self._truncate_line(line.rstrip()),
-                                    context_before=context_before,
-                                    context_after=context_after,
-                                ))
-
-                except (IOError, UnicodeDecodeError):
-                    continue
+                file_paths = sorted(dir_path.rglob(file_pattern), key=str)
+
+            check = candidates is None
+            scan = None
+            if self._use_parallel(parallel, len(file_paths), PARALLEL_SCAN_MIN_FILES):
+                scan = self._search_parallel(file_paths, dir_path, search_re, context_lines, max_results, check)
+            if scan is None:
+                scan = self._search_files(file_paths, dir_path, search_re, context_lines, max_results, check)
+            matches, total_matches, files_searched = scan
+            if candidates is not None:
+                files_searched = candidates[1]
 
             truncated = total_matches > max_results
 
-            logger.info(f"search_code: pattern={pattern}, searched {files_searched} files, {total_matches} matches")
+            logger.info(
+                f"search_code: pattern={pattern}, searched {files_searched} files"
+                f"{f' ({len(file_paths)} index candidates)' if candidates is not None else ''}, "
+                f"{total_matches} matches"
+            )
 
             return {
                 "success": True,
@@ -540,12 +693,118 @@ class RepositoryService:
                 "total": total_matches,
                 "files_searched": files_searched,
                 "truncated": truncated,
+                "indexed": candidates is not None,
             }
 
         except Exception as e:
             logger.error(f"search_code error: {e}")
             return {"success": False, "error": f"Error searching: {e}"}
 
+    def _search_files(
+        self,
+        file_paths: list[Path],
+        dir_path: Path,
+        search_re: re.Pattern,
+        context_lines: int,
+        max_results: int,
+        check: bool = True,
+    ) -> tuple[list[SearchMatch], int, int]:
+        """Search files in order.
+
+        Args:
+            check: Skip non-files and files refused by the sensitive, binary
+                   and allow-list rules (already done for index candidates)
+
+        Returns:
+            (up to max_results matches, total matches, files searched)
+        """
+        matches = []
+        files_searched = 0
+        total_matches = 0
+
+        for file_path in file_paths:
+            if check:
+                if not file_path.is_file():
+                    continue
+                # Skip sensitive, binary and disallowed (symlinked out) files
+                if not self._is_searchable(file_path):
+                    continue
+
+            # Search file
+            try:
+                with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+                    lines = f.readlines()
+
+                files_searched += 1
+
+                for line_num, line in enumerate(lines, 1):
+                    if search_re.search(line):
+                        total_matches += 1
+
+                        if len(matches) < max_results:
+                            # Get context
+                            start = max(0, line_num - 1 - context_lines)
+                            end = min(len(lines), line_num + context_lines)
+
+                            context_before = [
+                                self._truncate_line(lines[i].rstrip())
+                                for i in range(start, line_num - 1)
+                            ]
+                            context_after = [
+                                self._truncate_line(lines[i].rstrip())
+                                for i in range(line_num, end)
+                            ]
+
+                            matches.append(SearchMatch(
+                                file=str(file_path.relative_to(dir_path)),
+                                line_number=line_num,
+                                line=self._truncate_line(line.rstrip()),
+                                context_before=context_before,
+                                context_after=context_after,
+                            ))
+
+            except (IOError, UnicodeDecodeError):
+                continue
+
+        return matches, total_matches, files_searched
+
+    def _search_parallel(
+        self,
+        file_paths: list[Path],
+        dir_path: Path,
+        search_re: re.Pattern,
+        context_lines: int,
+        max_results: int,
+        check: bool,
+    ) -> Optional[tuple[list[SearchMatch], int, int]]:
+        """_search_files with the file list split into chunks for worker processes.
+
+        Chunks are merged in file order, so results are the same as a serial
+        scan; scanning stops once more than max_results matches are found.
+        Returns None if the pool failed (the caller scans serially).
+        """
+        settings = self._scan_settings()
+        tasks = (
+            (_search_chunk, settings, [str(p) for p in file_paths[i:i + SCAN_CHUNK_FILES]], str(dir_path),
+             search_re.pattern, search_re.flags, context_lines, max_results, check)
+            for i in range(0, len(file_paths), SCAN_CHUNK_FILES)
+        )
+        matches: list[SearchMatch] = []
+        total_matches = 0
+        files_searched = 0
+        try:
+            for chunk_matches, chunk_total, chunk_searched in _stream_ordered(tasks, SCAN_WORKERS * 2):
+                matches.extend(chunk_matches[:max_results - len(matches)])
+                total_matches += chunk_total
+                files_searched += chunk_searched
+                if total_matches > max_results:
+                    break
+        except BrokenProcessPool:
+            logger.warning("Scan workers died, searching serially")
+            shutdown_scan_pool()
+            return None
+        return matches, total_matches, files_searched
+
     def get_file_info(self, file_path: str) -> dict:
         """Get information about a file without reading contents.
 
@@ -604,6 +863,15 @@ def get_repository_service(
         if env_paths and not allowed_paths:
             allowed_paths = [p.strip() for p in env_paths.split(":") if p.strip()]
 
-        _repository_service = RepositoryService(allowed_paths=allowed_paths)
+        if _repository_service is not None and _repository_service.index is not None:
+            _repository_service.index.stop()
+
+        _repository_service = RepositoryService(
+            allowed_paths=allowed_paths,
+            max_file_size=config.REPOSITORY_MAX_FILE_SIZE,
+        )
+
+        if config.CODE_INDEX_ENABLED:
+            _repository_service.enable_index(config.BASE_DIR / "memory" / "code_index.db")
 
     return _repository_service
@@ -6,21 +6,135 @@ This module provides:
 - SQLite persistence across restarts
 - Task history and logging
 - Notification on task completion
+
+Due times are kept in an in-memory min-heap, so the run loop sleeps until
+the next task is due instead of polling the database. Naive schedule
+times are local wall-clock times and are converted to epoch timestamps
+for waiting, which keeps waits correct across DST changes.
+
+The cron weekday field uses standard numbering, 0 = Sunday ... 6 = Saturday.
+Earlier versions matched it against datetime.weekday() (0 = Monday); schema
+migration 3 rewrites stored recurring schedules so they keep firing on the
+same days.
 """
 import asyncio
-import aiosqlite
+import heapq
 import json
 import logging
 import re
+import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Callable, Optional
 
+from server.services.migrations import Migration, apply_migrations
+from server.services.metrics import metrics
+from server.services.storage import PooledConnection, get_pool
+
 logger = logging.getLogger(__name__)
 
+# Task runs allowed at the same time; further due tasks wait for a slot
+MAX_CONCURRENT_RUNS = 4
+
+# How far ahead CronParser looks for the next run (one year, in minutes)
+CRON_SEARCH_HORIZON = timedelta(minutes=525599)
+
+# Most run times a cron preview (API or CLI) may ask for
+MAX_PREVIEW_RUNS = 500
+
+# Longest the run loop sleeps before re-reading schedules from the database.
+# Picks up tasks written by other processes (the CLI) and bounds the error
+# after wall-clock jumps (suspend, NTP), which monotonic waits don't see.
+RESYNC_SECONDS = 60.0
+
+
+def _cron_weekdays_from_monday(cron_expr: str) -> str:
+    """Rewrite a cron expression whose weekday field counts from 0 = Monday.
+
+    Returns the expression unchanged when its weekday field is * or it
+    doesn't parse.
+    """
+    parts = cron_expr.split()
+    if len(parts) != 5 or parts[4] == "*":
+        return cron_expr
+    try:
+        weekdays = CronParser.parse(cron_expr)["weekday"]
+    except ValueError:
+        return cron_expr
+    parts[4] = ",".join(str(day) for day in sorted((day + 1) % 7 for day in weekdays))
+    return " ".join(parts)
+
+
+async def _migrate_cron_weekdays(db):
+    """Convert stored recurring schedules to cron weekday numbering (0 = Sunday)."""
+    cursor = await db.execute(
+        "SELECT id, schedule FROM scheduled_tasks WHERE task_type = ?",
+        (TaskType.RECURRING.value,)
+    )
+    for task_id, schedule in await cursor.fetchall():
+        migrated = _cron_weekdays_from_monday(schedule)
+        if migrated != schedule:
+            await db.execute(
+                "UPDATE scheduled_tasks SET schedule = ? WHERE id = ?", (migrated, task_id)
+            )
+            logger.info(f"Scheduled task {task_id}: schedule '{schedule}' is now '{migrated}'")
+
+
+# Schema history for the scheduler database (see server/services/migrations.py)
+_SCHEMA_MIGRATIONS = (
+    Migration(1, "initial schema", (
+        """CREATE TABLE IF NOT EXISTS scheduled_tasks (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            task_type TEXT NOT NULL,
+            schedule TEXT NOT NULL,
+            action TEXT NOT NULL,
+            action_params TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            created_at TEXT NOT NULL,
+            last_run TEXT,
+            next_run TEXT,
+            run_count INTEGER DEFAULT 0,
+            error_count INTEGER DEFAULT 0,
+            last_error TEXT,
+            metadata TEXT,
+            enabled INTEGER DEFAULT 1
+        )""",
+        """CREATE INDEX IF NOT EXISTS idx_tasks_next_run
+           ON scheduled_tasks(next_run)""",
+        """CREATE INDEX IF NOT EXISTS idx_tasks_status
+           ON scheduled_tasks(status)""",
+        # Task execution history
+        """CREATE TABLE IF NOT EXISTS task_executions (
+            id TEXT PRIMARY KEY,
+            task_id TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            completed_at TEXT,
+            status TEXT NOT NULL,
+            result TEXT,
+            error TEXT,
+            duration_ms INTEGER,
+            FOREIGN KEY (task_id) REFERENCES scheduled_tasks(id)
+        )""",
+        """CREATE INDEX IF NOT EXISTS idx_executions_task_id
+           ON task_executions(task_id)""",
+        """CREATE INDEX IF NOT EXISTS idx_executions_started_at
+           ON task_executions(started_at DESC)""",
+    )),
+    # get_task_history filters on task_id and orders by started_at
+    Migration(2, "composite task history index", (
+        """CREATE INDEX IF NOT EXISTS idx_executions_task_started
+           ON task_executions(task_id, started_at DESC)""",
+        "DROP INDEX IF EXISTS idx_executions_task_id",
+    )),
+    # The weekday field switched from datetime.weekday() to cron numbering
+    Migration(3, "cron weekday numbering (0 = Sunday)", (), upgrade=_migrate_cron_weekdays),
+)
+
 
 class TaskType(Enum):
     """Type of scheduled task."""
@@ -38,6 +152,10 @@ class TaskStatus(Enum):
     DISABLED = "disabled"
 
 
+# Statuses an enabled task with a next_run can be started from
+_RUNNABLE_STATUSES = (TaskStatus.PENDING, TaskStatus.COMPLETED, TaskStatus.FAILED)
+
+
 @dataclass
 class ScheduledTask:
     """Represents a scheduled task."""
@@ -96,6 +214,10 @@ class CronParser:
 
     Supports standard 5-field cron: minute hour day month weekday
     Special values: * (any), */n (every n), n-m (range), n,m (list)
+
+    Times are naive local wall-clock times. A time skipped by a DST change
+    runs once, right after the gap; a time repeated by one runs once, at
+    its first occurrence.
     """
 
     FIELDS = ["minute", "hour", "day", "month", "weekday"]
@@ -163,6 +285,11 @@ class CronParser:
 
         return values
 
+    @classmethod
+    def compile(cls, cron_expr: str) -> "CompiledCron":
+        """Compile a cron expression to per-field bitmasks (cached per expression)."""
+        return _compile_cron(cron_expr.strip())
+
     @classmethod
     def get_next_run(cls, cron_expr: str, after: Optional[datetime] = None) -> datetime:
         """Calculate the next run time for a cron expression.
@@ -176,25 +303,49 @@ class CronParser:
         """
         if after is None:
             after = datetime.now()
+        return cls._next_run(cls.compile(cron_expr), cron_expr, after)
 
-        # Start from the next minute
-        current = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
-
-        parsed = cls.parse(cron_expr)
-
-        # Search forward up to 1 year
-        max_iterations = 525600  # minutes in a year
+    @classmethod
+    def next_n_runs(cls, cron_expr: str, n: int, after: Optional[datetime] = None) -> list[datetime]:
+        """Calculate the next n run times for a cron expression.
 
-        for _ in range(max_iterations):
-            if (current.minute in parsed["minute"] and
-                current.hour in parsed["hour"] and
-                current.day in parsed["day"] and
-                current.month in parsed["month"] and
-                current.weekday() in parsed["weekday"]):
-                return current
-            current += timedelta(minutes=1)
+        Each run is computed from the previous one, as the scheduler does
+        after every execution, with the expression compiled once.
+        """
+        if after is None:
+            after = datetime.now()
+        compiled = cls.compile(cron_expr)
+        runs = []
+        for _ in range(n):
+            after = cls._next_run(compiled, cron_expr, after)
+            runs.append(after)
+        return runs
 
-        raise ValueError(f"No valid run time found for cron expression: {cron_expr}")
+    @classmethod
+    def _next_run(cls, compiled: "CompiledCron", cron_expr: str, after: datetime) -> datetime:
+        # Start from the next minute
+        start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        match = compiled.next_match(start, start + CRON_SEARCH_HORIZON)
+        if match is None:
+            raise ValueError(f"No valid run time found for cron expression: {cron_expr}")
+        return cls._resolve_local(match)
+
+    @staticmethod
+    def _cron_weekday(value: datetime) -> int:
+        """Weekday in cron numbering (0 = Sunday); datetime uses 0 = Monday."""
+        return (value.weekday() + 1) % 7
+
+    @staticmethod
+    def _resolve_local(value: datetime) -> datetime:
+        """Move a local time that falls in a DST gap to just after the gap.
+
+        Round-tripping through a timestamp leaves existing times unchanged
+        and shifts skipped ones forward by the size of the gap.
+        """
+        if value.tzinfo is not None:
+            return value
+        actual = datetime.fromtimestamp(value.timestamp())
+        return actual if actual != value else value
 
     @classmethod
     def is_valid(cls, cron_expr: str) -> tuple[bool, Optional[str]]:
@@ -210,10 +361,93 @@ class CronParser:
             return False, str(e)
 
 
+def _next_bit(mask: int, value: int) -> Optional[int]:
+    """Smallest set bit of mask at position >= value, or None."""
+    rest = mask >> value
+    if not rest:
+        return None
+    return value + (rest & -rest).bit_length() - 1
+
+
+@dataclass(frozen=True)
+class CompiledCron:
+    """A cron expression as one bitmask per field (bit n set = value n matches).
+
+    next_match jumps field by field, largest unit first: a month that
+    doesn't match skips to the next matching month, an hour to the next
+    matching hour, and so on, instead of stepping minute by minute.
+    """
+    minutes: int
+    hours: int
+    days: int
+    months: int
+    weekdays: int  # Cron numbering, bit 0 = Sunday
+
+    def matches(self, value: datetime) -> bool:
+        """Whether a time (to the minute) matches the expression."""
+        return bool(
+            self.minutes >> value.minute & 1
+            and self.hours >> value.hour & 1
+            and self.days >> value.day & 1
+            and self.months >> value.month & 1
+            and self.weekdays >> CronParser._cron_weekday(value) & 1
+        )
+
+    def next_match(self, start: datetime, limit: datetime) -> Optional[datetime]:
+        """First matching minute at or after start, or None if none by limit.
+
+        start must be a whole minute. Times are wall-clock times; see
+        CronParser._resolve_local for DST gaps.
+        """
+        if not (self.minutes and self.hours and self.days and self.months and self.weekdays):
+            return None
+
+        current = start
+        while current <= limit:
+            if not self.months >> current.month & 1:
+                month = _next_bit(self.months, current.month + 1)
+                if month is None:
+                    current = current.replace(
+                        year=current.year + 1, month=_next_bit(self.months, 1), day=1, hour=0, minute=0
+                    )
+                else:
+                    current = current.replace(month=month, day=1, hour=0, minute=0)
+                continue
+
+            if not (self.days >> current.day & 1 and self.weekdays >> CronParser._cron_weekday(current) & 1):
+                current = current.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+
+            if not self.hours >> current.hour & 1:
+                hour = _next_bit(self.hours, current.hour + 1)
+                if hour is None:
+                    current = current.replace(hour=0, minute=0) + timedelta(days=1)
+                else:
+                    current = current.replace(hour=hour, minute=0)
+                continue
+
+            if not self.minutes >> current.minute & 1:
+                minute = _next_bit(self.minutes, current.minute + 1)
+                if minute is None:
+                    current = current.replace(minute=0) + timedelta(hours=1)
+                else:
+                    current = current.replace(minute=minute)
+                continue
+
+            return current
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _compile_cron(cron_expr: str) -> CompiledCron:
+    parsed = CronParser.parse(cron_expr)
+    return CompiledCron(*(sum(1 << value for value in parsed[name]) for name in CronParser.FIELDS))
+
+
 class SchedulerService:
     """Service for managing scheduled tasks."""
 
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, max_concurrent_runs: int = MAX_CONCURRENT_RUNS):
         self.db_path = db_path
         self._initialized = False
         self._running = False
@@ -221,6 +455,22 @@ class SchedulerService:
         self._action_handlers: dict[str, Callable] = {}
         self._notification_callback: Optional[Callable] = None
 
+        # Due-time heap of (epoch seconds, task_id). Entries are replaced
+        # rather than removed: one only counts if it matches _due_at.
+        self._heap: list[tuple[float, str]] = []
+        self._due_at: dict[str, float] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        # Schedule changes made while _load_schedule is reading the database
+        self._changes_during_load: Optional[dict[str, Optional[str]]] = None
+
+        # Bounded executor for task runs
+        self.max_concurrent_runs = max_concurrent_runs
+        self._run_slots: Optional[asyncio.Semaphore] = None
+        self._runs: set[asyncio.Task] = set()
+        # IDs of tasks submitted and not yet finished (waiting for a slot or
+        # running); they stay PENDING in the database until they start
+        self._in_flight: set[str] = set()
+
         # Register default action handlers
         self._register_default_handlers()
 
@@ -230,65 +480,21 @@ class SchedulerService:
         self._action_handlers["http"] = self._handle_http
         self._action_handlers["log"] = self._handle_log
 
+    def _get_connection(self) -> PooledConnection:
+        """Get the pooled writer connection context manager."""
+        return get_pool(self.db_path).writer()
+
+    def _get_read_connection(self) -> PooledConnection:
+        """Get a pooled read-only connection context manager."""
+        return get_pool(self.db_path).reader()
+
     async def _ensure_initialized(self):
-        """Ensure database tables exist."""
+        """Ensure the database schema is migrated to the latest version."""
         if self._initialized:
             return
 
-        async with aiosqlite.connect(self.db_path) as db:
-            # Main tasks table
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS scheduled_tasks (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    task_type TEXT NOT NULL,
-                    schedule TEXT NOT NULL,
-                    action TEXT NOT NULL,
-                    action_params TEXT NOT NULL,
-                    status TEXT NOT NULL DEFAULT 'pending',
-                    created_at TEXT NOT NULL,
-                    last_run TEXT,
-                    next_run TEXT,
-                    run_count INTEGER DEFAULT 0,
-                    error_count INTEGER DEFAULT 0,
-                    last_error TEXT,
-                    metadata TEXT,
-                    enabled INTEGER DEFAULT 1
-                )
-            """)
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_tasks_next_run
-                ON scheduled_tasks(next_run)
-            """)
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_tasks_status
-                ON scheduled_tasks(status)
-            """)
-
-            # Task execution history
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS task_executions (
-                    id TEXT PRIMARY KEY,
-                    task_id TEXT NOT NULL,
-                    started_at TEXT NOT NULL,
-                    completed_at TEXT,
-                    status TEXT NOT NULL,
-                    result TEXT,
-                    error TEXT,
-                    duration_ms INTEGER,
-                    FOREIGN KEY (task_id) REFERENCES scheduled_tasks(id)
-                )
-            """)
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_executions_task_id
-                ON task_executions(task_id)
-            """)
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_executions_started_at
-                ON task_executions(started_at DESC)
-            """)
-
-            await db.commit()
+        async with self._get_connection() as db:
+            await apply_migrations(db, _SCHEMA_MIGRATIONS)
         self._initialized = True
 
     def register_action_handler(self, action_type: str, handler: Callable):
@@ -358,7 +564,7 @@ class SchedulerService:
             metadata=metadata or {}
         )
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute(
                 """INSERT INTO scheduled_tasks
                    (id, name, task_type, schedule, action, action_params,
@@ -380,6 +586,7 @@ class SchedulerService:
             )
             await db.commit()
 
+        self._schedule(task.id, task.next_run)
         logger.info(f"Created scheduled task: {task.name} ({task.id})")
         return task
 
@@ -387,7 +594,7 @@ class SchedulerService:
         """Get a task by ID."""
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 """SELECT id, name, task_type, schedule, action, action_params,
                           status, created_at, last_run, next_run, run_count,
@@ -402,6 +609,22 @@ class SchedulerService:
 
         return self._row_to_task(row)
 
+    async def _get_tasks(self, task_ids: list[str]) -> list[ScheduledTask]:
+        """Get several tasks in one query (missing IDs are skipped)."""
+        if not task_ids:
+            return []
+        placeholders = ", ".join("?" for _ in task_ids)
+        async with self._get_read_connection() as db:
+            cursor = await db.execute(
+                f"""SELECT id, name, task_type, schedule, action, action_params,
+                           status, created_at, last_run, next_run, run_count,
+                           error_count, last_error, metadata, enabled
+                    FROM scheduled_tasks WHERE id IN ({placeholders})""",
+                task_ids
+            )
+            rows = await cursor.fetchall()
+        return [self._row_to_task(row) for row in rows]
+
     async def list_tasks(
         self,
         status: Optional[TaskStatus] = None,
@@ -432,7 +655,7 @@ class SchedulerService:
         query += " ORDER BY next_run ASC NULLS LAST LIMIT ? OFFSET ?"
         params.extend([limit, offset])
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(query, params)
             rows = await cursor.fetchall()
 
@@ -502,20 +725,23 @@ class SchedulerService:
 
         params.append(task_id)
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute(
                 f"UPDATE scheduled_tasks SET {', '.join(updates)} WHERE id = ?",
                 params
             )
             await db.commit()
 
-        return await self.get_task(task_id)
+        task = await self.get_task(task_id)
+        if task:
+            self._reschedule(task)
+        return task
 
     async def delete_task(self, task_id: str) -> bool:
         """Delete a task and its execution history."""
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             # Delete executions first
             await db.execute(
                 "DELETE FROM task_executions WHERE task_id = ?",
@@ -527,7 +753,9 @@ class SchedulerService:
                 (task_id,)
             )
             await db.commit()
-            return cursor.rowcount > 0
+
+        self._unschedule(task_id)
+        return cursor.rowcount > 0
 
     async def get_task_history(
         self,
@@ -537,7 +765,7 @@ class SchedulerService:
         """Get execution history for a task."""
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 """SELECT id, task_id, started_at, completed_at, status,
                           result, error, duration_ms
@@ -569,11 +797,16 @@ class SchedulerService:
             return
 
         self._running = True
+        self._wakeup = asyncio.Event()
+        self._run_slots = asyncio.Semaphore(self.max_concurrent_runs)
         self._task = asyncio.create_task(self._run_loop())
         logger.info("Scheduler started")
 
     async def stop(self):
-        """Stop the scheduler background task."""
+        """Stop the scheduler background task.
+
+        Task runs already in progress are left to finish.
+        """
         self._running = False
         if self._task:
             self._task.cancel()
@@ -584,39 +817,176 @@ class SchedulerService:
             self._task = None
         logger.info("Scheduler stopped")
 
+    # Due-time heap
+
+    @staticmethod
+    def _timestamp(when: str) -> float:
+        """Epoch seconds for a stored next_run (naive values are local time)."""
+        return datetime.fromisoformat(when).timestamp()
+
+    def _schedule(self, task_id: str, next_run: Optional[str]):
+        """Set when a task is next due, waking the run loop if it is sooner."""
+        if not next_run:
+            self._unschedule(task_id)
+            return
+        if self._changes_during_load is not None:
+            self._changes_during_load[task_id] = next_run
+        due = self._timestamp(next_run)
+        if self._due_at.get(task_id) == due:
+            return
+        self._due_at[task_id] = due
+        heapq.heappush(self._heap, (due, task_id))
+        if self._wakeup and self._heap[0] == (due, task_id):
+            self._wakeup.set()
+
+    def _unschedule(self, task_id: str):
+        """Forget a task's due time (its heap entry is dropped lazily)."""
+        if self._changes_during_load is not None:
+            self._changes_during_load[task_id] = None
+        self._due_at.pop(task_id, None)
+
+    def _reschedule(self, task: ScheduledTask):
+        """Schedule or unschedule a task according to its current state."""
+        if task.enabled and task.status in _RUNNABLE_STATUSES and task.next_run:
+            self._schedule(task.id, task.next_run)
+        else:
+            self._unschedule(task.id)
+
+    def _next_due(self) -> Optional[float]:
+        """Earliest live due time, discarding replaced heap entries."""
+        while self._heap:
+            due, task_id = self._heap[0]
+            if self._due_at.get(task_id) == due:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, now: float) -> list[str]:
+        """Remove and return the IDs of all tasks due at or before now."""
+        due_ids = []
+        while True:
+            due = self._next_due()
+            if due is None or due > now:
+                return due_ids
+            _, task_id = heapq.heappop(self._heap)
+            del self._due_at[task_id]
+            due_ids.append(task_id)
+
+    async def _load_schedule(self):
+        """Rebuild the heap from the database."""
+        placeholders = ", ".join("?" for _ in _RUNNABLE_STATUSES)
+        self._changes_during_load = {}
+        try:
+            async with self._get_read_connection() as db:
+                cursor = await db.execute(
+                    f"""SELECT id, next_run FROM scheduled_tasks
+                        WHERE enabled = 1
+                        AND status IN ({placeholders})
+                        AND next_run IS NOT NULL""",
+                    [status.value for status in _RUNNABLE_STATUSES]
+                )
+                rows = await cursor.fetchall()
+        finally:
+            changes, self._changes_during_load = self._changes_during_load, None
+
+        self._due_at = {}
+        for task_id, next_run in rows:
+            if task_id in self._in_flight:
+                # Still past due in the database; finishing the run reschedules it
+                continue
+            try:
+                self._due_at[task_id] = self._timestamp(next_run)
+            except ValueError:
+                logger.warning(f"Skipping task {task_id} with invalid next_run: {next_run}")
+        self._heap = [(due, task_id) for task_id, due in self._due_at.items()]
+        heapq.heapify(self._heap)
+
+        # The snapshot may predate changes made while it was read
+        for task_id, next_run in changes.items():
+            self._schedule(task_id, next_run)
+
+    # Run loop
+
     async def _run_loop(self):
-        """Main scheduler loop."""
+        """Main scheduler loop: sleep until the next task is due, run it, repeat."""
         await self._ensure_initialized()
+        last_sync = None
 
         while self._running:
             try:
+                if last_sync is None or time.monotonic() - last_sync >= RESYNC_SECONDS:
+                    await self._load_schedule()
+                    last_sync = time.monotonic()
                 await self._check_and_run_tasks()
             except Exception as e:
                 logger.error(f"Scheduler error: {e}")
 
-            # Check every 30 seconds
-            await asyncio.sleep(30)
+            await self._wait_for_next()
+
+    async def _wait_for_next(self):
+        """Sleep until the next due time, a schedule change, or the resync interval."""
+        self._wakeup.clear()
+        timeout = RESYNC_SECONDS
+        due = self._next_due()
+        if due is not None:
+            timeout = min(timeout, due - time.time())
+        if timeout <= 0:
+            return
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
 
     async def _check_and_run_tasks(self):
-        """Check for tasks that need to run and execute them."""
-        now = datetime.now()
+        """Start every task that is due."""
+        now = time.time()
+        due_ids = self._pop_due(now)
+        if not due_ids:
+            return
 
-        async with aiosqlite.connect(self.db_path) as db:
-            # Find tasks due to run
-            cursor = await db.execute(
-                """SELECT id FROM scheduled_tasks
-                   WHERE enabled = 1
-                   AND status IN ('pending', 'completed', 'failed')
-                   AND next_run IS NOT NULL
-                   AND datetime(next_run) <= datetime(?)""",
-                (now.isoformat(),)
-            )
-            rows = await cursor.fetchall()
+        due_ids = [task_id for task_id in due_ids if task_id not in self._in_flight]
+        if not due_ids:
+            return
 
-        for (task_id,) in rows:
-            task = await self.get_task(task_id)
-            if task:
-                asyncio.create_task(self._execute_task(task))
+        for task in await self._get_tasks(due_ids):
+            # The heap can be stale if another process changed the task
+            if not (task.enabled and task.status in _RUNNABLE_STATUSES and task.next_run):
+                continue
+            due = self._timestamp(task.next_run)
+            if due > now:
+                self._schedule(task.id, task.next_run)
+                continue
+            metrics.record_stage("scheduler_lag", (now - due) * 1000)
+            self._submit(task)
+
+    def _submit(self, task: ScheduledTask):
+        """Run a task on the bounded executor."""
+        self._in_flight.add(task.id)
+        run = asyncio.create_task(self._run_bounded(task))
+        self._runs.add(run)
+
+        def done(run):
+            self._runs.discard(run)
+            self._in_flight.discard(task.id)
+
+        run.add_done_callback(done)
+
+    async def _run_bounded(self, task: ScheduledTask):
+        """Execute a task once a run slot is free."""
+        async with self._run_slots:
+            try:
+                # The task may have been changed, disabled or deleted while it waited
+                current = await self.get_task(task.id)
+                if current is None:
+                    return
+                if not (current.enabled and current.status in _RUNNABLE_STATUSES and current.next_run):
+                    return
+                if self._timestamp(current.next_run) > time.time():
+                    self._schedule(current.id, current.next_run)
+                    return
+                await self._execute_task(current)
+            except Exception as e:
+                logger.error(f"Task {task.id} run error: {e}")
 
     async def _execute_task(self, task: ScheduledTask):
         """Execute a scheduled task."""
@@ -626,7 +996,7 @@ class SchedulerService:
         logger.info(f"Executing task: {task.name} ({task.id})")
 
         # Update task status
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute(
                 "UPDATE scheduled_tasks SET status = ? WHERE id = ?",
                 (TaskStatus.RUNNING.value, task.id)
@@ -664,7 +1034,7 @@ class SchedulerService:
             next_status = TaskStatus.COMPLETED if status == "success" else TaskStatus.FAILED
 
         # Update task
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._get_connection() as db:
             await db.execute(
                 """UPDATE scheduled_tasks
                    SET status = ?, last_run = ?, next_run = ?,
@@ -700,6 +1070,9 @@ class SchedulerService:
             )
             await db.commit()
 
+        if next_run and task.enabled:
+            self._schedule(task.id, next_run.isoformat())
+
         # Notify
         if self._notification_callback:
             execution = TaskExecution(
@@ -7,10 +7,14 @@ Provides protection against:
 - Prompt injection attacks
 """
 
+import asyncio
 import re
 import logging
+import socket
+import threading
+import time
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Iterable, Tuple, Optional
 from urllib.parse import urlparse
 import ipaddress
 
@@ -48,14 +52,29 @@ class SecurityService:
         ipaddress.IPv4Network('172.16.0.0/12'),    # Private
         ipaddress.IPv4Network('192.168.0.0/16'),   # Private
         ipaddress.IPv4Network('169.254.0.0/16'),   # Link-local
+        ipaddress.IPv6Network('fc00::/7'),         # Unique local
+        ipaddress.IPv6Network('fe80::/10'),        # Link-local
     ]
 
-    def __init__(self):
+    # Resolved host addresses are reused for this long (seconds)
+    DNS_CACHE_TTL = 60.0
+    DNS_CACHE_SIZE = 1024
+
+    def __init__(self, trusted_hosts: Iterable[str] = ()):
+        """
+        Args:
+            trusted_hosts: Host names or IPs exempt from SSRF blocking
+                (e.g. a local service the assistant may fetch from)
+        """
         # Compile regex patterns once for performance
         self._prompt_injection_regex = re.compile(
             '|'.join(self.PROMPT_INJECTION_PATTERNS),
             re.IGNORECASE
         )
+        self.trusted_hosts = {host.lower() for host in trusted_hosts}
+        # Host name -> (expires at, addresses)
+        self._dns_cache: dict[str, Tuple[float, Tuple[str, ...]]] = {}
+        self._dns_lock = threading.Lock()
 
     def sanitize_shell_input(self, command: str) -> Tuple[str, bool]:
         """Sanitize shell command input.
@@ -146,28 +165,113 @@ class SecurityService:
             logger.error(f"Path validation error: {e}")
             return Path(file_path), False, str(e)
 
-    def validate_url(self, url: str) -> Tuple[bool, Optional[str]]:
+    def validate_url(self, url: str, resolve: bool = True) -> Tuple[bool, Optional[str]]:
         """Validate URL to prevent SSRF attacks.
 
+        Host names are resolved (through a short-lived DNS cache) and every
+        address they resolve to is checked, so a public name pointing at a
+        private address is refused too. A name that does not resolve is
+        allowed; there is nothing to connect to.
+
         Args:
             url: URL to validate
+            resolve: Resolve host names (False: check the URL text only)
 
         Returns:
             Tuple of (is_safe, error_message)
         """
+        is_safe, error, hostname = self._check_url(url)
+        if not is_safe or not resolve or hostname is None:
+            return is_safe, error
+
+        try:
+            addresses = self.resolve_host(hostname)
+        except OSError:
+            return True, None
+        return self._check_addresses(url, hostname, addresses)
+
+    async def validate_url_async(self, url: str) -> Tuple[bool, Optional[str]]:
+        """validate_url for async code; resolution does not block the event loop."""
+        is_safe, error, hostname = self._check_url(url)
+        if not is_safe or hostname is None:
+            return is_safe, error
+
+        try:
+            addresses = await self.resolve_host_async(hostname)
+        except OSError:
+            return True, None
+        return self._check_addresses(url, hostname, addresses)
+
+    def check_address(self, hostname: str, address: str) -> Tuple[bool, Optional[str]]:
+        """Check an address a host name was connected to (after the fact)."""
+        if hostname.lower() in self.trusted_hosts:
+            return True, None
+        error = self._address_error(address)
+        return error is None, error
+
+    def resolve_host(self, hostname: str) -> Tuple[str, ...]:
+        """Resolve a host name to its addresses, using the DNS cache.
+
+        Raises:
+            OSError: If the name does not resolve
+        """
+        addresses = self._cached_addresses(hostname)
+        if addresses is None:
+            infos = socket.getaddrinfo(hostname, None, type=socket.SOCK_STREAM)
+            addresses = self._cache_addresses(hostname, infos)
+        return addresses
+
+    async def resolve_host_async(self, hostname: str) -> Tuple[str, ...]:
+        """resolve_host without blocking the event loop."""
+        addresses = self._cached_addresses(hostname)
+        if addresses is None:
+            loop = asyncio.get_running_loop()
+            infos = await loop.getaddrinfo(hostname, None, type=socket.SOCK_STREAM)
+            addresses = self._cache_addresses(hostname, infos)
+        return addresses
+
+    def _cached_addresses(self, hostname: str) -> Optional[Tuple[str, ...]]:
+        key = hostname.lower()
+        with self._dns_lock:
+            cached = self._dns_cache.get(key)
+            if cached is None:
+                return None
+            expires_at, addresses = cached
+            if time.monotonic() >= expires_at:
+                del self._dns_cache[key]
+                return None
+            return addresses
+
+    def _cache_addresses(self, hostname: str, infos: list) -> Tuple[str, ...]:
+        # getaddrinfo lists each address once per socket type/protocol
+        addresses = tuple(dict.fromkeys(info[4][0] for info in infos))
+        with self._dns_lock:
+            if len(self._dns_cache) >= self.DNS_CACHE_SIZE:
+                self._dns_cache.pop(next(iter(self._dns_cache)))
+            self._dns_cache[hostname.lower()] = (time.monotonic() + self.DNS_CACHE_TTL, addresses)
+        return addresses
+
+    def _check_url(self, url: str) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Check a URL without resolving it.
+
+        Returns:
+            Tuple of (is_safe, error_message, hostname still to resolve or None)
+        """
         try:
             parsed = urlparse(url)
 
             # Check scheme
             if parsed.scheme not in ('http', 'https'):
-                return False, f"Invalid URL scheme: {parsed.scheme}"
+                return False, f"Invalid URL scheme: {parsed.scheme}", None
 
             # Check for missing domain
             if not parsed.netloc:
-                return False, "Missing domain in URL"
+                return False, "Missing domain in URL", None
 
-            # Extract hostname (remove port if present)
-            hostname = parsed.netloc.split(':')[0]
+            # Extract hostname (without port, userinfo or IPv6 brackets)
+            hostname = parsed.hostname or ''
+            if hostname in self.trusted_hosts:
+                return True, None, None
 
             # Block localhost variants
             localhost_variants = [
@@ -176,30 +280,51 @@ class SecurityService:
                 '::1',
                 '0.0.0.0',
             ]
-            if hostname.lower() in localhost_variants:
+            if hostname in localhost_variants:
                 logger.warning(f"Blocked localhost URL: {url}")
-                return False, "Access to localhost is blocked"
+                return False, "Access to localhost is blocked", None
 
-            # Try to resolve IP address
+            # Check if hostname is already an IP
             try:
-                # Check if hostname is already an IP
-                ip = ipaddress.IPv4Address(hostname)
-
-                # Check against private IP ranges
-                for private_range in self.PRIVATE_IP_RANGES:
-                    if ip in private_range:
-                        logger.warning(f"Blocked private IP: {url}")
-                        return False, f"Access to private IP range {private_range} is blocked"
-
+                ipaddress.ip_address(hostname)
             except ValueError:
                 # Not an IP address, that's fine (could be a domain name)
-                pass
+                return True, None, hostname
 
-            return True, None
+            error = self._address_error(hostname)
+            if error:
+                logger.warning(f"Blocked private IP: {url}")
+                return False, error, None
+            return True, None, None
 
         except Exception as e:
             logger.error(f"URL validation error: {e}")
-            return False, str(e)
+            return False, str(e), None
+
+    def _check_addresses(self, url: str, hostname: str, addresses: Tuple[str, ...]) -> Tuple[bool, Optional[str]]:
+        for address in addresses:
+            error = self._address_error(address)
+            if error:
+                logger.warning(f"Blocked URL resolving to {address}: {url}")
+                return False, f"{hostname} resolves to a blocked address. {error}"
+        return True, None
+
+    def _address_error(self, address: str) -> Optional[str]:
+        """Why connecting to an IP address is blocked, or None if it is allowed."""
+        try:
+            ip = ipaddress.ip_address(address.split('%')[0])
+        except ValueError:
+            return f"Invalid IP address: {address}"
+        if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+            ip = ip.ipv4_mapped
+
+        if ip.is_loopback or ip.is_unspecified:
+            return "Access to localhost is blocked"
+        # Check against private IP ranges
+        for private_range in self.PRIVATE_IP_RANGES:
+            if ip.version == private_range.version and ip in private_range:
+                return f"Access to private IP range {private_range} is blocked"
+        return None
 
     def sanitize_tool_args(
         self,
@@ -226,7 +351,9 @@ class SecurityService:
         # Web fetch tools need URL validation
         if 'web' in tool_name.lower() or 'fetch' in tool_name.lower():
             if 'url' in args:
-                is_safe, error = self.validate_url(args['url'])
+                # Names are resolved and checked by the fetcher at request
+                # time, off the event loop
+                is_safe, error = self.validate_url(args['url'], resolve=False)
                 if not is_safe:
                     return args, False, error
 
@@ -1,5 +1,4 @@
 """Settings service for persisting user configuration."""
-import aiosqlite
 import asyncio
 from datetime import datetime
 from pathlib import Path
@@ -13,6 +12,7 @@ from server.services.encryption import (
     is_encrypted,
     CRYPTOGRAPHY_AVAILABLE
 )
+from server.services.storage import PooledConnection, get_pool
 
 
 logger = logging.getLogger(__name__)
@@ -21,114 +21,12 @@ logger = logging.getLogger(__name__)
 # Keys that contain sensitive data and should be encrypted
 SENSITIVE_KEYS = {"openai_api_key", "anthropic_api_key", "calendar_password", "telegram_bot_token"}
 
-# Connection pool settings
-_DB_BUSY_TIMEOUT_MS = 5000  # 5 seconds - shorter timeout, rely on retries
-_DB_POOL_SIZE = 5  # Number of connections in pool (increased for concurrent access)
-
-
-class ConnectionPool:
-    """Simple async connection pool for aiosqlite with WAL mode."""
-
-    def __init__(self, db_path: Path, pool_size: int = _DB_POOL_SIZE):
-        self.db_path = db_path
-        self.pool_size = pool_size
-        self._pool: Optional[asyncio.Queue] = None
-        self._initialized = False
-        self._lock: Optional[asyncio.Lock] = None
-        self._init_lock = threading.Lock()  # Thread-safe lock for initialization
-        self._loop = None  # Track which event loop we're bound to
-
-    async def initialize(self):
-        """Initialize the connection pool."""
-        # Check if we're on a different event loop than we were initialized with
-        current_loop = asyncio.get_running_loop()
-        if self._loop is not None and self._loop != current_loop:
-            # We've switched event loops, need to reinitialize
-            await self.close()
-
-        if self._initialized:
-            return
-
-        # Create asyncio primitives lazily to avoid event loop attachment issues
-        # Use thread lock to prevent race condition in creating async lock
-        with self._init_lock:
-            if self._lock is None:
-                self._loop = current_loop
-                self._lock = asyncio.Lock()
-
-        async with self._lock:
-            if self._initialized:
-                return
-
-            # Create pool queue lazily
-            if self._pool is None:
-                self._pool = asyncio.Queue(maxsize=self.pool_size)
-
-            # Create pool of connections
-            for _ in range(self.pool_size):
-                conn = await aiosqlite.connect(
-                    self.db_path,
-                    timeout=_DB_BUSY_TIMEOUT_MS / 1000  # Convert to seconds
-                )
-                # Enable WAL mode for better concurrency
-                await conn.execute("PRAGMA journal_mode=WAL")
-                # Set busy timeout
-                await conn.execute(f"PRAGMA busy_timeout={_DB_BUSY_TIMEOUT_MS}")
-                # Optimize synchronous mode for WAL
-                await conn.execute("PRAGMA synchronous=NORMAL")
-                await self._pool.put(conn)
-
-            self._initialized = True
-
-    async def acquire(self) -> aiosqlite.Connection:
-        """Get a connection from the pool."""
-        await self.initialize()
-        if self._pool is None:
-            raise RuntimeError("Connection pool not initialized")
-        return await self._pool.get()
-
-    async def release(self, conn: aiosqlite.Connection):
-        """Return a connection to the pool."""
-        if self._pool is None:
-            raise RuntimeError("Connection pool not initialized")
-        await self._pool.put(conn)
-
-    async def close(self):
-        """Close all connections in the pool."""
-        if self._pool is not None:
-            while not self._pool.empty():
-                try:
-                    conn = self._pool.get_nowait()
-                    await conn.close()
-                except asyncio.QueueEmpty:
-                    break
-        self._initialized = False
-        self._pool = None
-        self._lock = None
-
-
-class PooledConnection:
-    """Context manager for pooled database connections."""
-
-    def __init__(self, pool: ConnectionPool):
-        self.pool = pool
-        self.conn: Optional[aiosqlite.Connection] = None
-
-    async def __aenter__(self) -> aiosqlite.Connection:
-        self.conn = await self.pool.acquire()
-        return self.conn
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.conn:
-            await self.pool.release(self.conn)
-            self.conn = None
-
 
 class SettingsService:
     """Service for managing user settings in SQLite.
 
     Sensitive settings (API keys) are encrypted at rest using AES-256-GCM.
-    Uses a connection pool with WAL mode for safe concurrent access.
+    Uses the shared connection pool (see server/services/storage.py).
     """
 
     # Track decryption errors to avoid log spam
@@ -192,16 +90,23 @@ class SettingsService:
                               will use the singleton instance when encrypting.
         """
         self.db_path = db_path
-        self._pool = ConnectionPool(db_path)
+        self._pool = get_pool(db_path)
         self._initialized = False
         self._tables_lock: Optional[asyncio.Lock] = None
         self._tables_init_lock = threading.Lock()
         self._encryption_service = encryption_service
         self._encryption_available = CRYPTOGRAPHY_AVAILABLE
+        # Decrypted get_all() result and the stored rows it was built from
+        self._snapshot: Optional[dict] = None
+        self._snapshot_rows: Optional[list] = None
 
     def _get_connection(self) -> PooledConnection:
-        """Get a pooled connection context manager."""
-        return PooledConnection(self._pool)
+        """Get the pooled writer connection context manager."""
+        return self._pool.writer()
+
+    def _get_read_connection(self) -> PooledConnection:
+        """Get a pooled read-only connection context manager."""
+        return self._pool.reader()
 
     def _get_encryption_service(self) -> Optional[EncryptionService]:
         """Get encryption service, initializing if needed."""
@@ -317,7 +222,7 @@ class SettingsService:
         """Get a setting value by key."""
         await self._ensure_initialized()
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 "SELECT value FROM settings WHERE key = ?",
                 (key,)
@@ -344,21 +249,37 @@ class SettingsService:
                 (key, stored_value, now, stored_value, now)
             )
             await db.commit()
+        self._invalidate_snapshot()
 
     async def get_all(self) -> dict:
-        """Get all settings as a dictionary."""
+        """Get all settings as a dictionary.
+
+        Decrypting sensitive values is expensive, so the decrypted result is
+        kept as a snapshot and reused while the stored rows are unchanged.
+        Comparing rows (rather than trusting invalidation alone) also picks
+        up writes made by other SettingsService instances or processes.
+        """
         await self._ensure_initialized()
 
+        async with self._get_read_connection() as db:
+            cursor = await db.execute("SELECT key, value FROM settings ORDER BY key")
+            rows = [tuple(row) for row in await cursor.fetchall()]
+
+        if self._snapshot is not None and rows == self._snapshot_rows:
+            return dict(self._snapshot)
+
         # Start with defaults
         settings = dict(self.DEFAULTS)
+        for key, value in rows:
+            settings[key] = self._decrypt_if_sensitive(key, value)
 
-        async with self._get_connection() as db:
-            cursor = await db.execute("SELECT key, value FROM settings")
-            rows = await cursor.fetchall()
-            for key, value in rows:
-                settings[key] = self._decrypt_if_sensitive(key, value)
+        self._snapshot, self._snapshot_rows = settings, rows
+        return dict(settings)
 
-        return settings
+    def _invalidate_snapshot(self):
+        """Drop the decrypted settings snapshot after a write."""
+        self._snapshot = None
+        self._snapshot_rows = None
 
     async def set_multiple(self, settings: dict):
         """Set multiple settings at once."""
@@ -378,6 +299,7 @@ class SettingsService:
                         (key, stored_value, now, stored_value, now)
                     )
             await db.commit()
+        self._invalidate_snapshot()
 
     def mask_api_key(self, key: str) -> str:
         """Mask an API key for display (show only last 4 chars)."""
@@ -539,7 +461,7 @@ class SettingsService:
         """
         await self._ensure_initialized()
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 "SELECT value FROM settings WHERE key = ?",
                 (key,)
@@ -598,7 +520,7 @@ class SettingsService:
         """
         await self._ensure_initialized()
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 "SELECT value FROM settings WHERE key = ?",
                 (key,)
@@ -773,6 +695,9 @@ class SettingsService:
                             del SettingsService._decryption_errors[key]
 
             await db.commit()
+        self._invalidate_snapshot()
+        # Old salts are gone from the database; drop their derived keys
+        enc_service.clear_key_cache()
 
         return {
             "success": len(failed) == 0,
@@ -801,7 +726,7 @@ class SettingsService:
         # Check for keys that can't be decrypted
         # Note: We check the raw DB value directly to avoid triggering get() which returns empty
         await self._ensure_initialized()
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             for key in SENSITIVE_KEYS:
                 cursor = await db.execute(
                     "SELECT value FROM settings WHERE key = ?",
@@ -0,0 +1,394 @@
+"""Shared SQLite connection pools.
+
+Every service opens its database through get_pool(db_path), so each database
+file has exactly one pool no matter how many services use it. A pool holds:
+
+- one writer connection, handed to one task at a time (SQLite allows a single
+  writer anyway, so more writer connections only add lock contention), and
+- up to DEFAULT_READERS read-only connections, opened on demand, which run
+  concurrently with the writer under WAL.
+
+All connections get the same PRAGMAs. Pools rebind themselves when used from
+a new event loop (each pytest-asyncio test runs its own loop).
+"""
+import asyncio
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+_DB_BUSY_TIMEOUT_MS = 5000  # 5 seconds - shorter timeout, rely on retries
+DEFAULT_READERS = 3  # Read-only connections per database file
+
+# Applied to every connection (writer and readers)
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    f"PRAGMA busy_timeout={_DB_BUSY_TIMEOUT_MS}",
+    "PRAGMA synchronous=NORMAL",  # Safe with WAL, avoids an fsync per commit
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",  # 8 MB page cache
+    "PRAGMA mmap_size=268435456",  # Map up to 256 MB of the file
+)
+
+
+class _WaitStats:
+    """Running totals for time spent waiting on a connection."""
+
+    def __init__(self):
+        self.acquisitions = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def record(self, wait_ms: float):
+        self.acquisitions += 1
+        self.total_wait_ms += wait_ms
+        if wait_ms > self.max_wait_ms:
+            self.max_wait_ms = wait_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "acquisitions": self.acquisitions,
+            "avg_wait_ms": round(self.total_wait_ms / self.acquisitions, 3) if self.acquisitions else 0.0,
+            "max_wait_ms": round(self.max_wait_ms, 3),
+        }
+
+
+class SQLitePool:
+    """Writer/reader connection pool for one SQLite database file.
+
+    The writer is reentrant: a task that already holds it (or asks for a
+    reader while holding it) gets the same connection back, so nested
+    service calls cannot deadlock and reads see the task's own writes.
+    """
+
+    def __init__(self, db_path: Path, readers: int = DEFAULT_READERS):
+        self.db_path = Path(db_path)
+        self.max_readers = readers
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._init_lock = threading.Lock()
+        self._open_lock: Optional[asyncio.Lock] = None
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._writer_lock: Optional[asyncio.Lock] = None
+        self._writer_owner: Optional[asyncio.Task] = None
+        self._writer_depth = 0
+        self._readers: Optional[asyncio.Queue] = None
+        self._reader_count = 0
+        self._reader_conns: set = set()
+        self._reader_owners: dict[asyncio.Task, list] = {}
+        self._writer_waits = _WaitStats()
+        self._reader_waits = _WaitStats()
+        self._replaced_connections = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def _bind_loop(self):
+        """Create loop-bound primitives, discarding connections from an old loop."""
+        current_loop = asyncio.get_running_loop()
+        if self._loop is current_loop:
+            return
+
+        with self._init_lock:
+            if self._loop is current_loop:
+                return
+            stale = self._loop is not None
+            self._loop = current_loop
+            old_connections = self._take_all_connections()
+            self._open_lock = asyncio.Lock()
+            self._writer_lock = asyncio.Lock()
+            self._readers = asyncio.Queue()
+
+        if stale:
+            logger.debug(f"Rebinding SQLite pool for {self.db_path.name} to a new event loop")
+        for conn in old_connections:
+            await self._close_quietly(conn)
+
+    def _take_all_connections(self) -> list:
+        """Detach every connection from the pool and return the idle ones.
+
+        Connections still checked out are closed by their release call.
+        """
+        connections = []
+        if self._writer is not None and not (self._writer_lock and self._writer_lock.locked()):
+            connections.append(self._writer)
+        if self._readers is not None:
+            while not self._readers.empty():
+                connections.append(self._readers.get_nowait())
+        self._writer = None
+        self._writer_owner = None
+        self._writer_depth = 0
+        self._reader_count = 0
+        self._reader_conns = set()
+        self._reader_owners = {}
+        return connections
+
+    async def _connect(self, read_only: bool) -> aiosqlite.Connection:
+        """Open a connection with the shared PRAGMAs."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = aiosqlite.connect(self.db_path, timeout=_DB_BUSY_TIMEOUT_MS / 1000)
+        # Pooled connections live as long as the process; their worker
+        # threads must not keep the interpreter alive after main() returns
+        # (older aiosqlite versions make the Connection itself the thread).
+        getattr(conn, "_thread", conn).daemon = True
+        await conn
+        for pragma in _CONNECTION_PRAGMAS:
+            await conn.execute(pragma)
+        if read_only:
+            await conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    @staticmethod
+    async def _close_quietly(conn: aiosqlite.Connection):
+        try:
+            await conn.close()
+        except Exception as e:
+            logger.debug(f"Error closing SQLite connection: {e}")
+
+    async def close(self):
+        """Close all idle connections. The pool reopens lazily on next use."""
+        with self._init_lock:
+            connections = self._take_all_connections()
+            self._loop = None
+        for conn in connections:
+            await self._close_quietly(conn)
+
+    # ------------------------------------------------------------------
+    # Writer
+    # ------------------------------------------------------------------
+
+    def writer(self) -> "PooledConnection":
+        """Context manager for the (exclusive) writer connection."""
+        return PooledConnection(self.acquire_writer, self.release_writer)
+
+    async def acquire_writer(self) -> aiosqlite.Connection:
+        await self._bind_loop()
+        task = asyncio.current_task()
+        if task is not None and self._writer_owner is task:
+            self._writer_depth += 1
+            return self._writer
+
+        start = time.perf_counter()
+        await self._writer_lock.acquire()
+        try:
+            if self._writer is None:
+                async with self._open_lock:
+                    self._writer = await self._connect(read_only=False)
+        except BaseException:
+            self._writer_lock.release()
+            raise
+        self._writer_waits.record((time.perf_counter() - start) * 1000)
+        self._writer_owner = task
+        self._writer_depth = 1
+        return self._writer
+
+    async def release_writer(self, conn: aiosqlite.Connection):
+        if conn is not self._writer:
+            # Pool was closed or rebound while this connection was out
+            await self._close_quietly(conn)
+            return
+        self._writer_depth -= 1
+        if self._writer_depth > 0:
+            return
+        try:
+            await self._reset(conn)
+        finally:
+            self._writer_owner = None
+            if self._writer_lock is not None and self._writer_lock.locked():
+                self._writer_lock.release()
+
+    # ------------------------------------------------------------------
+    # Readers
+    # ------------------------------------------------------------------
+
+    def reader(self) -> "PooledConnection":
+        """Context manager for a read-only connection."""
+        return PooledConnection(self.acquire_reader, self.release_reader)
+
+    async def acquire_reader(self) -> aiosqlite.Connection:
+        await self._bind_loop()
+        task = asyncio.current_task()
+        if task is not None:
+            if self._writer_owner is task:
+                # Read through the writer so the task sees its own writes
+                self._writer_depth += 1
+                return self._writer
+            held = self._reader_owners.get(task)
+            if held:
+                held[1] += 1
+                return held[0]
+
+        start = time.perf_counter()
+        try:
+            conn = self._readers.get_nowait()
+        except asyncio.QueueEmpty:
+            if self._reader_count < self.max_readers:
+                self._reader_count += 1
+                try:
+                    conn = await self._connect(read_only=True)
+                except BaseException:
+                    self._reader_count -= 1
+                    raise
+                self._reader_conns.add(conn)
+            else:
+                conn = await self._readers.get()
+        self._reader_waits.record((time.perf_counter() - start) * 1000)
+        if task is not None:
+            self._reader_owners[task] = [conn, 1]
+        return conn
+
+    async def release_reader(self, conn: aiosqlite.Connection):
+        if conn is self._writer and self._writer_owner is asyncio.current_task():
+            await self.release_writer(conn)
+            return
+        task = asyncio.current_task()
+        held = self._reader_owners.get(task)
+        if held is not None:
+            held[1] -= 1
+            if held[1] > 0:
+                return
+            del self._reader_owners[task]
+        if conn not in self._reader_conns:
+            await self._close_quietly(conn)
+            return
+        await self._reset(conn)
+        if self._readers is not None:
+            self._readers.put_nowait(conn)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def _reset(conn: aiosqlite.Connection):
+        """Return a connection to a clean state before it is reused."""
+        conn.row_factory = None
+        if conn.in_transaction:
+            # Uncommitted work must not leak into the next user's commit
+            await conn.rollback()
+
+    async def health_check(self) -> dict:
+        """Probe idle connections, replacing any that no longer respond.
+
+        Returns:
+            Dict with 'ok' and the number of connections checked/replaced
+        """
+        await self._bind_loop()
+        checked = 0
+        replaced = 0
+
+        # Writer (only if nobody is using it)
+        if self._writer is not None and not self._writer_lock.locked():
+            async with self._writer_lock:
+                checked += 1
+                if not await self._probe(self._writer):
+                    await self._close_quietly(self._writer)
+                    self._writer = await self._connect(read_only=False)
+                    replaced += 1
+
+        # Idle readers
+        idle = []
+        while not self._readers.empty():
+            idle.append(self._readers.get_nowait())
+        for conn in idle:
+            checked += 1
+            if not await self._probe(conn):
+                await self._close_quietly(conn)
+                self._reader_conns.discard(conn)
+                conn = await self._connect(read_only=True)
+                self._reader_conns.add(conn)
+                replaced += 1
+            self._readers.put_nowait(conn)
+
+        self._replaced_connections += replaced
+        return {"ok": True, "checked": checked, "replaced": replaced}
+
+    @staticmethod
+    async def _probe(conn: aiosqlite.Connection) -> bool:
+        try:
+            cursor = await conn.execute("SELECT 1")
+            await cursor.fetchone()
+            return True
+        except Exception as e:
+            logger.warning(f"SQLite connection failed health check: {e}")
+            return False
+
+    def get_stats(self) -> dict:
+        """Pool size and wait-time metrics."""
+        return {
+            "db": self.db_path.name,
+            "writer_open": self._writer is not None,
+            "writer_busy": bool(self._writer_lock and self._writer_lock.locked()),
+            "readers_open": self._reader_count,
+            "readers_idle": self._readers.qsize() if self._readers is not None else 0,
+            "max_readers": self.max_readers,
+            "writer_wait": self._writer_waits.to_dict(),
+            "reader_wait": self._reader_waits.to_dict(),
+            "replaced_connections": self._replaced_connections,
+        }
+
+
+class PooledConnection:
+    """Context manager for pooled database connections."""
+
+    def __init__(self, acquire, release):
+        self._acquire = acquire
+        self._release = release
+        self.conn: Optional[aiosqlite.Connection] = None
+
+    async def __aenter__(self) -> aiosqlite.Connection:
+        self.conn = await self._acquire()
+        return self.conn
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.conn:
+            conn, self.conn = self.conn, None
+            await self._release(conn)
+
+
+# One pool per database file, shared by every service that uses it
+_pools: dict[str, SQLitePool] = {}
+_pools_by_arg: dict[str, SQLitePool] = {}  # Fast path: skips Path.resolve()
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: Union[str, Path]) -> SQLitePool:
+    """Get the shared pool for a database file."""
+    pool = _pools_by_arg.get(str(db_path))
+    if pool is not None:
+        return pool
+    with _pools_lock:
+        key = str(Path(db_path).resolve())
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SQLitePool(Path(db_path))
+            _pools[key] = pool
+        _pools_by_arg[str(db_path)] = pool
+    return pool
+
+
+async def close_all_pools():
+    """Close every pool (called on app shutdown)."""
+    for pool in list(_pools.values()):
+        await pool.close()
+
+
+async def check_all_pools() -> dict[str, Any]:
+    """Run health_check on every open pool."""
+    results = {}
+    for pool in list(_pools.values()):
+        try:
+            results[pool.db_path.name] = await pool.health_check()
+        except Exception as e:
+            results[pool.db_path.name] = {"ok": False, "error": str(e)}
+    return results
+
+
+def get_pool_stats() -> list[dict]:
+    """Stats for every pool, for /api/metrics."""
+    return [pool.get_stats() for pool in list(_pools.values())]
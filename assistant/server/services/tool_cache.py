@@ -0,0 +1,496 @@
+"""Tool result cache.
+
+Results of tool calls are kept in two tiers:
+- an in-memory LRU, bounded by bytes, for repeat calls within a session
+- a SQLite table, also bounded by bytes, so results survive restarts and
+  remain available as an offline fallback
+
+Each tool has a CachePolicy. An entry goes through three windows:
+- fresh: returned without doing any work
+- stale-while-revalidate: returned at once while the caller refreshes it
+  in the background
+- retained: only used when the live call fails (offline, errors)
+
+After that the entry is dropped. For web_fetch, freshness follows the
+response's Cache-Control max-age (capped by the policy), and stale
+entries are revalidated with ETag/Last-Modified conditional requests.
+Deterministic file tools are opt-in and store a fingerprint of the file
+mtimes they depend on; a changed fingerprint invalidates the entry.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Byte budgets for the two tiers (sizes are of the JSON-encoded value)
+DEFAULT_MEMORY_BYTES = 8 * 1024 * 1024
+DEFAULT_DISK_BYTES = 64 * 1024 * 1024
+# Minimum seconds between sweeps that delete expired rows from disk
+PURGE_INTERVAL = 60.0
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How long one tool's results stay usable (all values in seconds)."""
+    ttl: float = 0.0                     # Fresh: served without any check
+    stale_while_revalidate: float = 0.0  # After ttl: served while refreshed
+    retain: float = 24 * 3600.0          # Kept this long as a failure fallback
+    enabled: bool = True
+    persist: bool = True                 # Also store in SQLite
+
+
+DEFAULT_POLICY = CachePolicy()
+
+DEFAULT_POLICIES: Dict[str, CachePolicy] = {
+    # Freshness comes from the response's max-age, capped at ttl
+    "web_fetch": CachePolicy(ttl=3600.0, stale_while_revalidate=600.0),
+    # Opt-in (config.TOOL_CACHE_FILE_TOOLS). Entries are checked against
+    # file mtimes on every hit, so they can stay fresh for long. File
+    # contents are not copied to disk.
+    "read_file": CachePolicy(ttl=3600.0, retain=3600.0, enabled=False, persist=False),
+    "search_code": CachePolicy(ttl=600.0, retain=600.0, enabled=False, persist=False),
+    "get_file_info": CachePolicy(ttl=3600.0, retain=3600.0, enabled=False, persist=False),
+}
+
+
+@dataclass
+class CacheEntry:
+    """A cached tool result and its validity windows (epoch seconds)."""
+    tool: str
+    key: str
+    value: Any
+    size: int
+    stored_at: float
+    fresh_until: float
+    swr_until: float
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fingerprint: Optional[str] = None
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (time.time() if now is None else now) < self.fresh_until
+
+    def can_serve_stale(self, now: Optional[float] = None) -> bool:
+        """Within the stale-while-revalidate window."""
+        now = time.time() if now is None else now
+        return self.fresh_until <= now < self.swr_until
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ToolResultCache:
+    """Two-tier (memory LRU + SQLite) cache for tool results. Thread-safe."""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_memory_bytes: int = DEFAULT_MEMORY_BYTES,
+        max_disk_bytes: int = DEFAULT_DISK_BYTES,
+        policies: Optional[Dict[str, CachePolicy]] = None,
+    ):
+        """
+        Args:
+            db_path: SQLite file for the persistent tier (memory only if None)
+            max_memory_bytes: Budget for the in-memory LRU
+            max_disk_bytes: Budget for the SQLite tier
+            policies: Per-tool policies (default: DEFAULT_POLICIES)
+        """
+        self.db_path = db_path
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._policies = dict(DEFAULT_POLICIES if policies is None else policies)
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[Tuple[str, str], CacheEntry]" = OrderedDict()
+        self._memory_bytes = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        self._last_purge = 0.0
+
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._evictions = 0
+
+    # Policies
+
+    def policy_for(self, tool: str) -> CachePolicy:
+        return self._policies.get(tool, DEFAULT_POLICY)
+
+    def configure(self, tool: str, **changes) -> CachePolicy:
+        """Change fields of a tool's policy (e.g. enabled=True)."""
+        with self._lock:
+            policy = replace(self.policy_for(tool), **changes)
+            self._policies[tool] = policy
+        return policy
+
+    def is_enabled(self, tool: str) -> bool:
+        return self.policy_for(tool).enabled
+
+    # Reads and writes
+
+    def get(self, tool: str, key: str, fingerprint: Optional[str] = None) -> Optional[CacheEntry]:
+        """Look up an entry that has not expired.
+
+        The caller decides what to do with a stale entry (see CacheEntry).
+        With a fingerprint, an entry stored under a different one is
+        invalidated and treated as a miss.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get((tool, key))
+            if entry is not None:
+                self._memory.move_to_end((tool, key))
+            elif self.policy_for(tool).persist:
+                entry = self._load(tool, key, now)
+                if entry is not None:
+                    self._remember(entry)
+
+            if entry is not None and now >= entry.expires_at:
+                self._delete(tool, key)
+                entry = None
+            if entry is not None and fingerprint is not None and entry.fingerprint != fingerprint:
+                self._delete(tool, key)
+                self._count(tool, "invalidated")
+                entry = None
+
+            if entry is None:
+                self._count(tool, "misses")
+            elif entry.is_fresh(now):
+                self._count(tool, "hits")
+            else:
+                self._count(tool, "stale_hits")
+            return entry
+
+    def set(
+        self,
+        tool: str,
+        key: str,
+        value: Any,
+        max_age: Optional[float] = None,
+        stale_while_revalidate: Optional[float] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+    ) -> Optional[CacheEntry]:
+        """Store a result.
+
+        Args:
+            max_age: Freshness lifetime from the source (e.g. Cache-Control
+                max-age), capped by the policy ttl. The policy ttl if None.
+            stale_while_revalidate: Window from the source, capped by the
+                policy. Without one, the policy window applies only to
+                entries that had a freshness lifetime.
+        """
+        policy = self.policy_for(tool)
+        if not policy.enabled:
+            return None
+
+        encoded = json.dumps(value)
+        now = time.time()
+        fresh = policy.ttl if max_age is None else max(0.0, min(max_age, policy.ttl))
+        if stale_while_revalidate is not None:
+            window = max(0.0, min(stale_while_revalidate, policy.stale_while_revalidate))
+        else:
+            window = policy.stale_while_revalidate if fresh > 0 else 0.0
+        entry = CacheEntry(
+            tool=tool,
+            key=key,
+            value=value,
+            size=len(encoded.encode()),
+            stored_at=now,
+            fresh_until=now + fresh,
+            swr_until=now + fresh + window,
+            expires_at=now + max(policy.retain, fresh + window),
+            etag=etag,
+            last_modified=last_modified,
+            fingerprint=fingerprint,
+        )
+
+        with self._lock:
+            self._discard_memory((tool, key))
+            self._remember(entry)
+            if policy.persist:
+                self._store(entry, encoded, now)
+        return entry
+
+    def refresh(self, tool: str, key: str, max_age: Optional[float] = None,
+                stale_while_revalidate: Optional[float] = None) -> Optional[CacheEntry]:
+        """Restart an entry's windows after the source confirmed it unchanged (HTTP 304)."""
+        with self._lock:
+            entry = self._memory.get((tool, key))
+            if entry is None and self.policy_for(tool).persist:
+                entry = self._load(tool, key, time.time())
+            self._count(tool, "revalidated")
+        if entry is None:
+            return None
+        return self.set(
+            tool, key, entry.value,
+            max_age=max_age,
+            stale_while_revalidate=stale_while_revalidate,
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+            fingerprint=entry.fingerprint,
+        )
+
+    def invalidate(self, tool: str, key: str):
+        """Remove one entry."""
+        with self._lock:
+            self._delete(tool, key)
+
+    def clear(self, tool: Optional[str] = None) -> int:
+        """Remove all entries (of one tool, if given). Returns how many were removed."""
+        with self._lock:
+            keys = [k for k in self._memory if tool is None or k[0] == tool]
+            removed = set(keys)
+            for k in keys:
+                self._discard_memory(k)
+            conn = self._connection()
+            if conn is not None:
+                where, params = ("", ()) if tool is None else (" WHERE tool = ?", (tool,))
+                rows = conn.execute(f"SELECT tool, key FROM tool_cache{where}", params).fetchall()
+                removed.update((row[0], row[1]) for row in rows)
+                with conn:
+                    conn.execute(f"DELETE FROM tool_cache{where}", params)
+                self._disk_bytes = self._sum_disk_bytes(conn)
+            return len(removed)
+
+    def count(self) -> int:
+        """Number of distinct cached entries across both tiers."""
+        with self._lock:
+            keys = set(self._memory)
+            conn = self._connection()
+            if conn is not None:
+                keys.update((row[0], row[1]) for row in conn.execute("SELECT tool, key FROM tool_cache"))
+            return len(keys)
+
+    def get_stats(self) -> dict:
+        """Hit/miss counters per tool and tier sizes."""
+        with self._lock:
+            by_tool = {tool: dict(counts) for tool, counts in self._stats.items()}
+            totals = {name: sum(counts.get(name, 0) for counts in by_tool.values())
+                      for name in ("hits", "stale_hits", "misses", "revalidated", "invalidated")}
+            lookups = totals["hits"] + totals["stale_hits"] + totals["misses"]
+            conn = self._connection()
+            disk_entries = conn.execute("SELECT COUNT(*) FROM tool_cache").fetchone()[0] if conn else 0
+            return {
+                **totals,
+                "hit_rate": round((totals["hits"] + totals["stale_hits"]) / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "disk_entries": disk_entries,
+                "disk_bytes": self._disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes,
+                "by_tool": by_tool,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+            self._evictions = 0
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # Memory tier (callers hold the lock)
+
+    def _remember(self, entry: CacheEntry):
+        if entry.size > self.max_memory_bytes:
+            return
+        self._memory[(entry.tool, entry.key)] = entry
+        self._memory_bytes += entry.size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.size
+            self._evictions += 1
+
+    def _discard_memory(self, memory_key: Tuple[str, str]):
+        entry = self._memory.pop(memory_key, None)
+        if entry is not None:
+            self._memory_bytes -= entry.size
+
+    def _delete(self, tool: str, key: str):
+        self._discard_memory((tool, key))
+        conn = self._connection()
+        if conn is not None:
+            row = conn.execute("SELECT size FROM tool_cache WHERE tool = ? AND key = ?", (tool, key)).fetchone()
+            if row:
+                with conn:
+                    conn.execute("DELETE FROM tool_cache WHERE tool = ? AND key = ?", (tool, key))
+                self._disk_bytes -= row[0]
+
+    def _count(self, tool: str, name: str):
+        counts = self._stats.setdefault(tool, {})
+        counts[name] = counts.get(name, 0) + 1
+
+    # SQLite tier (callers hold the lock)
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the database on first use; None when memory-only or unavailable."""
+        if self._conn is not None or self.db_path is None:
+            return self._conn
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS tool_cache (
+                        tool TEXT NOT NULL,
+                        key TEXT NOT NULL,
+                        value TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        stored_at REAL NOT NULL,
+                        fresh_until REAL NOT NULL,
+                        swr_until REAL NOT NULL,
+                        expires_at REAL NOT NULL,
+                        etag TEXT,
+                        last_modified TEXT,
+                        fingerprint TEXT,
+                        accessed_at REAL NOT NULL,
+                        PRIMARY KEY (tool, key)
+                    )
+                """)
+                # Eviction order and expiry sweeps
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_tool_cache_accessed ON tool_cache(accessed_at)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_tool_cache_expires ON tool_cache(expires_at)")
+        except sqlite3.Error as e:
+            logger.warning(f"Tool cache database unavailable, using memory only: {e}")
+            self.db_path = None
+            return None
+        self._conn = conn
+        self._disk_bytes = self._sum_disk_bytes(conn)
+        return conn
+
+    @staticmethod
+    def _sum_disk_bytes(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM tool_cache").fetchone()[0]
+
+    def _load(self, tool: str, key: str, now: float) -> Optional[CacheEntry]:
+        conn = self._connection()
+        if conn is None:
+            return None
+        row = conn.execute(
+            """SELECT value, size, stored_at, fresh_until, swr_until, expires_at,
+                      etag, last_modified, fingerprint
+               FROM tool_cache WHERE tool = ? AND key = ?""",
+            (tool, key),
+        ).fetchone()
+        if row is None:
+            return None
+        # Disk-tier LRU order is updated only when the memory tier misses
+        with conn:
+            conn.execute("UPDATE tool_cache SET accessed_at = ? WHERE tool = ? AND key = ?", (now, tool, key))
+        return CacheEntry(
+            tool=tool, key=key, value=json.loads(row[0]), size=row[1],
+            stored_at=row[2], fresh_until=row[3], swr_until=row[4], expires_at=row[5],
+            etag=row[6], last_modified=row[7], fingerprint=row[8],
+        )
+
+    def _store(self, entry: CacheEntry, encoded: str, now: float):
+        conn = self._connection()
+        if conn is None or entry.size > self.max_disk_bytes:
+            return
+        previous = conn.execute(
+            "SELECT size FROM tool_cache WHERE tool = ? AND key = ?", (entry.tool, entry.key)
+        ).fetchone()
+        with conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO tool_cache
+                   (tool, key, value, size, stored_at, fresh_until, swr_until, expires_at,
+                    etag, last_modified, fingerprint, accessed_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (entry.tool, entry.key, encoded, entry.size, entry.stored_at, entry.fresh_until,
+                 entry.swr_until, entry.expires_at, entry.etag, entry.last_modified,
+                 entry.fingerprint, now),
+            )
+        self._disk_bytes += entry.size - (previous[0] if previous else 0)
+
+        if now - self._last_purge >= PURGE_INTERVAL:
+            self._last_purge = now
+            with conn:
+                conn.execute("DELETE FROM tool_cache WHERE expires_at <= ?", (now,))
+            self._disk_bytes = self._sum_disk_bytes(conn)
+
+        # Evict least recently read rows until back under budget
+        while self._disk_bytes > self.max_disk_bytes:
+            rows = conn.execute(
+                "SELECT tool, key, size FROM tool_cache ORDER BY accessed_at LIMIT 32"
+            ).fetchall()
+            if not rows:
+                break
+            with conn:
+                for tool, key, size in rows:
+                    if self._disk_bytes <= self.max_disk_bytes:
+                        break
+                    conn.execute("DELETE FROM tool_cache WHERE tool = ? AND key = ?", (tool, key))
+                    self._disk_bytes -= size
+                    self._evictions += 1
+
+
+def parse_cache_control(header: Optional[str]) -> Tuple[Optional[float], Optional[float], bool]:
+    """Read max-age, stale-while-revalidate and no-store/no-cache from Cache-Control.
+
+    Returns:
+        (max_age, stale_while_revalidate, cacheable). max_age is 0 for
+        no-cache, and None when the header doesn't say.
+    """
+    if not header:
+        return None, None, True
+    max_age = swr = None
+    cacheable = True
+    for directive in header.lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        value = value.strip().strip('"')
+        if name == "no-store":
+            cacheable = False
+        elif name == "no-cache":
+            max_age = 0.0
+        elif name in ("max-age", "stale-while-revalidate") and value.isdigit():
+            if name == "max-age":
+                max_age = float(value) if max_age is None else min(max_age, float(value))
+            else:
+                swr = float(value)
+    return max_age, swr, cacheable
+
+
+# Global instance
+_tool_cache: Optional[ToolResultCache] = None
+
+
+def get_tool_cache(db_path: Optional[Path] = None) -> ToolResultCache:
+    """Get or create the global tool result cache."""
+    global _tool_cache
+    if _tool_cache is None:
+        import config
+        if db_path is None:
+            db_path = config.BASE_DIR / "memory" / "tool_cache.db"
+        _tool_cache = ToolResultCache(
+            db_path,
+            max_memory_bytes=config.TOOL_CACHE_MEMORY_BYTES,
+            max_disk_bytes=config.TOOL_CACHE_DISK_BYTES,
+        )
+        for tool in config.TOOL_CACHE_FILE_TOOLS:
+            _tool_cache.configure(tool, enabled=True)
+    return _tool_cache
@@ -11,11 +11,18 @@ Tool Requirements (per .claude/rules/04-tools-network.md):
 4. Registry entry - via @register_tool decorator
 """
 
+import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Callable, Any, Optional
 from datetime import datetime
 import hashlib
+import json
 import logging
+import os
+import threading
 from urllib.parse import urlparse
 
 # Import permission system
@@ -27,6 +34,61 @@ from core.permissions import PermissionLevel, get_permission_level, can_access
 
 logger = logging.getLogger(__name__)
 
+# Default per-call timeout for execute_async/execute_many (seconds)
+DEFAULT_TOOL_TIMEOUT = 60.0
+# Worker threads for sync tool handlers run from async code
+TOOL_EXECUTOR_MAX_WORKERS = 8
+
+_tool_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """Get the bounded thread pool that runs sync tool handlers."""
+    global _tool_executor
+    if _tool_executor is None:
+        _tool_executor = ThreadPoolExecutor(
+            max_workers=TOOL_EXECUTOR_MAX_WORKERS, thread_name_prefix="tool"
+        )
+    return _tool_executor
+
+
+def _run_awaitable_sync(awaitable: Any, timeout: float) -> Any:
+    """
+    Run an awaitable to completion from synchronous code.
+
+    The awaitable gets its own event loop, so this only works in a thread
+    without a running loop. Async code must await the tool instead (see
+    ToolRegistry.execute_async): blocking a running loop until the call
+    finishes would stall it, and the call could not use resources bound to
+    that loop.
+
+    Raises:
+        RuntimeError: If this thread is running an event loop
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        if inspect.iscoroutine(awaitable):
+            awaitable.close()
+        raise RuntimeError(
+            "Async tool called synchronously from a running event loop; use execute_async"
+        )
+
+    async def bounded():
+        return await asyncio.wait_for(awaitable, timeout=timeout)
+
+    return asyncio.run(bounded())
+
+
+def shutdown_tool_executor() -> None:
+    """Shut down the tool thread pool (called on app shutdown)."""
+    global _tool_executor
+    if _tool_executor is not None:
+        _tool_executor.shutdown(wait=False, cancel_futures=True)
+        _tool_executor = None
+
 
 @dataclass
 class ToolParameter:
@@ -48,6 +110,8 @@ class ToolSpec:
     handler: Optional[Callable[..., Any]] = None
     # Permission level required to execute this tool (default: SANDBOX)
     required_permission: PermissionLevel = PermissionLevel.SANDBOX
+    # Seconds before an async execution is abandoned (None: DEFAULT_TOOL_TIMEOUT)
+    timeout: Optional[float] = None
 
 
 class ToolRegistry:
@@ -127,6 +191,11 @@ class ToolRegistry:
         self._tools[spec.name] = spec
         logger.info(f"Registered tool: {spec.name}")
 
+    def unregister_tool(self, name: str) -> None:
+        """Remove a tool (no-op if it is not registered)."""
+        if self._tools.pop(name, None) is not None:
+            logger.info(f"Unregistered tool: {name}")
+
     def get_tool(self, name: str) -> Optional[ToolSpec]:
         """Get a tool by name."""
         return self._tools.get(name)
@@ -139,32 +208,27 @@ class ToolRegistry:
         """Get all tool specifications."""
         return list(self._tools.values())
 
-    def execute(self, name: str, user_ip: Optional[str] = None, **kwargs) -> dict[str, Any]:
+    def _prepare(
+        self, name: str, user_ip: Optional[str], kwargs: dict, start_time: float
+    ) -> tuple[Optional[ToolSpec], Optional[dict[str, Any]], dict]:
         """
-        Execute a tool by name with given arguments.
+        Run the pre-execution checks for a tool call.
 
-        Args:
-            name: Tool name
-            user_ip: User IP address (for audit logging)
-            **kwargs: Tool arguments
+        Checks happen in this order: lookup, rate limit, permission, argument
+        sanitization. Rate-limited and blocked calls are audited here.
 
         Returns:
-            dict with:
-            - 'success' bool and 'result' for successful execution
-            - 'success' False and 'error' for errors
-            - 'success' False and 'permission_escalation' for permission requests
-            - 'success' False and 'rate_limited' for rate limit errors
+            (tool, early_result, sanitized_args). When early_result is not
+            None the call must not run and early_result is its outcome.
         """
         import time
         from .security import get_security_service
         from .rate_limiter import get_rate_limiter
         from .audit import get_audit_logger
 
-        start_time = time.time()
-
         tool = self._tools.get(name)
         if not tool:
-            return {"success": False, "error": f"Tool not found: {name}"}
+            return None, {"success": False, "error": f"Tool not found: {name}"}, kwargs
 
         # Check rate limit
         rate_limiter = get_rate_limiter()
@@ -184,12 +248,12 @@ class ToolRegistry:
                 user_ip=user_ip,
                 rate_limited=True,
             )
-            return {
+            return tool, {
                 "success": False,
                 "rate_limited": True,
                 "retry_after": retry_after,
                 "error": f"Rate limit exceeded. Retry after {retry_after:.1f} seconds."
-            }
+            }, kwargs
 
         # Check permission before execution
         current_level = get_permission_level()
@@ -200,7 +264,7 @@ class ToolRegistry:
                 f"Tool {name} requires {required_level.name} permission "
                 f"(current: {current_level.name}). Returning escalation request."
             )
-            return {
+            return tool, {
                 "success": False,
                 "permission_escalation": {
                     "tool_name": name,
@@ -211,7 +275,7 @@ class ToolRegistry:
                     "required_level_name": required_level.name,
                     "pending_args": kwargs,
                 }
-            }
+            }, kwargs
 
         # Sanitize arguments
         security_service = get_security_service()
@@ -229,49 +293,224 @@ class ToolRegistry:
                 duration_ms=duration_ms,
                 user_ip=user_ip,
             )
-            return {"success": False, "error": f"Security check failed: {error}"}
+            return tool, {"success": False, "error": f"Security check failed: {error}"}, kwargs
+
+        if tool.handler is None:
+            return tool, {"success": False, "error": f"Tool {name} has no handler"}, sanitized_args
+
+        return tool, None, sanitized_args
+
+    def _complete(
+        self,
+        name: str,
+        sanitized_args: dict,
+        user_ip: Optional[str],
+        start_time: float,
+        result: Any = None,
+        error: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """Sanitize output, audit-log and package the outcome of a tool run."""
+        import time
+        from .security import get_security_service
+        from .audit import get_audit_logger
 
+        if error is None and isinstance(result, str):
+            # Sanitize output
+            result = get_security_service().sanitize_output(result)
+
+        duration_ms = (time.time() - start_time) * 1000
+
+        # Log to audit
+        audit_logger = get_audit_logger()
+        audit_logger.log_execution(
+            tool_name=name,
+            args=sanitized_args,
+            result=result if error is None else None,
+            success=error is None,
+            duration_ms=duration_ms,
+            user_ip=user_ip,
+        )
+
+        if error is not None:
+            logger.error(f"Tool {name} failed: {error}")
+            return {"success": False, "error": error}
+
+        logger.info(f"Tool {name} executed successfully in {duration_ms:.1f}ms")
+        return {"success": True, "result": result}
+
+    def execute(self, name: str, user_ip: Optional[str] = None, **kwargs) -> dict[str, Any]:
+        """
+        Execute a tool by name with given arguments.
+
+        Args:
+            name: Tool name
+            user_ip: User IP address (for audit logging)
+            **kwargs: Tool arguments
+
+        Coroutine handlers are run to completion on their own event loop,
+        bounded by the tool's timeout; that fails with an error result when
+        called from a running loop. From async code use execute_async.
+
+        Returns:
+            dict with:
+            - 'success' bool and 'result' for successful execution
+            - 'success' False and 'error' for errors
+            - 'success' False and 'permission_escalation' for permission requests
+            - 'success' False and 'rate_limited' for rate limit errors
+        """
+        import time
+
+        start_time = time.time()
+
+        tool, early_result, sanitized_args = self._prepare(name, user_ip, kwargs, start_time)
+        if early_result is not None:
+            return early_result
+
+        timeout = tool.timeout if tool.timeout is not None else DEFAULT_TOOL_TIMEOUT
         try:
-            if tool.handler is None:
-                return {"success": False, "error": f"Tool {name} has no handler"}
             result = tool.handler(**sanitized_args)
+            if inspect.isawaitable(result):
+                # Async handler (e.g. an MCP bridge) called from sync code
+                result = _run_awaitable_sync(result, timeout)
+        except asyncio.TimeoutError:
+            return self._complete(
+                name, sanitized_args, user_ip, start_time,
+                error=f"Tool {name} timed out after {timeout:g} seconds",
+            )
+        except Exception as e:
+            return self._complete(name, sanitized_args, user_ip, start_time, error=str(e))
+        return self._complete(name, sanitized_args, user_ip, start_time, result=result)
+
+    async def _run_prepared(
+        self,
+        tool: ToolSpec,
+        sanitized_args: dict,
+        user_ip: Optional[str],
+        start_time: float,
+        timeout: Optional[float] = None,
+    ) -> dict[str, Any]:
+        """
+        Run a tool that passed _prepare without blocking the event loop.
 
-            # Sanitize output
-            if isinstance(result, str):
-                result = security_service.sanitize_output(result)
+        Coroutine handlers are awaited directly; sync handlers run on the
+        shared tool thread pool. The call is bounded by its timeout (explicit
+        argument, then ToolSpec.timeout, then DEFAULT_TOOL_TIMEOUT).
+        """
+        name = tool.name
+        if timeout is None:
+            timeout = tool.timeout if tool.timeout is not None else DEFAULT_TOOL_TIMEOUT
 
-            duration_ms = (time.time() - start_time) * 1000
+        if inspect.iscoroutinefunction(tool.handler):
+            work = tool.handler(**sanitized_args)
+        else:
+            loop = asyncio.get_running_loop()
+            work = loop.run_in_executor(
+                get_tool_executor(), functools.partial(tool.handler, **sanitized_args)
+            )
 
-            # Log to audit
-            audit_logger = get_audit_logger()
-            audit_logger.log_execution(
-                tool_name=name,
-                args=sanitized_args,
-                result=result,
-                success=True,
-                duration_ms=duration_ms,
-                user_ip=user_ip,
+        try:
+            result = await asyncio.wait_for(work, timeout=timeout)
+            if inspect.isawaitable(result):
+                # Sync wrapper around an async implementation
+                result = await asyncio.wait_for(result, timeout=timeout)
+        except asyncio.TimeoutError:
+            return self._complete(
+                name, sanitized_args, user_ip, start_time,
+                error=f"Tool {name} timed out after {timeout:g} seconds",
             )
+        except asyncio.CancelledError:
+            self._complete(name, sanitized_args, user_ip, start_time, error="Cancelled")
+            raise
+        except Exception as e:
+            return self._complete(name, sanitized_args, user_ip, start_time, error=str(e))
+        return self._complete(name, sanitized_args, user_ip, start_time, result=result)
+
+    async def execute_async(
+        self,
+        name: str,
+        user_ip: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        """
+        Execute a tool without blocking the event loop.
 
-            logger.info(f"Tool {name} executed successfully in {duration_ms:.1f}ms")
-            return {"success": True, "result": result}
+        Same checks, audit logging and return format as execute(), plus a
+        per-call timeout. Sync handlers run on a bounded thread pool.
 
-        except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
+        Args:
+            name: Tool name
+            user_ip: User IP address (for audit logging)
+            timeout: Seconds before the call is abandoned (default: the
+                tool's own timeout, then DEFAULT_TOOL_TIMEOUT)
+            **kwargs: Tool arguments
+        """
+        import time
 
-            # Log to audit
-            audit_logger = get_audit_logger()
-            audit_logger.log_execution(
-                tool_name=name,
-                args=sanitized_args,
-                result=None,
-                success=False,
-                duration_ms=duration_ms,
-                user_ip=user_ip,
-            )
+        start_time = time.time()
+
+        tool, early_result, sanitized_args = self._prepare(name, user_ip, kwargs, start_time)
+        if early_result is not None:
+            return early_result
+        return await self._run_prepared(tool, sanitized_args, user_ip, start_time, timeout)
+
+    async def execute_many(
+        self,
+        calls: list[tuple[str, dict]],
+        user_ip: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Execute several independent tool calls concurrently.
 
-            logger.error(f"Tool {name} failed: {e}")
-            return {"success": False, "error": str(e)}
+        Rate limits, permissions and argument sanitization are checked for
+        each call in order, exactly as sequential execute() calls would. If a
+        call needs permission escalation, calls after it are not run (they
+        get 'skipped': True), matching the old behaviour of stopping at the
+        first escalation. Calls that pass the checks then run concurrently.
+
+        Args:
+            calls: (tool_name, arguments) pairs, in the order the model issued them
+            user_ip: User IP address (for audit logging)
+            timeout: Per-call timeout in seconds (see execute_async)
+
+        Returns:
+            One result dict per call, in the same order as calls.
+        """
+        import time
+
+        results: list[Optional[dict[str, Any]]] = [None] * len(calls)
+        runs = []
+        run_indexes = []
+        escalated = False
+
+        for index, (name, args) in enumerate(calls):
+            if escalated:
+                results[index] = {
+                    "success": False,
+                    "skipped": True,
+                    "error": "Skipped: an earlier tool call requires permission escalation",
+                }
+                continue
+
+            start_time = time.time()
+            tool, early_result, sanitized_args = self._prepare(name, user_ip, args, start_time)
+            if early_result is not None:
+                results[index] = early_result
+                escalated = "permission_escalation" in early_result
+                continue
+
+            runs.append(self._run_prepared(tool, sanitized_args, user_ip, start_time, timeout))
+            run_indexes.append(index)
+
+        if runs:
+            from .tracing import span
+            with span("tool_execution", tools=len(runs)):
+                outcomes = await asyncio.gather(*runs)
+            for index, result in zip(run_indexes, outcomes):
+                results[index] = result
+
+        return results
 
     def to_openai_tools(self) -> list[dict]:
         """
@@ -419,12 +658,97 @@ def _compute_cache_key(url: str, max_length: int) -> str:
     return hashlib.sha256(key_data.encode()).hexdigest()[:16]
 
 
-def _web_fetch_impl(url: str, max_length: int = 4000, use_cache: bool = True) -> str:
+# Cache keys with a background revalidation in flight, and the tasks doing it
+_web_fetch_revalidating: set[str] = set()
+_web_fetch_revalidating_lock = threading.Lock()
+_web_fetch_tasks: set[asyncio.Task] = set()
+
+
+def _format_web_fetch(url: str, max_length: int, fetched) -> str:
+    """Build the web_fetch result text for a successful fetch."""
+    content = fetched.text
+    content_type = fetched.headers.get("content-type", "")
+
+    if fetched.truncated:
+        content += f"\n\n[Content truncated at {max_length} characters]"
+
+    # Add metadata
+    return f"URL: {url}\nStatus: {fetched.status_code}\nContent-Type: {content_type}\n\n{content}"
+
+
+def _cache_web_fetch(cache_key: str, fetched, result: Optional[str]):
+    """Store a 200 response's result, or restart a cached entry's windows on 304.
+
+    Freshness follows the response's Cache-Control. Without one the entry
+    is revalidated on every call (conditionally, when the server sent an
+    ETag or Last-Modified) and otherwise kept only as an offline fallback.
+    """
+    from .tool_cache import get_tool_cache, parse_cache_control
+
+    cache = get_tool_cache()
+    max_age, stale_while_revalidate, cacheable = parse_cache_control(fetched.headers.get("cache-control"))
+    max_age = max_age or 0.0
+    if fetched.status_code == 304:
+        cache.refresh("web_fetch", cache_key, max_age=max_age, stale_while_revalidate=stale_while_revalidate)
+    elif not cacheable:
+        cache.invalidate("web_fetch", cache_key)
+    else:
+        cache.set(
+            "web_fetch", cache_key, result,
+            max_age=max_age,
+            stale_while_revalidate=stale_while_revalidate,
+            etag=fetched.headers.get("etag"),
+            last_modified=fetched.headers.get("last-modified"),
+        )
+
+
+async def _revalidate_web_fetch(url: str, max_length: int, cache_key: str, validators: dict):
+    """Refresh a stale web_fetch entry in the background."""
+    from .web_fetch import get_web_fetcher
+
+    try:
+        fetched = await get_web_fetcher().fetch(url, max_length, headers=validators)
+        logger.info(f"web_fetch: Revalidated {url}, status={fetched.status_code}")
+        if fetched.status_code == 304:
+            await asyncio.to_thread(_cache_web_fetch, cache_key, fetched, None)
+        elif fetched.status_code == 200:
+            result = _format_web_fetch(url, max_length, fetched)
+            await asyncio.to_thread(_cache_web_fetch, cache_key, fetched, result)
+    except Exception as e:
+        logger.warning(f"web_fetch: Background revalidation failed for {url}: {e}")
+    finally:
+        with _web_fetch_revalidating_lock:
+            _web_fetch_revalidating.discard(cache_key)
+
+
+def _start_revalidation(url: str, max_length: int, cache_key: str, validators: dict):
+    """Start one background revalidation per cache key on the running loop.
+
+    Sync callers run on a one-off loop that may end first; the entry then
+    stays stale and the next call starts another revalidation.
+    """
+    with _web_fetch_revalidating_lock:
+        if cache_key in _web_fetch_revalidating:
+            return
+        _web_fetch_revalidating.add(cache_key)
+    task = asyncio.get_running_loop().create_task(
+        _revalidate_web_fetch(url, max_length, cache_key, validators)
+    )
+    _web_fetch_tasks.add(task)
+    task.add_done_callback(_web_fetch_tasks.discard)
+
+
+async def _web_fetch_async(url: str, max_length: int = 4000, use_cache: bool = True) -> str:
     """Implementation for web_fetch tool.
 
-    Supports caching for offline access via the degradation service.
-    When offline or degraded, returns cached content if available.
-    Successful fetches are cached for future offline use.
+    Pages are fetched on a shared, pooled async client and streamed: HTML
+    is reduced to text and reading stops after max_length characters (see
+    web_fetch.py). Results are kept in the tool result cache. Fresh entries
+    are returned without a request; entries in their
+    stale-while-revalidate window are returned while a background request
+    refreshes them; older entries are revalidated with a conditional
+    request (ETag/Last-Modified). When offline, degraded or the request
+    fails, cached content is returned if available.
 
     Args:
         url: The URL to fetch
@@ -433,6 +757,8 @@ def _web_fetch_impl(url: str, max_length: int = 4000, use_cache: bool = True) ->
     """
     import httpx
     from .degradation import get_degradation_service, DegradationMode
+    from .tool_cache import get_tool_cache
+    from .web_fetch import FetchBlocked, get_web_fetcher
 
     # Validate URL
     parsed = urlparse(url)
@@ -441,84 +767,102 @@ def _web_fetch_impl(url: str, max_length: int = 4000, use_cache: bool = True) ->
     if not parsed.netloc:
         return f"Error: Invalid URL. Missing domain."
 
-    # Get degradation service for caching
     degradation_service = get_degradation_service()
     cache_key = _compute_cache_key(url, max_length)
-
-    # Check if we should try cache first (offline or network issues)
-    if use_cache and degradation_service.mode in (
-        DegradationMode.OFFLINE,
-        DegradationMode.DEGRADED,
-        DegradationMode.RATE_LIMITED,
-    ):
-        cached = degradation_service.get_cached_tool_result("web_fetch", cache_key)
-        if cached:
+    # The cache is sqlite; keep its reads and writes off the event loop
+    cached = await asyncio.to_thread(get_tool_cache().get, "web_fetch", cache_key) if use_cache else None
+
+    if cached is not None:
+        # Use cache first when offline or having network issues
+        if degradation_service.mode in (
+            DegradationMode.OFFLINE,
+            DegradationMode.DEGRADED,
+            DegradationMode.RATE_LIMITED,
+        ):
             logger.info(f"web_fetch: Returning cached content for {url} (mode: {degradation_service.mode.name})")
-            cached_result = cached["result"]
-            # Add cache indicator to result
-            return f"[CACHED - {cached['cached_at']}]\n{cached_result}"
+            cached_at = datetime.fromtimestamp(cached.stored_at).isoformat()
+            return f"[CACHED - {cached_at}]\n{cached.value}"
+
+        if cached.is_fresh():
+            logger.debug(f"web_fetch: Returning fresh cached content for {url}")
+            return cached.value
+
+        if cached.can_serve_stale():
+            _start_revalidation(url, max_length, cache_key, cached.validators)
+            logger.debug(f"web_fetch: Returning stale cached content for {url} while revalidating")
+            return cached.value
 
     # Log external call (per network rules in 04-tools-network.md)
     logger.info(f"web_fetch: Fetching URL={url}, purpose=user_request")
 
     try:
-        with httpx.Client(timeout=10.0, follow_redirects=True) as client:
-            response = client.get(url, headers={
-                "User-Agent": "GenesisAssistant/1.0 (AI Assistant web_fetch tool)"
-            })
+        validators = cached.validators if cached is not None else None
+        fetched = await get_web_fetcher().fetch(url, max_length, headers=validators)
 
         # Log result summary
-        logger.info(f"web_fetch: status={response.status_code}, content_type={response.headers.get('content-type', 'unknown')}, length={len(response.text)}")
+        logger.info(f"web_fetch: status={fetched.status_code}, content_type={fetched.headers.get('content-type', 'unknown')}, length={len(fetched.text)}")
 
-        if response.status_code != 200:
-            # On error, try cache as fallback
-            if use_cache:
-                cached = degradation_service.get_cached_tool_result("web_fetch", cache_key)
-                if cached:
-                    logger.info(f"web_fetch: HTTP error, returning cached content for {url}")
-                    return f"[CACHED FALLBACK - HTTP {response.status_code}]\n{cached['result']}"
-            return f"Error: HTTP {response.status_code} - {response.reason_phrase}"
-
-        content = response.text
-        content_type = response.headers.get("content-type", "")
+        if fetched.status_code == 304 and cached is not None:
+            # Unchanged since cached
+            await asyncio.to_thread(_cache_web_fetch, cache_key, fetched, None)
+            return cached.value
 
-        # Truncate if too long
-        if len(content) > max_length:
-            content = content[:max_length] + f"\n\n[Content truncated at {max_length} characters. Total length: {len(response.text)}]"
+        if fetched.status_code != 200:
+            # On error, try cache as fallback
+            if cached is not None:
+                logger.info(f"web_fetch: HTTP error, returning cached content for {url}")
+                return f"[CACHED FALLBACK - HTTP {fetched.status_code}]\n{cached.value}"
+            return f"Error: HTTP {fetched.status_code} - {fetched.reason_phrase}"
 
-        # Add metadata
-        result = f"URL: {url}\nStatus: {response.status_code}\nContent-Type: {content_type}\n\n{content}"
+        result = _format_web_fetch(url, max_length, fetched)
 
-        # Cache successful result for offline access
+        # Cache successful result for reuse and offline access
         if use_cache:
-            degradation_service.cache_tool_result("web_fetch", cache_key, result)
+            await asyncio.to_thread(_cache_web_fetch, cache_key, fetched, result)
             logger.debug(f"web_fetch: Cached result for {url}")
 
         return result
 
+    except FetchBlocked as e:
+        logger.warning(f"web_fetch: Blocked {url}: {e}")
+        return f"Error: {e}"
     except httpx.TimeoutException:
         logger.warning(f"web_fetch: Timeout fetching {url}")
         # Try cache on timeout
-        if use_cache:
-            cached = degradation_service.get_cached_tool_result("web_fetch", cache_key)
-            if cached:
-                logger.info(f"web_fetch: Timeout, returning cached content for {url}")
-                return f"[CACHED FALLBACK - Timeout]\n{cached['result']}"
+        if cached is not None:
+            logger.info(f"web_fetch: Timeout, returning cached content for {url}")
+            return f"[CACHED FALLBACK - Timeout]\n{cached.value}"
         return f"Error: Request timed out after 10 seconds"
     except httpx.RequestError as e:
         logger.error(f"web_fetch: Request error for {url}: {e}")
         # Try cache on network error
-        if use_cache:
-            cached = degradation_service.get_cached_tool_result("web_fetch", cache_key)
-            if cached:
-                logger.info(f"web_fetch: Network error, returning cached content for {url}")
-                return f"[CACHED FALLBACK - Network Error]\n{cached['result']}"
+        if cached is not None:
+            logger.info(f"web_fetch: Network error, returning cached content for {url}")
+            return f"[CACHED FALLBACK - Network Error]\n{cached.value}"
         return f"Error: Failed to fetch URL - {str(e)}"
     except Exception as e:
         logger.error(f"web_fetch: Unexpected error for {url}: {e}")
         return f"Error: {str(e)}"
 
 
+def _web_fetch_impl(url: str, max_length: int = 4000, use_cache: bool = True) -> str:
+    """web_fetch for synchronous callers (runs the async fetch on its own loop).
+
+    Not for use inside a running event loop: the registered tool's handler
+    is _web_fetch_async, which async callers await via execute_async.
+    """
+    from .web_fetch import get_web_fetcher
+
+    async def fetch_once():
+        try:
+            return await _web_fetch_async(url, max_length, use_cache)
+        finally:
+            # The loop ends with this call, so its connections can't be reused
+            await get_web_fetcher().release()
+
+    return _run_awaitable_sync(fetch_once(), DEFAULT_TOOL_TIMEOUT)
+
+
 # Register web_fetch with explicit spec
 registry.register_tool(ToolSpec(
     name="web_fetch",
@@ -545,7 +889,7 @@ registry.register_tool(ToolSpec(
             default=True,
         ),
     ],
-    handler=_web_fetch_impl,
+    handler=_web_fetch_async,
 ))
 
 # Expose for direct calls
@@ -1172,6 +1516,87 @@ registry.register_tool(ToolSpec(
 # Repository Analysis Tools
 # ============================================================
 
+def _path_fingerprint(file_path: str) -> Optional[str]:
+    """Identify a file's current version by resolved path, mtime and size."""
+    from .repository import get_repository_service
+
+    is_valid, _, path = get_repository_service().validate_path(file_path)
+    if not is_valid:
+        return None
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _tree_fingerprint(directory: str) -> Optional[str]:
+    """Identify the current version of the files a search would read.
+
+    Taken from the code index, which tracks file changes with a periodic
+    stat walk, so a cache check doesn't walk the tree itself. Without an
+    index covering the directory, None (searches are not cached).
+    """
+    from .repository import get_repository_service
+
+    service = get_repository_service()
+    if service.index is None:
+        return None
+    is_valid, _, root = service.validate_path(directory)
+    if not is_valid or not root.is_dir():
+        return None
+    generation = service.index.generation(root)
+    if generation is None:
+        return None
+    return f"{root}:{generation}"
+
+
+def _cached_file_tool(tool_name: str, fingerprint: Callable[..., Optional[str]]):
+    """Serve a deterministic file tool from the tool result cache.
+
+    Only active when the tool is enabled in the cache (see
+    config.TOOL_CACHE_FILE_TOOLS). Entries are keyed by the call's
+    arguments and invalidated when the fingerprint of the files they were
+    computed from changes. Errors are not cached.
+
+    Args:
+        tool_name: Cache namespace (the registered tool name)
+        fingerprint: Called with the bound arguments; None skips the cache
+    """
+    def decorator(func: Callable[..., str]) -> Callable[..., str]:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> str:
+            from .tool_cache import get_tool_cache
+
+            cache = get_tool_cache()
+            if not cache.is_enabled(tool_name):
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            version = fingerprint(**bound.arguments)
+            if version is None:
+                return func(*args, **kwargs)
+
+            # Relative paths resolve against the working directory
+            key_data = json.dumps({"cwd": os.getcwd(), **bound.arguments}, sort_keys=True, default=str)
+            cache_key = hashlib.sha256(key_data.encode()).hexdigest()[:32]
+            cached = cache.get(tool_name, cache_key, fingerprint=version)
+            if cached is not None and cached.is_fresh():
+                return cached.value
+
+            result = func(*args, **kwargs)
+            if not result.startswith("Error"):
+                cache.set(tool_name, cache_key, result, fingerprint=version)
+            return result
+
+        return wrapper
+    return decorator
+
+
+@_cached_file_tool("read_file", lambda file_path, **_: _path_fingerprint(file_path))
 def _read_file_impl(
     file_path: str,
     max_length: int = 50000,
@@ -1203,6 +1628,11 @@ def _read_file_impl(
     # Add metadata header
     header = f"File: {result['path']}\n"
     header += f"Lines: {result.get('start_line', 1)}-{result.get('end_line', result['lines'])} of {result['lines']}\n"
+    if result.get("windowed"):
+        header += (
+            f"[Large file ({_format_size(result['size'])}): showing one window; "
+            f"use start_line/end_line to read other parts]\n"
+        )
     if result.get("truncated"):
         header += "[Content truncated]\n"
     header += "-" * 60 + "\n"
@@ -1339,6 +1769,7 @@ registry.register_tool(ToolSpec(
 ))
 
 
+@_cached_file_tool("search_code", lambda directory, **_: _tree_fingerprint(directory))
 def _search_code_impl(
     pattern: str,
     directory: str = ".",
@@ -1451,6 +1882,7 @@ registry.register_tool(ToolSpec(
 ))
 
 
+@_cached_file_tool("get_file_info", lambda file_path: _path_fingerprint(file_path))
 def _get_file_info_impl(file_path: str) -> str:
     """Implementation for get_file_info tool."""
     from .repository import get_repository_service
@@ -1500,8 +1932,10 @@ registry.register_tool(ToolSpec(
 def register_mcp_tools_from_manager():
     """Register tools from connected MCP servers into Genesis tool registry.
 
-    This function should be called after MCP manager connects to servers.
-    It bridges MCP tools into Genesis's native tool system.
+    This function should be called after MCP manager connects to servers,
+    and again whenever their tool sets change. It bridges MCP tools into
+    Genesis's native tool system; previously registered MCP tools that are
+    no longer offered are removed.
     """
     try:
         from .mcp_client import get_mcp_manager
@@ -1509,6 +1943,11 @@ def register_mcp_tools_from_manager():
         manager = get_mcp_manager()
         mcp_tools = manager.get_all_tools()
 
+        current = {f"mcp:{t.server_name}:{t.name}" for t in mcp_tools}
+        for name in registry.list_tools():
+            if name.startswith("mcp:") and name not in current:
+                registry.unregister_tool(name)
+
         for mcp_tool in mcp_tools:
             # Create a handler that routes to MCP
             def make_mcp_handler(tool_name_capture: str):
@@ -0,0 +1,284 @@
+"""Lightweight request tracing.
+
+A trace is a tree of timed spans for one request. IDs, parent links and the
+exported span shape follow OpenTelemetry (W3C trace context, OTLP/JSON field
+names), so traces can be correlated with a caller's `traceparent` header and
+fed to OTel tooling later, but nothing here depends on an OTel SDK: finished
+traces go to an in-process store that keeps the slowest ones for
+/api/debug/traces.
+
+Every finished span is also recorded as a stage timing in the metrics
+service, so span names double as the stage names in /api/metrics.
+"""
+import contextvars
+import heapq
+import itertools
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from server.services.metrics import metrics
+
+TRACE_STORE_SIZE = 50  # Slowest traces kept for inspection
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+# Innermost open span in the current task (copied into child tasks, so
+# spans opened under asyncio.gather nest correctly)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = ("trace", "name", "span_id", "parent_id", "start_ns", "end_ns",
+                 "_start_perf", "_duration_ms", "attributes", "error")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str],
+                 attributes: Optional[dict] = None):
+        self.trace = trace
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self._start_perf = time.perf_counter()
+        self._duration_ms: Optional[float] = None
+        self.attributes: dict[str, Any] = dict(attributes or {})
+        self.error: Optional[str] = None
+
+    @property
+    def ended(self) -> bool:
+        return self._duration_ms is not None
+
+    @property
+    def duration_ms(self) -> float:
+        """Duration so far (or final duration once ended)."""
+        if self._duration_ms is not None:
+            return self._duration_ms
+        return (time.perf_counter() - self._start_perf) * 1000
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def end(self, error: Optional[BaseException] = None):
+        """Finish the span. Ending twice is a no-op."""
+        if self.ended:
+            return
+        self._duration_ms = (time.perf_counter() - self._start_perf) * 1000
+        self.end_ns = self.start_ns + int(self._duration_ms * 1_000_000)
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        if self is not self.trace.root:
+            metrics.record_stage(self.name, self._duration_ms)
+
+    def to_dict(self) -> dict:
+        """Export in OTLP/JSON span shape."""
+        return {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns) if self.end_ns is not None else "",
+            "durationMs": round(self.duration_ms, 3),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+
+
+class Trace:
+    """All spans recorded for one request."""
+
+    def __init__(self, name: str, traceparent: Optional[str] = None, attributes: Optional[dict] = None):
+        remote_parent = None
+        match = _TRACEPARENT_RE.match(traceparent.strip().lower()) if traceparent else None
+        if match and match.group(1) != "0" * 32:
+            self.trace_id, remote_parent = match.group(1), match.group(2)
+        else:
+            self.trace_id = secrets.token_hex(16)
+        self.spans: list[Span] = []
+        self.root = Span(self, name, remote_parent, attributes)
+        self.spans.append(self.root)
+
+    @property
+    def name(self) -> str:
+        return self.root.name
+
+    @property
+    def duration_ms(self) -> float:
+        return self.root.duration_ms
+
+    @property
+    def traceparent(self) -> str:
+        """W3C traceparent for propagating this trace downstream."""
+        return f"00-{self.trace_id}-{self.root.span_id}-01"
+
+    def start_span(self, name: str, parent: Optional[Span] = None, **attributes) -> Span:
+        """Open a span that the caller ends explicitly.
+
+        Without an explicit parent, the parent is the innermost open span of
+        this trace in the current task, or the root span.
+        """
+        if parent is None:
+            parent = _current_span.get()
+            if parent is None or parent.trace is not self or parent.ended:
+                parent = self.root
+        span = Span(self, name, parent.span_id, attributes)
+        self.spans.append(span)
+        return span
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, **attributes) -> Iterator[Span]:
+        """Time the enclosed block as a child span."""
+        span = self.start_span(name, parent=parent, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.end(error=e)
+            raise
+        finally:
+            span.end()
+            _reset_current(token)
+
+    @contextmanager
+    def activate(self) -> Iterator["Trace"]:
+        """Make this trace current, so module-level span() calls join it."""
+        token = _current_span.set(self.root)
+        try:
+            yield self
+        finally:
+            _reset_current(token)
+
+    def stage_timings(self) -> dict[str, float]:
+        """Duration per span name (summed when a name repeats), in ms."""
+        timings: dict[str, float] = {}
+        for span in self.spans[1:]:
+            if span.ended:
+                timings[span.name] = round(timings.get(span.name, 0.0) + span.duration_ms, 2)
+        return timings
+
+    def finish(self, error: Optional[BaseException] = None):
+        """End the root span and hand the trace to the store."""
+        if self.root.ended:
+            return
+        self.root.end(error=error)
+        get_trace_store().add(self)
+
+    def summary(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "start_time": self.root.start_ns / 1e9,
+            "duration_ms": round(self.duration_ms, 2),
+            "error": self.root.error,
+            "attributes": dict(self.root.attributes),
+            "stages": self.stage_timings(),
+        }
+
+    def to_dict(self) -> dict:
+        return {**self.summary(), "spans": [span.to_dict() for span in self.spans]}
+
+
+class TraceStore:
+    """Keeps the slowest N finished traces (in-process exporter)."""
+
+    def __init__(self, max_traces: int = TRACE_STORE_SIZE):
+        self.max_traces = max_traces
+        self._heap: list[tuple[float, int, Trace]] = []  # min-heap on duration
+        self._by_id: dict[str, Trace] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.total_traces = 0
+
+    def add(self, trace: Trace):
+        entry = (trace.duration_ms, next(self._counter), trace)
+        with self._lock:
+            self.total_traces += 1
+            if len(self._heap) < self.max_traces:
+                heapq.heappush(self._heap, entry)
+                self._by_id[trace.trace_id] = trace
+                return
+            if entry[0] <= self._heap[0][0]:
+                return
+            evicted = heapq.heapreplace(self._heap, entry)[2]
+            self._by_id.pop(evicted.trace_id, None)
+            self._by_id[trace.trace_id] = trace
+
+    def slowest(self, limit: Optional[int] = None) -> list[Trace]:
+        """Stored traces, slowest first."""
+        with self._lock:
+            traces = [entry[2] for entry in sorted(self._heap, reverse=True)]
+        return traces[:limit] if limit is not None else traces
+
+    def get(self, trace_id: str) -> Optional[Trace]:
+        with self._lock:
+            return self._by_id.get(trace_id)
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+            self._by_id.clear()
+
+
+def start_trace(name: str, traceparent: Optional[str] = None, **attributes) -> Trace:
+    """Begin a new trace (continuing the caller's if `traceparent` is valid)."""
+    return Trace(name, traceparent=traceparent, attributes=attributes)
+
+
+def current_trace() -> Optional[Trace]:
+    span = _current_span.get()
+    return span.trace if span is not None else None
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """Time a block as a span of the current trace, if there is one.
+
+    Without an active trace the block is still recorded as a metrics stage.
+    """
+    trace = current_trace()
+    if trace is None:
+        with metrics.time_stage(name):
+            yield None
+        return
+    with trace.span(name, **attributes) as active:
+        yield active
+
+
+def _reset_current(token: contextvars.Token):
+    try:
+        _current_span.reset(token)
+    except ValueError:
+        # Exited from a different context than the one that entered
+        # (e.g. an async generator finalized by another task)
+        pass
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+_trace_store: Optional[TraceStore] = None
+
+
+def get_trace_store() -> TraceStore:
+    """Get or create the trace store singleton."""
+    global _trace_store
+    if _trace_store is None:
+        _trace_store = TraceStore()
+    return _trace_store
@@ -4,7 +4,6 @@ This service builds a coherent profile from extracted facts (memory_extractor),
 organizing them into sections like personal_info, work, preferences, etc.
 The profile is injected into system prompts to provide user-specific context.
 """
-import aiosqlite
 import asyncio
 import logging
 import uuid
@@ -13,11 +12,35 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+from server.services.migrations import Migration, apply_migrations
+from server.services.storage import PooledConnection, get_pool
+
 logger = logging.getLogger(__name__)
 
-# Connection pool settings
-_DB_BUSY_TIMEOUT_MS = 5000
-_DB_POOL_SIZE = 5
+# Schema history for profile.db (see server/services/migrations.py)
+_SCHEMA_MIGRATIONS = (
+    Migration(1, "initial schema", (
+        # Profile table stores structured profile entries
+        """CREATE TABLE IF NOT EXISTS user_profile (
+            id TEXT PRIMARY KEY,
+            section TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            source TEXT,
+            confidence REAL,
+            is_manual_override INTEGER DEFAULT 0,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            UNIQUE(section, key)
+        )""",
+        """CREATE INDEX IF NOT EXISTS idx_profile_section
+           ON user_profile(section)""",
+    )),
+    # UNIQUE(section, key) already indexes section-prefixed lookups
+    Migration(2, "drop redundant section index", (
+        "DROP INDEX IF EXISTS idx_profile_section",
+    )),
+)
 
 
 # Profile section definitions
@@ -41,95 +64,6 @@ FACT_TYPE_TO_SECTION = {
 }
 
 
-class ConnectionPool:
-    """Simple async connection pool for aiosqlite with WAL mode."""
-
-    def __init__(self, db_path: Path, pool_size: int = _DB_POOL_SIZE):
-        self.db_path = db_path
-        self.pool_size = pool_size
-        self._pool: Optional[asyncio.Queue] = None
-        self._initialized = False
-        self._lock: Optional[asyncio.Lock] = None
-        self._init_lock = threading.Lock()
-        self._loop = None
-
-    async def initialize(self):
-        """Initialize the connection pool."""
-        current_loop = asyncio.get_running_loop()
-        if self._loop is not None and self._loop != current_loop:
-            await self.close()
-
-        if self._initialized:
-            return
-
-        with self._init_lock:
-            if self._lock is None:
-                self._loop = current_loop
-                self._lock = asyncio.Lock()
-
-        async with self._lock:
-            if self._initialized:
-                return
-
-            if self._pool is None:
-                self._pool = asyncio.Queue(maxsize=self.pool_size)
-
-            for _ in range(self.pool_size):
-                conn = await aiosqlite.connect(
-                    self.db_path,
-                    timeout=_DB_BUSY_TIMEOUT_MS / 1000
-                )
-                await conn.execute("PRAGMA journal_mode=WAL")
-                await conn.execute(f"PRAGMA busy_timeout={_DB_BUSY_TIMEOUT_MS}")
-                await conn.execute("PRAGMA synchronous=NORMAL")
-                await self._pool.put(conn)
-
-            self._initialized = True
-
-    async def acquire(self) -> aiosqlite.Connection:
-        """Get a connection from the pool."""
-        await self.initialize()
-        if self._pool is None:
-            raise RuntimeError("Connection pool not initialized")
-        return await self._pool.get()
-
-    async def release(self, conn: aiosqlite.Connection):
-        """Return a connection to the pool."""
-        if self._pool is None:
-            raise RuntimeError("Connection pool not initialized")
-        await self._pool.put(conn)
-
-    async def close(self):
-        """Close all connections in the pool."""
-        if self._pool is not None:
-            while not self._pool.empty():
-                try:
-                    conn = self._pool.get_nowait()
-                    await conn.close()
-                except asyncio.QueueEmpty:
-                    break
-        self._initialized = False
-        self._pool = None
-        self._lock = None
-
-
-class PooledConnection:
-    """Context manager for pooled database connections."""
-
-    def __init__(self, pool: ConnectionPool):
-        self.pool = pool
-        self.conn: Optional[aiosqlite.Connection] = None
-
-    async def __aenter__(self) -> aiosqlite.Connection:
-        self.conn = await self.pool.acquire()
-        return self.conn
-
-    async def __aexit__(self, _exc_type, _exc_val, _exc_tb):
-        if self.conn:
-            await self.pool.release(self.conn)
-            self.conn = None
-
-
 class UserProfileService:
     """Service for managing user profile aggregated from long-term memory facts.
 
@@ -148,17 +82,21 @@ class UserProfileService:
 
     def __init__(self, db_path: Path):
         self.db_path = db_path
-        self._pool = ConnectionPool(db_path)
+        self._pool = get_pool(db_path)
         self._tables_created = False
         self._tables_lock: Optional[asyncio.Lock] = None
         self._tables_init_lock = threading.Lock()
 
     def _get_connection(self) -> PooledConnection:
-        """Get a pooled connection context manager."""
-        return PooledConnection(self._pool)
+        """Get the pooled writer connection context manager."""
+        return self._pool.writer()
+
+    def _get_read_connection(self) -> PooledConnection:
+        """Get a pooled read-only connection context manager."""
+        return self._pool.reader()
 
     async def _ensure_initialized(self):
-        """Ensure database tables exist."""
+        """Ensure the database schema is migrated to the latest version."""
         if self._tables_created:
             return
 
@@ -171,29 +109,7 @@ class UserProfileService:
                 return
 
             async with self._get_connection() as db:
-                # Profile table stores structured profile entries
-                await db.execute("""
-                    CREATE TABLE IF NOT EXISTS user_profile (
-                        id TEXT PRIMARY KEY,
-                        section TEXT NOT NULL,
-                        key TEXT NOT NULL,
-                        value TEXT NOT NULL,
-                        source TEXT,
-                        confidence REAL,
-                        is_manual_override INTEGER DEFAULT 0,
-                        created_at TEXT NOT NULL,
-                        updated_at TEXT NOT NULL,
-                        UNIQUE(section, key)
-                    )
-                """)
-
-                # Index for efficient section lookups
-                await db.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_profile_section
-                    ON user_profile(section)
-                """)
-
-                await db.commit()
+                await apply_migrations(db, _SCHEMA_MIGRATIONS)
             self._tables_created = True
 
     async def aggregate_from_facts(self, memory_extractor):
@@ -292,7 +208,7 @@ class UserProfileService:
 
         profile = {section: {} for section in PROFILE_SECTIONS.keys()}
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 """SELECT id, section, key, value, source, confidence, is_manual_override, created_at, updated_at
                    FROM user_profile
@@ -330,7 +246,7 @@ class UserProfileService:
 
         entries = {}
 
-        async with self._get_connection() as db:
+        async with self._get_read_connection() as db:
             cursor = await db.execute(
                 """SELECT id, key, value, source, confidence, is_manual_override, created_at, updated_at
                    FROM user_profile
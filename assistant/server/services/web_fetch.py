@@ -0,0 +1,322 @@
+"""Pooled, streaming HTTP fetches for the web_fetch tool.
+
+One httpx.AsyncClient is kept per event loop (pooled connections are bound
+to their loop), with keep-alive, HTTP/2 when available, and a cap on
+concurrent connections per host. Response bodies are streamed: HTML is
+reduced to text as it arrives and reading stops once enough text has been
+collected, so a large page costs no more than the part that is returned.
+
+Every hop, including redirects, goes through the SSRF guard
+(SecurityService.validate_url_async, which resolves names through its DNS
+cache), and the address actually connected to is checked again before the
+body is read.
+"""
+import asyncio
+import codecs
+import logging
+import re
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Optional
+
+import httpx
+
+from .security import SecurityService, get_security_service
+
+logger = logging.getLogger(__name__)
+
+FETCH_TIMEOUT = 10.0
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+MAX_CONNECTIONS_PER_HOST = 4
+KEEPALIVE_EXPIRY_SECONDS = 60.0
+MAX_REDIRECTS = 5
+# Bytes read before giving up on collecting max_length characters of text
+# (e.g. a page that is mostly scripts)
+MAX_DOWNLOAD_BYTES = 2 * 1024 * 1024
+USER_AGENT = "GenesisAssistant/1.0 (AI Assistant web_fetch tool)"
+
+
+class FetchBlocked(Exception):
+    """A URL (or a redirect target) was refused by the SSRF guard."""
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a fetch. text is only read for 200 responses."""
+    url: str
+    status_code: int
+    reason_phrase: str
+    headers: httpx.Headers
+    text: str = ""
+    truncated: bool = False
+
+
+class HTMLTextExtractor(HTMLParser):
+    """Incrementally reduce HTML to readable text.
+
+    Feed chunks as they arrive; length tracks the text collected so far.
+    """
+
+    SKIP_TAGS = {"script", "style", "noscript", "template", "svg"}
+    BLOCK_TAGS = {
+        "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+        "figcaption", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header",
+        "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table", "title",
+        "tr", "ul",
+    }
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._parts: list[str] = []
+        self._skip_depth = 0
+        self._pre_depth = 0
+        self._in_head = False
+        self._in_title = False
+        self._at_line_start = True
+        self.length = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "head":
+            self._in_head = True
+        elif tag == "body":
+            self._in_head = False
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "pre":
+            self._pre_depth += 1
+        if tag in self.BLOCK_TAGS:
+            self._newline()
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "head":
+            self._in_head = False
+        elif tag == "title":
+            self._in_title = False
+        elif tag == "pre" and self._pre_depth:
+            self._pre_depth -= 1
+        if tag in self.BLOCK_TAGS:
+            self._newline()
+
+    def handle_data(self, data):
+        # Of the head, only the title is text
+        if self._skip_depth or (self._in_head and not self._in_title):
+            return
+        if not self._pre_depth:
+            data = re.sub(r"\s+", " ", data)
+            if self._at_line_start:
+                data = data.lstrip()
+        if data:
+            self._append(data)
+            self._at_line_start = data.endswith("\n")
+
+    def text(self) -> str:
+        return "".join(self._parts).strip()
+
+    def _newline(self):
+        if not self._at_line_start:
+            self._append("\n")
+            self._at_line_start = True
+
+    def _append(self, text: str):
+        self._parts.append(text)
+        self.length += len(text)
+
+
+def _is_html(content_type: str) -> bool:
+    return "html" in content_type.lower()
+
+
+async def _read_text(response: httpx.Response, max_length: int) -> tuple[str, bool]:
+    """Stream a response body until max_length characters of text are collected.
+
+    Returns:
+        (text, truncated)
+    """
+    extractor = HTMLTextExtractor() if _is_html(response.headers.get("content-type", "")) else None
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    parts: list[str] = []
+    length = 0
+    downloaded = 0
+    complete = True
+
+    async for chunk in response.aiter_bytes():
+        downloaded += len(chunk)
+        text = decoder.decode(chunk)
+        if extractor is not None:
+            extractor.feed(text)
+            length = extractor.length
+        else:
+            parts.append(text)
+            length += len(text)
+        if length > max_length or downloaded >= MAX_DOWNLOAD_BYTES:
+            complete = False
+            break
+
+    if complete:
+        tail = decoder.decode(b"", final=True)
+        if extractor is not None:
+            extractor.feed(tail)
+        else:
+            parts.append(tail)
+    if extractor is not None:
+        extractor.close()
+        text = extractor.text()
+    else:
+        text = "".join(parts)
+
+    truncated = not complete or len(text) > max_length
+    return text[:max_length], truncated
+
+
+@dataclass
+class _LoopClient:
+    """A connection pool and its per-host slots, bound to one event loop."""
+    client: httpx.AsyncClient
+    loop: asyncio.AbstractEventLoop
+    host_slots: dict
+
+
+class WebFetcher:
+    """Shared async HTTP client for web_fetch."""
+
+    def __init__(
+        self,
+        security: Optional[SecurityService] = None,
+        timeout: float = FETCH_TIMEOUT,
+        max_connections_per_host: int = MAX_CONNECTIONS_PER_HOST,
+    ):
+        """
+        Args:
+            security: SSRF guard (default: the global SecurityService)
+            timeout: Connect/read timeout in seconds
+            max_connections_per_host: Concurrent requests allowed per host
+        """
+        self.security = security or get_security_service()
+        self.timeout = timeout
+        self.max_connections_per_host = max_connections_per_host
+        self._current: Optional[_LoopClient] = None
+        # Clients replaced while their loop was still running; closed at shutdown
+        self._retired: list[httpx.AsyncClient] = []
+
+    async def fetch(self, url: str, max_length: int, headers: Optional[dict] = None) -> FetchResult:
+        """GET a URL, following redirects, and read up to max_length characters of text.
+
+        Args:
+            url: http(s) URL
+            max_length: Characters of text to collect (HTML is reduced to text)
+            headers: Extra request headers (e.g. conditional request validators)
+
+        Raises:
+            FetchBlocked: The URL or a redirect target is not allowed
+            httpx.TimeoutException, httpx.RequestError: The request failed
+        """
+        state = self._state()
+        request_headers = {"User-Agent": USER_AGENT, **(headers or {})}
+        current = url
+        for _ in range(MAX_REDIRECTS + 1):
+            is_safe, error = await self.security.validate_url_async(current)
+            if not is_safe:
+                raise FetchBlocked(error)
+
+            host = httpx.URL(current).host
+            async with self._host_slot(state, host):
+                async with state.client.stream("GET", current, headers=request_headers) as response:
+                    self._check_peer(host, response)
+                    if response.has_redirect_location:
+                        current = str(response.url.join(response.headers["location"]))
+                        continue
+                    result = FetchResult(
+                        url=str(response.url),
+                        status_code=response.status_code,
+                        reason_phrase=response.reason_phrase,
+                        headers=response.headers,
+                    )
+                    if response.status_code == 200:
+                        result.text, result.truncated = await _read_text(response, max_length)
+                    return result
+        raise httpx.TooManyRedirects(f"Exceeded {MAX_REDIRECTS} redirects", request=response.request)
+
+    async def release(self):
+        """Close the current event loop's client (for one-off loops)."""
+        state = self._current
+        if state is not None and state.loop is asyncio.get_running_loop():
+            self._current = None
+            await state.client.aclose()
+
+    async def aclose(self):
+        """Close every client (called at shutdown)."""
+        await self.release()
+        retired, self._retired = self._retired, []
+        for client in retired:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing web_fetch client: {e}")
+
+    def _state(self) -> _LoopClient:
+        """The client for the running loop, built on first use."""
+        loop = asyncio.get_running_loop()
+        state = self._current
+        if state is not None and state.loop is loop:
+            return state
+        if state is not None and not state.loop.is_closed():
+            self._retired.append(state.client)
+        self._current = _LoopClient(client=self._build_client(), loop=loop, host_slots={})
+        return self._current
+
+    def _build_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+        )
+        # Redirects are followed in fetch() so each hop passes the SSRF guard
+        options = dict(timeout=self.timeout, limits=limits, follow_redirects=False)
+        try:
+            return httpx.AsyncClient(http2=True, **options)
+        except ImportError:
+            # HTTP/2 support is an optional extra of the HTTP client
+            logger.info("HTTP/2 unavailable for web_fetch, pooling HTTP/1.1 connections")
+            return httpx.AsyncClient(**options)
+
+    @asynccontextmanager
+    async def _host_slot(self, state: _LoopClient, host: str):
+        """Hold one of the host's connection slots."""
+        slot = state.host_slots.get(host)
+        if slot is None:
+            slot = state.host_slots[host] = [asyncio.Semaphore(self.max_connections_per_host), 0]
+        slot[1] += 1
+        try:
+            async with slot[0]:
+                yield
+        finally:
+            slot[1] -= 1
+            if not slot[1]:
+                del state.host_slots[host]
+
+    def _check_peer(self, host: str, response: httpx.Response):
+        """Refuse responses from a blocked address (e.g. DNS changed after validation)."""
+        stream = response.extensions.get("network_stream")
+        peer = stream.get_extra_info("server_addr") if stream is not None else None
+        if peer:
+            is_safe, error = self.security.check_address(host, peer[0])
+            if not is_safe:
+                raise FetchBlocked(error)
+
+
+# Global instance
+_web_fetcher: Optional[WebFetcher] = None
+
+
+def get_web_fetcher() -> WebFetcher:
+    """Get or create the global web fetcher."""
+    global _web_fetcher
+    if _web_fetcher is None:
+        _web_fetcher = WebFetcher()
+    return _web_fetcher
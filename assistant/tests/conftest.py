@@ -1,7 +1,120 @@
 """Pytest configuration and fixtures."""
 import os
 import importlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
 
 # Disable authentication globally BEFORE any imports
 # This must happen at module load time
 os.environ["ASSISTANT_AUTH_ENABLED"] = "false"
+
+
+class LocalHTTPServer:
+    """Stand-in HTTP server on 127.0.0.1 for fetch tests.
+
+    Routes map a path to a function taking the request handler and
+    returning (status, headers, body). body is bytes or an iterable of
+    bytes chunks (sent with chunked encoding). Connections are kept alive.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []        # (path, headers) per request
+        self.connections = set()  # Client ports seen
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append((self.path, dict(self.headers)))
+                    server.connections.add(self.client_address[1])
+                route = server.routes.get(self.path.split("?")[0])
+                status, headers, body = route(self) if route else (404, {}, b"not found")
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                try:
+                    if isinstance(body, bytes):
+                        self.send_header("Content-Length", str(len(body)))
+                        self.end_headers()
+                        self._write(body)
+                    else:
+                        self.send_header("Transfer-Encoding", "chunked")
+                        self.end_headers()
+                        for chunk in body:
+                            self._write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                        self._write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True
+
+            def _write(self, data):
+                self.wfile.write(data)
+                self.wfile.flush()
+                with server._lock:
+                    server.bytes_sent += len(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,), daemon=True)
+
+    def url(self, path: str = "/") -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}{path}"
+
+    def route(self, path: str, status: int = 200, headers=None, body=b"", delay: float = 0):
+        """Serve a fixed response at path."""
+        def respond(handler):
+            if delay:
+                time.sleep(delay)
+            return status, dict(headers or {}), body
+        self.routes[path] = respond
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_tool_cache(tmp_path, monkeypatch):
+    """Give each test its own tool cache and a fresh degradation service.
+
+    Keeps cached web_fetch results and degraded modes from leaking between
+    tests, and keeps tests from writing memory/tool_cache.db.
+    """
+    from server.services import degradation, tool_cache
+
+    cache = tool_cache.ToolResultCache(tmp_path / "tool_cache.db")
+    monkeypatch.setattr(tool_cache, "_tool_cache", cache)
+    monkeypatch.setattr(degradation, "_degradation_service", None)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def local_http_server(monkeypatch):
+    """A LocalHTTPServer that web_fetch is allowed to reach.
+
+    127.0.0.1 is trusted by the SSRF guard for the test, and web_fetch
+    gets a fresh connection pool.
+    """
+    from server.services import web_fetch
+    from server.services.security import get_security_service
+
+    monkeypatch.setattr(get_security_service(), "trusted_hosts", {"127.0.0.1"})
+    monkeypatch.setattr(web_fetch, "_web_fetcher", None)
+    server = LocalHTTPServer()
+    server.start()
+    yield server
+    server.stop()
@@ -1,7 +1,9 @@
 """Tests for backup and restore service."""
+import io
 import json
 import pytest
 import shutil
+import sqlite3
 import sys
 import tarfile
 import tempfile
@@ -10,6 +12,7 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from server.services import backup
 from server.services.backup import (
     BackupService,
     BackupStatus,
@@ -559,3 +562,210 @@ class TestChecksumCalculation:
         checksum2 = backup_service._calculate_checksum(file2)
 
         assert checksum1 != checksum2
+
+
+def create_wal_database(path: Path, rows: int = 200) -> sqlite3.Connection:
+    """A WAL-mode database with committed rows still in the WAL (connection left open)."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA wal_autocheckpoint=0")
+    conn.execute("CREATE TABLE messages (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO messages (body) VALUES (?)", [(f"message {i} " + "x" * 500,) for i in range(rows)])
+    conn.commit()
+    return conn
+
+
+def count_rows(path: Path) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestDatabaseSnapshots:
+    """Tests for online SQLite snapshots."""
+
+    def test_snapshot_includes_wal(self, tmp_path):
+        """Test committed rows still in the WAL are part of the snapshot."""
+        conn = create_wal_database(tmp_path / "live.db")
+        assert (tmp_path / "live.db-wal").stat().st_size > 0
+
+        backup.snapshot_database(tmp_path / "live.db", tmp_path / "copy.db")
+        conn.close()
+
+        assert count_rows(tmp_path / "copy.db") == 200
+        assert not (tmp_path / "copy.db-wal").exists()
+
+    def test_paged_snapshot(self, tmp_path, monkeypatch):
+        """Test rollback-journal databases are copied a few pages per step."""
+        monkeypatch.setattr(backup, "BACKUP_PAGES_PER_STEP", 2)
+        conn = sqlite3.connect(tmp_path / "live.db")
+        conn.execute("CREATE TABLE messages (id INTEGER PRIMARY KEY, body TEXT)")
+        conn.executemany("INSERT INTO messages (body) VALUES (?)", [("x" * 500,) for _ in range(100)])
+        conn.commit()
+        conn.close()
+
+        backup.snapshot_database(tmp_path / "live.db", tmp_path / "copy.db")
+        assert count_rows(tmp_path / "copy.db") == 100
+
+    @pytest.mark.asyncio
+    async def test_backup_of_live_database(self, temp_memory_dir):
+        """Test a database open for writing is restored with all committed rows."""
+        db_path = temp_memory_dir / "conversations.db"
+        db_path.unlink()
+        conn = create_wal_database(db_path)
+        service = BackupService(temp_memory_dir)
+
+        result = await service.create_backup()
+        conn.execute("DELETE FROM messages")
+        conn.commit()
+        conn.close()
+
+        restored = await service.restore(result.output_path, force=True)
+        assert restored.status == BackupStatus.SUCCESS
+        assert count_rows(db_path) == 200
+
+
+class TestContentChecksum:
+    """Tests for checksums computed while writing archives."""
+
+    @pytest.mark.asyncio
+    async def test_metadata_is_last_member(self, backup_service):
+        """Test the archive is written once, with the checksum in its metadata."""
+        result = await backup_service.create_backup()
+
+        with tarfile.open(result.output_path, "r:gz") as tar:
+            names = tar.getnames()
+        assert names[-1] == "./backup_metadata.json"
+        assert result.metadata.checksum_type == "content"
+        assert len(result.metadata.checksum) == 64
+
+    @pytest.mark.asyncio
+    async def test_verify_detects_changed_content(self, backup_service, temp_memory_dir):
+        """Test verification fails when a file in the archive no longer matches."""
+        result = await backup_service.create_backup()
+
+        tampered = temp_memory_dir / "tampered.tar.gz"
+        with tarfile.open(result.output_path, "r:gz") as src, tarfile.open(tampered, "w:gz") as dst:
+            for member in src:
+                f = src.extractfile(member) if member.isfile() else None
+                if member.name == "./alerts.db":
+                    data = b"SQLite format 3 - changed"
+                    member.size = len(data)
+                    f = io.BytesIO(data)
+                dst.addfile(member, f)
+
+        is_valid, message = await backup_service.verify_backup(tampered)
+        assert not is_valid
+        assert "checksum" in message.lower()
+
+    @pytest.mark.asyncio
+    async def test_legacy_metadata_still_readable(self, backup_service):
+        """Test metadata without the newer fields defaults to an unverifiable checksum."""
+        metadata = BackupMetadata.from_dict({
+            "version": "1.0",
+            "created_at": "2024-01-01T00:00:00",
+            "assistant_version": "1.0.0",
+            "files_included": ["conversations.db"],
+            "total_size_bytes": 10,
+            "checksum": "abc",
+        })
+        assert metadata.checksum_type == "archive"
+        assert metadata.incremental is False
+
+
+class TestIncrementalBackup:
+    """Tests for incremental, chunked backups."""
+
+    @pytest.fixture
+    def service(self, temp_memory_dir):
+        db_path = temp_memory_dir / "conversations.db"
+        db_path.unlink()
+        create_wal_database(db_path, rows=2000).close()
+        return BackupService(temp_memory_dir, max_backups=2)
+
+    @pytest.mark.asyncio
+    async def test_unchanged_files_not_stored_again(self, service):
+        """Test a second backup of unchanged data writes no chunks."""
+        first = await service.create_backup(incremental=True)
+        assert first.status == BackupStatus.SUCCESS
+        assert first.metadata.incremental
+        assert first.stats["new_chunks"] > 0
+
+        second = await service.create_backup(
+            output_path=service.backup_dir / "backup_second.tar.gz", incremental=True
+        )
+        assert second.stats["new_chunks"] == 0
+        assert second.stats["files_reused"] == len(
+            service._read_manifest(second.output_path)["files"]
+        )
+        assert second.metadata.checksum == first.metadata.checksum
+
+    @pytest.mark.asyncio
+    async def test_only_changed_chunks_written(self, service, temp_memory_dir, monkeypatch):
+        """Test a small change to a large database stores only the chunks it touched."""
+        monkeypatch.setattr(backup, "CHUNK_SIZE", 8192)
+        first = await service.create_backup(incremental=True)
+
+        conn = sqlite3.connect(temp_memory_dir / "conversations.db")
+        conn.execute("UPDATE messages SET body = 'changed' WHERE id = 1000")
+        conn.commit()
+        conn.close()
+
+        second = await service.create_backup(
+            output_path=service.backup_dir / "backup_second.tar.gz", incremental=True
+        )
+        assert 0 < second.stats["new_chunks"] < first.stats["new_chunks"] / 10
+
+    @pytest.mark.asyncio
+    async def test_restore(self, service, temp_memory_dir):
+        """Test files are rebuilt from chunks on restore."""
+        result = await service.create_backup(incremental=True)
+        assert (await service.verify_backup(result.output_path))[0]
+
+        shutil.rmtree(temp_memory_dir / "files")
+        (temp_memory_dir / "conversations.db").unlink()
+
+        restored = await service.restore(result.output_path, force=True)
+        assert restored.status == BackupStatus.SUCCESS
+        assert count_rows(temp_memory_dir / "conversations.db") == 2000
+        assert (temp_memory_dir / "files" / "test_image.png").read_bytes() == b"\x89PNG test data"
+
+    @pytest.mark.asyncio
+    async def test_missing_chunk_fails_verify(self, service):
+        """Test a backup whose chunks were lost is reported and not restored."""
+        result = await service.create_backup(incremental=True)
+        chunk = service._read_manifest(result.output_path)["files"][0]["chunks"][0]
+        service._chunk_path(chunk).unlink()
+
+        is_valid, message = await service.verify_backup(result.output_path)
+        assert not is_valid
+        assert "missing chunk" in message
+
+        restored = await service.restore(result.output_path, force=True)
+        assert restored.status == BackupStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_rotation_collects_unused_chunks(self, service, temp_memory_dir, monkeypatch):
+        """Test chunks only rotated-away backups used are deleted."""
+        monkeypatch.setattr(backup, "CHUNK_GC_GRACE", -1)
+        await service.create_backup(output_path=service.backup_dir / "backup_1.tar.gz", incremental=True)
+        old_chunks = set(p.name for p in service.chunk_dir.glob("*/*"))
+
+        (temp_memory_dir / "capabilities.json").write_text(json.dumps({"tools": ["other"]}))
+        for name in ("backup_2", "backup_3"):
+            path = service.backup_dir / f"{name}.tar.gz"
+            await service.create_backup(output_path=path, incremental=True)
+
+        remaining = set(p.name for p in service.chunk_dir.glob("*/*"))
+        assert not (service.backup_dir / "backup_1.tar.gz").exists()
+        assert len(old_chunks - remaining) == 1
+        assert (await service.verify_backup(service.backup_dir / "backup_3.tar.gz"))[0]
+
+    @pytest.mark.asyncio
+    async def test_output_outside_backup_dir_refused(self, service, tmp_path):
+        """Test incremental archives must live next to the chunks they use."""
+        result = await service.create_backup(output_path=tmp_path / "elsewhere.tar.gz", incremental=True)
+        assert result.status == BackupStatus.FAILED
+
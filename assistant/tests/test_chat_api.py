@@ -106,6 +106,7 @@ class TestSearchEndpoint:
             mock_completion.choices = [MagicMock()]
             mock_completion.choices[0].message.content = "Test response with keyword"
             mock_completion.choices[0].message.tool_calls = None
+            mock_client.chat.completions.create = AsyncMock()
             mock_client.chat.completions.create.return_value = mock_completion
             mock_get_client.return_value = mock_client
 
@@ -144,6 +145,7 @@ class TestChatEndpoint:
         """Test that chat uses the single infinite conversation."""
         with patch('server.routes.chat.get_openai_client') as mock_get_client:
             mock_client = MagicMock()
+            mock_client.chat.completions.create = AsyncMock()
             mock_client.chat.completions.create.return_value = mock_openai_response
             mock_get_client.return_value = mock_client
 
@@ -170,6 +172,7 @@ class TestChatEndpoint:
         """Test that multiple chats all use the same single conversation."""
         with patch('server.routes.chat.get_openai_client') as mock_get_client:
             mock_client = MagicMock()
+            mock_client.chat.completions.create = AsyncMock()
             mock_client.chat.completions.create.return_value = mock_openai_response
             mock_get_client.return_value = mock_client
 
@@ -198,6 +201,7 @@ class TestChatEndpoint:
         """Test that passing a non-existent conversation_id returns 404."""
         with patch('server.routes.chat.get_openai_client') as mock_get_client:
             mock_client = MagicMock()
+            mock_client.chat.completions.create = AsyncMock()
             mock_client.chat.completions.create.return_value = mock_openai_response
             mock_get_client.return_value = mock_client
 
@@ -221,6 +225,7 @@ class TestChatEndpoint:
         """Test that omitting conversation_id defaults to 'main'."""
         with patch('server.routes.chat.get_openai_client') as mock_get_client:
             mock_client = MagicMock()
+            mock_client.chat.completions.create = AsyncMock()
             mock_client.chat.completions.create.return_value = mock_openai_response
             mock_get_client.return_value = mock_client
 
@@ -246,11 +251,13 @@ class TestChatEndpoint:
 
             # Claude client raises an exception
             claude_mock = MagicMock()
+            claude_mock.messages.create = AsyncMock()
             claude_mock.messages.create.side_effect = Exception("Claude API error")
             mock_claude_client.return_value = claude_mock
 
             # OpenAI client works
             openai_mock = MagicMock()
+            openai_mock.chat.completions.create = AsyncMock()
             openai_mock.chat.completions.create.return_value = mock_openai_response
             mock_openai_client.return_value = openai_mock
 
@@ -277,6 +284,7 @@ class TestConversationsEndpoint:
         # First create some messages
         with patch('server.routes.chat.get_openai_client') as mock_get_client:
             mock_client = MagicMock()
+            mock_client.chat.completions.create = AsyncMock()
             mock_client.chat.completions.create.return_value = mock_openai_response
             mock_get_client.return_value = mock_client
 
@@ -310,6 +318,7 @@ class TestConversationsEndpoint:
         # First create a conversation via chat
         with patch('server.routes.chat.get_openai_client') as mock_get_client:
             mock_client = MagicMock()
+            mock_client.chat.completions.create = AsyncMock()
             mock_client.chat.completions.create.return_value = mock_openai_response
             mock_get_client.return_value = mock_client
 
@@ -484,6 +493,7 @@ class TestToolIntegration:
 
         with patch('server.routes.chat.get_openai_client') as mock_get_client:
             mock_client = MagicMock()
+            mock_client.chat.completions.create = AsyncMock()
             mock_client.chat.completions.create.side_effect = [mock_response1, mock_response2]
             mock_get_client.return_value = mock_client
 
@@ -518,6 +528,7 @@ class TestToolIntegration:
 
         with patch('server.routes.chat.get_openai_client') as mock_get_client:
             mock_client = MagicMock()
+            mock_client.chat.completions.create = AsyncMock()
             mock_client.chat.completions.create.return_value = mock_response
             mock_get_client.return_value = mock_client
 
@@ -556,6 +567,7 @@ class TestMessageSearch:
         # First, create a conversation with messages
         with patch('server.routes.chat.get_openai_client') as mock_get_client:
             mock_client = MagicMock()
+            mock_client.chat.completions.create = AsyncMock()
             mock_client.chat.completions.create.return_value = mock_openai_response
             mock_get_client.return_value = mock_client
 
@@ -725,6 +737,7 @@ class TestMessageActions:
         """Test successful message deletion."""
         with patch('server.routes.chat.get_openai_client') as mock_get_client:
             mock_client = MagicMock()
+            mock_client.chat.completions.create = AsyncMock()
             mock_client.chat.completions.create.return_value = mock_openai_response
             mock_get_client.return_value = mock_client
 
@@ -767,6 +780,7 @@ class TestMessageActions:
         """Test deleting message from wrong conversation."""
         with patch('server.routes.chat.get_openai_client') as mock_get_client:
             mock_client = MagicMock()
+            mock_client.chat.completions.create = AsyncMock()
             mock_client.chat.completions.create.return_value = mock_openai_response
             mock_get_client.return_value = mock_client
 
@@ -794,6 +808,7 @@ class TestMessageActions:
         """Test deleting multiple messages in sequence."""
         with patch('server.routes.chat.get_openai_client') as mock_get_client:
             mock_client = MagicMock()
+            mock_client.chat.completions.create = AsyncMock()
             mock_client.chat.completions.create.return_value = mock_openai_response
             mock_get_client.return_value = mock_client
 
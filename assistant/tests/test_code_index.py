@@ -0,0 +1,278 @@
+"""Tests for the search_code trigram index."""
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from server.services.code_index import CodeIndex, trigram_query
+from server.services.repository import RepositoryService
+
+
+@pytest.fixture
+def repo_dir():
+    """A small tree of source files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir).resolve()
+        (root / "app.py").write_text("def handle_request(req):\n    return render(req)\n")
+        (root / "util.py").write_text("def render(value):\n    return str(value)\n")
+        (root / "notes.txt").write_text("TODO: handle errors\nKelvin scale\n")
+        (root / "pkg").mkdir()
+        (root / "pkg" / "models.py").write_text("class User:\n    name = 'x'\n")
+        (root / ".env").write_text("SECRET_TOKEN=handle_request\n")
+        (root / "image.png").write_bytes(b"\x89PNG handle_request")
+        yield root
+
+
+def make_service(root: Path, db_path=None) -> RepositoryService:
+    service = RepositoryService(allowed_paths=[str(root)])
+    index = service.enable_index(db_path)
+    index.build()
+    return service
+
+
+def search(service, pattern, directory, **kwargs):
+    result = service.search_code(pattern, directory=str(directory), **kwargs)
+    assert result["success"], result.get("error")
+    return result
+
+
+def match_set(result):
+    return [(m.file, m.line_number) for m in result["matches"]]
+
+
+class TestTrigramQuery:
+    """Tests for extracting required trigrams from a regex."""
+
+    def test_literal(self):
+        """Test a literal yields its case-folded trigrams."""
+        _, trigrams, subqueries = trigram_query("Render")
+        assert trigrams == {b"ren", b"end", b"nde", b"der"}
+        assert subqueries == ()
+
+    def test_no_literals(self):
+        """Test patterns without a 3-character literal impose no filter."""
+        assert trigram_query(r"\w+\s*=") is None
+        assert trigram_query("ab|cd") is None
+        assert trigram_query("x.*y") is None
+
+    def test_alternation(self):
+        """Test alternatives become an any-of subquery."""
+        _, trigrams, subqueries = trigram_query("def (foo|bar)")
+        assert trigrams == {b"def", b"ef "}
+        kind, alternatives = subqueries[0]
+        assert kind == "any"
+        assert [alt[1] for alt in alternatives] == [{b"foo"}, {b"bar"}]
+
+    def test_optional_parts_not_required(self):
+        """Test optional and repeated-zero parts don't become requirements."""
+        assert trigram_query("(abc)?") is None
+        assert trigram_query("x(abc)*") is None
+        assert trigram_query("(abc)+")[1] == {b"abc"}
+
+    def test_ignorecase_avoids_unicode_folds(self):
+        """Test letters with non-ASCII case variants aren't required when ignoring case."""
+        assert trigram_query("kelvin", re.IGNORECASE)[1] == {b"elv"}
+        assert trigram_query("(?i)kelvin")[1] == {b"elv"}
+        assert trigram_query("kelvin")[1] == {b"kel", b"elv", b"lvi", b"vin"}
+
+    def test_invalid_pattern(self):
+        """Test unparseable patterns fall back to no filter."""
+        assert trigram_query("(") is None
+
+
+class TestCodeIndex:
+    """Tests for CodeIndex maintenance and candidates."""
+
+    def test_candidates_narrowed(self, repo_dir):
+        """Test only files containing the pattern's trigrams are candidates."""
+        service = make_service(repo_dir)
+        paths, eligible = service.index.candidates(re.compile("render"), repo_dir)
+
+        assert sorted(p.name for p in paths) == ["app.py", "util.py"]
+        # .env and image.png are never searchable
+        assert eligible == 4
+
+    def test_sensitive_and_binary_skipped(self, repo_dir):
+        """Test refused files are recorded but never candidates."""
+        service = make_service(repo_dir)
+        stats = service.get_index_stats()
+        assert stats["skipped_files"] == 2
+        assert stats["indexed_files"] == 4
+
+        result = search(service, "handle_request", repo_dir)
+        assert [m.file for m in result["matches"]] == ["app.py"]
+
+    def test_matches_full_scan(self, repo_dir):
+        """Test indexed searches return exactly what a scan returns."""
+        indexed = make_service(repo_dir)
+        scanning = RepositoryService(allowed_paths=[str(repo_dir)])
+        cases = [
+            ("render", {}),
+            ("RENDER", {"case_sensitive": False}),
+            (r"def \w+\(", {}),
+            ("class (User|Admin)", {}),
+            ("KELVIN", {"case_sensitive": False}),
+            ("return", {"file_pattern": "*.py"}),
+            ("name", {}),
+            ("missing_everywhere", {}),
+        ]
+        for pattern, kwargs in cases:
+            with_index = search(indexed, pattern, repo_dir, **kwargs)
+            without = search(scanning, pattern, repo_dir, **kwargs)
+            assert with_index["indexed"] and not without["indexed"]
+            assert match_set(with_index) == match_set(without), pattern
+            assert with_index["files_searched"] == without["files_searched"], pattern
+
+    def test_unicode_case_fold(self, repo_dir):
+        """Test a case-insensitive match on a non-ASCII fold is still found."""
+        (repo_dir / "units.txt").write_text("Kelvin\n")  # Kelvin sign
+        service = make_service(repo_dir)
+        result = search(service, "kelvin", repo_dir, case_sensitive=False)
+        assert {m.file for m in result["matches"]} == {"notes.txt", "units.txt"}
+
+    def test_scope_and_file_pattern(self, repo_dir):
+        """Test candidates are limited to the searched directory and file names."""
+        service = make_service(repo_dir)
+        result = search(service, "name", repo_dir / "pkg")
+        assert match_set(result) == [("models.py", 2)]
+
+        paths, _ = service.index.candidates(re.compile("def"), repo_dir, "util*")
+        assert [p.name for p in paths] == ["util.py"]
+
+    def test_path_patterns_fall_back(self, repo_dir):
+        """Test path-based file patterns are answered by a scan."""
+        service = make_service(repo_dir)
+        assert service.index.candidates(re.compile("name"), repo_dir, "**/*.py") is None
+        result = search(service, "name", repo_dir, file_pattern="**/*.py")
+        assert not result["indexed"]
+        assert match_set(result) == [("pkg/models.py", 2)]
+
+    def test_not_ready_falls_back(self, repo_dir):
+        """Test searches scan until the index has been built."""
+        service = RepositoryService(allowed_paths=[str(repo_dir)])
+        service.enable_index()
+        result = search(service, "render", repo_dir)
+        assert not result["indexed"]
+        assert result["total"] == 2
+
+    def test_incremental_refresh(self, repo_dir):
+        """Test only changed, new and deleted files are re-indexed."""
+        service = make_service(repo_dir)
+        index = service.index
+        assert index.refresh() == 0
+
+        (repo_dir / "util.py").write_text("def render_all(values):\n    pass\n")
+        (repo_dir / "new.py").write_text("render_all([])\n")
+        (repo_dir / "app.py").unlink()
+        assert index.refresh() == 3
+
+        paths, _ = index.candidates(re.compile("render_all"), repo_dir)
+        assert sorted(p.name for p in paths) == ["new.py", "util.py"]
+        assert index.get_stats()["dead_postings"] > 0
+
+    def test_search_picks_up_changes(self, repo_dir):
+        """Test a search re-walks its directory once the refresh interval passes."""
+        service = make_service(repo_dir)
+        service.index.refresh_interval = 0
+        (repo_dir / "late.py").write_text("render()\n")
+
+        result = search(service, "render", repo_dir)
+        assert "late.py" in {m.file for m in result["matches"]}
+
+    def test_generation_tracks_changes(self, repo_dir):
+        """Test the generation is stable until a file changes."""
+        service = make_service(repo_dir)
+        index = service.index
+        index.refresh_interval = 0
+        generation = index.generation(repo_dir)
+        assert index.generation(repo_dir / "pkg") == generation
+
+        (repo_dir / "pkg" / "views.py").write_text("render()\n")
+        assert index.generation(repo_dir) != generation
+        assert index.generation(repo_dir.parent) is None
+
+    def test_large_files_always_candidates(self, repo_dir):
+        """Test files over the size limit are searched without being indexed."""
+        (repo_dir / "big.txt").write_text("x" * 200 + "\nneedle\n")
+        service = RepositoryService(allowed_paths=[str(repo_dir)], max_file_size=100)
+        service.enable_index().build()
+
+        assert service.get_index_stats()["unindexed_files"] == 1
+        result = search(service, "needle", repo_dir)
+        assert match_set(result) == [("big.txt", 2)]
+
+    def test_persisted(self, repo_dir, tmp_path):
+        """Test a stored index is loaded and only brought up to date."""
+        db_path = tmp_path / "code_index.db"
+        service = make_service(repo_dir, db_path)
+        service.index.stop()
+
+        reads = []
+
+        def accept(path):
+            reads.append(path)
+            return True
+
+        reloaded = CodeIndex([repo_dir], db_path=db_path, accept=accept)
+        reloaded.build()
+        assert reads == []
+        assert reloaded.get_stats()["indexed_files"] == 4
+        paths, _ = reloaded.candidates(re.compile("render"), repo_dir)
+        assert sorted(p.name for p in paths) == ["app.py", "util.py"]
+        reloaded.stop()
+
+    def test_compact(self, repo_dir):
+        """Test compaction drops postings of replaced files."""
+        service = make_service(repo_dir)
+        index = service.index
+        before = index.get_stats()["postings"]
+        os.utime(repo_dir / "util.py", ns=(1, 1))
+        index.refresh()
+        index.compact()
+
+        stats = index.get_stats()
+        assert stats["dead_postings"] == 0
+        assert stats["postings"] == before
+
+    def test_background_build(self, repo_dir):
+        """Test start() builds the index off the calling thread."""
+        service = RepositoryService(allowed_paths=[str(repo_dir)])
+        index = service.enable_index()
+        index.start()
+        assert index.wait_ready(10)
+        assert index.get_stats()["state"] == "ready"
+        assert search(service, "render", repo_dir)["indexed"]
+        index.stop()
+
+    def test_stats_during_build(self, repo_dir):
+        """Test stats answer while the build is reading files."""
+        reading = threading.Event()
+        release = threading.Event()
+
+        def accept(path):
+            reading.set()
+            release.wait(10)
+            return True
+
+        index = CodeIndex([repo_dir], accept=accept)
+        index.start()
+        assert reading.wait(10)
+
+        result = []
+        reader = threading.Thread(target=lambda: result.append(index.get_stats()))
+        reader.start()
+        reader.join(2)
+        release.set()
+        assert result and result[0]["state"] == "building"
+
+        assert index.wait_ready(10)
+        assert index.get_stats()["indexed_files"] == 6
+        index.stop()
+
+    def test_stats_disabled(self, repo_dir):
+        """Test stats without an index."""
+        service = RepositoryService(allowed_paths=[str(repo_dir)])
+        assert service.get_index_stats() == {"enabled": False}
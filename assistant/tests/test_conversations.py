@@ -304,6 +304,86 @@ class TestMultiConversationMessages:
         assert conv_after["updated_at"] >= original_updated
 
 
+class TestMessagePagination:
+    """Tests for paging through long conversations."""
+
+    async def _conversation_with(self, memory_service, count):
+        conv_id = await memory_service.create_conversation(title="Long chat")
+        ids = []
+        for i in range(count):
+            role = "user" if i % 2 == 0 else "assistant"
+            ids.append(await memory_service.add_message(conv_id, role, f"Message {i}"))
+        return conv_id, ids
+
+    @pytest.mark.asyncio
+    async def test_newest_page_in_chronological_order(self, memory_service):
+        """Test the first page is the newest messages, oldest first."""
+        conv_id, ids = await self._conversation_with(memory_service, 12)
+
+        page = await memory_service.get_messages_page(conv_id, limit=5)
+        assert [m["id"] for m in page["messages"]] == ids[-5:]
+        assert page["has_more_before"] is True
+        assert page["has_more_after"] is False
+
+    @pytest.mark.asyncio
+    async def test_before_walks_back_to_the_start(self, memory_service):
+        """Test paging with before visits every message exactly once."""
+        conv_id, ids = await self._conversation_with(memory_service, 12)
+
+        page = await memory_service.get_messages_page(conv_id, limit=5)
+        seen = [m["id"] for m in page["messages"]]
+        while page["has_more_before"]:
+            page = await memory_service.get_messages_page(conv_id, before=seen[0], limit=5)
+            assert page["has_more_after"] is True
+            seen = [m["id"] for m in page["messages"]] + seen
+
+        assert seen == ids
+        assert len(page["messages"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_after_returns_newer_messages(self, memory_service):
+        """Test paging with after returns the messages following the anchor."""
+        conv_id, ids = await self._conversation_with(memory_service, 8)
+
+        page = await memory_service.get_messages_page(conv_id, after=ids[2], limit=3)
+        assert [m["id"] for m in page["messages"]] == ids[3:6]
+        assert page["has_more_before"] is True
+        assert page["has_more_after"] is True
+
+        page = await memory_service.get_messages_page(conv_id, after=ids[5], limit=3)
+        assert [m["id"] for m in page["messages"]] == ids[6:]
+        assert page["has_more_after"] is False
+
+    @pytest.mark.asyncio
+    async def test_unknown_anchor_returns_none(self, memory_service):
+        """Test an anchor from another conversation is not accepted."""
+        conv_id, _ = await self._conversation_with(memory_service, 3)
+        other_id, other_ids = await self._conversation_with(memory_service, 3)
+
+        assert await memory_service.get_messages_page(conv_id, before="msg_missing") is None
+        assert await memory_service.get_messages_page(conv_id, before=other_ids[0]) is None
+
+    @pytest.mark.asyncio
+    async def test_before_and_after_together_rejected(self, memory_service):
+        """Test passing both anchors is an error."""
+        conv_id, ids = await self._conversation_with(memory_service, 3)
+        with pytest.raises(ValueError):
+            await memory_service.get_messages_page(conv_id, before=ids[2], after=ids[0])
+
+    @pytest.mark.asyncio
+    async def test_get_conversation_with_limit(self, memory_service):
+        """Test get_conversation can return only the newest messages."""
+        conv_id, ids = await self._conversation_with(memory_service, 6)
+
+        conv = await memory_service.get_conversation(conv_id, limit=4)
+        assert [m["id"] for m in conv["messages"]] == ids[-4:]
+        assert conv["has_more_before"] is True
+
+        full = await memory_service.get_conversation(conv_id)
+        assert len(full["messages"]) == 6
+        assert "has_more_before" not in full
+
+
 class TestConversationAPIEndpoints:
     """Tests for the REST API endpoints using FastAPI test client."""
 
@@ -449,6 +529,49 @@ class TestConversationAPIEndpoints:
         data = response.json()
         assert data["id"] == "main"
 
+    def test_conversation_endpoint_limit(self, client):
+        """Test GET /api/conversations/{id}?limit= returns the newest page."""
+        from server.routes import chat
+        import asyncio
+        conv_id = client.post("/api/conversations", json={"title": "Paged"}).json()["id"]
+        for i in range(5):
+            asyncio.run(chat.memory.add_message(conv_id, "user", f"Message {i}"))
+
+        data = client.get(f"/api/conversations/{conv_id}?limit=2").json()
+        assert [m["content"] for m in data["messages"]] == ["Message 3", "Message 4"]
+        assert data["has_more_before"] is True
+
+        assert client.get(f"/api/conversations/{conv_id}?limit=0").status_code == 422
+
+    def test_messages_page_endpoint(self, client):
+        """Test GET /api/conversations/{id}/messages pages backwards."""
+        from server.routes import chat
+        import asyncio
+        conv_id = client.post("/api/conversations", json={"title": "Paged"}).json()["id"]
+        for i in range(5):
+            asyncio.run(chat.memory.add_message(conv_id, "user", f"Message {i}"))
+
+        newest = client.get(f"/api/conversations/{conv_id}/messages?limit=3").json()
+        assert newest["conversation_id"] == conv_id
+        assert [m["content"] for m in newest["messages"]] == ["Message 2", "Message 3", "Message 4"]
+
+        first_id = newest["messages"][0]["id"]
+        older = client.get(f"/api/conversations/{conv_id}/messages?before={first_id}&limit=3").json()
+        assert [m["content"] for m in older["messages"]] == ["Message 0", "Message 1"]
+        assert older["has_more_before"] is False
+        assert older["has_more_after"] is True
+
+    def test_messages_page_endpoint_errors(self, client):
+        """Test the page endpoint rejects bad anchors and unknown conversations."""
+        conv_id = client.post("/api/conversations", json={"title": "Paged"}).json()["id"]
+
+        assert client.get("/api/conversations/conv_doesnotexist/messages").status_code == 404
+        response = client.get(f"/api/conversations/{conv_id}/messages?before=msg_missing")
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Message not found"
+        response = client.get(f"/api/conversations/{conv_id}/messages?before=a&after=b")
+        assert response.status_code == 400
+
     def test_conversations_include_preview(self, client):
         """Test that conversation list includes preview snippets."""
         # Create a conversation with messages
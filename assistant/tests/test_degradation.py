@@ -3,6 +3,7 @@ import pytest
 from datetime import datetime, timedelta
 from unittest.mock import patch, AsyncMock, MagicMock
 import asyncio
+import time
 
 from server.services.degradation import (
     DegradationService,
@@ -10,6 +11,7 @@ from server.services.degradation import (
     APIHealth,
     get_degradation_service,
 )
+from server.services.tool_cache import ToolResultCache
 
 
 class TestAPIHealth:
@@ -299,13 +301,13 @@ class TestDegradationService:
 
     def test_cache_tool_result(self):
         """Test caching tool results."""
-        service = DegradationService()
+        service = DegradationService(tool_cache=ToolResultCache())
         service.cache_tool_result("web_fetch", "hash123", {"data": "test"})
-        assert len(service._tool_cache) == 1
+        assert service.get_status()["cache_entries"] == 1
 
     def test_get_cached_tool_result(self):
         """Test retrieving cached tool results."""
-        service = DegradationService()
+        service = DegradationService(tool_cache=ToolResultCache())
         service.cache_tool_result("web_fetch", "hash123", {"data": "test"})
         result = service.get_cached_tool_result("web_fetch", "hash123")
         assert result is not None
@@ -314,29 +316,28 @@ class TestDegradationService:
 
     def test_get_cached_tool_result_not_found(self):
         """Test retrieving non-existent cached result."""
-        service = DegradationService()
+        service = DegradationService(tool_cache=ToolResultCache())
         result = service.get_cached_tool_result("web_fetch", "nonexistent")
         assert result is None
 
     def test_get_cached_tool_result_expired(self):
         """Test expired cache entries are not returned."""
-        service = DegradationService()
-        service._tool_cache["web_fetch:hash123"] = {
-            "result": {"data": "old"},
-            "cached_at": datetime.now() - timedelta(hours=25)  # Expired
-        }
+        service = DegradationService(tool_cache=ToolResultCache())
+        stored_at = time.time() - 25 * 3600  # Past the 24h retention
+        with patch("server.services.tool_cache.time.time", return_value=stored_at):
+            service.cache_tool_result("web_fetch", "hash123", {"data": "old"})
         result = service.get_cached_tool_result("web_fetch", "hash123")
         assert result is None
-        assert len(service._tool_cache) == 0  # Entry should be removed
+        assert service.get_status()["cache_entries"] == 0  # Entry should be removed
 
     def test_clear_cache(self):
         """Test clearing cache."""
-        service = DegradationService()
+        service = DegradationService(tool_cache=ToolResultCache())
         service.cache_tool_result("web_fetch", "hash1", "data1")
         service.cache_tool_result("web_fetch", "hash2", "data2")
-        assert len(service._tool_cache) == 2
-        service.clear_cache()
-        assert len(service._tool_cache) == 0
+        assert service.get_status()["cache_entries"] == 2
+        assert service.clear_cache() == 2
+        assert service.get_status()["cache_entries"] == 0
 
     @pytest.mark.asyncio
     async def test_queue_request(self):
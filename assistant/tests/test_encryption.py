@@ -5,6 +5,7 @@ import pytest
 import secrets
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 from server.services.encryption import (
     EncryptionService,
@@ -17,6 +18,7 @@ from server.services.encryption import (
     NONCE_SIZE,
     SALT_SIZE,
     ENCRYPTION_VERSION,
+    DERIVED_KEY_CACHE_SIZE,
     CRYPTOGRAPHY_AVAILABLE
 )
 
@@ -187,6 +189,38 @@ class TestEncryptionService:
 
         assert decrypted == plaintext
 
+    def test_derived_key_cached_per_salt(self, encryption_service):
+        """Test that repeat decrypts of a value skip key derivation."""
+        encrypted = encryption_service.encrypt("sk-cached")
+
+        with patch("server.services.encryption.PBKDF2HMAC") as mock_kdf:
+            assert encryption_service.decrypt(encrypted) == "sk-cached"
+            assert encryption_service.decrypt(encrypted) == "sk-cached"
+
+        mock_kdf.assert_not_called()
+
+    def test_derived_key_cache_is_bounded(self, encryption_service):
+        """Test that the least recently used derived keys are evicted."""
+        salts = [secrets.token_bytes(SALT_SIZE) for _ in range(DERIVED_KEY_CACHE_SIZE + 1)]
+        with patch("server.services.encryption.PBKDF2HMAC") as mock_kdf:
+            mock_kdf.return_value.derive.side_effect = lambda _: secrets.token_bytes(KEY_SIZE)
+            for salt in salts:
+                encryption_service._derive_encryption_key(salt)
+
+        assert len(encryption_service._derived_keys) == DERIVED_KEY_CACHE_SIZE
+        assert salts[0] not in encryption_service._derived_keys
+        assert salts[-1] in encryption_service._derived_keys
+
+    def test_clear_key_cache_zeroizes_keys(self, encryption_service):
+        """Test that clearing the cache overwrites key material."""
+        encryption_service.encrypt("sk-secret")
+        cached = list(encryption_service._derived_keys.values())
+
+        encryption_service.clear_key_cache()
+
+        assert encryption_service._derived_keys == {}
+        assert all(key == bytearray(KEY_SIZE) for key in cached)
+
     def test_key_file_persistence(self, temp_key_file):
         """Test that key file is created and persists."""
         # Create first service
@@ -338,6 +372,9 @@ class TestKeyRotation:
         assert new_service.decrypt(rotated["key2"]) == "value2"
         assert new_service.decrypt(rotated["key3"]) == "value3"
 
+        # Keys derived from the old master key are discarded
+        assert old_service._derived_keys == {}
+
     def test_rotate_key_empty_dict(self, temp_key_file):
         """Test key rotation with empty dict."""
         service = EncryptionService(key_file_path=temp_key_file)
@@ -398,6 +398,33 @@ class TestMetricsEndpoints:
         # Should return metrics data
         assert isinstance(data, dict)
 
+    def test_prometheus_metrics(self, client):
+        """Test GET /metrics returns Prometheus text format."""
+        client.get("/api/health")
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE assistant_uptime_seconds gauge" in response.text
+        assert 'route="/api/health"' in response.text
+
+    def test_debug_traces(self, client):
+        """Test GET /api/debug/traces lists stored traces."""
+        from server.services.tracing import start_trace
+
+        trace = start_trace("chat")
+        trace.finish()
+
+        response = client.get("/api/debug/traces", params={"limit": 100})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_traces"] >= 1
+        assert all("stages" in t for t in data["traces"])
+
+        response = client.get(f"/api/debug/traces/{trace.trace_id}")
+        assert response.status_code == 200
+        assert response.json()["spans"][0]["name"] == "chat"
+        assert client.get("/api/debug/traces/" + "0" * 32).status_code == 404
+
 
 class TestAlertsEndpoints:
     """Test /api/alerts endpoints."""
@@ -0,0 +1,77 @@
+"""Tests for line-offset indexes used by read_file."""
+from server.services.line_index import LineIndex, LineIndexCache
+
+
+def build(tmp_path, data: bytes) -> LineIndex:
+    path = tmp_path / "file.txt"
+    path.write_bytes(data)
+    return LineIndex.build(path)
+
+
+class TestLineIndex:
+    """Tests for LineIndex."""
+
+    def test_line_counts_match_text_mode(self, tmp_path):
+        """Test line totals agree with readlines()."""
+        for data in [b"", b"a", b"a\n", b"a\nb", b"a\n\n\nb\n", b"\n"]:
+            index = build(tmp_path, data)
+            with open(tmp_path / "file.txt") as f:
+                assert index.line_count == len(f.readlines()), data
+
+    def test_read_range(self, tmp_path):
+        """Test a range is read from its byte offsets."""
+        index = build(tmp_path, b"one\ntwo\nthree\nfour\n")
+        assert index.byte_range(2, 3) == (4, 14)
+        assert index.read(2, 3, 100) == ("two\nthree\n", False)
+        assert index.read(4, 10, 100) == ("four\n", False)
+        assert index.read(5, 10, 100) == ("", False)
+        assert index.read(3, 2, 100) == ("", False)
+
+    def test_max_chars_multibyte(self, tmp_path):
+        """Test decoding stops at max_chars without splitting characters."""
+        index = build(tmp_path, ("é" * 50 + "\n").encode() * 100)
+        text, truncated = index.read(1, 100, 10)
+        assert text == "é" * 10
+        assert truncated
+
+    def test_crlf(self, tmp_path):
+        """Test Windows line endings read as newlines."""
+        index = build(tmp_path, b"a\r\nb\r\n")
+        assert index.line_count == 2
+        assert index.read(1, 2, 100) == ("a\nb\n", False)
+
+
+class TestLineIndexCache:
+    """Tests for LineIndexCache."""
+
+    def test_reuse_and_invalidate(self, tmp_path):
+        """Test an index is reused until mtime or size change."""
+        cache = LineIndexCache()
+        path = tmp_path / "file.txt"
+        path.write_text("a\nb\n")
+        stat = path.stat()
+        first = cache.get(path, stat.st_mtime_ns, stat.st_size)
+        assert cache.get(path, stat.st_mtime_ns, stat.st_size) is first
+
+        path.write_text("a\nb\nc\n")
+        stat = path.stat()
+        assert cache.get(path, stat.st_mtime_ns, stat.st_size).line_count == 3
+        assert cache.get_stats()["misses"] == 2
+
+    def test_bounded_by_bytes(self, tmp_path):
+        """Test least recently used indexes are evicted past the byte budget."""
+        cache = LineIndexCache(max_bytes=8 * 15)
+        for name in ["a", "b", "c"]:
+            path = tmp_path / name
+            path.write_text("x\n" * 5)
+            stat = path.stat()
+            cache.get(path, stat.st_mtime_ns, stat.st_size)
+        stats = cache.get_stats()
+        assert stats["files"] == 3
+        assert stats["bytes"] == 8 * 15
+
+        path = tmp_path / "d"
+        path.write_text("x\n" * 5)
+        stat = path.stat()
+        cache.get(path, stat.st_mtime_ns, stat.st_size)
+        assert cache.get_stats()["files"] == 3
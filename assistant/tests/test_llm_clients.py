@@ -0,0 +1,109 @@
+"""Tests for the pooled LLM client registry."""
+import asyncio
+import pytest
+from pathlib import Path
+import sys
+
+import openai
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.services.llm_clients import LLMClientRegistry
+from server.services.metrics import metrics
+
+
+async def _start_keepalive_server():
+    """Start a minimal HTTP/1.1 server that keeps connections open."""
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        while True:
+            request = await reader.readuntil(b"\r\n\r\n")
+            if not request:
+                break
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: 2\r\nConnection: keep-alive\r\n\r\n{}"
+            )
+            await writer.drain()
+
+    async def handle_safely(reader, writer):
+        try:
+            await handle(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle_safely, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, port, connections
+
+
+class TestLLMClientRegistry:
+    """Tests for LLMClientRegistry."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    @pytest.mark.asyncio
+    async def test_same_key_returns_shared_client(self):
+        """Test that repeated lookups reuse one client per provider."""
+        registry = LLMClientRegistry()
+
+        first = registry.get_openai("sk-test-one")
+        second = registry.get_openai("sk-test-one")
+        claude = registry.get_anthropic("sk-ant-test")
+
+        assert first is second
+        assert claude is not first
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_key_change_rebuilds_client(self):
+        """Test that a new API key builds a new client."""
+        registry = LLMClientRegistry()
+
+        old = registry.get_anthropic("sk-ant-old")
+        new = registry.get_anthropic("sk-ant-new")
+
+        assert new is not old
+        assert registry.get_anthropic("sk-ant-new") is new
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_client(self):
+        """Test that invalidate forces a rebuild for that provider only."""
+        registry = LLMClientRegistry()
+        openai_client = registry.get_openai("sk-test")
+        claude = registry.get_anthropic("sk-ant-test")
+
+        registry.invalidate("openai")
+
+        assert registry.get_openai("sk-test") is not openai_client
+        assert registry.get_anthropic("sk-ant-test") is claude
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_requests_reuse_pooled_connection(self):
+        """Test that sequential requests share one keep-alive connection."""
+        server, port, connections = await _start_keepalive_server()
+        registry = LLMClientRegistry()
+        http_client = registry._build_http_client("local", openai)
+
+        try:
+            for _ in range(3):
+                response = await http_client.get(f"http://127.0.0.1:{port}/v1/ping")
+                assert response.status_code == 200
+        finally:
+            await http_client.aclose()
+            server.close()
+            await server.wait_closed()
+
+        stats = metrics.to_dict()["connections"]["local"]
+        assert len(connections) == 1
+        assert stats["requests"] == 3
+        assert stats["new"] == 1
+        assert stats["reused"] == 2
+        assert stats["reuse_rate"] == pytest.approx(66.67)
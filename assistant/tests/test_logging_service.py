@@ -10,8 +10,11 @@ import pytest
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from server.services import logging_service
 from server.services.logging_service import (
     LogConfig,
+    LogFilter,
+    LogFollower,
     LoggingService,
     DEFAULT_LOG_LEVEL,
     DEFAULT_MAX_BYTES,
@@ -453,3 +456,206 @@ class TestCLIIntegration:
 
         assert stats["total_files"] == 4
         assert "assistant.log" in stats["files_by_type"]
+
+
+def write_records(path: Path):
+    """A log with a multi-line ERROR record between INFO and WARNING records."""
+    path.write_text(
+        "2026-01-01 10:00:00 INFO [app] started\n"
+        "2026-01-01 10:00:01 ERROR [app] request failed\n"
+        "Traceback (most recent call last):\n"
+        "  File \"app.py\", line 1\n"
+        "ValueError: bad\n"
+        "2026-01-01 10:00:02 INFO [app] timeout waiting\n"
+        "2026-01-01 10:00:03 WARNING [app] timeout exceeded\n"
+    )
+
+
+class TestLogReading:
+    """Tests for reverse reads, cursors and filters."""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        return LoggingService(LogConfig(log_dir=tmp_path))
+
+    def test_reads_across_blocks(self, service, monkeypatch):
+        """Test lines spanning block boundaries are reassembled."""
+        monkeypatch.setattr(logging_service, "READ_BLOCK_SIZE", 7)
+        lines = [f"entry number {i} " + "x" * (i % 5) for i in range(50)]
+        (service.config.log_dir / "assistant.log").write_text("\n".join(lines) + "\n")
+
+        result = service.get_log_content("assistant", lines=20, offset=5)
+
+        assert result["lines"] == lines[25:45]
+        assert result["total_lines"] == 50
+
+    def test_cursor_pagination(self, service):
+        """Test pages chained by cursor cover the file without gaps or repeats."""
+        lines = [f"line{i}" for i in range(25)]
+        (service.config.log_dir / "assistant.log").write_text("\n".join(lines) + "\n")
+
+        pages = []
+        before = None
+        while True:
+            result = service.get_log_content("assistant", lines=10, before=before)
+            pages.insert(0, result["lines"])
+            if not result["has_more"]:
+                break
+            before = result["cursor"]
+
+        assert [len(page) for page in pages] == [5, 10, 10]
+        assert sum(pages, []) == lines
+
+    def test_cursor_stable_while_appending(self, service):
+        """Test a cursor still addresses the same lines after the log grows."""
+        log_path = service.config.log_dir / "assistant.log"
+        log_path.write_text("a\nb\nc\nd\n")
+        first = service.get_log_content("assistant", lines=2)
+
+        with open(log_path, "a") as f:
+            f.write("e\nf\n")
+        result = service.get_log_content("assistant", lines=2, before=first["cursor"])
+
+        assert result["lines"] == ["a", "b"]
+        assert result["total_lines"] == 6
+
+    def test_level_filter_keeps_tracebacks(self, service):
+        """Test a level filter keeps whole records, including continuation lines."""
+        write_records(service.config.log_dir / "assistant.log")
+
+        result = service.get_log_content("assistant", level="warning")
+
+        assert result["lines"] == [
+            "2026-01-01 10:00:01 ERROR [app] request failed",
+            "Traceback (most recent call last):",
+            '  File "app.py", line 1',
+            "ValueError: bad",
+            "2026-01-01 10:00:03 WARNING [app] timeout exceeded",
+        ]
+
+    def test_pattern_and_level_filter(self, service):
+        """Test a regex applies per line, on top of the level filter."""
+        write_records(service.config.log_dir / "assistant.log")
+
+        assert len(service.tail_log("assistant", pattern="timeout")) == 2
+        assert service.tail_log("assistant", level="WARNING", pattern="time.ut") == [
+            "2026-01-01 10:00:03 WARNING [app] timeout exceeded",
+        ]
+
+    def test_invalid_filters(self, service):
+        """Test unknown levels and bad regexes are rejected."""
+        with pytest.raises(ValueError):
+            service.get_log_content("assistant", level="LOUD")
+        with pytest.raises(logging_service.re.error):
+            service.get_log_content("assistant", pattern="(")
+
+    def test_forward_filter_matches_reverse(self, tmp_path):
+        """Test following and tailing select the same lines."""
+        log_path = tmp_path / "assistant.log"
+        write_records(log_path)
+        service = LoggingService(LogConfig(log_dir=tmp_path))
+
+        log_filter = LogFilter("ERROR")
+        forward = [line for line in log_path.read_text().splitlines() if log_filter.feed(line)]
+
+        assert forward == service.tail_log("assistant", level="ERROR")
+
+
+class TestLogFollower:
+    """Tests for following a growing log."""
+
+    def test_follows_appends(self, tmp_path):
+        """Test only lines written after the start position are returned."""
+        log_path = tmp_path / "assistant.log"
+        log_path.write_text("old\n")
+        follower = LogFollower(log_path)
+        assert follower.poll() == []
+
+        with open(log_path, "a") as f:
+            f.write("new1\nnew2\n")
+
+        assert follower.poll() == [(4, 9, "new1"), (9, 14, "new2")]
+        assert follower.offset == log_path.stat().st_size
+
+    def test_partial_line_held(self, tmp_path):
+        """Test a line is returned only once it is complete."""
+        log_path = tmp_path / "assistant.log"
+        log_path.write_text("")
+        follower = LogFollower(log_path)
+
+        with open(log_path, "a") as f:
+            f.write("hal")
+        assert follower.poll() == []
+        assert follower.offset == 0
+
+        with open(log_path, "a") as f:
+            f.write("f\n")
+        assert follower.poll() == [(0, 5, "half")]
+
+    def test_rotation(self, tmp_path):
+        """Test the end of a rotated file is read before the new file."""
+        log_path = tmp_path / "assistant.log"
+        log_path.write_text("one\n")
+        follower = LogFollower(log_path)
+
+        with open(log_path, "a") as f:
+            f.write("two\n")
+        log_path.rename(tmp_path / "assistant.log.1")
+        log_path.write_text("three\n")
+
+        assert [line for _, _, line in follower.poll()] == ["two", "three"]
+
+    def test_truncation(self, tmp_path):
+        """Test a cleared log is read again from the start."""
+        log_path = tmp_path / "assistant.log"
+        log_path.write_text("a long first line\n")
+        follower = LogFollower(log_path)
+
+        log_path.write_text("new\n")
+
+        assert follower.poll() == [(0, 4, "new")]
+
+    def test_follow_log_filtered(self, tmp_path):
+        """Test the service's follower applies filters."""
+        service = LoggingService(LogConfig(log_dir=tmp_path))
+        log_path = tmp_path / "assistant.log"
+        log_path.write_text("")
+        follower = service.follow_log("assistant", level="ERROR")
+
+        write_records(log_path)
+
+        assert len(follower.poll()) == 4
+
+
+class TestLogRoutes:
+    """Tests for the logs API."""
+
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        from fastapi.testclient import TestClient
+        from server.main import app
+        from server.routes import logs
+
+        service = LoggingService(LogConfig(log_dir=tmp_path))
+        monkeypatch.setattr(logs, "get_logging_service", lambda: service)
+        write_records(tmp_path / "assistant.log")
+        return TestClient(app)
+
+    def test_get_log(self, client):
+        """Test paged reads with filters."""
+        response = client.get("/api/logs/assistant", params={"lines": 2, "pattern": "timeout"})
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["lines"]) == 2
+        assert data["has_more"] is True
+
+    def test_get_log_errors(self, client):
+        """Test unknown logs and invalid filters."""
+        assert client.get("/api/logs/secrets").status_code == 404
+        assert client.get("/api/logs/assistant", params={"level": "LOUD"}).status_code == 400
+        assert client.get("/api/logs/assistant", params={"pattern": "("}).status_code == 400
+
+    def test_follow_unknown_log(self, client):
+        """Test following an unknown log is refused before streaming."""
+        assert client.get("/api/logs/secrets/follow").status_code == 404
+
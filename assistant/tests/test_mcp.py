@@ -1,14 +1,19 @@
 """Tests for MCP (Model Context Protocol) client and server functionality."""
 
+import asyncio
 import json
+import os
+import sys
+import textwrap
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 from server.services.mcp_client import (
     MCPClient,
     MCPClientManager,
     MCPServerConfig,
     MCPTool
 )
+from server.services import mcp_client
 from server.services.mcp_server import MCPServer, get_mcp_server
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
@@ -122,8 +127,9 @@ async def test_mcp_client_disconnect():
 
     # Mock a connected state
     mock_process = MagicMock()
+    mock_process.returncode = None
     mock_process.terminate = MagicMock()
-    mock_process.wait = MagicMock()
+    mock_process.wait = AsyncMock(return_value=0)
     client.process = mock_process
     client._connected = True
 
@@ -460,6 +466,317 @@ def test_get_mcp_server_singleton():
     assert server1 is server2
 
 
+# ============================================================================
+# End-to-end tests against a local stub MCP stdio server
+# ============================================================================
+
+STUB_MCP_SERVER = textwrap.dedent('''
+    import json
+    import os
+    import sys
+    import threading
+    import time
+
+    TOOLS = [
+        {"name": "echo", "description": "Echo text back",
+         "inputSchema": {"type": "object", "properties": {"text": {"type": "string"}},
+                         "required": ["text"]}},
+        {"name": "slow_echo", "description": "Echo text after a delay",
+         "inputSchema": {"type": "object", "properties": {
+             "text": {"type": "string"}, "delay": {"type": "number"}}}},
+        {"name": "crash", "description": "Exit the server",
+         "inputSchema": {"type": "object", "properties": {}}},
+        {"name": "stderr", "description": "Write to stderr then echo",
+         "inputSchema": {"type": "object", "properties": {"text": {"type": "string"}}}},
+    ]
+    if os.environ.get("STUB_EXTRA_TOOL"):
+        TOOLS.append({"name": "extra", "description": "Added by a later version",
+                      "inputSchema": {"type": "object", "properties": {}}})
+    write_lock = threading.Lock()
+
+    def send(message):
+        with write_lock:
+            sys.stdout.write(json.dumps(message) + "\\n")
+            sys.stdout.flush()
+
+    def call_tool(request_id, params):
+        args = params.get("arguments", {})
+        if params["name"] == "slow_echo":
+            time.sleep(args.get("delay", 0))
+        elif params["name"] == "crash":
+            os._exit(3)
+        elif params["name"] == "stderr":
+            sys.stderr.write("x" * 200000 + "\\n")
+            sys.stderr.flush()
+        send({"jsonrpc": "2.0", "id": request_id,
+              "result": {"content": [{"type": "text", "text": args.get("text", "")}]}})
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        if "id" not in request:
+            continue  # notification
+        method = request["method"]
+        params = request.get("params", {})
+        if method == "initialize":
+            result = {"protocolVersion": "2024-11-05", "capabilities": {"tools": {}},
+                      "serverInfo": {"name": "stub", "version": "0.0.1"}}
+        elif method == "tools/list":
+            result = {"tools": TOOLS}
+        elif method == "tools/call":
+            # Answer tool calls concurrently, so responses may arrive out of order
+            threading.Thread(target=call_tool, args=(request["id"], params), daemon=True).start()
+            continue
+        else:
+            send({"jsonrpc": "2.0", "id": request["id"],
+                  "error": {"code": -32601, "message": "Method not found"}})
+            continue
+        send({"jsonrpc": "2.0", "id": request["id"], "result": result})
+''')
+
+
+@pytest.fixture
+def stub_server_config(tmp_path):
+    """stdio config that launches the stub MCP server."""
+    script = tmp_path / "stub_mcp_server.py"
+    script.write_text(STUB_MCP_SERVER)
+    return MCPServerConfig(
+        name="stub",
+        transport="stdio",
+        command=[sys.executable, str(script)],
+    )
+
+
+@pytest.fixture
+async def stub_mcp_tools(stub_server_config, temp_db_path):
+    """Connect to the stub server and bridge its tools into the global registry."""
+    from server.services.tools import registry, register_mcp_tools_from_manager
+
+    manager = MCPClientManager(temp_db_path)
+    manager._configs = [stub_server_config]
+    await manager.connect_all()
+
+    with patch.object(mcp_client, "_mcp_manager", manager), \
+            patch.dict(os.environ, {"ASSISTANT_PERMISSION_LEVEL": "1"}):
+        register_mcp_tools_from_manager()
+        yield registry
+
+    for name in [n for n in registry.list_tools() if n.startswith("mcp:stub:")]:
+        del registry._tools[name]
+    await manager.disconnect_all()
+
+
+@pytest.mark.asyncio
+async def test_stub_server_connect_and_call(stub_server_config):
+    """Test connecting to a real stdio MCP server and calling a tool."""
+    client = MCPClient(stub_server_config)
+    await client.connect()
+    try:
+        assert {tool.name for tool in client.list_tools()} == {"echo", "slow_echo", "crash", "stderr"}
+        result = await client.call_tool("echo", {"text": "hello"})
+        assert result["content"][0]["text"] == "hello"
+    finally:
+        await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_stub_server_concurrent_requests(stub_server_config):
+    """Test that many tools/call requests to one server are in flight at once."""
+    client = MCPClient(stub_server_config)
+    await client.connect()
+    try:
+        start = asyncio.get_running_loop().time()
+        results = await asyncio.gather(*[
+            client.call_tool("slow_echo", {"text": f"r{i}", "delay": 0.5 - i * 0.05})
+            for i in range(8)
+        ])
+        elapsed = asyncio.get_running_loop().time() - start
+
+        # Responses arrive out of order but are matched to their requests by id
+        assert [r["content"][0]["text"] for r in results] == [f"r{i}" for i in range(8)]
+        assert elapsed < 2.0
+    finally:
+        await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_stub_server_request_timeout(stub_server_config):
+    """Test that a timed-out request does not desynchronize later responses."""
+    client = MCPClient(stub_server_config)
+    await client.connect()
+    try:
+        with pytest.raises(TimeoutError):
+            await client.call_tool("slow_echo", {"text": "late", "delay": 0.5}, timeout=0.05)
+
+        result = await client.call_tool("echo", {"text": "next"})
+        assert result["content"][0]["text"] == "next"
+
+        # Let the late response arrive; it must be dropped, not delivered
+        await asyncio.sleep(0.6)
+        result = await client.call_tool("echo", {"text": "after"})
+        assert result["content"][0]["text"] == "after"
+        assert client._pending == {}
+    finally:
+        await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_stub_server_crash_respawn(stub_server_config):
+    """Test that a crashed server fails in-flight calls and is respawned."""
+    client = MCPClient(stub_server_config)
+    await client.connect()
+    try:
+        first_pid = client.process.pid
+        with pytest.raises(RuntimeError, match="exited"):
+            await client.call_tool("crash", {})
+
+        result = await client.call_tool("echo", {"text": "revived"})
+
+        assert result["content"][0]["text"] == "revived"
+        assert client.restart_count == 1
+        assert client.process.pid != first_pid
+        assert client.is_connected()
+    finally:
+        await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_stub_server_gives_up_after_repeated_crashes(stub_server_config):
+    """Test that a server crashing in quick succession is eventually dropped."""
+    client = MCPClient(stub_server_config)
+    await client.connect()
+    try:
+        for _ in range(mcp_client.MAX_STDIO_RESTARTS + 2):
+            with pytest.raises(RuntimeError):
+                await client.call_tool("crash", {})
+
+        assert client.restart_count == mcp_client.MAX_STDIO_RESTARTS
+        assert not client.is_connected()
+    finally:
+        await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_stub_server_restart_budget_resets_when_healthy(stub_server_config, monkeypatch):
+    """Test that crashes far apart don't use up the restart budget."""
+    monkeypatch.setattr(mcp_client, "STDIO_HEALTHY_SECONDS", 0.0)
+    client = MCPClient(stub_server_config)
+    await client.connect()
+    try:
+        for _ in range(mcp_client.MAX_STDIO_RESTARTS + 2):
+            with pytest.raises(RuntimeError, match="exited"):
+                await client.call_tool("crash", {})
+
+        result = await client.call_tool("echo", {"text": "still here"})
+        assert result["content"][0]["text"] == "still here"
+        assert client.restart_count == 1
+    finally:
+        await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_stub_server_respawn_relists_tools(stub_mcp_tools):
+    """Test that a respawned server's new tool set reaches the registry."""
+    from server.services.tools import register_mcp_tools_from_manager
+
+    manager = mcp_client.get_mcp_manager()
+    manager.on_tools_changed = register_mcp_tools_from_manager
+    client = manager.clients["stub"]
+    client.config.env["STUB_EXTRA_TOOL"] = "1"
+
+    with pytest.raises(RuntimeError, match="exited"):
+        await client.call_tool("crash", {})
+    await client.call_tool("echo", {"text": "revived"})
+
+    assert "extra" in {tool.name for tool in client.list_tools()}
+    assert stub_mcp_tools.get_tool("mcp:stub:extra") is not None
+
+
+@pytest.mark.asyncio
+async def test_stub_server_large_stderr_does_not_stall(stub_server_config):
+    """Test that server stderr output is drained."""
+    client = MCPClient(stub_server_config)
+    await client.connect()
+    try:
+        for _ in range(3):
+            result = await client.call_tool("stderr", {"text": "ok"}, timeout=5)
+            assert result["content"][0]["text"] == "ok"
+    finally:
+        await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_stub_server_disconnect_stops_process(stub_server_config):
+    """Test that disconnect terminates the server and does not respawn it."""
+    client = MCPClient(stub_server_config)
+    await client.connect()
+    process = client.process
+
+    await client.disconnect()
+
+    assert process.returncode is not None
+    with pytest.raises(RuntimeError, match="not connected"):
+        await client.call_tool("echo", {"text": "gone"})
+
+
+@pytest.mark.asyncio
+async def test_bridged_mcp_tool_timeout(stub_mcp_tools):
+    """Test that a slow MCP tool is bounded by the call timeout."""
+    result = await stub_mcp_tools.execute_async(
+        "mcp:stub:slow_echo", timeout=0.1, text="late", delay=2
+    )
+
+    assert result["success"] is False
+    assert "timed out" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_bridged_mcp_tool_execute_async(stub_mcp_tools):
+    """Test that a bridged MCP tool returns its result, not a coroutine."""
+    result = await stub_mcp_tools.execute_async("mcp:stub:echo", text="bridged")
+
+    assert result == {"success": True, "result": "bridged"}
+
+
+@pytest.mark.asyncio
+async def test_bridged_mcp_tool_sync_execute(stub_mcp_tools):
+    """Test that sync execute() runs the async MCP handler to completion."""
+    result = await asyncio.to_thread(stub_mcp_tools.execute, "mcp:stub:echo", text="sync")
+
+    assert result["success"] is True
+    assert result["result"] == "sync"
+
+
+@pytest.mark.asyncio
+async def test_bridged_mcp_tool_runs_with_native_tools(stub_mcp_tools):
+    """Test MCP and native tools in one execute_many batch."""
+    results = await stub_mcp_tools.execute_many([
+        ("mcp:stub:slow_echo", {"text": "mcp", "delay": 0.1}),
+        ("calculate", {"expression": "6*7"}),
+        ("mcp:stub:echo", {"text": "again"}),
+    ])
+
+    assert [r["success"] for r in results] == [True, True, True]
+    assert results[0]["result"] == "mcp"
+    assert "42" in str(results[1]["result"])
+    assert results[2]["result"] == "again"
+
+
+@pytest.mark.asyncio
+async def test_mcp_server_tools_call_bridged_tool(stub_mcp_tools):
+    """Test the MCP server awaiting an MCP-bridged tool for tools/call."""
+    server = MCPServer()
+    response = await server.handle_request_async({
+        "jsonrpc": "2.0",
+        "id": 7,
+        "method": "tools/call",
+        "params": {"name": "mcp:stub:echo", "arguments": {"text": "relayed"}}
+    })
+
+    assert response["id"] == 7
+    assert response["result"]["content"][0]["text"] == "relayed"
+    assert "isError" not in response["result"]
+
+
 # ============================================================================
 # API Integration Tests
 # ============================================================================
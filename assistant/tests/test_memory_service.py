@@ -595,6 +595,96 @@ class TestContextSummarization:
         assert len(summary_messages) == 1
 
 
+    @pytest.mark.asyncio
+    async def test_only_full_batches_are_sealed(self, memory_service, monkeypatch):
+        """Test that partial batches are summarized on the fly but not stored."""
+        monkeypatch.setattr("config.RECENT_MESSAGES_VERBATIM", 5)
+        monkeypatch.setattr("config.MESSAGES_PER_SUMMARY_BATCH", 3)
+
+        for i in range(15):
+            await memory_service.add_to_conversation("user", f"Message {i}")
+
+        _, meta = await memory_service.get_context_for_api()
+
+        # 10 old messages -> 3 sealed batches + 1 pending message
+        summaries = await memory_service.get_summaries()
+        assert [s["message_count"] for s in summaries] == [3, 3, 3]
+        assert meta["summaries_used"] == 4
+
+    @pytest.mark.asyncio
+    async def test_context_incremental_after_new_messages(self, memory_service, monkeypatch):
+        """Test that new messages only seal new batches past the cursor."""
+        monkeypatch.setattr("config.RECENT_MESSAGES_VERBATIM", 5)
+        monkeypatch.setattr("config.MESSAGES_PER_SUMMARY_BATCH", 3)
+
+        for i in range(15):
+            await memory_service.add_to_conversation("user", f"Message {i}")
+        await memory_service.get_context_for_api()
+
+        for i in range(15, 20):
+            await memory_service.add_to_conversation("user", f"Message {i}")
+        messages, meta = await memory_service.get_context_for_api()
+
+        assert meta["total_messages"] == 20
+        assert meta["summarized_count"] == 15
+        assert meta["verbatim_count"] == 5
+        summaries = await memory_service.get_summaries()
+        assert [s["message_count"] for s in summaries] == [3, 3, 3, 3, 3]
+        assert [m["content"] for m in messages[-5:]] == [f"Message {i}" for i in range(15, 20)]
+
+    @pytest.mark.asyncio
+    async def test_context_cursor_persists_across_instances(self, tmp_path, monkeypatch):
+        """Test that a new service instance resumes from the stored cursor."""
+        monkeypatch.setattr("config.RECENT_MESSAGES_VERBATIM", 5)
+        monkeypatch.setattr("config.MESSAGES_PER_SUMMARY_BATCH", 3)
+
+        db_path = tmp_path / "cursor.db"
+        first = MemoryService(db_path)
+        for i in range(15):
+            await first.add_to_conversation("user", f"Message {i}")
+        messages_first, meta_first = await first.get_context_for_api()
+
+        second = MemoryService(db_path)
+        messages_second, meta_second = await second.get_context_for_api()
+
+        assert meta_second == meta_first
+        assert messages_second == messages_first
+        assert len(await second.get_summaries()) == 3
+
+    @pytest.mark.asyncio
+    async def test_context_counts_after_deleting_summarized_message(self, memory_service, monkeypatch):
+        """Test that deleting a summarized message keeps totals accurate."""
+        monkeypatch.setattr("config.RECENT_MESSAGES_VERBATIM", 5)
+        monkeypatch.setattr("config.MESSAGES_PER_SUMMARY_BATCH", 3)
+
+        ids = []
+        for i in range(15):
+            ids.append(await memory_service.add_to_conversation("user", f"Message {i}"))
+        await memory_service.get_context_for_api()
+
+        assert await memory_service.delete_message(DEFAULT_CONVERSATION_ID, ids[0]) is True
+        _, meta = await memory_service.get_context_for_api()
+
+        assert meta["total_messages"] == 14
+        assert meta["summarized_count"] == 9
+
+    @pytest.mark.asyncio
+    async def test_clear_summaries_resets_cursor(self, memory_service, monkeypatch):
+        """Test that summaries are rebuilt after being cleared."""
+        monkeypatch.setattr("config.RECENT_MESSAGES_VERBATIM", 5)
+        monkeypatch.setattr("config.MESSAGES_PER_SUMMARY_BATCH", 3)
+
+        for i in range(15):
+            await memory_service.add_to_conversation("user", f"Message {i}")
+        await memory_service.get_context_for_api()
+        await memory_service.clear_summaries()
+
+        _, meta = await memory_service.get_context_for_api()
+
+        assert meta["summarized_count"] == 10
+        assert len(await memory_service.get_summaries()) == 3
+
+
 class TestExportImport:
     """Tests for conversation export/import functionality (Issue #8)."""
 
@@ -881,11 +971,14 @@ class TestConcurrency:
             await memory_service.add_to_conversation("user", f"Message {i}")
             await memory_service.get_messages()
 
-        # Pool should be initialized
-        assert memory_service._pool._initialized is True
+        stats = memory_service._pool.get_stats()
 
-        # Pool should have its connections available
-        assert memory_service._pool._pool.qsize() <= memory_service._pool.pool_size
+        # One writer, and never more readers than the pool allows
+        assert stats["writer_open"] is True
+        assert stats["writer_busy"] is False
+        assert stats["readers_open"] <= stats["max_readers"]
+        # All connections are back in the pool
+        assert stats["readers_idle"] == stats["readers_open"]
 
     @pytest.mark.asyncio
     async def test_high_concurrency_stress(self, memory_service):
@@ -0,0 +1,62 @@
+"""Tests for paginated, virtualized conversation history in the Web UI"""
+from pathlib import Path
+
+# Get project root
+ASSISTANT_DIR = Path(__file__).parent.parent
+UI_DIR = ASSISTANT_DIR / "ui"
+
+
+def test_message_list_loaded_before_app_js():
+    """Verify index.html loads message_list.js before app.js"""
+    content = (UI_DIR / "index.html").read_text()
+
+    list_pos = content.find("/static/message_list.js")
+    assert list_pos > 0, "message_list.js not included in index.html"
+    assert list_pos < content.find("/static/app.js"), "message_list.js loaded after app.js"
+
+
+def test_message_list_is_precached():
+    """Verify the service worker pre-caches message_list.js for offline use"""
+    content = (UI_DIR / "sw.js").read_text()
+    assert "'/static/message_list.js'" in content
+
+
+def test_history_loaded_a_page_at_a_time():
+    """Verify conversations load the newest page and fetch older pages by anchor"""
+    content = (UI_DIR / "app.js").read_text()
+
+    fetch_fn = content.split("async function fetchMessagePage(")[1].split("\n}\n")[0]
+    assert "?limit=${MESSAGE_PAGE_SIZE}" in fetch_fn, "newest page is not limited"
+    assert "/messages?before=" in fetch_fn, "older pages are not fetched by anchor"
+
+    load_fn = content.split("async function loadConversationMessages(")[1].split("\n}\n")[0]
+    assert "messageList.load(conversationId)" in load_fn
+    assert "addMessageToUI" not in load_fn, "history still rendered one message at a time"
+
+
+def test_only_visible_messages_rendered():
+    """Verify the list renders a window around the viewport and spaces the rest"""
+    content = (UI_DIR / "message_list.js").read_text()
+
+    assert "class VirtualMessageList" in content
+    assert "message-spacer" in content, "off-screen messages are not replaced by spacers"
+    assert "OVERSCAN_PX" in content
+    assert "requestAnimationFrame" in content, "scroll updates are not throttled to frames"
+    assert "el.remove()" in content, "messages leaving the window are not removed"
+
+
+def test_scroll_position_kept_when_older_messages_load():
+    """Verify prepending older messages does not make the view jump"""
+    content = (UI_DIR / "message_list.js").read_text()
+
+    load_older = content.split("async loadOlder() {")[1].split("\n    }\n")[0]
+    assert "this.scrollEl.scrollTop +=" in load_older
+
+
+def test_message_actions_cover_unrendered_history():
+    """Verify edit/regenerate/delete also use the loaded history, not just the DOM"""
+    content = (UI_DIR / "app.js").read_text()
+
+    assert "messageList.idsFrom(messageId)" in content
+    assert "messageList.previousUserMessage(messageId)" in content
+    assert "messageList.remove(messageId)" in content
@@ -1,7 +1,7 @@
 """Tests for the metrics service."""
 import pytest
 import time
-from server.services.metrics import MetricsService
+from server.services.metrics import MetricsService, Histogram, WindowedHistogram
 
 
 class TestMetricsService:
@@ -67,14 +67,15 @@ class TestMetricsService:
         # p99 should be around 99
         assert 97 <= stats["p99"] <= 100
 
-    def test_max_latency_samples(self):
-        """Test that latency samples are limited."""
-        # Record more than max samples
-        for i in range(1500):
-            self.metrics.record_request("/api/chat", 100.0)
+    def test_latency_memory_is_bounded(self):
+        """Test that latency storage does not grow with request count."""
+        for i in range(20000):
+            self.metrics.record_request("/api/chat", float(i % 5000) + 0.5)
 
-        # Should only keep last 1000 samples
-        assert len(self.metrics._latencies["/api/chat"]) == 1000
+        histogram = self.metrics._latencies["/api/chat"].total
+        # Every sample counts, but storage is a few hundred buckets
+        assert histogram.count == 20000
+        assert histogram.bucket_count < 300
 
     def test_uptime(self):
         """Test uptime tracking."""
@@ -118,6 +119,20 @@ class TestMetricsService:
         # 2 errors out of 4 requests = 50%
         assert data["errors"]["rate"] == 50.0
 
+    def test_record_connection(self):
+        """Test connection reuse counters per provider."""
+        self.metrics.record_connection("anthropic", reused=False, tls_handshake=True)
+        self.metrics.record_connection("anthropic", reused=True)
+        self.metrics.record_connection("anthropic", reused=True)
+        self.metrics.record_connection("openai", reused=False, tls_handshake=True)
+
+        data = self.metrics.to_dict()["connections"]
+        assert data["anthropic"]["requests"] == 3
+        assert data["anthropic"]["new"] == 1
+        assert data["anthropic"]["reused"] == 2
+        assert data["anthropic"]["tls_handshakes"] == 1
+        assert data["openai"]["reuse_rate"] == 0.0
+
     def test_reset(self):
         """Test metrics reset."""
         self.metrics.record_request("/api/chat", 100.0)
@@ -133,7 +148,7 @@ class TestMetricsService:
 
     def test_empty_latency_stats(self):
         """Test latency stats with no data."""
-        stats = self.metrics._calculate_latency_stats([])
+        stats = self.metrics._calculate_latency_stats(Histogram())
         assert stats["avg"] == 0
         assert stats["min"] == 0
         assert stats["max"] == 0
@@ -147,3 +162,125 @@ class TestMetricsService:
         snapshot = self.metrics.get_snapshot()
         assert snapshot.errors["/api/chat:ValueError"] == 2
         assert snapshot.errors["/api/chat:TimeoutError"] == 1
+
+    def test_record_stage(self):
+        """Test per-stage timings."""
+        self.metrics.record_stage("context_build", 12.0)
+        self.metrics.record_stage("context_build", 18.0)
+        with self.metrics.time_stage("persistence"):
+            time.sleep(0.01)
+
+        stages = self.metrics.to_dict()["stages"]
+        assert stages["context_build"]["count"] == 2
+        assert stages["context_build"]["avg"] == 15.0
+        assert stages["context_build"]["windows"]["1m"]["count"] == 2
+        assert stages["persistence"]["min"] >= 10
+
+    def test_record_http(self):
+        """Test HTTP response recording by route."""
+        self.metrics.record_http("GET", "/api/conversations/{conversation_id}", 200, 5.0)
+        self.metrics.record_http("GET", "/api/conversations/{conversation_id}", 404, 3.0)
+
+        http = self.metrics.to_dict()["http"]
+        assert http["GET /api/conversations/{conversation_id}"]["count"] == 2
+
+    def test_gauges(self):
+        """Test absolute and relative gauge updates."""
+        self.metrics.add_gauge("http_requests_in_flight", 1)
+        self.metrics.add_gauge("http_requests_in_flight", 1)
+        self.metrics.add_gauge("http_requests_in_flight", -1)
+        self.metrics.set_gauge("queue_depth", 7)
+
+        gauges = self.metrics.to_dict()["gauges"]
+        assert gauges == {"http_requests_in_flight": 1, "queue_depth": 7}
+
+    def test_time_windows(self):
+        """Test that windowed views only include recent samples."""
+        now = [1_000_000.0]
+        service = MetricsService(clock=lambda: now[0])
+
+        service.record_request("/api/chat", 100.0)
+        now[0] += 120  # two minutes later
+        service.record_request("/api/chat", 300.0)
+
+        windows = service.to_dict()["latency"]["windows"]
+        assert windows["1m"]["count"] == 1
+        assert windows["1m"]["avg"] == 300.0
+        assert windows["5m"]["count"] == 2
+        assert windows["1h"]["count"] == 2
+
+        now[0] += 3600  # an hour after that, both are out of every window
+        windows = service.to_dict()["latency"]["windows"]
+        assert windows["1h"]["count"] == 0
+        # Totals since startup are kept
+        assert service.get_snapshot().latency["/api/chat"]["avg"] == 200.0
+
+    def test_prometheus_exposition(self):
+        """Test the Prometheus text format output."""
+        self.metrics.record_request("/api/chat", 40.0)
+        self.metrics.record_request("/api/chat", 400.0, success=False)
+        self.metrics.record_error("/api/chat", "ValueError")
+        self.metrics.record_stage("llm_first_token", 250.0)
+        self.metrics.record_tool_call("calculate")
+        self.metrics.record_http("POST", "/api/chat", 200, 410.0)
+
+        text = self.metrics.to_prometheus()
+        lines = text.splitlines()
+
+        assert "# TYPE assistant_request_duration_seconds histogram" in lines
+        assert 'assistant_request_duration_seconds_bucket{endpoint="/api/chat",le="0.05"} 1' in lines
+        assert 'assistant_request_duration_seconds_bucket{endpoint="/api/chat",le="0.5"} 2' in lines
+        assert 'assistant_request_duration_seconds_bucket{endpoint="/api/chat",le="+Inf"} 2' in lines
+        assert 'assistant_request_duration_seconds_count{endpoint="/api/chat"} 2' in lines
+        assert 'assistant_requests_total{endpoint="/api/chat"} 2' in lines
+        assert 'assistant_errors_total{endpoint="/api/chat",type="ValueError"} 1' in lines
+        assert 'assistant_stage_duration_seconds_count{stage="llm_first_token"} 1' in lines
+        assert 'assistant_tool_calls_total{tool="calculate"} 1' in lines
+        assert 'assistant_http_responses_total{method="POST",route="/api/chat",status="200"} 1' in lines
+        assert text.endswith("\n")
+
+    def test_prometheus_label_escaping(self):
+        """Test that label values are escaped."""
+        self.metrics.record_tool_call('say "hi"\\now')
+        assert 'assistant_tool_calls_total{tool="say \\"hi\\"\\\\now"} 1' in self.metrics.to_prometheus()
+
+
+class TestHistogram:
+    """Tests for the bounded-memory histogram."""
+
+    def test_quantiles_within_bucket_error(self):
+        """Test quantile estimates stay within the bucket width."""
+        histogram = Histogram()
+        for i in range(1, 10001):
+            histogram.record(float(i))
+
+        for q, expected in ((0.5, 5000), (0.9, 9000), (0.99, 9900)):
+            assert abs(histogram.quantile(q) - expected) / expected < 0.04
+
+    def test_merge(self):
+        """Test merging two histograms."""
+        a = Histogram()
+        b = Histogram()
+        for value in (1.0, 2.0, 3.0):
+            a.record(value)
+        for value in (10.0, 20.0):
+            b.record(value)
+
+        a.merge(b)
+
+        assert a.count == 5
+        assert a.sum == 36.0
+        assert a.min == 1.0
+        assert a.max == 20.0
+
+    def test_windowed_slots_expire(self):
+        """Test that old time slots are dropped."""
+        series = WindowedHistogram()
+        for minute in range(120):
+            series.record(1.0, minute * 60.0)
+
+        # Only the last hour of 10-second slots is retained
+        assert len(series._slots) <= 360
+        assert series.total.count == 120
+        assert series.window(3600, 119 * 60.0).count == 60
+
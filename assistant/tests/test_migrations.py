@@ -0,0 +1,145 @@
+"""Tests for the schema migration framework and the indexes it installs."""
+import aiosqlite
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.services.migrations import Migration, apply_migrations, get_schema_version
+from server.services.memory import MemoryService, DEFAULT_CONVERSATION_ID
+from server.services.memory_extractor import MemoryExtractorService
+from server.services.user_profile import UserProfileService
+from server.services.proactive import ProactiveService
+from server.services.scheduler import SchedulerService
+
+
+STEPS = (
+    Migration(1, "create items", (
+        "CREATE TABLE IF NOT EXISTS items (id TEXT PRIMARY KEY, name TEXT)",
+    )),
+    Migration(2, "index item names", (
+        "CREATE INDEX IF NOT EXISTS idx_items_name ON items(name)",
+    )),
+)
+
+
+async def _query_plan(db_path: Path, sql: str, params: tuple) -> str:
+    """Return the EXPLAIN QUERY PLAN details joined into one string."""
+    async with aiosqlite.connect(db_path) as db:
+        cursor = await db.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        rows = await cursor.fetchall()
+    return " | ".join(row[-1] for row in rows)
+
+
+class TestApplyMigrations:
+    """Tests for apply_migrations()."""
+
+    @pytest.mark.asyncio
+    async def test_applies_all_steps_in_order(self, tmp_path):
+        """Test that a fresh database is migrated to the latest version."""
+        async with aiosqlite.connect(tmp_path / "m.db") as db:
+            version = await apply_migrations(db, reversed(STEPS))
+
+            assert version == 2
+            cursor = await db.execute("SELECT version, description FROM schema_version ORDER BY version")
+            assert await cursor.fetchall() == [(1, "create items"), (2, "index item names")]
+
+    @pytest.mark.asyncio
+    async def test_only_pending_steps_run(self, tmp_path):
+        """Test that re-running applies nothing and new steps apply once."""
+        db_path = tmp_path / "m.db"
+        async with aiosqlite.connect(db_path) as db:
+            await apply_migrations(db, STEPS[:1])
+            await db.execute("INSERT INTO items (id, name) VALUES ('a', 'x')")
+            await db.commit()
+
+        # A non-idempotent step would fail if it ran twice
+        steps = STEPS + (Migration(3, "add column", ("ALTER TABLE items ADD COLUMN size INTEGER",)),)
+        async with aiosqlite.connect(db_path) as db:
+            assert await apply_migrations(db, steps) == 3
+            assert await apply_migrations(db, steps) == 3
+            cursor = await db.execute("SELECT COUNT(*) FROM items")
+            assert (await cursor.fetchone())[0] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_step_rolls_back(self, tmp_path):
+        """Test that a failing step leaves the version unchanged."""
+        steps = STEPS + (Migration(3, "broken", (
+            "CREATE TABLE extra (id TEXT)",
+            "THIS IS NOT SQL",
+        )),)
+        async with aiosqlite.connect(tmp_path / "m.db") as db:
+            with pytest.raises(aiosqlite.OperationalError):
+                await apply_migrations(db, steps)
+
+            assert await get_schema_version(db) == 2
+            cursor = await db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'extra'"
+            )
+            assert await cursor.fetchone() is None
+
+    @pytest.mark.asyncio
+    async def test_duplicate_versions_rejected(self, tmp_path):
+        """Test that duplicate migration versions raise ValueError."""
+        async with aiosqlite.connect(tmp_path / "m.db") as db:
+            with pytest.raises(ValueError):
+                await apply_migrations(db, STEPS + (STEPS[0],))
+
+    @pytest.mark.asyncio
+    async def test_legacy_database_upgrades_in_place(self, tmp_path):
+        """Test that a pre-migration conversations.db keeps its data."""
+        db_path = tmp_path / "legacy.db"
+        async with aiosqlite.connect(db_path) as db:
+            await db.execute(
+                "CREATE TABLE conversations (id TEXT PRIMARY KEY, title TEXT, "
+                "created_at TIMESTAMP, updated_at TIMESTAMP)"
+            )
+            await db.execute(
+                "CREATE TABLE messages (id TEXT PRIMARY KEY, conversation_id TEXT, "
+                "role TEXT, content TEXT, created_at TIMESTAMP)"
+            )
+            await db.execute("INSERT INTO conversations VALUES ('main', 'Conversation', '2025', '2025')")
+            await db.execute("INSERT INTO messages VALUES ('msg_1', 'main', 'user', 'hello', '2025')")
+            await db.commit()
+
+        service = MemoryService(db_path)
+        messages = await service.get_messages()
+
+        assert messages[-1]["content"] == "hello"
+        async with aiosqlite.connect(db_path) as db:
+            assert await get_schema_version(db) == 3
+
+
+class TestServiceSchemas:
+    """Every SQLite store is versioned and avoids full scans on hot queries."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("factory", [
+        MemoryService, MemoryExtractorService, UserProfileService, ProactiveService, SchedulerService,
+    ])
+    async def test_store_is_versioned(self, tmp_path, factory):
+        """Test that each service records a schema version on init."""
+        db_path = tmp_path / "store.db"
+        await factory(db_path)._ensure_initialized()
+
+        async with aiosqlite.connect(db_path) as db:
+            assert await get_schema_version(db) >= 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sql", [
+        "SELECT id, role, content, created_at FROM messages WHERE conversation_id = ? ORDER BY created_at",
+        "SELECT id FROM messages WHERE conversation_id = ? ORDER BY created_at DESC LIMIT 1",
+        "SELECT COUNT(*) FROM messages WHERE conversation_id = ?",
+        "SELECT summary FROM message_summaries WHERE conversation_id = ? ORDER BY created_at",
+        "SELECT id FROM files WHERE conversation_id = ? ORDER BY uploaded_at DESC",
+    ])
+    async def test_conversation_queries_use_indexes(self, tmp_path, sql):
+        """Test that per-conversation queries are index searches, not scans."""
+        db_path = tmp_path / "conversations.db"
+        await MemoryService(db_path)._ensure_initialized()
+
+        plan = await _query_plan(db_path, sql, (DEFAULT_CONVERSATION_ID,))
+
+        assert "USING" in plan and "INDEX" in plan
+        assert "TEMP B-TREE" not in plan
@@ -0,0 +1,247 @@
+"""Tests for concurrent prompt assembly."""
+import asyncio
+import time
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.services.prompt_assembly import PromptAssembler, PromptSources
+from server.services.persona import DEFAULT_SYSTEM_PROMPT
+from server.services.tracing import start_trace
+
+
+class FakeMemory:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    async def get_context_for_api(self):
+        await asyncio.sleep(self.delay)
+        return [{"role": "user", "content": "hi"}], {"total_messages": 1, "summarized_count": 0, "verbatim_count": 1}
+
+    async def get_conversation_messages(self, conversation_id):
+        await asyncio.sleep(self.delay)
+        return [{"role": "user", "content": "earlier"}, {"role": "user", "content": "hi"}]
+
+    async def get_conversation(self, conversation_id, limit=None):
+        self.recent_limit = limit
+        return {"id": conversation_id, "messages": [
+            {"id": "1", "role": "user", "content": "earlier", "created_at": "t1"},
+            {"id": "2", "role": "assistant", "content": "noted", "created_at": "t2"},
+            {"id": "3", "role": "user", "content": "hello", "created_at": "t3"},
+        ]}
+
+
+class FakeSettings:
+    def __init__(self, delay=0.0, prompt="Be brief.", error=None):
+        self.delay = delay
+        self.prompt = prompt
+        self.error = error
+
+    async def get_all(self):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {"system_prompt": self.prompt}
+
+
+class FakePersona:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    async def get_active_system_prompt(self, conversation_id, default_system_prompt=""):
+        await asyncio.sleep(self.delay)
+        return default_system_prompt or DEFAULT_SYSTEM_PROMPT
+
+
+class FakeFacts:
+    def __init__(self, delay=0.0, facts=None):
+        self.delay = delay
+        self.facts = facts or []
+
+    async def recall_facts(self, query=None, limit=10):
+        await asyncio.sleep(self.delay)
+        return self.facts[:limit]
+
+    def format_facts_for_system_prompt(self, facts):
+        return "## Facts:\n" + "\n".join(facts) if facts else ""
+
+
+class FakeProfile:
+    def __init__(self, delay=0.0, summary=""):
+        self.delay = delay
+        self.summary = summary
+
+    async def get_profile_summary(self):
+        await asyncio.sleep(self.delay)
+        return self.summary
+
+
+class FakeSuggestions:
+    def analyze_message(self, message):
+        return []
+
+    def get_available_tools_summary(self):
+        return "Tools: calculate"
+
+
+def make_sources(delay=0.0, **overrides):
+    sources = dict(
+        memory=FakeMemory(delay),
+        settings=FakeSettings(delay),
+        persona=FakePersona(delay),
+        facts=FakeFacts(delay, facts=["- likes tea"]),
+        profile=FakeProfile(delay, summary="## User Profile:"),
+        suggestions=FakeSuggestions(),
+    )
+    sources.update(overrides)
+    return PromptSources(**sources)
+
+
+class TestAssembly:
+    """Tests for building the prompt."""
+
+    @pytest.mark.asyncio
+    async def test_builds_system_prompt(self):
+        """Test the system prompt parts and their order."""
+        prompt = await PromptAssembler().assemble(make_sources(), "main", "hi")
+
+        assert prompt.system_prompt == "Be brief.\n\n## User Profile:\n\n## Facts:\n- likes tea\n\nTools: calculate"
+        assert prompt.messages == [{"role": "user", "content": "hi"}]
+        assert prompt.degraded == []
+        assert prompt.network_available is None
+
+    @pytest.mark.asyncio
+    async def test_non_default_conversation_history(self):
+        """Test that other conversations use their full message list."""
+        prompt = await PromptAssembler().assemble(make_sources(), "conv-1", "hi")
+        assert len(prompt.messages) == 2
+        assert prompt.context_meta["verbatim_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_sources_fetched_concurrently(self):
+        """Test that total time is close to the slowest source, not the sum."""
+        start = time.perf_counter()
+        await PromptAssembler().assemble(make_sources(delay=0.05), "main", "hi")
+        elapsed = time.perf_counter() - start
+
+        # Settings -> persona is the only chain (2 x 50ms); sequential would be 250ms
+        assert elapsed < 0.2
+
+    @pytest.mark.asyncio
+    async def test_spans_recorded(self):
+        """Test that each source is a child span of context_build."""
+        trace = start_trace("chat")
+        await PromptAssembler().assemble(make_sources(), "main", "hi", trace=trace)
+
+        context = next(s for s in trace.spans if s.name == "context_build")
+        children = {s.name for s in trace.spans if s.parent_id == context.span_id}
+        assert children == {"history", "settings", "persona", "fact_recall", "profile", "tool_suggestions"}
+        assert context.attributes["prompt_version"]
+
+
+class TestDegradation:
+    """Tests for slow and failing sources."""
+
+    @pytest.mark.asyncio
+    async def test_slow_source_uses_default(self):
+        """Test that a source past its timeout is replaced by its default."""
+        assembler = PromptAssembler(timeouts={"fact_recall": 0.05})
+        sources = make_sources(facts=FakeFacts(delay=5, facts=["- slow"]))
+
+        start = time.perf_counter()
+        prompt = await assembler.assemble(sources, "main", "hi")
+
+        assert time.perf_counter() - start < 1
+        assert prompt.degraded == ["fact_recall"]
+        assert "slow" not in prompt.system_prompt
+
+    @pytest.mark.asyncio
+    async def test_failed_settings_fall_back(self):
+        """Test that failed settings still yield a usable system prompt."""
+        sources = make_sources(settings=FakeSettings(error=RuntimeError("db locked")))
+        prompt = await PromptAssembler().assemble(sources, "main", "hi")
+
+        assert prompt.degraded == ["settings"]
+        assert prompt.system_prompt.startswith(DEFAULT_SYSTEM_PROMPT)
+
+    @pytest.mark.asyncio
+    async def test_persona_timeout_keeps_settings(self):
+        """Test that a persona timeout falls back to the settings prompt."""
+        assembler = PromptAssembler(timeouts={"persona": 0.05})
+        sources = make_sources(persona=FakePersona(delay=5))
+        prompt = await assembler.assemble(sources, "main", "hi")
+
+        assert prompt.degraded == ["persona"]
+        assert prompt.system_prompt.startswith("Be brief.")
+
+    @pytest.mark.asyncio
+    async def test_failed_history_uses_recent_messages(self):
+        """Test that failed history falls back to a bounded recent window."""
+        import config
+
+        class BrokenMemory(FakeMemory):
+            async def get_context_for_api(self):
+                raise OSError("disk I/O error")
+
+        memory = BrokenMemory()
+        prompt = await PromptAssembler().assemble(make_sources(memory=memory), "main", "hello")
+        assert prompt.messages == [
+            {"role": "system", "content": DEFAULT_SYSTEM_PROMPT},
+            {"role": "user", "content": "earlier"},
+            {"role": "assistant", "content": "noted"},
+            {"role": "user", "content": "hello"},
+        ]
+        assert memory.recent_limit == config.RECENT_MESSAGES_VERBATIM
+        assert prompt.degraded == ["history"]
+
+    @pytest.mark.asyncio
+    async def test_slow_history_and_recent_use_current_message(self):
+        """Test that the turn proceeds with only its message when no history can be read."""
+        class StuckMemory(FakeMemory):
+            async def get_conversation(self, conversation_id, limit=None):
+                await asyncio.sleep(5)
+
+        assembler = PromptAssembler(timeouts={"history": 0.05, "recent_history": 0.05})
+        sources = make_sources(memory=StuckMemory(delay=5))
+
+        start = time.perf_counter()
+        prompt = await assembler.assemble(sources, "main", "hello")
+
+        assert time.perf_counter() - start < 1
+        assert prompt.messages == [{"role": "user", "content": "hello"}]
+        assert prompt.degraded == ["history", "recent_history"]
+
+    @pytest.mark.asyncio
+    async def test_network_check(self):
+        """Test the optional network check."""
+        class Offline:
+            async def check_network(self):
+                return False
+
+        prompt = await PromptAssembler().assemble(make_sources(degradation=Offline()), "main", "hi")
+        assert prompt.network_available is False
+
+
+class TestVersioning:
+    """Tests for the system prompt version stamp."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_inputs_keep_version(self):
+        """Test that identical inputs produce the same version."""
+        assembler = PromptAssembler()
+        first = await assembler.assemble(make_sources(), "main", "hi")
+        second = await assembler.assemble(make_sources(), "main", "hi again")
+
+        assert second.version == first.version
+        assert second.system_prompt == first.system_prompt
+
+    @pytest.mark.asyncio
+    async def test_changed_input_changes_version(self):
+        """Test that a settings change produces a new version."""
+        assembler = PromptAssembler()
+        first = await assembler.assemble(make_sources(), "main", "hi")
+        second = await assembler.assemble(make_sources(settings=FakeSettings(prompt="Be verbose.")), "main", "hi")
+
+        assert second.version != first.version
@@ -135,21 +135,54 @@ class TestRepositoryService:
         assert not result["success"]
         assert "not in allowed" in result["error"].lower()
 
-    def test_read_file_large_file_rejected(self, temp_dir):
-        """Test that large files are rejected."""
+    def test_read_file_large_file_windowed(self, temp_dir):
+        """Test that large files are read a window at a time."""
         # Create service with small max size
         service = RepositoryService(
             allowed_paths=[temp_dir],
             max_file_size=100
         )
+        service.LARGE_FILE_WINDOW_LINES = 10
 
         # Create large file
         large = Path(temp_dir) / "large.txt"
-        large.write_text("x" * 1000)
+        large.write_text("".join(f"line {i}\n" for i in range(1, 201)))
 
         result = service.read_file(str(large))
-        assert not result["success"]
-        assert "too large" in result["error"].lower()
+        assert result["success"]
+        assert result["windowed"]
+        assert result["lines"] == 200
+        assert (result["start_line"], result["end_line"]) == (1, 10)
+        assert result["content"].startswith("line 1\n") and "line 11" not in result["content"]
+
+        result = service.read_file(str(large), start_line=150)
+        assert result["content"].startswith("line 150\n")
+        assert result["end_line"] == 159
+
+        # A single huge line is capped at max_file_size characters
+        (Path(temp_dir) / "wide.txt").write_text("x" * 1000)
+        result = service.read_file(f"{temp_dir}/wide.txt")
+        assert result["success"]
+        assert result["truncated"]
+        assert len(result["content"]) == 100
+
+    def test_read_file_line_index_cached(self, service, temp_dir):
+        """Test line offsets are reused until the file changes."""
+        from server.services.line_index import get_line_index_cache
+
+        cache = get_line_index_cache()
+        path = Path(temp_dir) / "test.py"
+        service.read_file(str(path))
+        misses = cache.misses
+        result = service.read_file(str(path), start_line=4, end_line=4)
+        assert cache.misses == misses
+        assert result["content"] == "hello()\n"
+
+        path.write_text("one\r\ntwo\r\nthree")
+        result = service.read_file(str(path), start_line=2)
+        assert cache.misses == misses + 1
+        assert result["lines"] == 3
+        assert result["content"] == "two\nthree"
 
     # === List Files Tests ===
 
@@ -490,3 +523,70 @@ class TestMultipleAllowedPaths:
                 Path(not_allowed, "secret.txt").write_text("secret")
                 result = service.read_file(f"{not_allowed}/secret.txt")
                 assert not result["success"]
+
+
+class TestParallelScan:
+    """Test the process-pool scan mode of search_code and list_files."""
+
+    @pytest.fixture
+    def tree(self):
+        """A tree with enough directories and matches to split across workers."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            for d in range(12):
+                sub = root / f"pkg{d:02d}"
+                sub.mkdir()
+                for f in range(30):
+                    (sub / f"mod{f:02d}.py").write_text(
+                        f"import os\n\ndef func_{d}_{f}():\n    return 'value {f}'\n"
+                    )
+            (root / "pkg03" / "secrets.py").write_text("def func_secret():\n    pass\n")
+            (root / "pkg05" / "blob.py").write_bytes(b"def func_blob\x00\n")
+            (root / "top.py").write_text("def func_top():\n    pass\n")
+            yield tmpdir
+
+    @pytest.fixture
+    def service(self, tree, monkeypatch):
+        # Parallel scans are off on single-core machines
+        monkeypatch.setattr("server.services.repository.SCAN_WORKERS", 2)
+        return RepositoryService(allowed_paths=[tree])
+
+    def test_search_matches_serial(self, service, tree):
+        """Test a parallel search returns the serial results in the same order."""
+        serial = service.search_code(r"def func_\d+_1", directory=tree, max_results=1000, parallel=False)
+        parallel = service.search_code(r"def func_\d+_1", directory=tree, max_results=1000, parallel=True)
+
+        assert parallel["success"]
+        assert parallel["total"] == serial["total"] == 12 * 11
+        assert parallel["files_searched"] == serial["files_searched"]
+        assert [(m.file, m.line_number, m.context_after) for m in parallel["matches"]] == \
+            [(m.file, m.line_number, m.context_after) for m in serial["matches"]]
+
+    def test_search_skips_sensitive_and_binary(self, service, tree):
+        """Test workers apply the same file rules."""
+        result = service.search_code("func_(secret|blob|top)", directory=tree, parallel=True)
+        assert [m.file for m in result["matches"]] == ["top.py"]
+
+    def test_search_stops_early(self, service, tree, monkeypatch):
+        """Test the scan stops once more than max_results matches are found."""
+        monkeypatch.setattr("server.services.repository.SCAN_CHUNK_FILES", 10)
+        result = service.search_code("import os", directory=tree, max_results=5, parallel=True)
+
+        assert [m.file for m in result["matches"]] == [f"pkg00/mod0{i}.py" for i in range(5)]
+        assert result["truncated"]
+        assert 5 < result["total"] < 360
+
+    def test_list_matches_serial(self, service, tree):
+        """Test a parallel recursive listing equals the serial one."""
+        serial = service.list_files(tree, pattern="mod1*.py", recursive=True, parallel=False)
+        parallel = service.list_files(tree, pattern="mod1*.py", recursive=True, parallel=True)
+
+        assert parallel["total"] == serial["total"] == 120
+        assert [f.path for f in parallel["files"]] == [f.path for f in serial["files"]]
+
+    def test_list_includes_directories(self, service, tree):
+        """Test parallel listings include directories and top-level files, not sensitive files."""
+        result = service.list_files(tree, recursive=True, parallel=True)
+        paths = [f.path for f in result["files"]]
+        assert len(paths) == 12 + 12 * 30 + 2  # blob.py and top.py; secrets.py is sensitive
+        assert paths[0] == "pkg00" and paths[-1] == "top.py"
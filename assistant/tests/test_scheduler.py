@@ -1,6 +1,7 @@
 """Tests for the scheduler service and API."""
 import asyncio
 import json
+import random
 import pytest
 import tempfile
 from datetime import datetime, timedelta
@@ -14,7 +15,10 @@ from server.services.scheduler import (
     TaskType,
     TaskStatus,
     CronParser,
+    CompiledCron,
     init_scheduler_service,
+    _SCHEMA_MIGRATIONS,
+    _cron_weekdays_from_monday,
 )
 
 
@@ -111,6 +115,146 @@ class TestCronParser:
         next_run = CronParser.get_next_run("0 9 * * 1-5", base_time)
         assert next_run.weekday() in range(0, 5)  # Monday-Friday
 
+    def test_get_next_run_weekday_zero_is_sunday(self):
+        """Test weekday 0 means Sunday, as in standard cron."""
+        base_time = datetime(2026, 2, 2, 10, 0, 0)  # Monday
+        next_run = CronParser.get_next_run("0 9 * * 0", base_time)
+        assert next_run == datetime(2026, 2, 8, 9, 0)  # Sunday
+
+    def test_weekdays_from_monday_rewritten(self):
+        """Test old 0 = Monday weekday fields are converted to cron numbering."""
+        assert _cron_weekdays_from_monday("0 9 * * 0") == "0 9 * * 1"
+        assert _cron_weekdays_from_monday("0 9 * * 0-4") == "0 9 * * 1,2,3,4,5"
+        assert _cron_weekdays_from_monday("0 9 * * 5,6") == "0 9 * * 0,6"
+        assert _cron_weekdays_from_monday("0 9 * * *") == "0 9 * * *"
+        assert _cron_weekdays_from_monday("not a cron") == "not a cron"
+
+    def test_get_next_run_dst_gap(self, monkeypatch):
+        """Test a time skipped by spring-forward runs right after the gap."""
+        import time as time_module
+        if not hasattr(time_module, "tzset"):
+            pytest.skip("tzset not available")
+        monkeypatch.setenv("TZ", "America/New_York")
+        time_module.tzset()
+        try:
+            # 2026-03-08 02:00-03:00 does not exist in New York
+            next_run = CronParser.get_next_run("30 2 * * *", datetime(2026, 3, 8, 1, 0))
+            assert next_run == datetime(2026, 3, 8, 3, 30)
+
+            # The next day is unaffected
+            next_run = CronParser.get_next_run("30 2 * * *", next_run)
+            assert next_run == datetime(2026, 3, 9, 2, 30)
+        finally:
+            monkeypatch.delenv("TZ")
+            time_module.tzset()
+
+
+def brute_force_next_run(cron_expr, after, skip_days=False):
+    """Reference next-run search: step minute by minute through one year.
+
+    With skip_days, whole days whose date doesn't match are skipped in one
+    step, which finds the same minute much faster.
+    """
+    parsed = CronParser.parse(cron_expr)
+    current = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    end = current + timedelta(minutes=525599)
+    while current <= end:
+        date_matches = (current.day in parsed["day"] and current.month in parsed["month"]
+                        and (current.weekday() + 1) % 7 in parsed["weekday"])
+        if skip_days and not date_matches:
+            current = current.replace(hour=0, minute=0) + timedelta(days=1)
+            continue
+        if date_matches and current.minute in parsed["minute"] and current.hour in parsed["hour"]:
+            return current
+        current += timedelta(minutes=1)
+    return None
+
+
+def random_cron_field(rng, low, high):
+    """A random cron field using every supported syntax."""
+    kind = rng.randrange(6)
+    if kind == 0:
+        return "*"
+    if kind == 1:
+        return f"*/{rng.randint(1, high - low + 1)}"
+    start = rng.randint(low, high)
+    end = rng.randint(start, high)
+    if kind == 2:
+        return f"{start}-{end}"
+    if kind == 3:
+        return f"{start}-{end}/{rng.randint(1, 5)}"
+    if kind == 4:
+        return ",".join(str(v) for v in sorted(rng.sample(range(low, high + 1), 3)))
+    return str(start)
+
+
+def random_cron_expr(rng):
+    return " ".join(
+        random_cron_field(rng, *CronParser.RANGES[name]) for name in CronParser.FIELDS
+    )
+
+
+class TestCompiledCron:
+    """Tests for the bitmask cron representation against the brute-force search."""
+
+    def test_compile_sets_field_bits(self):
+        """Test each matching value sets its bit."""
+        compiled = CronParser.compile("0,30 9-10 1 */6 0")
+        assert compiled == CompiledCron(
+            minutes=1 << 0 | 1 << 30,
+            hours=1 << 9 | 1 << 10,
+            days=1 << 1,
+            months=1 << 1 | 1 << 7,
+            weekdays=1 << 0,
+        )
+        assert CronParser.compile("0,30 9-10 1 */6 0") is compiled  # Cached
+
+    def test_matches(self):
+        """Test matching a single time."""
+        compiled = CronParser.compile("*/15 9-17 * * 1-5")
+        assert compiled.matches(datetime(2026, 2, 2, 9, 45))  # Monday
+        assert not compiled.matches(datetime(2026, 2, 2, 9, 46))
+        assert not compiled.matches(datetime(2026, 2, 1, 9, 45))  # Sunday
+
+    def test_common_expressions_match_minute_stepping(self):
+        """Test everyday expressions against the literal minute-by-minute search."""
+        after = datetime(2026, 2, 27, 22, 47, 13)
+        for expr in ["* * * * *", "*/5 * * * *", "0 * * * *", "0 7 * * *", "30 8 * * 1-5",
+                     "0 9 * * 0", "0 0 1 * *", "15 14 1 3 *", "0 22 * * 6", "*/20 8-18 * * *"]:
+            assert CronParser.get_next_run(expr, after) == brute_force_next_run(expr, after), expr
+
+    def test_random_expressions_match_brute_force(self):
+        """Property test: random expressions and start times agree with the reference search."""
+        rng = random.Random(2026)
+        for _ in range(500):
+            expr = random_cron_expr(rng)
+            after = datetime(2024, 1, 1) + timedelta(minutes=rng.randrange(5 * 525600), seconds=rng.randrange(60))
+            start = after.replace(second=0) + timedelta(minutes=1)
+            expected = brute_force_next_run(expr, after, skip_days=True)
+            assert CronParser.compile(expr).next_match(start, start + timedelta(minutes=525599)) == expected, \
+                f"{expr!r} after {after}"
+
+    def test_impossible_expression(self):
+        """Test an expression with no run within a year raises ValueError."""
+        with pytest.raises(ValueError, match="No valid run time"):
+            CronParser.get_next_run("0 0 30 2 *", datetime(2026, 1, 1))
+
+    def test_next_n_runs(self):
+        """Test next_n_runs chains run times like repeated get_next_run calls."""
+        after = datetime(2026, 12, 31, 23, 50)
+        runs = CronParser.next_n_runs("0 */8 * * *", 4, after)
+        assert runs == [
+            datetime(2027, 1, 1, 0, 0),
+            datetime(2027, 1, 1, 8, 0),
+            datetime(2027, 1, 1, 16, 0),
+            datetime(2027, 1, 2, 0, 0),
+        ]
+
+        current = after
+        for run in runs:
+            current = CronParser.get_next_run("0 */8 * * *", current)
+            assert current == run
+
 
 # SchedulerService Tests
 
@@ -128,6 +272,33 @@ class TestSchedulerService:
         """Create a scheduler service instance."""
         return SchedulerService(temp_db)
 
+    @pytest.mark.asyncio
+    async def test_stored_weekday_schedules_migrated(self, temp_db):
+        """Test schedules saved with 0 = Monday weekdays keep their days after upgrade."""
+        import aiosqlite
+        from server.services.migrations import apply_migrations
+
+        async with aiosqlite.connect(temp_db) as db:
+            await apply_migrations(db, _SCHEMA_MIGRATIONS[:2])
+            for task_id, task_type, schedule in [
+                ("weekly", "recurring", "0 9 * * 0"),
+                ("daily", "recurring", "0 9 * * *"),
+                ("once", "one_time", "2026-02-02T09:00:00"),
+            ]:
+                await db.execute(
+                    """INSERT INTO scheduled_tasks
+                       (id, name, task_type, schedule, action, action_params, created_at)
+                       VALUES (?, ?, ?, ?, 'notification', '{}', '2026-02-01T00:00:00')""",
+                    (task_id, task_id, task_type, schedule)
+                )
+            await db.commit()
+
+        service = SchedulerService(temp_db)
+
+        assert (await service.get_task("weekly")).schedule == "0 9 * * 1"  # Still Mondays
+        assert (await service.get_task("daily")).schedule == "0 9 * * *"
+        assert (await service.get_task("once")).schedule == "2026-02-02T09:00:00"
+
     @pytest.mark.asyncio
     async def test_create_one_time_task(self, service):
         """Test creating a one-time task."""
@@ -437,6 +608,203 @@ class TestSchedulerService:
 
 # Action Handler Tests
 
+class TestSchedulerLoop:
+    """Tests for the heap-driven run loop."""
+
+    @pytest.fixture
+    def temp_db(self):
+        """Create a temporary database path."""
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            yield Path(f.name)
+
+    @pytest.fixture
+    async def service(self, temp_db):
+        """Create a scheduler service that records task runs."""
+        service = SchedulerService(temp_db, max_concurrent_runs=2)
+        service.runs = []
+
+        async def record(task):
+            service.runs.append((task.id, datetime.now()))
+            return {"ok": True}
+
+        service.register_action_handler("record", record)
+        yield service
+        await service.stop()
+
+    async def _wait_for_runs(self, service, count, timeout=3.0):
+        deadline = asyncio.get_running_loop().time() + timeout
+        while len(service.runs) < count:
+            assert asyncio.get_running_loop().time() < deadline, "task did not run in time"
+            await asyncio.sleep(0.01)
+
+    @pytest.mark.asyncio
+    async def test_task_fires_on_time(self, service):
+        """Test a task created while running fires within a fraction of a second."""
+        await service.start()
+        due = datetime.now() + timedelta(seconds=0.3)
+        task = await service.create_task("Soon", TaskType.ONE_TIME, due.isoformat(), "record", {})
+
+        await self._wait_for_runs(service, 1)
+        run_id, ran_at = service.runs[0]
+        assert run_id == task.id
+        assert timedelta(0) <= ran_at - due < timedelta(seconds=0.25)
+
+    @pytest.mark.asyncio
+    async def test_existing_tasks_loaded_on_start(self, service):
+        """Test tasks stored before start are loaded into the heap."""
+        due = datetime.now() + timedelta(seconds=0.2)
+        task = await service.create_task("Stored", TaskType.ONE_TIME, due.isoformat(), "record", {})
+
+        await service.start()
+        await self._wait_for_runs(service, 1)
+        assert service.runs[0][0] == task.id
+        # The handler records the run before the result is written
+        await asyncio.gather(*service._runs)
+
+        completed = await service.get_task(task.id)
+        assert completed.status == TaskStatus.COMPLETED
+        assert completed.run_count == 1
+
+    @pytest.mark.asyncio
+    async def test_update_moves_task_earlier(self, service):
+        """Test rescheduling a task wakes the sleeping loop early."""
+        await service.start()
+        later = datetime.now() + timedelta(hours=1)
+        task = await service.create_task("Later", TaskType.ONE_TIME, later.isoformat(), "record", {})
+        await asyncio.sleep(0.05)
+
+        await service.update_task(task.id, schedule=(datetime.now() + timedelta(seconds=0.1)).isoformat())
+        await self._wait_for_runs(service, 1)
+        assert service.runs[0][0] == task.id
+
+    @pytest.mark.asyncio
+    async def test_disabled_and_deleted_tasks_do_not_run(self, service):
+        """Test disabling or deleting a task removes it from the schedule."""
+        await service.start()
+        due = (datetime.now() + timedelta(seconds=0.2)).isoformat()
+        disabled = await service.create_task("Disabled", TaskType.ONE_TIME, due, "record", {})
+        deleted = await service.create_task("Deleted", TaskType.ONE_TIME, due, "record", {})
+        kept = await service.create_task("Kept", TaskType.ONE_TIME, due, "record", {})
+
+        await service.update_task(disabled.id, enabled=False)
+        await service.delete_task(deleted.id)
+
+        await self._wait_for_runs(service, 1)
+        await asyncio.sleep(0.1)
+        assert [run_id for run_id, _ in service.runs] == [kept.id]
+
+    @pytest.mark.asyncio
+    async def test_runs_bounded_by_executor(self, service):
+        """Test no more than max_concurrent_runs tasks run at once."""
+        active = 0
+        peak = 0
+
+        async def slow(task):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.1)
+            active -= 1
+            service.runs.append((task.id, datetime.now()))
+            return {}
+
+        service.register_action_handler("slow", slow)
+        await service.start()
+        due = (datetime.now() + timedelta(seconds=0.1)).isoformat()
+        for i in range(5):
+            await service.create_task(f"Slow {i}", TaskType.ONE_TIME, due, "slow", {})
+
+        await self._wait_for_runs(service, 5)
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_queued_task_not_resubmitted_by_resync(self, service):
+        """Test a due task waiting for a run slot is not queued again by a resync."""
+        release = asyncio.Event()
+
+        async def blocking(task):
+            await release.wait()
+            service.runs.append((task.id, datetime.now()))
+            return {}
+
+        service.register_action_handler("block", blocking)
+        await service.start()
+        due = (datetime.now() + timedelta(seconds=0.1)).isoformat()
+        tasks = [
+            await service.create_task(f"Block {i}", TaskType.ONE_TIME, due, "block", {})
+            for i in range(3)
+        ]
+        await asyncio.sleep(0.3)
+
+        # The third task is still PENDING and past due in the database
+        await service._load_schedule()
+        await service._check_and_run_tasks()
+        assert len(service._runs) == 3
+
+        release.set()
+        await self._wait_for_runs(service, 3)
+        await asyncio.sleep(0.1)
+        assert sorted(run_id for run_id, _ in service.runs) == sorted(t.id for t in tasks)
+
+    @pytest.mark.asyncio
+    async def test_task_disabled_while_queued_does_not_run(self, service):
+        """Test a queued task is re-checked when it gets a run slot."""
+        release = asyncio.Event()
+
+        async def blocking(task):
+            await release.wait()
+            service.runs.append((task.id, datetime.now()))
+            return {}
+
+        service.register_action_handler("block", blocking)
+        await service.start()
+        due = (datetime.now() + timedelta(seconds=0.1)).isoformat()
+        for i in range(3):
+            await service.create_task(f"Block {i}", TaskType.ONE_TIME, due, "block", {})
+        await asyncio.sleep(0.3)
+
+        # Two tasks hold the slots; the third is waiting and still PENDING
+        tasks = await service.list_tasks()
+        queued = [t for t in tasks if t.status == TaskStatus.PENDING]
+        assert len(queued) == 1
+        await service.update_task(queued[0].id, enabled=False)
+
+        release.set()
+        await self._wait_for_runs(service, 2)
+        await asyncio.sleep(0.1)
+        assert len(service.runs) == 2
+        assert queued[0].id not in [run_id for run_id, _ in service.runs]
+
+    @pytest.mark.asyncio
+    async def test_idle_loop_does_not_poll(self, service):
+        """Test the loop sleeps instead of querying while nothing is due."""
+        await service.start()
+        await asyncio.sleep(0.05)
+
+        with patch.object(service, "_check_and_run_tasks", AsyncMock()) as check:
+            await asyncio.sleep(0.3)
+        assert check.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_recurring_task_rescheduled_after_run(self, service):
+        """Test a recurring task gets its next cron time back on the heap."""
+        await service.start()
+        task = await service.create_task("Every minute", TaskType.RECURRING, "* * * * *", "record", {})
+        # Make it due now
+        now = datetime.now().isoformat()
+        async with service._get_connection() as db:
+            await db.execute("UPDATE scheduled_tasks SET next_run = ? WHERE id = ?", (now, task.id))
+            await db.commit()
+        service._schedule(task.id, now)
+
+        await self._wait_for_runs(service, 1)
+        await asyncio.sleep(0.05)
+
+        updated = await service.get_task(task.id)
+        assert updated.status == TaskStatus.PENDING
+        assert service._due_at[task.id] == service._timestamp(updated.next_run)
+
+
 class TestActionHandlers:
     """Tests for built-in action handlers."""
 
@@ -757,6 +1125,42 @@ class TestScheduleAPI:
         assert data["valid"] is False
         assert data["error"] is not None
 
+    def test_preview_cron(self, client):
+        """Test previewing the next run times of a cron expression."""
+        response = client.post("/api/schedule/preview", json={
+            "cron": "30 9 * * 1-5",
+            "count": 3,
+            "after": "2026-02-06T12:00:00",  # Friday
+        })
+        assert response.status_code == 200
+        data = response.json()
+        assert data["after"] == "2026-02-06T12:00:00"
+        assert data["next_runs"] == [
+            "2026-02-09T09:30:00",
+            "2026-02-10T09:30:00",
+            "2026-02-11T09:30:00",
+        ]
+
+    def test_preview_cron_defaults_to_ten_runs(self, client):
+        """Test the preview returns ten runs from now by default."""
+        response = client.post("/api/schedule/preview", json={"cron": "*/5 * * * *"})
+        assert response.status_code == 200
+        runs = [datetime.fromisoformat(r) for r in response.json()["next_runs"]]
+        assert len(runs) == 10
+        assert runs == sorted(runs)
+        assert runs[0] > datetime.now()
+
+    def test_preview_cron_invalid(self, client):
+        """Test invalid expressions, dates and counts are rejected."""
+        assert client.post("/api/schedule/preview", json={"cron": "bad"}).status_code == 400
+        assert client.post("/api/schedule/preview", json={"cron": "0 0 30 2 *"}).status_code == 400
+        assert client.post("/api/schedule/preview", json={
+            "cron": "* * * * *", "after": "yesterday"
+        }).status_code == 400
+        assert client.post("/api/schedule/preview", json={
+            "cron": "* * * * *", "count": 0
+        }).status_code == 422
+
     def test_get_task_history(self, client):
         """Test getting task history."""
         # Create a task first
@@ -1,6 +1,7 @@
 """Tests for security hardening features."""
 
 import pytest
+from unittest.mock import patch
 from server.services.security import SecurityService, get_security_service
 from server.services.sandbox import SandboxExecutor, SandboxConfig, get_sandbox_executor
 from server.services.rate_limiter import ToolRateLimiter, RateLimitConfig, get_rate_limiter
@@ -165,6 +166,55 @@ class TestSecurityService:
             is_safe, error = service.validate_url(url)
             assert not is_safe, f"Should block invalid scheme: {url}"
 
+    def test_validate_url_resolves_to_private_ip(self):
+        """Test URL validation blocks names that resolve to private addresses."""
+        service = SecurityService()
+        infos = [(2, 1, 6, "", ("10.0.0.5", 0))]
+        with patch("socket.getaddrinfo", return_value=infos):
+            is_safe, error = service.validate_url("http://internal.example.com/admin")
+        assert not is_safe
+        assert "10.0.0.0/8" in error
+
+    def test_validate_url_blocks_ipv6_loopback(self):
+        """Test URL validation blocks IPv6 loopback and link-local literals."""
+        service = SecurityService()
+        for url in ["http://[::1]:8080", "http://[fe80::1]/", "http://[::ffff:127.0.0.1]/"]:
+            is_safe, error = service.validate_url(url)
+            assert not is_safe, f"Should block: {url}"
+
+    def test_validate_url_dns_cached(self):
+        """Test host names are resolved once within the cache TTL."""
+        service = SecurityService()
+        infos = [(2, 1, 6, "", ("93.184.216.34", 0))]
+        with patch("socket.getaddrinfo", return_value=infos) as resolve:
+            for _ in range(3):
+                assert service.validate_url("https://example.com/page") == (True, None)
+        assert resolve.call_count == 1
+
+    def test_validate_url_unresolvable_allowed(self):
+        """Test names that don't resolve are left to fail at connect time."""
+        import socket
+
+        service = SecurityService()
+        with patch("socket.getaddrinfo", side_effect=socket.gaierror("no such host")):
+            assert service.validate_url("https://nonexistent.invalid/") == (True, None)
+
+    async def test_validate_url_async_resolves_to_private_ip(self):
+        """Test the async variant checks resolved addresses too."""
+        service = SecurityService()
+        infos = [(2, 1, 6, "", ("192.168.1.20", 0))]
+        with patch("socket.getaddrinfo", return_value=infos):
+            is_safe, error = await service.validate_url_async("http://printer.example.com/")
+        assert not is_safe
+        assert "private" in error.lower()
+
+    def test_trusted_hosts_exempt(self):
+        """Test trusted hosts bypass SSRF blocking."""
+        service = SecurityService(trusted_hosts={"127.0.0.1"})
+        assert service.validate_url("http://127.0.0.1:8080/") == (True, None)
+        assert service.check_address("127.0.0.1", "127.0.0.1") == (True, None)
+        assert service.check_address("example.com", "127.0.0.1")[0] is False
+
     def test_detect_prompt_injection(self):
         """Test prompt injection detection."""
         service = SecurityService()
@@ -476,6 +526,73 @@ class TestAuditLogger:
         assert stats["success_rate"] == pytest.approx(66.67, rel=0.1)
         assert len(stats["top_tools"]) > 0
 
+    def _count_rows(self, db_path):
+        import sqlite3
+        conn = sqlite3.connect(str(db_path))
+        try:
+            return conn.execute("SELECT COUNT(*) FROM audit_log").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_write_behind_flush(self, tmp_path):
+        """Test that queued entries are written by the background writer."""
+        db_path = tmp_path / "audit.db"
+        logger = AuditLogger(db_path)
+
+        for i in range(1200):
+            logger.log_execution(f"tool{i % 3}", {"i": i}, "ok", True, 1.0)
+
+        assert logger.flush()
+        assert self._count_rows(db_path) == 1200
+
+        stats = logger.get_pipeline_stats()
+        assert stats["mode"] == "write_behind"
+        assert stats["written"] == 1200
+        assert stats["dropped"] == 0
+        # Rows were committed in batches, not one transaction per entry
+        assert stats["batches"] < 1200
+        logger.close()
+
+    def test_synchronous_mode_writes_immediately(self, tmp_path):
+        """Test that synchronous mode writes before log_execution returns."""
+        db_path = tmp_path / "audit.db"
+        logger = AuditLogger(db_path, synchronous=True)
+
+        logger.log_execution("tool1", {}, "ok", True, 1.0)
+
+        assert self._count_rows(db_path) == 1
+        assert logger._writer is None
+        assert logger.get_pipeline_stats()["mode"] == "synchronous"
+
+    def test_queue_full_drops_entries(self, tmp_path):
+        """Test backpressure: entries beyond the queue bound are dropped and counted."""
+        db_path = tmp_path / "audit.db"
+        logger = AuditLogger(db_path, max_queue_size=2)
+
+        with patch.object(logger, "_ensure_writer"):
+            for _ in range(5):
+                logger.log_execution("tool1", {}, "ok", True, 1.0)
+
+        stats = logger.get_pipeline_stats()
+        assert stats["queued"] == 2
+        assert stats["queue_high_water"] == 2
+        assert stats["dropped"] == 3
+
+    def test_close_flushes_pending_entries(self, tmp_path):
+        """Test that close() writes queued entries and later logs still land."""
+        db_path = tmp_path / "audit.db"
+        logger = AuditLogger(db_path)
+
+        for _ in range(10):
+            logger.log_execution("tool1", {}, "ok", True, 1.0)
+        logger.close()
+
+        assert self._count_rows(db_path) == 10
+        assert not logger._writer.is_alive()
+
+        logger.log_execution("tool1", {}, "ok", True, 1.0)
+        assert self._count_rows(db_path) == 11
+
     def test_get_audit_logger_singleton(self, tmp_path):
         """Test audit logger singleton."""
         # Reset global instance
@@ -2,6 +2,7 @@
 import pytest
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 from httpx import AsyncClient, ASGITransport
 
 from server.services.encryption import CRYPTOGRAPHY_AVAILABLE, is_encrypted
@@ -577,6 +578,55 @@ class TestSettingsEncryption:
         assert "encryption_enabled" in display
         assert display["encryption_enabled"] is True
 
+    @pytest.mark.asyncio
+    async def test_get_all_reuses_decrypted_snapshot(self, settings_service):
+        """Test that unchanged settings are not decrypted again."""
+        await settings_service.set("openai_api_key", "sk-snapshot")
+        first = await settings_service.get_all()
+
+        enc_service = settings_service._get_encryption_service()
+        with patch.object(enc_service, "decrypt", wraps=enc_service.decrypt) as mock_decrypt:
+            second = await settings_service.get_all()
+
+        mock_decrypt.assert_not_called()
+        assert second == first
+        assert second["openai_api_key"] == "sk-snapshot"
+
+    @pytest.mark.asyncio
+    async def test_snapshot_invalidated_on_write(self, settings_service):
+        """Test that set and set_multiple refresh the snapshot."""
+        await settings_service.set("openai_api_key", "sk-old")
+        assert (await settings_service.get_all())["openai_api_key"] == "sk-old"
+
+        await settings_service.set("openai_api_key", "sk-new")
+        assert (await settings_service.get_all())["openai_api_key"] == "sk-new"
+
+        await settings_service.set_multiple({"anthropic_api_key": "sk-ant-new", "model": "gpt-4o"})
+        settings = await settings_service.get_all()
+        assert settings["anthropic_api_key"] == "sk-ant-new"
+        assert settings["model"] == "gpt-4o"
+
+    @pytest.mark.asyncio
+    async def test_snapshot_sees_writes_from_other_instances(self, settings_service):
+        """Test that a write through another service instance is not masked."""
+        from server.services.settings import SettingsService
+
+        await settings_service.set("openai_api_key", "sk-first")
+        await settings_service.get_all()
+
+        other = SettingsService(settings_service.db_path)
+        await other.set("openai_api_key", "sk-second")
+
+        assert (await settings_service.get_all())["openai_api_key"] == "sk-second"
+
+    @pytest.mark.asyncio
+    async def test_get_all_result_is_a_copy(self, settings_service):
+        """Test that callers cannot mutate the cached snapshot."""
+        settings = await settings_service.get_all()
+        settings["model"] = "mutated"
+
+        assert (await settings_service.get_all())["model"] != "mutated"
+
     @pytest.mark.asyncio
     async def test_migrate_to_encrypted(self, settings_service):
         """Test migration of plaintext keys to encrypted."""
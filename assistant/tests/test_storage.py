@@ -0,0 +1,193 @@
+"""Tests for the shared SQLite connection pools."""
+import asyncio
+import sqlite3
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.services.storage import SQLitePool, get_pool, get_pool_stats, close_all_pools
+from server.services.memory import MemoryService
+from server.services.settings import SettingsService
+from server.services.auth import AuthService
+
+
+@pytest.fixture
+async def pool(tmp_path):
+    """Pool on a temporary database with one table."""
+    pool = SQLitePool(tmp_path / "pool.db", readers=2)
+    async with pool.writer() as db:
+        await db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        await db.commit()
+    yield pool
+    await pool.close()
+
+
+class TestRegistry:
+    """Tests for get_pool()."""
+
+    def test_same_file_shares_pool(self, tmp_path):
+        """Test that every path spelling of one file maps to one pool."""
+        db_path = tmp_path / "shared.db"
+        assert get_pool(db_path) is get_pool(str(db_path))
+        assert get_pool(db_path) is get_pool(tmp_path / "sub" / ".." / "shared.db")
+        assert get_pool(db_path) is not get_pool(tmp_path / "other.db")
+
+    @pytest.mark.asyncio
+    async def test_services_share_pool(self, tmp_path):
+        """Test that services on the same database file use one pool."""
+        db_path = tmp_path / "app.db"
+        memory = MemoryService(db_path)
+        settings = SettingsService(db_path)
+        auth = AuthService(db_path)
+
+        await memory.add_to_conversation("user", "hello")
+        await settings.set("model", "gpt-4o")
+        await auth._set_auth_config("k", "v")
+
+        stats = [s for s in get_pool_stats() if s["db"] == "app.db"]
+        assert len(stats) == 1
+        assert stats[0]["writer_wait"]["acquisitions"] >= 3
+        await close_all_pools()
+
+
+class TestWriter:
+    """Tests for the writer connection."""
+
+    @pytest.mark.asyncio
+    async def test_writer_is_exclusive(self, pool):
+        """Test that only one task holds the writer at a time."""
+        active = 0
+        peak = 0
+
+        async def write(i):
+            nonlocal active, peak
+            async with pool.writer() as db:
+                active += 1
+                peak = max(peak, active)
+                await db.execute("INSERT INTO items (name) VALUES (?)", (f"item-{i}",))
+                await asyncio.sleep(0.01)
+                await db.commit()
+                active -= 1
+
+        await asyncio.gather(*[write(i) for i in range(10)])
+
+        assert peak == 1
+        async with pool.reader() as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM items")
+            assert (await cursor.fetchone())[0] == 10
+        assert pool.get_stats()["writer_wait"]["acquisitions"] >= 10
+
+    @pytest.mark.asyncio
+    async def test_writer_is_reentrant(self, pool):
+        """Test that nested acquisition in one task reuses the connection."""
+        async with pool.writer() as outer:
+            async with pool.writer() as inner:
+                assert inner is outer
+            # Reads inside a write see the task's uncommitted rows
+            await outer.execute("INSERT INTO items (name) VALUES ('pending')")
+            async with pool.reader() as reader:
+                assert reader is outer
+                cursor = await reader.execute("SELECT COUNT(*) FROM items")
+                assert (await cursor.fetchone())[0] == 1
+            await outer.commit()
+
+        assert pool.get_stats()["writer_busy"] is False
+
+    @pytest.mark.asyncio
+    async def test_uncommitted_work_rolled_back_on_release(self, pool):
+        """Test that a forgotten commit does not leak into the next user."""
+        async with pool.writer() as db:
+            await db.execute("INSERT INTO items (name) VALUES ('lost')")
+
+        async with pool.writer() as db:
+            assert not db.in_transaction
+            await db.execute("INSERT INTO items (name) VALUES ('kept')")
+            await db.commit()
+
+        async with pool.reader() as db:
+            cursor = await db.execute("SELECT name FROM items")
+            assert [row[0] for row in await cursor.fetchall()] == ["kept"]
+
+    @pytest.mark.asyncio
+    async def test_row_factory_reset_on_release(self, pool):
+        """Test that a row_factory set by one caller is cleared."""
+        async with pool.writer() as db:
+            db.row_factory = sqlite3.Row
+        async with pool.writer() as db:
+            assert db.row_factory is None
+
+
+class TestReaders:
+    """Tests for read-only connections."""
+
+    @pytest.mark.asyncio
+    async def test_readers_are_read_only(self, pool):
+        """Test that writes through a reader are rejected."""
+        async with pool.reader() as db:
+            with pytest.raises(sqlite3.OperationalError):
+                await db.execute("INSERT INTO items (name) VALUES ('nope')")
+
+    @pytest.mark.asyncio
+    async def test_readers_run_while_writer_held(self, pool):
+        """Test that readers are not blocked by an open write transaction."""
+        async with pool.writer() as db:
+            await db.execute("INSERT INTO items (name) VALUES ('uncommitted')")
+
+            async def read():
+                async with pool.reader() as reader:
+                    cursor = await reader.execute("SELECT COUNT(*) FROM items")
+                    return (await cursor.fetchone())[0]
+
+            # Other tasks see the last committed state
+            assert await asyncio.wait_for(asyncio.create_task(read()), timeout=2) == 0
+            await db.commit()
+
+    @pytest.mark.asyncio
+    async def test_reader_count_is_bounded(self, pool):
+        """Test that concurrent reads never open more than max_readers."""
+        async def read():
+            async with pool.reader() as db:
+                await asyncio.sleep(0.01)
+                cursor = await db.execute("SELECT 1")
+                return await cursor.fetchone()
+
+        await asyncio.gather(*[read() for _ in range(10)])
+
+        stats = pool.get_stats()
+        assert stats["readers_open"] == 2
+        assert stats["readers_idle"] == 2
+        assert stats["reader_wait"]["acquisitions"] == 10
+
+
+class TestMaintenance:
+    """Tests for health checks and closing."""
+
+    @pytest.mark.asyncio
+    async def test_health_check_replaces_dead_connection(self, pool):
+        """Test that a connection that stopped working is replaced."""
+        async with pool.reader():
+            pass
+        dead = await pool._readers.get()
+        await dead.close()
+        pool._readers.put_nowait(dead)
+
+        result = await pool.health_check()
+
+        assert result["replaced"] == 1
+        async with pool.reader() as db:
+            assert db is not dead
+            cursor = await db.execute("SELECT COUNT(*) FROM items")
+            assert (await cursor.fetchone())[0] == 0
+
+    @pytest.mark.asyncio
+    async def test_close_then_reuse(self, pool):
+        """Test that a closed pool reopens lazily."""
+        await pool.close()
+        assert pool.get_stats()["writer_open"] is False
+
+        async with pool.writer() as db:
+            await db.execute("INSERT INTO items (name) VALUES ('again')")
+            await db.commit()
+        assert pool.get_stats()["writer_open"] is True
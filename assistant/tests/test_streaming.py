@@ -10,8 +10,10 @@ Tests cover:
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 from pathlib import Path
+import asyncio
 import sys
 import tempfile
+import time
 import json
 
 # Add parent to path for imports
@@ -19,7 +21,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from fastapi.testclient import TestClient
 from server.main import app
-from server.routes.chat import format_sse, StreamEvent
+from server.routes.chat import format_sse, StreamEvent, stream_openai_response
 
 
 @pytest.fixture
@@ -28,6 +30,39 @@ def client():
     return TestClient(app)
 
 
+class FakeAsyncStream:
+    """Stand-in for the SDK's AsyncStream: async context manager + async iterator."""
+
+    def __init__(self, chunks, delay: float = 0.0):
+        self._chunks = list(chunks)
+        self._delay = delay
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.closed = True
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self._chunks:
+            if self._delay:
+                await asyncio.sleep(self._delay)
+            yield chunk
+
+
+def make_text_chunk(text):
+    """Build an OpenAI-style streaming chunk carrying text."""
+    chunk = MagicMock()
+    chunk.choices = [MagicMock()]
+    chunk.choices[0].delta.content = text
+    chunk.choices[0].delta.tool_calls = None
+    return chunk
+
+
 class TestSSEFormatting:
     """Tests for SSE event formatting utilities."""
 
@@ -133,21 +168,9 @@ class TestStreamingEndpoint:
             mock_client = MagicMock()
 
             # Create a mock stream that yields chunks
-            def mock_stream():
-                chunk = MagicMock()
-                chunk.choices = [MagicMock()]
-                chunk.choices[0].delta.content = "Hello"
-                chunk.choices[0].delta.tool_calls = None
-                yield chunk
-
-                # Final chunk
-                final_chunk = MagicMock()
-                final_chunk.choices = [MagicMock()]
-                final_chunk.choices[0].delta.content = None
-                final_chunk.choices[0].delta.tool_calls = None
-                yield final_chunk
-
-            mock_client.chat.completions.create.return_value = mock_stream()
+            mock_client.chat.completions.create = AsyncMock(
+                return_value=FakeAsyncStream([make_text_chunk("Hello"), make_text_chunk(None)])
+            )
             mock_get_client.return_value = mock_client
 
             with patch('server.routes.chat.config') as mock_config:
@@ -179,14 +202,9 @@ class TestStreamingEndpoint:
             with patch('server.routes.chat.get_openai_client') as mock_get_client:
                 mock_client = MagicMock()
 
-                def mock_stream():
-                    chunk = MagicMock()
-                    chunk.choices = [MagicMock()]
-                    chunk.choices[0].delta.content = "World"
-                    chunk.choices[0].delta.tool_calls = None
-                    yield chunk
-
-                mock_client.chat.completions.create.return_value = mock_stream()
+                mock_client.chat.completions.create = AsyncMock(
+                    return_value=FakeAsyncStream([make_text_chunk("World")])
+                )
                 mock_get_client.return_value = mock_client
 
                 with patch('server.routes.chat.config') as mock_config:
@@ -200,6 +218,104 @@ class TestStreamingEndpoint:
 
             # User message should have been stored
             mock_memory.add_message.assert_called()
+            # The auto-title check reads only the newest messages
+            assert mock_memory.get_conversation.call_args.kwargs["limit"] == 2
+
+    def test_timing_event_after_first_token(self, client):
+        """Test that a timing event follows the first token and the trace is kept."""
+        from server.services.tracing import get_trace_store
+
+        with patch('server.routes.chat.memory') as mock_memory:
+            mock_memory.add_message = AsyncMock()
+            mock_memory.get_context_for_api = AsyncMock(return_value=(
+                [{"role": "user", "content": "Hello"}],
+                {"summarized_count": 0, "verbatim_count": 1, "total_messages": 1}
+            ))
+            mock_memory._ensure_initialized = AsyncMock()
+            mock_memory._ensure_default_conversation = AsyncMock()
+            mock_memory.get_conversation = AsyncMock(return_value={"title": "Existing", "messages": []})
+
+            with patch('server.routes.chat.get_openai_client') as mock_get_client:
+                mock_client = MagicMock()
+                mock_client.chat.completions.create = AsyncMock(
+                    return_value=FakeAsyncStream([make_text_chunk("Hi"), make_text_chunk(" there")])
+                )
+                mock_get_client.return_value = mock_client
+
+                with patch('server.routes.chat.config') as mock_config:
+                    mock_config.USE_CLAUDE = False
+                    mock_config.OPENAI_API_KEY = "test-key"
+                    mock_config.OPENAI_MODEL = "gpt-4o"
+
+                    response = client.post("/api/chat/stream", json={"message": "Hello"})
+                    content = response.content.decode()
+
+        events = [block.split("\n")[0] for block in content.split("\n\n") if block]
+        first_token = events.index("event: token")
+        assert events[first_token + 1] == "event: timing"
+        assert events.count("event: timing") == 1
+
+        timing_block = content.split("event: timing\n", 1)[1].split("\n\n")[0]
+        timing = json.loads(timing_block.removeprefix("data: "))
+        assert timing["trace_id"] == response.headers["x-trace-id"]
+        assert timing["ttft_ms"] > 0
+        assert "context_build" in timing["stages"]
+        assert "history" not in timing["degraded"]
+
+        trace = get_trace_store().get(timing["trace_id"])
+        assert trace is not None
+        assert {"persistence", "context_build", "llm_first_token", "llm_total"} <= set(trace.stage_timings())
+
+
+class TestStreamingConcurrency:
+    """Provider streams must not block the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_streams_interleave(self):
+        """Test that N simultaneous streams progress together, not one after another."""
+        n_streams, n_tokens, delay = 5, 5, 0.02
+        arrivals = []
+
+        def make_client():
+            mock_client = MagicMock()
+            mock_client.chat.completions.create = AsyncMock(return_value=FakeAsyncStream(
+                [make_text_chunk(f"t{t}") for t in range(n_tokens)], delay=delay
+            ))
+            return mock_client
+
+        async def consume(stream_index):
+            generator = stream_openai_response([{"role": "user", "content": "Hi"}], [], "Hi")
+            async for event in generator:
+                if event.startswith("event: token"):
+                    arrivals.append(stream_index)
+
+        with patch("server.routes.chat.get_openai_client", side_effect=make_client):
+            start = time.perf_counter()
+            await asyncio.gather(*(consume(i) for i in range(n_streams)))
+            elapsed = time.perf_counter() - start
+
+        assert len(arrivals) == n_streams * n_tokens
+        # Serialized streams would deliver all tokens of one stream before the next
+        assert arrivals[:n_streams] != [arrivals[0]] * n_streams
+        assert len(set(arrivals[:n_streams])) > 1
+        # Concurrent wall time stays close to a single stream's
+        assert elapsed < n_streams * n_tokens * delay * 0.6
+
+    @pytest.mark.asyncio
+    async def test_closing_generator_closes_provider_stream(self):
+        """Test that a disconnecting client aborts the upstream stream."""
+        upstream = FakeAsyncStream([make_text_chunk(f"t{i}") for i in range(10)], delay=0.01)
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=upstream)
+
+        with patch("server.routes.chat.get_openai_client", return_value=mock_client):
+            generator = stream_openai_response([{"role": "user", "content": "Hi"}], [], "Hi")
+            async for event in generator:
+                if event.startswith("event: token"):
+                    break
+            await generator.aclose()
+
+        assert upstream.closed is True
 
 
 class TestStreamingWithTools:
@@ -0,0 +1,73 @@
+"""Tests for incremental markdown rendering of streamed replies in the Web UI"""
+import re
+from pathlib import Path
+
+# Get project root
+ASSISTANT_DIR = Path(__file__).parent.parent
+UI_DIR = ASSISTANT_DIR / "ui"
+
+
+def test_stream_renderer_loaded_after_libraries_before_app_js():
+    """Verify index.html loads stream_render.js after marked/DOMPurify and before app.js"""
+    content = (UI_DIR / "index.html").read_text()
+
+    renderer_pos = content.find("/static/stream_render.js")
+    assert renderer_pos > 0, "stream_render.js not included in index.html"
+    assert content.find("/static/vendor/marked.min.js") < renderer_pos
+    assert content.find("/static/vendor/purify.min.js") < renderer_pos
+    assert renderer_pos < content.find("/static/app.js"), "stream_render.js loaded after app.js"
+
+
+def test_stream_renderer_is_precached():
+    """Verify the service worker pre-caches stream_render.js for offline use"""
+    content = (UI_DIR / "sw.js").read_text()
+    assert "'/static/stream_render.js'" in content
+
+
+def test_tokens_do_not_rewrite_whole_message():
+    """Verify token events append to the renderer instead of rewriting the message"""
+    content = (UI_DIR / "app.js").read_text()
+
+    token_case = content.split("case 'token':")[1].split("break;")[0]
+    assert "textContent +=" not in token_case, "token handler rewrites the whole message text"
+    assert "innerHTML" not in token_case, "token handler re-renders the whole message"
+    assert "renderer.append(text)" in content, "streamed text not passed to the renderer"
+    assert "renderer.finish()" in content, "renderer not finished when the stream ends"
+
+
+def test_open_block_rendered_on_animation_frame():
+    """Verify the open block is re-rendered on a requestAnimationFrame throttle"""
+    content = (UI_DIR / "stream_render.js").read_text()
+
+    assert "class StreamingMarkdownRenderer" in content
+    assert "requestAnimationFrame" in content
+    assert "frameRequested" in content, "frame requests are not coalesced"
+
+
+def test_code_highlighted_only_in_completed_blocks():
+    """Verify highlighting happens when a block completes, not on each frame"""
+    content = (UI_DIR / "stream_render.js").read_text()
+
+    complete_block = content.split("_completeBlock(end) {")[1].split("\n    }\n")[0]
+    render_open = content.split("_renderOpen() {")[1].split("\n    }\n")[0]
+    assert "this.highlight(" in complete_block, "completed code blocks are not highlighted"
+    assert "highlight" not in render_open, "open block is highlighted on every frame"
+
+
+def test_completed_blocks_are_sanitized():
+    """Verify the default block parser sanitizes marked output"""
+    content = (UI_DIR / "stream_render.js").read_text()
+    parse_fn = re.search(r"function defaultMarkdownParse\(source\) \{(.*?)\n\}", content, re.DOTALL)
+    assert parse_fn, "defaultMarkdownParse not found"
+    assert "DOMPurify.sanitize(marked.parse(" in parse_fn.group(1)
+
+
+def test_benchmark_page_replays_stream():
+    """Verify the synthetic benchmark page exists and drives the real renderer"""
+    page = UI_DIR / "bench" / "stream_render.html"
+    assert page.exists(), "benchmark page not found"
+
+    content = page.read_text()
+    assert "/static/stream_render.js" in content
+    assert "new StreamingMarkdownRenderer(" in content
+    assert 'id="tokens" type="number" value="20000"' in content, "benchmark should default to 20k tokens"
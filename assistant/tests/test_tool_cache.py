@@ -0,0 +1,360 @@
+"""Tests for the tool result cache."""
+import asyncio
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from server.services import tool_cache as tool_cache_module
+from server.services.tool_cache import (
+    CachePolicy,
+    ToolResultCache,
+    parse_cache_control,
+)
+from server.services.tools import web_fetch
+
+
+@pytest.fixture
+def cache():
+    """Memory-only cache."""
+    return ToolResultCache()
+
+
+@pytest.fixture
+def global_cache(tmp_path, monkeypatch):
+    """Replace the global cache with one backed by a temporary database."""
+    cache = ToolResultCache(tmp_path / "tool_cache.db")
+    monkeypatch.setattr(tool_cache_module, "_tool_cache", cache)
+    yield cache
+    cache.close()
+
+
+def at(timestamp):
+    """Freeze the cache's clock."""
+    return patch("server.services.tool_cache.time.time", return_value=timestamp)
+
+
+class TestToolResultCache:
+    """Tests for ToolResultCache."""
+
+    def test_set_and_get(self, cache):
+        """Test a stored result is returned and counted as a hit."""
+        cache.set("web_fetch", "k", "value", max_age=60)
+        entry = cache.get("web_fetch", "k")
+        assert entry.value == "value"
+        assert entry.is_fresh()
+        assert cache.get_stats()["hits"] == 1
+
+    def test_miss(self, cache):
+        """Test missing entries are counted."""
+        assert cache.get("web_fetch", "missing") is None
+        stats = cache.get_stats()
+        assert stats["misses"] == 1
+        assert stats["by_tool"]["web_fetch"]["misses"] == 1
+
+    def test_memory_tier_bounded_by_bytes(self):
+        """Test the least recently used entries are evicted over the byte limit."""
+        cache = ToolResultCache(max_memory_bytes=300)
+        for i in range(5):
+            cache.set("web_fetch", f"k{i}", "x" * 98)  # 100 bytes as JSON
+        cache.get("web_fetch", "k2")  # Recently used
+        cache.set("web_fetch", "k5", "x" * 98)
+
+        stats = cache.get_stats()
+        assert stats["memory_bytes"] <= 300
+        assert stats["evictions"] == 3
+        assert cache.get("web_fetch", "k2") is not None
+        assert cache.get("web_fetch", "k0") is None
+
+    def test_disk_tier_bounded_by_bytes(self, tmp_path):
+        """Test the disk tier evicts least recently read rows."""
+        cache = ToolResultCache(tmp_path / "cache.db", max_disk_bytes=500)
+        for i in range(10):
+            cache.set("web_fetch", f"k{i}", "x" * 98)
+        stats = cache.get_stats()
+        assert stats["disk_bytes"] <= 500
+        assert stats["disk_entries"] == 5
+        cache.close()
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test results survive a restart."""
+        path = tmp_path / "cache.db"
+        first = ToolResultCache(path)
+        first.set("web_fetch", "k", {"text": "persisted"}, max_age=60, etag='"v1"')
+        first.close()
+
+        second = ToolResultCache(path)
+        entry = second.get("web_fetch", "k")
+        assert entry.value == {"text": "persisted"}
+        assert entry.etag == '"v1"'
+        assert entry.is_fresh()
+        second.close()
+
+    def test_non_persistent_policy_stays_in_memory(self, tmp_path):
+        """Test tools with persist=False never reach the database."""
+        cache = ToolResultCache(tmp_path / "cache.db")
+        cache.configure("read_file", enabled=True)
+        cache.set("read_file", "k", "contents")
+        assert cache.get_stats()["disk_entries"] == 0
+        assert cache.get("read_file", "k").value == "contents"
+        cache.close()
+
+    def test_disabled_tool_not_cached(self, cache):
+        """Test opt-in tools are not cached until enabled."""
+        assert not cache.is_enabled("read_file")
+        assert cache.set("read_file", "k", "contents") is None
+        assert cache.count() == 0
+
+    def test_freshness_capped_by_policy_ttl(self, cache):
+        """Test a long max-age is capped at the tool's ttl."""
+        cache.configure("web_fetch", ttl=60.0)
+        now = time.time()
+        with at(now):
+            entry = cache.set("web_fetch", "k", "value", max_age=86400)
+        assert entry.fresh_until == pytest.approx(now + 60)
+
+    def test_stale_while_revalidate_window(self, cache):
+        """Test an entry moves from fresh to stale-while-revalidate to fallback-only."""
+        cache.configure("web_fetch", ttl=60.0, stale_while_revalidate=30.0, retain=3600.0)
+        now = time.time()
+        with at(now):
+            cache.set("web_fetch", "k", "value", max_age=60)
+
+        with at(now + 70):
+            entry = cache.get("web_fetch", "k")
+        assert not entry.is_fresh(now + 70)
+        assert entry.can_serve_stale(now + 70)
+
+        with at(now + 100):
+            entry = cache.get("web_fetch", "k")
+        assert entry is not None
+        assert not entry.can_serve_stale(now + 100)
+
+        with at(now + 3601):
+            assert cache.get("web_fetch", "k") is None
+
+        stats = cache.get_stats()["by_tool"]["web_fetch"]
+        assert stats["stale_hits"] == 2
+        assert stats["misses"] == 1
+
+    def test_no_revalidate_window_without_freshness(self, cache):
+        """Test a zero max-age gives no stale-while-revalidate window."""
+        entry = cache.set("web_fetch", "k", "value", max_age=0)
+        assert not entry.is_fresh()
+        assert not entry.can_serve_stale()
+
+    def test_refresh_restarts_windows(self, cache):
+        """Test a 304 refresh keeps the value and validators."""
+        now = time.time()
+        with at(now):
+            cache.set("web_fetch", "k", "value", max_age=0, etag='"v1"')
+        with at(now + 10):
+            entry = cache.refresh("web_fetch", "k", max_age=60)
+        assert entry.value == "value"
+        assert entry.etag == '"v1"'
+        assert entry.fresh_until == pytest.approx(now + 70)
+        assert cache.get_stats()["revalidated"] == 1
+
+    def test_fingerprint_mismatch_invalidates(self, cache):
+        """Test entries computed from older files are dropped."""
+        cache.configure("read_file", enabled=True)
+        cache.set("read_file", "k", "old", fingerprint="mtime-1")
+        assert cache.get("read_file", "k", fingerprint="mtime-1").value == "old"
+        assert cache.get("read_file", "k", fingerprint="mtime-2") is None
+        assert cache.get_stats()["invalidated"] == 1
+        assert cache.count() == 0
+
+    def test_clear_returns_count(self, tmp_path):
+        """Test clear reports entries removed from both tiers."""
+        path = tmp_path / "cache.db"
+        cache = ToolResultCache(path)
+        cache.set("web_fetch", "a", "1")
+        cache.set("web_fetch", "b", "2")
+        cache.close()
+
+        reopened = ToolResultCache(path)
+        reopened.set("web_fetch", "c", "3")
+        assert reopened.count() == 3
+        assert reopened.clear() == 3
+        assert reopened.count() == 0
+        reopened.close()
+
+    def test_custom_policies(self):
+        """Test policies can be supplied per instance."""
+        cache = ToolResultCache(policies={"custom": CachePolicy(ttl=5.0)})
+        assert cache.policy_for("custom").ttl == 5.0
+        assert cache.policy_for("web_fetch").ttl == 0.0  # Default policy
+
+
+class TestParseCacheControl:
+    """Tests for parse_cache_control."""
+
+    def test_missing_header(self):
+        assert parse_cache_control(None) == (None, None, True)
+
+    def test_max_age_and_swr(self):
+        assert parse_cache_control("public, max-age=300, stale-while-revalidate=60") == (300.0, 60.0, True)
+
+    def test_no_store(self):
+        assert parse_cache_control("no-store")[2] is False
+
+    def test_no_cache(self):
+        assert parse_cache_control("no-cache, max-age=300")[0] == 0.0
+
+
+class TestWebFetchCache:
+    """Tests for web_fetch freshness and revalidation."""
+
+    def test_fresh_entry_served_without_request(self, global_cache, local_http_server):
+        """Test a response with max-age is served from cache."""
+        local_http_server.route("/page", headers={"Cache-Control": "max-age=300"}, body=b"hello")
+        url = local_http_server.url("/page")
+        web_fetch(url)
+        result = web_fetch(url)
+
+        assert "hello" in result
+        assert len(local_http_server.requests) == 1
+        assert global_cache.get_stats()["hits"] == 1
+
+    def test_conditional_request_on_304(self, global_cache, local_http_server):
+        """Test a stale entry is revalidated with its validators and kept on 304."""
+        local_http_server.route("/page", headers={
+            "ETag": '"abc"', "Last-Modified": "Mon, 12 Oct 2026 10:00:00 GMT",
+        }, body=b"hello")
+        url = local_http_server.url("/page")
+        web_fetch(url)
+
+        local_http_server.route("/page", status=304)
+        result = web_fetch(url)
+
+        assert "hello" in result
+        headers = local_http_server.requests[-1][1]
+        assert headers["If-None-Match"] == '"abc"'
+        assert headers["If-Modified-Since"] == "Mon, 12 Oct 2026 10:00:00 GMT"
+        assert global_cache.get_stats()["revalidated"] == 1
+
+    def test_changed_content_replaces_entry(self, global_cache, local_http_server):
+        """Test a 200 on revalidation stores the new content."""
+        from server.services.tools import _compute_cache_key
+
+        url = local_http_server.url("/page")
+        local_http_server.route("/page", headers={"ETag": '"v1"'}, body=b"old")
+        web_fetch(url)
+        local_http_server.route("/page", headers={"ETag": '"v2"'}, body=b"new")
+        assert "new" in web_fetch(url)
+
+        entry = global_cache.get("web_fetch", _compute_cache_key(url, 4000))
+        assert entry.etag == '"v2"'
+
+    async def test_stale_entry_served_while_revalidating(self, global_cache, local_http_server):
+        """Test an entry in its stale-while-revalidate window is returned at once and refreshed."""
+        from server.services.tools import _compute_cache_key, _web_fetch_async, _web_fetch_tasks
+
+        url = local_http_server.url("/page")
+        key = _compute_cache_key(url, 4000)
+        with at(time.time() - 400):
+            global_cache.set("web_fetch", key, "old", max_age=300, stale_while_revalidate=600)
+        local_http_server.route("/page", headers={"Cache-Control": "max-age=300"}, body=b"new")
+
+        assert await _web_fetch_async(url) == "old"
+        await asyncio.gather(*_web_fetch_tasks)
+
+        assert len(local_http_server.requests) == 1
+        entry = global_cache.get("web_fetch", key)
+        assert "new" in entry.value
+        assert entry.is_fresh()
+
+    def test_no_store_not_cached(self, global_cache, local_http_server):
+        """Test responses marked no-store are not kept."""
+        local_http_server.route("/page", headers={"Cache-Control": "no-store"}, body=b"secret")
+        web_fetch(local_http_server.url("/page"))
+        assert global_cache.count() == 0
+
+
+class TestFileToolCache:
+    """Tests for opt-in caching of deterministic file tools."""
+
+    @pytest.fixture
+    def repo(self, tmp_path, monkeypatch):
+        """Repository service rooted at a temporary directory."""
+        from server.services import repository
+
+        monkeypatch.setattr(repository, "_repository_service", repository.RepositoryService(allowed_paths=[str(tmp_path)]))
+        (tmp_path / "module.py").write_text("def alpha():\n    return 1\n")
+        return tmp_path
+
+    def test_disabled_by_default(self, global_cache, repo):
+        """Test file tools bypass the cache unless enabled."""
+        from server.services.tools import _read_file_impl
+
+        _read_file_impl(str(repo / "module.py"))
+        assert global_cache.count() == 0
+
+    def test_read_file_cached_until_file_changes(self, global_cache, repo):
+        """Test read_file hits the cache and is invalidated by a new mtime."""
+        from server.services.tools import _read_file_impl
+
+        global_cache.configure("read_file", enabled=True)
+        path = repo / "module.py"
+        first = _read_file_impl(str(path))
+        assert _read_file_impl(str(path)) == first
+        assert global_cache.get_stats()["hits"] == 1
+
+        path.write_text("def beta():\n    return 2\n")
+        os.utime(path, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+        assert "beta" in _read_file_impl(str(path))
+        assert global_cache.get_stats()["invalidated"] == 1
+
+    def test_search_code_not_cached_without_index(self, global_cache, repo):
+        """Test search_code bypasses the cache when no code index covers it."""
+        from server.services.tools import _search_code_impl
+
+        global_cache.configure("search_code", enabled=True)
+        assert "Matches: 1" in _search_code_impl("def ", directory=str(repo))
+        assert global_cache.count() == 0
+
+    def test_search_code_invalidated_by_new_file(self, global_cache, repo):
+        """Test search_code results change when a matching file is added."""
+        from server.services.repository import get_repository_service
+        from server.services.tools import _search_code_impl
+
+        index = get_repository_service().enable_index()
+        index.refresh_interval = 0
+        index.build()
+        global_cache.configure("search_code", enabled=True)
+        assert "Matches: 1" in _search_code_impl("def ", directory=str(repo))
+        assert "Matches: 1" in _search_code_impl("def ", directory=str(repo))
+        assert global_cache.get_stats()["hits"] == 1
+
+        (repo / "other.py").write_text("def gamma():\n    pass\n")
+        assert "Matches: 2" in _search_code_impl("def ", directory=str(repo))
+
+    def test_errors_not_cached(self, global_cache, repo):
+        """Test error results are not stored."""
+        from server.services.tools import _get_file_info_impl
+
+        global_cache.configure("get_file_info", enabled=True)
+        assert _get_file_info_impl(str(repo / "missing.py")).startswith("Error")
+        assert global_cache.count() == 0
+
+
+class TestToolCacheMetrics:
+    """Tests for tool cache stats on /api/metrics."""
+
+    def test_metrics_include_tool_cache(self, global_cache):
+        """Test hit/miss counters are reported."""
+        from fastapi.testclient import TestClient
+        from server.main import app
+
+        global_cache.set("web_fetch", "k", "value", max_age=60)
+        global_cache.get("web_fetch", "k")
+        global_cache.get("web_fetch", "missing")
+
+        response = TestClient(app).get("/api/metrics")
+        assert response.status_code == 200
+        stats = response.json()["tool_cache"]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["by_tool"]["web_fetch"]["hits"] == 1
@@ -1,6 +1,6 @@
 """Tests for the tool suggestion service."""
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from dataclasses import dataclass
 from enum import Enum
 
@@ -261,6 +261,7 @@ class TestChatAPIIntegration:
         """Test that chat response includes suggested tools."""
         with patch("server.routes.chat.get_openai_client") as mock_client:
             mock_instance = MagicMock()
+            mock_instance.chat.completions.create = AsyncMock()
             mock_instance.chat.completions.create.return_value = mock_openai_response
             mock_client.return_value = mock_instance
 
@@ -288,6 +289,7 @@ class TestChatAPIIntegration:
         """Test format of suggested tools in response."""
         with patch("server.routes.chat.get_openai_client") as mock_client:
             mock_instance = MagicMock()
+            mock_instance.chat.completions.create = AsyncMock()
             mock_instance.chat.completions.create.return_value = mock_openai_response
             mock_client.return_value = mock_instance
 
@@ -243,7 +243,7 @@ class TestGlobalRegistry:
 
 
 class TestWebFetchTool:
-    """Tests for the web_fetch tool."""
+    """Tests for the web_fetch tool (against a local stand-in server)."""
 
     def test_web_fetch_invalid_scheme(self):
         """Test web_fetch rejects invalid URL schemes."""
@@ -256,77 +256,65 @@ class TestWebFetchTool:
         result = web_fetch("not-a-url")
         assert "Error" in result
 
-    def test_web_fetch_success(self):
-        """Test web_fetch with mocked successful response."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = "<html>Hello World</html>"
-        mock_response.reason_phrase = "OK"
-        mock_response.headers = {"content-type": "text/html"}
+    def test_web_fetch_success(self, local_http_server):
+        """Test web_fetch returns the page as text."""
+        local_http_server.route("/", headers={"Content-Type": "text/html"}, body=b"<html><body><p>Hello World</p></body></html>")
+        url = local_http_server.url("/")
+        result = web_fetch(url)
 
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
-            result = web_fetch("https://example.com")
-
-        assert "URL: https://example.com" in result
+        assert f"URL: {url}" in result
         assert "Status: 200" in result
         assert "Hello World" in result
+        assert "<p>" not in result
 
-    def test_web_fetch_truncation(self):
+    def test_web_fetch_truncation(self, local_http_server):
         """Test web_fetch truncates long content."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = "A" * 10000
-        mock_response.reason_phrase = "OK"
-        mock_response.headers = {"content-type": "text/html"}
-
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
-            result = web_fetch("https://example.com", max_length=100)
+        local_http_server.route("/long", headers={"Content-Type": "text/plain"}, body=b"A" * 10000)
+        result = web_fetch(local_http_server.url("/long"), max_length=100)
 
         assert "[Content truncated at 100 characters" in result
+        assert "A" * 101 not in result
 
-    def test_web_fetch_http_error(self):
+    def test_web_fetch_http_error(self, local_http_server):
         """Test web_fetch handles HTTP errors."""
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_response.reason_phrase = "Not Found"
-        mock_response.headers = {}
-
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
-            result = web_fetch("https://example.com/notfound")
+        result = web_fetch(local_http_server.url("/notfound"))
 
         assert "Error" in result
         assert "404" in result
 
-    def test_web_fetch_timeout(self):
+    def test_web_fetch_timeout(self, local_http_server, monkeypatch):
         """Test web_fetch handles timeouts (with no cached fallback)."""
-        import httpx
+        from server.services import web_fetch as web_fetch_module
 
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.side_effect = httpx.TimeoutException("timeout")
-            # Use unique URL and disable cache to test pure timeout behavior
-            result = web_fetch("https://example.com/unique-timeout-test-no-cache", use_cache=False)
+        monkeypatch.setattr(web_fetch_module, "_web_fetcher", web_fetch_module.WebFetcher(timeout=0.2))
+        local_http_server.route("/slow", body=b"late", delay=1.0)
+        result = web_fetch(local_http_server.url("/slow"), use_cache=False)
 
         assert "Error" in result
         assert "timed out" in result
 
-    def test_web_fetch_via_registry(self):
-        """Test executing web_fetch via global registry."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = "Test content"
-        mock_response.reason_phrase = "OK"
-        mock_response.headers = {"content-type": "text/plain"}
+    def test_web_fetch_blocks_private_addresses(self):
+        """Test web_fetch refuses URLs the SSRF guard blocks."""
+        result = web_fetch("http://127.0.0.1:9/admin", use_cache=False)
+        assert "Error" in result
+        assert "localhost" in result
 
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
-            result = registry.execute("web_fetch", url="https://example.com")
+    def test_web_fetch_via_registry(self, local_http_server):
+        """Test executing web_fetch via global registry."""
+        local_http_server.route("/", headers={"Content-Type": "text/plain"}, body=b"Test content")
+        result = registry.execute("web_fetch", url=local_http_server.url("/"))
 
         assert result["success"] is True
         assert "Test content" in result["result"]
 
+    async def test_web_fetch_via_execute_async(self, local_http_server):
+        """Test web_fetch runs on the caller's event loop from async code."""
+        local_http_server.route("/", headers={"Content-Type": "text/plain"}, body=b"Async content")
+        result = await registry.execute_async("web_fetch", url=local_http_server.url("/"), use_cache=False)
+
+        assert result["success"] is True
+        assert "Async content" in result["result"]
+
 
 class TestPermissionEscalation:
     """Tests for permission-aware tool execution."""
@@ -427,6 +415,149 @@ class TestPermissionEscalation:
         assert result["permission_escalation"]["pending_args"] == {"cmd": "ls -la"}
 
 
+class TestConcurrentExecution:
+    """Tests for execute_async/execute_many."""
+
+    @pytest.mark.asyncio
+    async def test_execute_many_preserves_call_order(self):
+        """Test that results come back in call order regardless of finish order."""
+        import time
+        reg = ToolRegistry()
+        reg.register_tool(ToolSpec(
+            name="sleepy",
+            description="Sleeps then echoes",
+            handler=lambda delay, value: (time.sleep(delay), value)[1],
+        ))
+
+        results = await reg.execute_many([
+            ("sleepy", {"delay": 0.2, "value": "first"}),
+            ("sleepy", {"delay": 0.0, "value": "second"}),
+            ("sleepy", {"delay": 0.1, "value": "third"}),
+        ])
+
+        assert [r["result"] for r in results] == ["first", "second", "third"]
+
+    @pytest.mark.asyncio
+    async def test_execute_many_runs_sync_handlers_concurrently(self):
+        """Test that blocking handlers overlap instead of running serially."""
+        import time
+        reg = ToolRegistry()
+        reg.register_tool(ToolSpec(
+            name="blocking",
+            description="Blocks for a while",
+            handler=lambda: time.sleep(0.3) or "done",
+        ))
+
+        start = time.monotonic()
+        results = await reg.execute_many([("blocking", {})] * 4)
+        elapsed = time.monotonic() - start
+
+        assert all(r["success"] for r in results)
+        assert elapsed < 0.9
+
+    @pytest.mark.asyncio
+    async def test_execute_async_awaits_coroutine_handler(self):
+        """Test that async handlers are awaited natively."""
+        reg = ToolRegistry()
+
+        async def async_handler(x: int) -> int:
+            return x * 3
+
+        reg.register_tool(ToolSpec(name="triple", description="Triples", handler=async_handler))
+
+        result = await reg.execute_async("triple", x=5)
+
+        assert result == {"success": True, "result": 15}
+
+    def test_execute_runs_coroutine_handler(self):
+        """Test that sync execute runs async handlers on their own loop."""
+        reg = ToolRegistry()
+
+        async def async_handler(x: int) -> int:
+            return x * 3
+
+        reg.register_tool(ToolSpec(name="triple", description="Triples", handler=async_handler))
+
+        assert reg.execute("triple", x=5) == {"success": True, "result": 15}
+
+    @pytest.mark.asyncio
+    async def test_execute_coroutine_handler_refused_in_running_loop(self):
+        """Test that sync execute won't block a running loop on an async handler."""
+        reg = ToolRegistry()
+
+        async def async_handler(x: int) -> int:
+            return x * 3
+
+        reg.register_tool(ToolSpec(name="triple", description="Triples", handler=async_handler))
+
+        result = reg.execute("triple", x=5)
+
+        assert result["success"] is False
+        assert "execute_async" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_execute_async_timeout(self):
+        """Test that a slow tool is abandoned after its timeout."""
+        import asyncio
+        reg = ToolRegistry()
+
+        async def slow():
+            await asyncio.sleep(5)
+
+        reg.register_tool(ToolSpec(name="slow", description="Slow", handler=slow, timeout=0.05))
+
+        result = await reg.execute_async("slow")
+
+        assert result["success"] is False
+        assert "timed out" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_execute_many_handler_error_is_isolated(self):
+        """Test that one failing tool does not affect the others."""
+        reg = ToolRegistry()
+
+        def boom():
+            raise RuntimeError("boom")
+
+        reg.register_tool(ToolSpec(name="boom", description="Fails", handler=boom))
+        reg.register_tool(ToolSpec(name="ok", description="Works", handler=lambda: "fine"))
+
+        results = await reg.execute_many([("boom", {}), ("ok", {}), ("missing", {})])
+
+        assert results[0] == {"success": False, "error": "boom"}
+        assert results[1] == {"success": True, "result": "fine"}
+        assert "Tool not found" in results[2]["error"]
+
+    @pytest.mark.asyncio
+    async def test_execute_many_stops_at_permission_escalation(self):
+        """Test that calls after an escalation are skipped, as in sequential execution."""
+        reg = ToolRegistry()
+        ran = []
+        reg.register_tool(ToolSpec(
+            name="safe",
+            description="Safe",
+            handler=lambda tag: ran.append(tag) or tag,
+        ))
+        reg.register_tool(ToolSpec(
+            name="admin",
+            description="Admin",
+            handler=lambda: ran.append("admin"),
+            required_permission=PermissionLevel.SYSTEM,
+        ))
+
+        with patch.dict(os.environ, {"ASSISTANT_PERMISSION_LEVEL": "1"}):
+            results = await reg.execute_many([
+                ("safe", {"tag": "before"}),
+                ("admin", {}),
+                ("safe", {"tag": "after"}),
+            ])
+
+        assert results[0]["result"] == "before"
+        assert "permission_escalation" in results[1]
+        assert results[2]["skipped"] is True
+        assert ran == ["before"]
+
+
 class TestRunShellCommand:
     """Tests for the run_shell_command tool."""
 
@@ -483,29 +614,24 @@ class TestRunShellCommand:
 class TestWebFetchCaching:
     """Tests for web_fetch caching functionality."""
 
-    def test_web_fetch_caches_successful_result(self):
+    def test_web_fetch_caches_successful_result(self, local_http_server):
         """Test that successful web_fetch results are cached."""
         from server.services.degradation import get_degradation_service
+        from server.services.tools import _compute_cache_key
 
         # Clear any existing cache
         degradation = get_degradation_service()
         degradation.clear_cache()
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = "Cached content here"
-        mock_response.reason_phrase = "OK"
-        mock_response.headers = {"content-type": "text/html"}
-
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
-            result = web_fetch("https://example.com/cacheable", use_cache=True)
+        local_http_server.route("/cacheable", headers={"Content-Type": "text/plain"}, body=b"Cached content here")
+        url = local_http_server.url("/cacheable")
+        result = web_fetch(url, use_cache=True)
 
         assert "Cached content here" in result
         # Verify content is cached
-        assert degradation._tool_cache  # Should have at least one entry
+        assert degradation.get_cached_tool_result("web_fetch", _compute_cache_key(url, 4000))
 
-    def test_web_fetch_returns_cached_when_offline(self):
+    def test_web_fetch_returns_cached_when_offline(self, local_http_server):
         """Test that web_fetch returns cached content when in OFFLINE mode."""
         from server.services.degradation import get_degradation_service, DegradationMode
 
@@ -513,31 +639,26 @@ class TestWebFetchCaching:
         degradation.clear_cache()
 
         # First, cache some content
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = "Original cached content"
-        mock_response.reason_phrase = "OK"
-        mock_response.headers = {"content-type": "text/html"}
-
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
-            web_fetch("https://example.com/offline-test", use_cache=True)
+        local_http_server.route("/offline-test", headers={"Content-Type": "text/plain"}, body=b"Original cached content")
+        url = local_http_server.url("/offline-test")
+        web_fetch(url, use_cache=True)
 
         # Now simulate offline mode
         degradation._network_available = False
         degradation._update_mode()
         assert degradation.mode == DegradationMode.OFFLINE
 
-        # Fetch should return cached content
-        result = web_fetch("https://example.com/offline-test", use_cache=True)
-        assert "[CACHED" in result
-        assert "Original cached content" in result
-
-        # Cleanup
-        degradation._network_available = True
-        degradation._update_mode()
-
-    def test_web_fetch_returns_cached_on_http_error(self):
+        try:
+            # Fetch should return cached content
+            result = web_fetch(url, use_cache=True)
+            assert "[CACHED" in result
+            assert "Original cached content" in result
+        finally:
+            # Cleanup
+            degradation._network_available = True
+            degradation._update_mode()
+
+    def test_web_fetch_returns_cached_on_http_error(self, local_http_server):
         """Test that web_fetch returns cached content on HTTP errors."""
         from server.services.degradation import get_degradation_service
 
@@ -545,107 +666,73 @@ class TestWebFetchCaching:
         degradation.clear_cache()
 
         # First, cache some content
-        mock_response_ok = MagicMock()
-        mock_response_ok.status_code = 200
-        mock_response_ok.text = "Good content before error"
-        mock_response_ok.reason_phrase = "OK"
-        mock_response_ok.headers = {"content-type": "text/html"}
-
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response_ok
-            web_fetch("https://example.com/error-fallback", use_cache=True)
+        local_http_server.route("/error-fallback", headers={"Content-Type": "text/plain"}, body=b"Good content before error")
+        url = local_http_server.url("/error-fallback")
+        web_fetch(url, use_cache=True)
 
         # Now simulate HTTP error
-        mock_response_error = MagicMock()
-        mock_response_error.status_code = 500
-        mock_response_error.reason_phrase = "Internal Server Error"
-        mock_response_error.headers = {}
-
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response_error
-            result = web_fetch("https://example.com/error-fallback", use_cache=True)
+        local_http_server.route("/error-fallback", status=500, body=b"boom")
+        result = web_fetch(url, use_cache=True)
 
         assert "[CACHED FALLBACK" in result
         assert "Good content before error" in result
 
-    def test_web_fetch_returns_cached_on_timeout(self):
+    def test_web_fetch_returns_cached_on_timeout(self, local_http_server, monkeypatch):
         """Test that web_fetch returns cached content on timeout."""
-        import httpx
+        from server.services import web_fetch as web_fetch_module
         from server.services.degradation import get_degradation_service
 
         degradation = get_degradation_service()
         degradation.clear_cache()
+        monkeypatch.setattr(web_fetch_module, "_web_fetcher", web_fetch_module.WebFetcher(timeout=0.2))
 
         # First, cache some content
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = "Content before timeout"
-        mock_response.reason_phrase = "OK"
-        mock_response.headers = {"content-type": "text/html"}
-
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
-            web_fetch("https://example.com/timeout-test", use_cache=True)
+        local_http_server.route("/timeout-test", headers={"Content-Type": "text/plain"}, body=b"Content before timeout")
+        url = local_http_server.url("/timeout-test")
+        web_fetch(url, use_cache=True)
 
         # Now simulate timeout
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.side_effect = httpx.TimeoutException("timeout")
-            result = web_fetch("https://example.com/timeout-test", use_cache=True)
+        local_http_server.route("/timeout-test", body=b"late", delay=1.0)
+        result = web_fetch(url, use_cache=True)
 
         assert "[CACHED FALLBACK - Timeout]" in result
         assert "Content before timeout" in result
 
-    def test_web_fetch_returns_cached_on_network_error(self):
+    def test_web_fetch_returns_cached_on_network_error(self, local_http_server):
         """Test that web_fetch returns cached content on network errors."""
-        import httpx
         from server.services.degradation import get_degradation_service
 
         degradation = get_degradation_service()
         degradation.clear_cache()
 
         # First, cache some content
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = "Content before network error"
-        mock_response.reason_phrase = "OK"
-        mock_response.headers = {"content-type": "text/html"}
-
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
-            web_fetch("https://example.com/network-error", use_cache=True)
+        local_http_server.route("/network-error", headers={"Content-Type": "text/plain"}, body=b"Content before network error")
+        url = local_http_server.url("/network-error")
+        web_fetch(url, use_cache=True)
 
         # Now simulate network error
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.side_effect = httpx.RequestError("Connection refused")
-            result = web_fetch("https://example.com/network-error", use_cache=True)
+        local_http_server.stop()
+        result = web_fetch(url, use_cache=True)
 
         assert "[CACHED FALLBACK - Network Error]" in result
         assert "Content before network error" in result
 
-    def test_web_fetch_with_cache_disabled(self):
+    def test_web_fetch_with_cache_disabled(self, local_http_server):
         """Test that web_fetch doesn't cache when use_cache=False."""
         from server.services.degradation import get_degradation_service
 
         degradation = get_degradation_service()
-        initial_cache_count = len(degradation._tool_cache)
+        initial_cache_count = degradation.get_status()["cache_entries"]
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = "No cache content"
-        mock_response.reason_phrase = "OK"
-        mock_response.headers = {"content-type": "text/html"}
-
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
-            result = web_fetch("https://example.com/nocache", use_cache=False)
+        local_http_server.route("/nocache", headers={"Content-Type": "text/plain"}, body=b"No cache content")
+        result = web_fetch(local_http_server.url("/nocache"), use_cache=False)
 
         assert "No cache content" in result
         # Cache should not have grown
-        assert len(degradation._tool_cache) == initial_cache_count
+        assert degradation.get_status()["cache_entries"] == initial_cache_count
 
     def test_web_fetch_cache_key_includes_max_length(self):
         """Test that different max_length values use different cache keys."""
-        from server.services.degradation import get_degradation_service
         from server.services.tools import _compute_cache_key
 
         # Verify cache keys differ for same URL with different max_length
@@ -653,18 +740,17 @@ class TestWebFetchCaching:
         key2 = _compute_cache_key("https://example.com/test", 8000)
         assert key1 != key2
 
-    def test_web_fetch_no_cached_returns_error_on_failure(self):
+    def test_web_fetch_no_cached_returns_error_on_failure(self, local_http_server):
         """Test that web_fetch returns error when no cached content exists."""
-        import httpx
         from server.services.degradation import get_degradation_service
 
         degradation = get_degradation_service()
         degradation.clear_cache()
 
         # Simulate network error without prior cache
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.side_effect = httpx.RequestError("Connection refused")
-            result = web_fetch("https://example.com/never-cached", use_cache=True)
+        url = local_http_server.url("/never-cached")
+        local_http_server.stop()
+        result = web_fetch(url, use_cache=True)
 
         assert "Error" in result
         assert "Failed to fetch URL" in result
@@ -0,0 +1,163 @@
+"""Tests for request tracing."""
+import asyncio
+import time
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.services.tracing import Trace, TraceStore, start_trace, current_trace, span
+from server.services.metrics import metrics
+
+
+class TestTrace:
+    """Tests for spans within one trace."""
+
+    def test_spans_nest(self):
+        """Test that spans opened inside a span become its children."""
+        trace = start_trace("chat_stream")
+        with trace.span("context_build") as outer:
+            with trace.span("history") as inner:
+                time.sleep(0.005)
+
+        assert outer.parent_id == trace.root.span_id
+        assert inner.parent_id == outer.span_id
+        assert outer.duration_ms >= inner.duration_ms >= 5
+
+    def test_explicit_parent(self):
+        """Test start_span with an explicit parent outside any with-block."""
+        trace = start_trace("chat")
+        context = trace.start_span("context_build")
+        with trace.span("settings", parent=context) as child:
+            pass
+        context.end()
+
+        assert child.parent_id == context.span_id
+        assert set(trace.stage_timings()) == {"context_build", "settings"}
+
+    @pytest.mark.asyncio
+    async def test_spans_nest_across_gather(self):
+        """Test that spans opened in gathered tasks attach to the enclosing span."""
+        trace = start_trace("chat")
+
+        async def tool(name):
+            with span(name) as active:
+                await asyncio.sleep(0.001)
+                return active
+
+        with trace.span("tool_execution") as parent:
+            children = await asyncio.gather(tool("a"), tool("b"))
+
+        assert all(child.parent_id == parent.span_id for child in children)
+
+    def test_error_recorded(self):
+        """Test that an exception marks the span as failed and propagates."""
+        trace = start_trace("chat")
+        with pytest.raises(ValueError):
+            with trace.span("llm_total"):
+                raise ValueError("boom")
+
+        llm = trace.spans[1]
+        assert llm.ended
+        assert llm.to_dict()["status"] == {"code": 2, "message": "ValueError: boom"}
+
+    def test_spans_feed_stage_metrics(self):
+        """Test that finished spans are recorded as metrics stages."""
+        before = metrics._stages.get("trace_test_stage")
+        before_count = before.total.count if before else 0
+
+        trace = start_trace("chat")
+        with trace.span("trace_test_stage"):
+            pass
+
+        assert metrics._stages["trace_test_stage"].total.count == before_count + 1
+
+    def test_traceparent_continued(self):
+        """Test that a valid incoming traceparent keeps its trace id."""
+        incoming = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+        trace = Trace("chat", traceparent=incoming)
+
+        assert trace.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+        assert trace.root.parent_id == "00f067aa0ba902b7"
+        assert trace.traceparent.startswith("00-4bf92f3577b34da6a3ce929d0e0e4736-")
+
+    def test_invalid_traceparent_ignored(self):
+        """Test that a malformed traceparent starts a fresh trace."""
+        trace = Trace("chat", traceparent="not-a-traceparent")
+        assert len(trace.trace_id) == 32
+        assert trace.root.parent_id is None
+
+    def test_otlp_export_shape(self):
+        """Test the exported span fields."""
+        trace = start_trace("chat", conversation_id="main")
+        with trace.span("persistence", rows=1):
+            pass
+        trace.finish()
+
+        data = trace.to_dict()
+        root, child = data["spans"]
+        assert root["parentSpanId"] == ""
+        assert child["parentSpanId"] == root["spanId"]
+        assert {"key": "rows", "value": {"intValue": "1"}} in child["attributes"]
+        assert int(child["endTimeUnixNano"]) >= int(child["startTimeUnixNano"])
+        assert data["attributes"] == {"conversation_id": "main"}
+
+
+class TestModuleSpan:
+    """Tests for the module-level span() helper."""
+
+    def test_without_trace_records_stage(self):
+        """Test that span() outside a trace still records a metrics stage."""
+        assert current_trace() is None
+        before = metrics._stages.get("untraced_stage")
+        before_count = before.total.count if before else 0
+
+        with span("untraced_stage") as active:
+            assert active is None
+
+        assert metrics._stages["untraced_stage"].total.count == before_count + 1
+
+    def test_joins_active_trace(self):
+        """Test that span() joins the trace made current with activate()."""
+        trace = start_trace("chat")
+        with trace.activate():
+            assert current_trace() is trace
+            with span("tool_execution"):
+                pass
+        assert current_trace() is None
+        assert "tool_execution" in trace.stage_timings()
+
+
+class TestTraceStore:
+    """Tests for the slowest-N trace store."""
+
+    def _finished(self, duration_ms):
+        trace = Trace("chat")
+        trace.root.end()
+        trace.root._duration_ms = duration_ms
+        return trace
+
+    def test_keeps_slowest(self):
+        """Test that only the slowest traces are retained."""
+        store = TraceStore(max_traces=3)
+        traces = [self._finished(ms) for ms in (50, 10, 300, 20, 120, 5)]
+        for trace in traces:
+            store.add(trace)
+
+        assert [t.duration_ms for t in store.slowest()] == [300, 120, 50]
+        assert store.total_traces == 6
+        assert store.get(traces[1].trace_id) is None
+        assert store.get(traces[2].trace_id) is traces[2]
+
+    def test_finish_adds_once(self):
+        """Test that finishing a trace twice stores it once."""
+        from server.services.tracing import get_trace_store
+
+        store = get_trace_store()
+        before = store.total_traces
+        trace = start_trace("chat")
+        trace.finish()
+        trace.finish()
+
+        assert store.total_traces == before + 1
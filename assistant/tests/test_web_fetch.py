@@ -0,0 +1,161 @@
+"""Tests for the pooled, streaming web_fetch engine."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from server.services.security import SecurityService
+from server.services.web_fetch import FetchBlocked, HTMLTextExtractor, WebFetcher
+
+
+@pytest.fixture
+def fetcher():
+    """Fetcher allowed to reach the local stand-in server."""
+    return WebFetcher(security=SecurityService(trusted_hosts={"127.0.0.1"}))
+
+
+class TestHTMLTextExtractor:
+    """Tests for HTMLTextExtractor."""
+
+    def test_reduces_html_to_text(self):
+        """Test markup, scripts and styles are dropped and blocks become lines."""
+        extractor = HTMLTextExtractor()
+        extractor.feed(
+            "<html><head><title>Title &amp; more</title><style>p {}</style></head>"
+            "<body><script>var x = 1;</script><h1>Heading</h1>"
+            "<p>Some   text\n  here</p><ul><li>one</li><li>two</li></ul></body></html>"
+        )
+        extractor.close()
+        assert extractor.text() == "Title & more\nHeading\nSome text here\none\ntwo"
+
+    def test_incremental_feed(self):
+        """Test chunk boundaries inside tags don't change the result."""
+        html = "<div><p>alpha <b>beta</b></p><pre>keep\n  spacing</pre></div>"
+        whole = HTMLTextExtractor()
+        whole.feed(html)
+        whole.close()
+
+        chunked = HTMLTextExtractor()
+        for i in range(0, len(html), 3):
+            chunked.feed(html[i:i + 3])
+        chunked.close()
+        assert chunked.text() == whole.text() == "alpha beta\nkeep\n  spacing"
+
+
+class TestWebFetcher:
+    """Tests for WebFetcher against a local stand-in server."""
+
+    async def test_fetch_text(self, fetcher, local_http_server):
+        """Test a page is fetched and reduced to text."""
+        local_http_server.route("/", headers={"Content-Type": "text/html; charset=utf-8"},
+                                body="<p>café</p>".encode())
+        result = await fetcher.fetch(local_http_server.url("/"), 100)
+
+        assert result.status_code == 200
+        assert result.text == "café"
+        assert not result.truncated
+        await fetcher.aclose()
+
+    async def test_stops_reading_large_body(self, fetcher, local_http_server):
+        """Test only as much of the body as needed is downloaded."""
+        chunk = b"<p>" + b"x" * 65530 + b"</p>"
+        total = len(chunk) * 500  # ~32 MB
+        local_http_server.route("/big", headers={"Content-Type": "text/html"}, body=(chunk for _ in range(500)))
+
+        result = await fetcher.fetch(local_http_server.url("/big"), 1000)
+
+        assert len(result.text) == 1000
+        assert result.truncated
+        await fetcher.aclose()
+        # Give the server a moment to notice the closed connection
+        await asyncio.sleep(0.2)
+        assert local_http_server.bytes_sent < total / 4
+
+    async def test_connections_reused(self, fetcher, local_http_server):
+        """Test sequential fetches share one keep-alive connection."""
+        local_http_server.route("/", headers={"Content-Type": "text/plain"}, body=b"ok")
+        for _ in range(5):
+            await fetcher.fetch(local_http_server.url("/"), 100)
+
+        assert len(local_http_server.requests) == 5
+        assert len(local_http_server.connections) == 1
+        await fetcher.aclose()
+
+    async def test_per_host_connection_limit(self, local_http_server):
+        """Test concurrent requests to one host are capped."""
+        fetcher = WebFetcher(security=SecurityService(trusted_hosts={"127.0.0.1"}), max_connections_per_host=2)
+        lock = threading.Lock()
+        active = [0, 0]  # current, peak
+
+        def slow(handler):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.1)
+            with lock:
+                active[0] -= 1
+            return 200, {"Content-Type": "text/plain"}, b"ok"
+
+        local_http_server.routes["/slow"] = slow
+        results = await asyncio.gather(*(fetcher.fetch(local_http_server.url("/slow"), 100) for _ in range(6)))
+
+        assert all(result.text == "ok" for result in results)
+        assert active[1] == 2
+        await fetcher.aclose()
+
+    async def test_follows_redirects(self, fetcher, local_http_server):
+        """Test redirects are followed and the final URL reported."""
+        local_http_server.route("/old", status=302, headers={"Location": "/new"})
+        local_http_server.route("/new", headers={"Content-Type": "text/plain"}, body=b"moved")
+
+        result = await fetcher.fetch(local_http_server.url("/old"), 100)
+        assert result.text == "moved"
+        assert result.url == local_http_server.url("/new")
+        await fetcher.aclose()
+
+    async def test_redirect_to_blocked_host_refused(self, fetcher, local_http_server):
+        """Test every redirect hop goes through the SSRF guard."""
+        port = local_http_server.url("/").split(":")[2].rstrip("/")
+        local_http_server.route("/escape", status=302, headers={"Location": f"http://localhost:{port}/internal"})
+
+        with pytest.raises(FetchBlocked, match="localhost"):
+            await fetcher.fetch(local_http_server.url("/escape"), 100)
+        await fetcher.aclose()
+
+    async def test_connected_address_checked(self, local_http_server):
+        """Test a name that passed validation but connected to a blocked address is refused."""
+        security = SecurityService()
+
+        async def passes(url):
+            return True, None  # As if DNS changed after validation
+
+        security.validate_url_async = passes
+        fetcher = WebFetcher(security=security)
+        local_http_server.route("/", body=b"internal")
+
+        with pytest.raises(FetchBlocked):
+            await fetcher.fetch(local_http_server.url("/"), 100)
+        await fetcher.aclose()
+
+    async def test_conditional_headers_sent(self, fetcher, local_http_server):
+        """Test extra headers reach the server and 304 bodies are not read."""
+        local_http_server.route("/", status=304)
+        result = await fetcher.fetch(local_http_server.url("/"), 100, headers={"If-None-Match": '"v1"'})
+
+        assert result.status_code == 304
+        assert result.text == ""
+        assert local_http_server.requests[0][1]["If-None-Match"] == '"v1"'
+        await fetcher.aclose()
+
+    def test_new_client_per_event_loop(self, fetcher, local_http_server):
+        """Test a client bound to a finished loop is not reused."""
+        local_http_server.route("/", headers={"Content-Type": "text/plain"}, body=b"ok")
+
+        async def fetch():
+            await fetcher.fetch(local_http_server.url("/"), 100)
+            return fetcher._current.client
+
+        first = asyncio.run(fetch())
+        second = asyncio.run(fetch())
+        assert first is not second
@@ -482,21 +482,34 @@ async function switchConversation(conversationId) {
     }
 }
 
-async function loadConversationMessages(conversationId) {
-    try {
-        const url = conversationId === 'main'
-            ? '/api/conversation'
-            : `/api/conversations/${conversationId}`;
+// Loaded history is paged in from the server and virtualized (message_list.js)
+const messageList = new VirtualMessageList(messagesContainer, {
+    renderItem: (msg) => addMessageToUI(msg.role, msg.content, null, msg.id, true),
+    fetchPage: fetchMessagePage,
+});
 
-        const response = await fetch(url);
-        const data = await response.json();
+// Newest page when beforeId is null, otherwise the page before that message
+async function fetchMessagePage(conversationId, beforeId) {
+    let url;
+    if (beforeId) {
+        url = `/api/conversations/${conversationId}/messages?before=${encodeURIComponent(beforeId)}&limit=${MESSAGE_PAGE_SIZE}`;
+    } else if (conversationId === 'main') {
+        url = `/api/conversation?limit=${MESSAGE_PAGE_SIZE}`;
+    } else {
+        url = `/api/conversations/${conversationId}?limit=${MESSAGE_PAGE_SIZE}`;
+    }
 
-        if (response.ok) {
-            messagesContainer.innerHTML = '';
-            (data.messages || []).forEach(msg => {
-                addMessageToUI(msg.role, msg.content, null, msg.id);
-            });
-        }
+    const response = await fetch(url);
+    const data = await response.json();
+    if (!response.ok) {
+        throw new Error(data.detail || `Failed to load messages (${response.status})`);
+    }
+    return data;
+}
+
+async function loadConversationMessages(conversationId) {
+    try {
+        await messageList.load(conversationId);
     } catch (error) {
         console.error('Failed to load conversation messages:', error);
     }
@@ -835,6 +848,7 @@ async function sendMessageStreaming(message, fileIds) {
 
     let accumulatedText = '';
     let modelUsed = null;
+    const renderer = createStreamRenderer(contentSpan);
 
     try {
         const response = await fetch('/api/chat/stream', {
@@ -889,6 +903,7 @@ async function sendMessageStreaming(message, fileIds) {
                 if (eventType && eventData) {
                     handleStreamEvent(eventType, eventData, contentSpan, messageEl, (text) => {
                         accumulatedText += text;
+                        renderer.append(text);
                     }, (model) => {
                         modelUsed = model;
                     });
@@ -910,8 +925,15 @@ async function sendMessageStreaming(message, fileIds) {
     messageEl.classList.remove('streaming');
     progressEl.remove();
 
+    // Render the last open block; completed blocks are already in place
+    if (!messageEl.classList.contains('error')) {
+        renderer.finish();
+    }
+
     // Convert accumulated plain text to markdown
-    if (accumulatedText && typeof marked !== 'undefined' && typeof DOMPurify !== 'undefined') {
+    // (a full parse is only needed when block-by-block rendering can differ,
+    // e.g. reference-style links defined in a later block)
+    if (accumulatedText && renderer.needsFullRender && typeof marked !== 'undefined' && typeof DOMPurify !== 'undefined') {
         marked.setOptions({
             breaks: true,
             gfm: true,
@@ -939,6 +961,8 @@ async function sendMessageStreaming(message, fileIds) {
 
         // Add copy buttons to code blocks in streamed content
         addCopyButtonsToCodeBlocks(messageEl);
+    } else {
+        addCopyButtonsToCodeBlocks(messageEl);
     }
 
     // Add model badge if we know the model
@@ -950,6 +974,23 @@ async function sendMessageStreaming(message, fileIds) {
     }
 }
 
+/**
+ * Create the renderer for a streamed reply: incremental markdown when the
+ * markdown libraries are loaded, plain text otherwise.
+ */
+function createStreamRenderer(contentSpan) {
+    if (typeof StreamingMarkdownRenderer !== 'undefined' && typeof marked !== 'undefined' && typeof DOMPurify !== 'undefined') {
+        return new StreamingMarkdownRenderer(contentSpan);
+    }
+    return {
+        needsFullRender: false,
+        append(text) {
+            contentSpan.appendChild(document.createTextNode(text));
+        },
+        finish() {},
+    };
+}
+
 function handleStreamEvent(eventType, data, contentSpan, messageEl, addText, setModel) {
     switch (eventType) {
         case 'start':
@@ -958,7 +999,6 @@ function handleStreamEvent(eventType, data, contentSpan, messageEl, addText, set
 
         case 'token':
             if (data.text) {
-                contentSpan.textContent += data.text;
                 addText(data.text);
             }
             break;
@@ -989,6 +1029,13 @@ function handleStreamEvent(eventType, data, contentSpan, messageEl, addText, set
             }
             break;
 
+        case 'timing':
+            // Keep the trace id so slow replies can be found in /api/debug/traces
+            messageEl.dataset.traceId = data.trace_id;
+            messageEl.dataset.ttftMs = data.ttft_ms;
+            messageEl.title = `First token in ${Math.round(data.ttft_ms)} ms`;
+            break;
+
         case 'done':
             if (data.model) {
                 setModel(data.model);
@@ -1034,7 +1081,8 @@ async function sendMessageRegular(message, fileIds) {
     }
 }
 
-function addMessageToUI(role, content, model = null, messageId = null) {
+// With detached, the element is only built; the history list places it itself
+function addMessageToUI(role, content, model = null, messageId = null, detached = false) {
     const messageEl = document.createElement('div');
     messageEl.className = `message ${role}`;
     if (messageId) {
@@ -1101,25 +1149,18 @@ function addMessageToUI(role, content, model = null, messageId = null) {
         messageEl.appendChild(actionsBar);
     }
 
-    messagesContainer.appendChild(messageEl);
-    messagesContainer.scrollTop = messagesContainer.scrollHeight;
+    if (!detached) {
+        messagesContainer.appendChild(messageEl);
+        messagesContainer.scrollTop = messagesContainer.scrollHeight;
+    }
     return messageEl;
 }
 
 // Load the single infinite conversation
 async function loadSingleConversation() {
     try {
-        const response = await fetch('/api/conversation');
-        const data = await response.json();
-
-        if (response.ok) {
-            messagesContainer.innerHTML = '';
-
-            // Display messages (most recent at bottom)
-            data.messages.forEach(msg => {
-                addMessageToUI(msg.role, msg.content, null, msg.id);
-            });
-        }
+        // Most recent page at the bottom; older pages load on scroll
+        await messageList.load('main');
     } catch (error) {
         console.error('Failed to load conversation:', error);
     }
@@ -2185,13 +2226,20 @@ async function regenerateMessage(messageId) {
         prevElement = prevElement.previousElementSibling;
     }
 
-    if (!prevElement || !prevElement.classList.contains('user')) {
+    // It may be outside the rendered window of a long history
+    let userMessageText = null;
+    if (prevElement) {
+        userMessageText = prevElement.querySelector('.message-content-wrapper').textContent;
+    } else {
+        const prevMessage = messageList.previousUserMessage(messageId);
+        userMessageText = prevMessage ? prevMessage.content : null;
+    }
+
+    if (userMessageText === null) {
         console.error('Cannot find previous user message');
         return;
     }
 
-    const userMessageText = prevElement.querySelector('.message-content-wrapper').textContent;
-
     // Delete the assistant message
     try {
         const response = await fetch(`/api/conversations/${currentConversationId}/messages/${messageId}`, {
@@ -2201,6 +2249,7 @@ async function regenerateMessage(messageId) {
         if (response.ok) {
             // Remove from UI
             messageEl.remove();
+            messageList.remove(messageId);
 
             // Re-send the user message
             if (useStreaming) {
@@ -2237,12 +2286,13 @@ async function editMessage(text, messageId) {
         return;
     }
 
-    // Collect all messages to delete (this message and everything after it)
-    const messagesToDelete = [];
+    // Collect all messages to delete (this message and everything after it),
+    // including loaded history that is not currently rendered
+    const messagesToDelete = messageList.idsFrom(messageId);
     let currentEl = messageEl;
     while (currentEl) {
         const id = currentEl.dataset.messageId;
-        if (id) {
+        if (id && !messagesToDelete.includes(id)) {
             messagesToDelete.push(id);
         }
         currentEl = currentEl.nextElementSibling;
@@ -2260,6 +2310,7 @@ async function editMessage(text, messageId) {
         messagesToDelete.forEach(id => {
             const el = document.querySelector(`[data-message-id="${id}"]`);
             if (el) el.remove();
+            messageList.remove(id);
         });
 
         // Put text in input for user to edit and re-send
@@ -2295,6 +2346,7 @@ async function deleteMessage(messageId) {
             if (messageEl) {
                 messageEl.remove();
             }
+            messageList.remove(messageId);
         } else {
             const error = await response.json();
             alert(`Failed to delete message: ${error.detail || 'Unknown error'}`);
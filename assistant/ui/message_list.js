@@ -0,0 +1,290 @@
+/**
+ * Virtualized Message History
+ *
+ * Long conversations are loaded a page at a time (newest first) and only
+ * the messages near the viewport are kept in the DOM. Spacer elements
+ * stand in for the rest, so the scrollbar still reflects the loaded
+ * history. Scrolling near the top fetches the next older page.
+ *
+ * Messages sent during the session are appended after the history as
+ * before (see addMessageToUI); the list only manages loaded history.
+ */
+
+const MESSAGE_PAGE_SIZE = 50;
+const OVERSCAN_PX = 1000;        // Rendered beyond each edge of the viewport
+const LOAD_OLDER_PX = 600;       // Fetch older messages when this close to the top
+const ESTIMATED_MESSAGE_PX = 120; // Height assumed until a message is measured
+
+class VirtualMessageList {
+    /**
+     * @param {HTMLElement} scrollEl - The scrolling messages container
+     * @param {Object} options
+     * @param {Function} options.renderItem - message -> element
+     * @param {Function} options.fetchPage - (conversationId, beforeId|null) -> page response
+     */
+    constructor(scrollEl, options) {
+        this.scrollEl = scrollEl;
+        this.renderItem = options.renderItem;
+        this.fetchPage = options.fetchPage;
+
+        this.conversationId = null;
+        this.items = [];              // Loaded messages, oldest first
+        this.heights = new Map();     // Message id -> measured height incl. gap
+        this.rendered = new Map();    // Message id -> element currently in the DOM
+        this.start = 0;               // Rendered range [start, end)
+        this.end = 0;
+        this.hasMoreBefore = false;
+        this.loadingOlder = false;
+        this.frameRequested = false;
+        this.generation = 0;          // Bumped on load() so stale fetches are dropped
+
+        this.topSpacer = null;
+        this.bottomSpacer = null;
+        this.gap = 0;
+
+        this.scrollEl.addEventListener('scroll', () => this._requestUpdate(), { passive: true });
+        window.addEventListener('resize', () => this._requestUpdate());
+    }
+
+    /** Replace the container contents with the newest page of a conversation. */
+    async load(conversationId) {
+        const generation = ++this.generation;
+        const page = await this.fetchPage(conversationId, null);
+        if (generation !== this.generation) {
+            return;
+        }
+
+        this.conversationId = conversationId;
+        this.items = page.messages || [];
+        this.hasMoreBefore = Boolean(page.has_more_before);
+        this.heights.clear();
+        this.rendered.clear();
+        this.start = this.end = this.items.length;
+
+        this.scrollEl.innerHTML = '';
+        this.topSpacer = this._createSpacer();
+        this.bottomSpacer = this._createSpacer();
+        this.scrollEl.append(this.topSpacer, this.bottomSpacer);
+        this.gap = parseFloat(getComputedStyle(this.scrollEl).rowGap) || 0;
+
+        // Start at the newest message: render the bottom of the (estimated)
+        // history, then settle again once real heights are known
+        this._setSpacers();
+        this.scrollEl.scrollTop = this.scrollEl.scrollHeight;
+        this._update();
+        this.scrollEl.scrollTop = this.scrollEl.scrollHeight;
+        this._update();
+    }
+
+    /** Fetch the page before the oldest loaded message and keep the view in place. */
+    async loadOlder() {
+        if (this.loadingOlder || !this.hasMoreBefore || !this.items.length) {
+            return;
+        }
+        this.loadingOlder = true;
+        const generation = this.generation;
+        try {
+            const page = await this.fetchPage(this.conversationId, this.items[0].id);
+            if (generation !== this.generation || !page) {
+                return;
+            }
+            const older = page.messages || [];
+            this.hasMoreBefore = Boolean(page.has_more_before);
+            if (!older.length) {
+                return;
+            }
+            // Everything rendered shifts down by the new items' (estimated) height
+            this.items = older.concat(this.items);
+            this.start += older.length;
+            this.end += older.length;
+            const added = older.reduce((sum, msg) => sum + this._height(msg), 0);
+            this._setSpacers();
+            this.scrollEl.scrollTop += added;
+            this._update();
+        } catch (error) {
+            console.error('Failed to load older messages:', error);
+        } finally {
+            this.loadingOlder = false;
+        }
+    }
+
+    /** Forget a deleted message. */
+    remove(messageId) {
+        const index = this._indexOf(messageId);
+        if (index === -1) {
+            return;
+        }
+        const el = this.rendered.get(messageId);
+        if (el) {
+            el.remove();
+            this.rendered.delete(messageId);
+        }
+        this.items.splice(index, 1);
+        this.heights.delete(messageId);
+        if (index < this.start) {
+            this.start--;
+        }
+        if (index < this.end) {
+            this.end--;
+        }
+        this._setSpacers();
+    }
+
+    /** IDs of a loaded message and every loaded message after it. */
+    idsFrom(messageId) {
+        const index = this._indexOf(messageId);
+        return index === -1 ? [] : this.items.slice(index).map((msg) => msg.id);
+    }
+
+    /** The closest loaded user message before the given message. */
+    previousUserMessage(messageId) {
+        for (let i = this._indexOf(messageId) - 1; i >= 0; i--) {
+            if (this.items[i].role === 'user') {
+                return this.items[i];
+            }
+        }
+        return null;
+    }
+
+    _indexOf(messageId) {
+        return this.items.findIndex((msg) => msg.id === messageId);
+    }
+
+    _createSpacer() {
+        const spacer = document.createElement('div');
+        spacer.className = 'message-spacer';
+        spacer.setAttribute('aria-hidden', 'true');
+        return spacer;
+    }
+
+    _height(msg) {
+        return this.heights.get(msg.id) || ESTIMATED_MESSAGE_PX + this.gap;
+    }
+
+    _requestUpdate() {
+        if (this.frameRequested || !this.topSpacer) {
+            return;
+        }
+        this.frameRequested = true;
+        requestAnimationFrame(() => {
+            this.frameRequested = false;
+            this._update();
+        });
+    }
+
+    /** Render the messages overlapping the viewport (plus overscan), drop the rest. */
+    _update() {
+        if (!this.topSpacer || !this.topSpacer.isConnected) {
+            return;
+        }
+        // Viewport in history coordinates (offset from the first loaded message)
+        const historyTop = this._historyTop();
+        const viewTop = this.scrollEl.scrollTop - historyTop - OVERSCAN_PX;
+        const viewBottom = this.scrollEl.scrollTop - historyTop + this.scrollEl.clientHeight + OVERSCAN_PX;
+
+        let offset = 0;
+        let start = this.items.length;
+        let end = this.items.length;
+        for (let i = 0; i < this.items.length; i++) {
+            const height = this._height(this.items[i]);
+            if (start === this.items.length && offset + height > viewTop) {
+                start = i;
+            }
+            offset += height;
+            if (offset >= viewBottom) {
+                end = i + 1;
+                break;
+            }
+        }
+        if (start > end) {
+            start = end;
+        }
+
+        this._renderRange(start, end);
+
+        if (this.hasMoreBefore && this.scrollEl.scrollTop - historyTop < LOAD_OLDER_PX) {
+            this.loadOlder();
+        }
+    }
+
+    _renderRange(start, end) {
+        // Drop elements that left the range
+        for (let i = this.start; i < this.end; i++) {
+            if (i < start || i >= end) {
+                const id = this.items[i].id;
+                const el = this.rendered.get(id);
+                if (el) {
+                    el.remove();
+                    this.rendered.delete(id);
+                }
+            }
+        }
+
+        // Add elements that entered it, in order
+        let anchorShift = 0;
+        const firstVisible = this.rendered.size ? this.start : end;
+        for (let i = start; i < end; i++) {
+            const msg = this.items[i];
+            if (this.rendered.has(msg.id)) {
+                continue;
+            }
+            const el = this.renderItem(msg);
+            const next = this._nextRendered(i, end);
+            this.scrollEl.insertBefore(el, next || this.bottomSpacer);
+            this.rendered.set(msg.id, el);
+
+            const measured = el.offsetHeight + this.gap;
+            // Items added above what was on screen push it down; compensate
+            if (i < firstVisible) {
+                anchorShift += measured - this._height(msg);
+            }
+            this.heights.set(msg.id, measured);
+        }
+
+        this.start = start;
+        this.end = end;
+        this._setSpacers();
+        if (anchorShift) {
+            this.scrollEl.scrollTop += anchorShift;
+        }
+    }
+
+    _historyTop() {
+        let first = this.topSpacer;
+        if (first.style.display === 'none') {
+            first = this.start < this.end ? this.rendered.get(this.items[this.start].id) : this.bottomSpacer;
+        }
+        const top = first.getBoundingClientRect().top - this.scrollEl.getBoundingClientRect().top;
+        return top + this.scrollEl.scrollTop;
+    }
+
+    _nextRendered(index, end) {
+        for (let i = index + 1; i < end; i++) {
+            const el = this.rendered.get(this.items[i].id);
+            if (el) {
+                return el;
+            }
+        }
+        return null;
+    }
+
+    _setSpacers() {
+        let above = 0;
+        for (let i = 0; i < this.start; i++) {
+            above += this._height(this.items[i]);
+        }
+        let below = 0;
+        for (let i = this.end; i < this.items.length; i++) {
+            below += this._height(this.items[i]);
+        }
+        this._sizeSpacer(this.topSpacer, above);
+        this._sizeSpacer(this.bottomSpacer, below);
+    }
+
+    _sizeSpacer(spacer, height) {
+        // A visible spacer already gets one gap from the flex layout; an
+        // empty one is hidden so it adds no gap at all
+        spacer.style.display = height > 0 ? '' : 'none';
+        spacer.style.height = `${Math.max(0, height - this.gap)}px`;
+    }
+}
@@ -0,0 +1,223 @@
+/**
+ * Incremental Markdown Rendering for Streamed Responses
+ *
+ * Re-parsing the whole response on every token makes long answers cost
+ * O(n²) and stutter on slow devices. This renderer splits the stream into
+ * markdown blocks as lines arrive:
+ *
+ * - Completed blocks (ended by a blank line, or a closed code fence) are
+ *   parsed, sanitized and highlighted once, then never touched again.
+ * - The open block keeps receiving tokens as plain text and is re-parsed
+ *   at most once per animation frame. Code in an open fence is shown but
+ *   not highlighted until the fence closes.
+ *
+ * Work per frame is bounded by the size of the open block, not the size
+ * of the response.
+ */
+
+// Opening/closing code fence: up to 3 spaces, then ``` or ~~~ (3 or more)
+const FENCE_RE = /^ {0,3}(`{3,}|~{3,})/;
+// List item start: bullet or ordered marker followed by a space
+const LIST_ITEM_RE = /^ {0,3}([-*+]|\d{1,9}[.)])(\s|$)/;
+// Continuation line of a list item
+const INDENTED_RE = /^( {2,}|\t)/;
+// Reference-style link definition ([id]: url), which may be used by other blocks
+const REF_DEF_RE = /^ {0,3}\[[^\]]+\]:\s*\S/;
+// Elements plain text may be appended into between frames
+const TAIL_CONTAINERS = new Set([
+    'P', 'LI', 'UL', 'OL', 'BLOCKQUOTE', 'PRE', 'CODE', 'H1', 'H2', 'H3', 'H4', 'H5', 'H6',
+    'TABLE', 'THEAD', 'TBODY', 'TR', 'TH', 'TD',
+]);
+
+function defaultMarkdownParse(source) {
+    return DOMPurify.sanitize(marked.parse(source, { breaks: true, gfm: true }));
+}
+
+function defaultCodeHighlight(codeEl) {
+    if (typeof hljs === 'undefined') {
+        return;
+    }
+    try {
+        hljs.highlightElement(codeEl);
+    } catch (err) {
+        console.error('Syntax highlighting error:', err);
+    }
+}
+
+class StreamingMarkdownRenderer {
+    /**
+     * @param {HTMLElement} container - Element the rendered blocks go into
+     * @param {Object} options
+     * @param {Function} options.parse - markdown -> sanitized HTML
+     * @param {Function} options.highlight - highlights one <code> element
+     * @param {Function} options.schedule - frame scheduler (requestAnimationFrame)
+     */
+    constructor(container, options = {}) {
+        this.container = container;
+        this.parse = options.parse || defaultMarkdownParse;
+        this.highlight = options.highlight || defaultCodeHighlight;
+        this.schedule = options.schedule || ((callback) => requestAnimationFrame(callback));
+
+        this.text = '';             // Everything received so far
+        this.blockStart = 0;        // Offset where the open block begins
+        this.scanPos = 0;           // Offset of the first line not yet scanned
+        this.fence = null;          // { char, length } while inside a code fence
+        this.blockIsList = false;   // Open block started with a list item
+        this.pendingBlank = false;  // Blank line seen after the open block's content
+        this.frameRequested = false;
+        this.finished = false;
+
+        // Set when splitting into blocks may render differently from one
+        // full parse (reference links defined in another block)
+        this.needsFullRender = false;
+
+        this.stats = { blocks: 0, openRenders: 0, charsParsed: 0, highlighted: 0 };
+
+        this.openEl = document.createElement('div');
+        this.openEl.className = 'md-open';
+        this.container.appendChild(this.openEl);
+        this.tailEl = this.openEl;  // Where plain text is appended between frames
+    }
+
+    /** Add a chunk of streamed text. */
+    append(chunk) {
+        if (!chunk || this.finished) {
+            return;
+        }
+        this.text += chunk;
+        this.tailEl.appendChild(document.createTextNode(chunk));
+        this._scanLines();
+        this._requestFrame();
+    }
+
+    /** Render whatever is still open. Call once the stream has ended. */
+    finish() {
+        if (this.finished) {
+            return;
+        }
+        this.finished = true;
+        this._scanLines();
+        const lastLine = this.text.slice(this.scanPos);
+        if (!this.fence && REF_DEF_RE.test(lastLine)) {
+            this.needsFullRender = true;
+        }
+        this._completeBlock(this.text.length);
+        this.openEl.remove();
+    }
+
+    _scanLines() {
+        let newline;
+        while ((newline = this.text.indexOf('\n', this.scanPos)) !== -1) {
+            const lineStart = this.scanPos;
+            this.scanPos = newline + 1;
+            this._scanLine(this.text.slice(lineStart, newline), lineStart, this.scanPos);
+        }
+    }
+
+    _scanLine(line, lineStart, lineEnd) {
+        if (this.fence) {
+            const close = FENCE_RE.exec(line);
+            if (close && close[1][0] === this.fence.char && close[1].length >= this.fence.length
+                    && !line.slice(close[0].length).trim()) {
+                this.fence = null;
+                this._completeBlock(lineEnd);
+            }
+            return;
+        }
+
+        if (!line.trim()) {
+            if (lineStart === this.blockStart) {
+                this.blockStart = lineEnd;  // Nothing open yet; skip leading blank lines
+            } else {
+                this.pendingBlank = true;
+            }
+            return;
+        }
+
+        const fence = FENCE_RE.exec(line);
+        const isListItem = LIST_ITEM_RE.test(line);
+        if (lineStart > this.blockStart) {
+            // A blank line ends the open block unless the list carries on;
+            // an opening fence always starts a block of its own
+            const continuesList = this.blockIsList && (isListItem || INDENTED_RE.test(line));
+            if (fence || (this.pendingBlank && !continuesList)) {
+                this._completeBlock(lineStart);
+            }
+        }
+        this.pendingBlank = false;
+
+        if (lineStart === this.blockStart) {
+            this.blockIsList = isListItem;
+        }
+        if (fence) {
+            this.fence = { char: fence[1][0], length: fence[1].length };
+        } else if (REF_DEF_RE.test(line)) {
+            this.needsFullRender = true;
+        }
+    }
+
+    _completeBlock(end) {
+        const source = this.text.slice(this.blockStart, end);
+        this.blockStart = end;
+        this.blockIsList = false;
+        this.pendingBlank = false;
+
+        if (source.trim()) {
+            const blockEl = document.createElement('div');
+            blockEl.className = 'md-block';
+            blockEl.innerHTML = this.parse(source);
+            blockEl.querySelectorAll('pre code').forEach((codeEl) => {
+                this.highlight(codeEl);
+                this.stats.highlighted++;
+            });
+            this.container.insertBefore(blockEl, this.openEl);
+            this.stats.blocks++;
+            this.stats.charsParsed += source.length;
+        }
+
+        // The open element still holds the completed text; keep only the rest
+        this.openEl.textContent = this.text.slice(this.blockStart);
+        this.tailEl = this.openEl;
+    }
+
+    _requestFrame() {
+        if (this.frameRequested) {
+            return;
+        }
+        this.frameRequested = true;
+        this.schedule(() => {
+            this.frameRequested = false;
+            if (!this.finished) {
+                this._renderOpen();
+            }
+        });
+    }
+
+    _renderOpen() {
+        const source = this.text.slice(this.blockStart);
+        if (!source.trim()) {
+            this.openEl.textContent = source;
+            this.tailEl = this.openEl;
+            return;
+        }
+        // An unclosed fence parses as a code block running to the end
+        this.openEl.innerHTML = this.parse(source);
+        this.stats.openRenders++;
+        this.stats.charsParsed += source.length;
+
+        // Continue plain text inside the innermost last element (the open
+        // paragraph, list item or code block) until the next frame
+        let tail = this.openEl;
+        for (;;) {
+            let last = tail.lastChild;
+            while (last && last.nodeType === Node.TEXT_NODE && !last.textContent.trim()) {
+                last = last.previousSibling;
+            }
+            if (!last || !TAIL_CONTAINERS.has(last.nodeName)) {
+                break;
+            }
+            tail = last;
+        }
+        this.tailEl = tail;
+    }
+}
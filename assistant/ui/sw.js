@@ -1,7 +1,7 @@
 // Genesis AI Assistant - Service Worker
 // Provides offline caching and background sync capabilities
 
-const CACHE_VERSION = 'genesis-v1';
+const CACHE_VERSION = 'genesis-v3';
 const CACHE_NAME = `${CACHE_VERSION}-static`;
 const RUNTIME_CACHE = `${CACHE_VERSION}-runtime`;
 
@@ -10,6 +10,8 @@ const PRECACHE_ASSETS = [
   '/',
   '/static/style.css',
   '/static/app.js',
+  '/static/stream_render.js',
+  '/static/message_list.js',
   '/static/shortcuts.js',
   '/static/offline.html',
   '/static/vendor/marked.min.js',